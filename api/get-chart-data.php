@@ -2,6 +2,7 @@
 require_once __DIR__ . '/../includes/config.php';
 require_once __DIR__ . '/../includes/database.php';
 require_once __DIR__ . '/../includes/functions.php';
+require_once __DIR__ . '/../includes/price_history.php';
 
 header('Content-Type: application/json');
 
@@ -17,9 +18,12 @@ try {
 
     // Fetch historical price data
     try {
-        $stmt = $db->prepare("SELECT recorded_at, price FROM price_history WHERE coin_id = ? ORDER BY recorded_at ASC");
-        $stmt->execute([$coinId]);
-        $history = $stmt->fetchAll(PDO::FETCH_ASSOC);
+        // Optional range (unix seconds) and point spacing; defaults to the full history
+        $end = isset($_GET['end']) ? (int)$_GET['end'] : time();
+        $start = isset($_GET['start']) ? (int)$_GET['start'] : getPriceHistoryStart($db, $coinId);
+        $step = isset($_GET['step']) ? (int)$_GET['step'] : null;
+        $maxPoints = isset($_GET['points']) ? (int)$_GET['points'] : null;
+        $history = $start === null ? [] : fetchPriceHistoryRange($db, $coinId, $start, $end, $step, $maxPoints);
     } catch (PDOException $e) {
         error_log("PDO Error fetching price history for $coinId: " . $e->getMessage());
         throw $e; // Re-throw to be caught by the outer catch block
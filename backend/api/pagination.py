@@ -0,0 +1,104 @@
+"""
+Keyset pagination and streaming export helpers for the trading API.
+
+List endpoints return rows newest first, ordered by (time column, id), and hand out an
+opaque cursor holding the last row's key. The next page filters on that key instead of
+an OFFSET, so with a composite (time, id) index every page is a short index range scan
+no matter how deep it is.
+
+Exports read the same ordered query through a server-side cursor (yield_per) and emit
+NDJSON or CSV chunk by chunk, so memory stays flat for any result size.
+"""
+
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_CHUNK_SIZE = 500
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque URL-safe cursor for the row at (timestamp, row_id)."""
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_order(query, time_column, id_column):
+    """Order a query newest first by (time_column, id_column)."""
+    return query.order_by(time_column.desc(), id_column.desc())
+
+
+def keyset_page(query, time_column, id_column, cursor: Optional[str] = None,
+                limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of `query` after `cursor`.
+
+    Returns the rows and the cursor for the next page, or None when this is the last page.
+    The key condition is spelled out as (t < ct) OR (t = ct AND id < cid) rather than a
+    row-value comparison so MySQL and SQLite both use the (time, id) index for it.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            time_column < timestamp,
+            and_(time_column == timestamp, id_column < row_id)
+        ))
+    # One extra row tells whether another page exists without a COUNT query
+    rows = keyset_order(query, time_column, id_column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, time_column.key), getattr(last, id_column.key))
+
+
+def iter_chunks(query, time_column, id_column, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """Yield lists of up to chunk_size rows from a server-side cursor over the ordered query."""
+    result = keyset_order(query, time_column, id_column).yield_per(chunk_size)
+    chunk = []
+    for row in result:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ndjson_stream(chunks: Iterable[List[Any]], serialize: Callable[[Any], Dict]) -> Iterator[str]:
+    """One JSON object per line, one string per chunk."""
+    for chunk in chunks:
+        yield ''.join(json.dumps(serialize(row), default=str) + '\n' for row in chunk)
+
+
+def csv_stream(chunks: Iterable[List[Any]], serialize: Callable[[Any], Dict]) -> Iterator[str]:
+    """CSV with a header taken from the first row; nested values are written as JSON."""
+    writer, buffer = None, io.StringIO()
+    for chunk in chunks:
+        for row in chunk:
+            record = serialize(row)
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(record), extrasaction='ignore')
+                writer.writeheader()
+            writer.writerow({k: json.dumps(v) if isinstance(v, (dict, list)) else v for k, v in record.items()})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -1,18 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field
 
-from database import get_db
-from data.trading_db import (
-    create_trade, close_trade, get_trades, get_trade_by_id,
-    record_trading_decision, get_trading_decisions,
-    record_bot_thought, get_bot_thoughts,
-    get_profit_summaries, get_total_profit_stats,
+from database import get_db, SessionLocal
+from data.trading_store import (
+    create_trade, close_trade, get_trade_by_id,
+    record_trading_decision,
+    record_bot_thought,
+    get_total_profit_stats,
     add_joke, get_jokes, get_random_joke, update_joke, delete_joke, initialize_default_jokes
 )
 from models.trading_models import Trade, TradingDecision, BotThought, ProfitSummary, BotJoke
+from api.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, iter_chunks, ndjson_stream, csv_stream
+)
 
 router = APIRouter(
     prefix="/trading",
@@ -50,6 +54,7 @@ class ThoughtCreate(BaseModel):
     thought_content: str
     symbol: Optional[str] = None
     confidence: Optional[float] = None
+    metrics: Optional[dict] = None
 
 class JokeCreate(BaseModel):
     joke_text: str
@@ -61,6 +66,86 @@ class JokeUpdate(BaseModel):
     active: Optional[bool] = None
     metrics: Optional[dict] = None
 
+# Filtered queries shared by the list and export endpoints
+
+def _trades_query(db: Session, symbol: Optional[str] = None, status: Optional[str] = None):
+    query = db.query(Trade)
+    if symbol:
+        query = query.filter(Trade.symbol == symbol)
+    if status:
+        query = query.filter(Trade.status == status)
+    return query
+
+def _decisions_query(db: Session, symbol: Optional[str] = None, decision: Optional[str] = None,
+                     from_date: Optional[datetime] = None, to_date: Optional[datetime] = None):
+    query = db.query(TradingDecision)
+    if symbol:
+        query = query.filter(TradingDecision.symbol == symbol)
+    if decision:
+        query = query.filter(TradingDecision.decision == decision)
+    if from_date:
+        query = query.filter(TradingDecision.timestamp >= from_date)
+    if to_date:
+        query = query.filter(TradingDecision.timestamp <= to_date)
+    return query
+
+def _thoughts_query(db: Session, thought_type: Optional[str] = None, symbol: Optional[str] = None,
+                    from_date: Optional[datetime] = None, to_date: Optional[datetime] = None):
+    query = db.query(BotThought)
+    if thought_type:
+        query = query.filter(BotThought.thought_type == thought_type)
+    if symbol:
+        query = query.filter(BotThought.symbol == symbol)
+    if from_date:
+        query = query.filter(BotThought.timestamp >= from_date)
+    if to_date:
+        query = query.filter(BotThought.timestamp <= to_date)
+    return query
+
+def _summaries_query(db: Session, symbol: Optional[str] = None,
+                     from_date: Optional[datetime] = None, to_date: Optional[datetime] = None):
+    query = db.query(ProfitSummary)
+    if symbol:
+        query = query.filter(ProfitSummary.symbol == symbol)
+    if from_date:
+        query = query.filter(ProfitSummary.date >= from_date)
+    if to_date:
+        query = query.filter(ProfitSummary.date <= to_date)
+    return query
+
+def _page_response(query, time_column, id_column, cursor: Optional[str], limit: int) -> dict:
+    """One keyset page, newest first; next_cursor is null on the last page"""
+    try:
+        rows, next_cursor = keyset_page(query, time_column, id_column, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "status": "success",
+        "count": len(rows),
+        "next_cursor": next_cursor,
+        "data": [row.to_dict() for row in rows]
+    }
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _export_response(build_query, time_column, id_column, format: str, name: str) -> StreamingResponse:
+    """Stream every matching row as NDJSON or CSV from a server-side cursor"""
+    def generate():
+        # The request's session may be closed before the body is sent, so the stream owns one
+        db = SessionLocal()
+        try:
+            chunks = iter_chunks(build_query(db), time_column, id_column)
+            stream = ndjson_stream if format == "ndjson" else csv_stream
+            yield from stream(chunks, lambda row: row.to_dict())
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
+
 # API Routes
 
 @router.post("/trades/", response_model=dict)
@@ -99,19 +184,25 @@ def api_close_trade(trade_id: int, close_data: TradeClose, db: Session = Depends
 
 @router.get("/trades/", response_model=dict)
 def api_get_trades(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     symbol: Optional[str] = None,
     status: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get trades with optional filtering"""
-    trades = get_trades(db=db, skip=skip, limit=limit, symbol=symbol, status=status)
-    return {
-        "status": "success",
-        "count": len(trades),
-        "data": [trade.to_dict() for trade in trades]
-    }
+    """Get trades newest first with optional filtering; pass next_cursor as cursor for the next page"""
+    query = _trades_query(db, symbol=symbol, status=status)
+    return _page_response(query, Trade.entry_time, Trade.id, cursor, limit)
+
+@router.get("/trades/export")
+def api_export_trades(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    symbol: Optional[str] = None,
+    status: Optional[str] = None
+):
+    """Export all matching trades as NDJSON or CSV"""
+    return _export_response(lambda db: _trades_query(db, symbol=symbol, status=status),
+                            Trade.entry_time, Trade.id, format, "trades")
 
 @router.get("/trades/{trade_id}", response_model=dict)
 def api_get_trade(trade_id: int, db: Session = Depends(get_db)):
@@ -142,24 +233,31 @@ def api_record_decision(decision: DecisionCreate, db: Session = Depends(get_db))
 
 @router.get("/decisions/", response_model=dict)
 def api_get_decisions(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     symbol: Optional[str] = None,
     decision: Optional[str] = None,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
     db: Session = Depends(get_db)
 ):
-    """Get trading decisions with optional filtering"""
-    decisions = get_trading_decisions(
-        db=db, skip=skip, limit=limit, symbol=symbol,
-        decision=decision, from_date=from_date, to_date=to_date
+    """Get trading decisions newest first with optional filtering"""
+    query = _decisions_query(db, symbol=symbol, decision=decision, from_date=from_date, to_date=to_date)
+    return _page_response(query, TradingDecision.timestamp, TradingDecision.id, cursor, limit)
+
+@router.get("/decisions/export")
+def api_export_decisions(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    symbol: Optional[str] = None,
+    decision: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+):
+    """Export all matching trading decisions as NDJSON or CSV"""
+    return _export_response(
+        lambda db: _decisions_query(db, symbol=symbol, decision=decision, from_date=from_date, to_date=to_date),
+        TradingDecision.timestamp, TradingDecision.id, format, "decisions"
     )
-    return {
-        "status": "success",
-        "count": len(decisions),
-        "data": [decision.to_dict() for decision in decisions]
-    }
 
 @router.post("/thoughts/", response_model=dict)
 def api_record_thought(thought: ThoughtCreate, db: Session = Depends(get_db)):
@@ -179,44 +277,57 @@ def api_record_thought(thought: ThoughtCreate, db: Session = Depends(get_db)):
 
 @router.get("/thoughts/", response_model=dict)
 def api_get_thoughts(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     thought_type: Optional[str] = None,
     symbol: Optional[str] = None,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
     db: Session = Depends(get_db)
 ):
-    """Get bot thoughts with optional filtering"""
-    thoughts = get_bot_thoughts(
-        db=db, skip=skip, limit=limit, thought_type=thought_type,
-        symbol=symbol, from_date=from_date, to_date=to_date
+    """Get bot thoughts newest first with optional filtering"""
+    query = _thoughts_query(db, thought_type=thought_type, symbol=symbol, from_date=from_date, to_date=to_date)
+    return _page_response(query, BotThought.timestamp, BotThought.id, cursor, limit)
+
+@router.get("/thoughts/export")
+def api_export_thoughts(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    thought_type: Optional[str] = None,
+    symbol: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+):
+    """Export all matching bot thoughts as NDJSON or CSV"""
+    return _export_response(
+        lambda db: _thoughts_query(db, thought_type=thought_type, symbol=symbol, from_date=from_date, to_date=to_date),
+        BotThought.timestamp, BotThought.id, format, "thoughts"
     )
-    return {
-        "status": "success",
-        "count": len(thoughts),
-        "data": [thought.to_dict() for thought in thoughts]
-    }
 
 @router.get("/profit/summaries/", response_model=dict)
 def api_get_profit_summaries(
-    skip: int = 0,
-    limit: int = 30,
+    cursor: Optional[str] = None,
+    limit: int = Query(30, ge=1, le=MAX_PAGE_SIZE),
     symbol: Optional[str] = None,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
     db: Session = Depends(get_db)
 ):
-    """Get profit summaries with optional filtering"""
-    summaries = get_profit_summaries(
-        db=db, skip=skip, limit=limit, symbol=symbol,
-        from_date=from_date, to_date=to_date
+    """Get profit summaries newest first with optional filtering"""
+    query = _summaries_query(db, symbol=symbol, from_date=from_date, to_date=to_date)
+    return _page_response(query, ProfitSummary.date, ProfitSummary.id, cursor, limit)
+
+@router.get("/profit/summaries/export")
+def api_export_profit_summaries(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    symbol: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None
+):
+    """Export all matching profit summaries as NDJSON or CSV"""
+    return _export_response(
+        lambda db: _summaries_query(db, symbol=symbol, from_date=from_date, to_date=to_date),
+        ProfitSummary.date, ProfitSummary.id, format, "profit_summaries"
     )
-    return {
-        "status": "success",
-        "count": len(summaries),
-        "data": [summary.to_dict() for summary in summaries]
-    }
 
 @router.get("/profit/stats/", response_model=dict)
 def api_get_profit_stats(
@@ -15,6 +15,7 @@ from flask_cors import CORS
 from flask_socketio import SocketIO
 from sqlalchemy.orm import sessionmaker
 from backend.models.unified_models import Base, LearningMetric, TradingPerformance, engine
+from backend.market_stream import MarketStreamBroker
 import os
 from datetime import datetime, timedelta
 from cachetools import TTLCache
@@ -33,6 +34,24 @@ app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+# Live price/trade/decision/equity stream, fed over local UDP by the updaters and trading loop.
+# Requires a single worker process; see backend/market_stream.py
+stream_broker = MarketStreamBroker(
+    socketio.emit,
+    min_interval=float(os.getenv('MARKET_STREAM_INTERVAL', '0.25')),
+    queue_size=int(os.getenv('MARKET_STREAM_QUEUE_SIZE', '100'))
+)
+
+def start_stream_broker():
+    """Start the broker's background tasks once, whichever server runs the app."""
+    if stream_broker.start(socketio.start_background_task, socketio.sleep):
+        app.logger.info("Market stream broker started")
+
+# Under gunicorn/eventlet the __main__ block never runs, so start on the first request or connection
+@app.before_request
+def ensure_stream_broker():
+    start_stream_broker()
+
 # Configure logging
 log_dir = os.getenv('LOG_DIR', '/tmp')
 if not os.path.exists(log_dir):
@@ -74,11 +93,35 @@ except Exception as e:
 @socketio.on('connect')
 def handle_connect():
     print('Client connected')
-    socketio.emit('server_status', {'status': 'ready'})
+    start_stream_broker()
+    socketio.emit('server_status', {'status': 'ready'}, to=request.sid)
 
 @socketio.on('disconnect')
 def handle_disconnect():
     print('Client disconnected')
+    stream_broker.disconnect(request.sid)
+
+@socketio.on('subscribe')
+def handle_subscribe(data):
+    """Join symbol rooms: {'symbols': ['BTCUSDT', 'portfolio']}. Updates arrive as 'market_update'."""
+    symbols = (data or {}).get('symbols', [])
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    try:
+        return {'subscribed': stream_broker.subscribe(request.sid, symbols)}
+    except RuntimeError as e:
+        return {'subscribed': [], 'error': str(e)}
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe(data):
+    symbols = (data or {}).get('symbols')
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    return {'subscribed': stream_broker.unsubscribe(request.sid, symbols)}
+
+@app.route('/api/stream/stats')
+def get_stream_stats():
+    return jsonify({'success': True, 'data': stream_broker.stats()})
 
 @app.route('/api/status')
 def get_status():
@@ -158,4 +201,5 @@ def get_chart_data():
         session.close()
 
 if __name__ == '__main__':
+    start_stream_broker()
     socketio.run(app, host='0.0.0.0', allow_unsafe_werkzeug=True, port=5000, debug=False)
@@ -0,0 +1,220 @@
+"""
+Circuit breakers for external dependencies (exchange, database, model, data source).
+
+A breaker is CLOSED while calls succeed. After failure_threshold consecutive failures
+it trips to OPEN, and every call fails fast with CircuitOpenError instead of waiting on
+a dependency that is known to be down. Once reset_timeout has passed (or the server's
+Retry-After, if longer) it turns HALF_OPEN and lets up to half_open_max_calls trial
+calls through. Success_threshold successes close it again; one failure re-opens it.
+Each breaker keeps counters for dashboards and recovery analysis.
+
+Configured per dependency in the recovery config:
+
+    "circuit_breakers": {
+        "exchange": {"failure_threshold": 5, "reset_timeout": 30},
+        "database": {"failure_threshold": 3, "reset_timeout": 10}
+    }
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_SETTINGS = {
+    'failure_threshold': 5,
+    'reset_timeout': 30.0,
+    'half_open_max_calls': 1,
+    'success_threshold': 1,
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one dependency.
+
+    Args:
+        name (str): Dependency name, used in errors and metrics.
+        failure_threshold (int): Consecutive failures that trip the breaker.
+        reset_timeout (float): Seconds to stay open before allowing trial calls.
+        half_open_max_calls (int): Concurrent trial calls allowed while half-open.
+        success_threshold (int): Trial successes needed to close again.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, success_threshold: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.clock = clock
+        self._state = CLOSED
+        self._opened_at: Optional[float] = None
+        self._open_for = reset_timeout
+        self._consecutive_failures = 0
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self.trips = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() - self._opened_at >= self._open_for:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+            self._half_open_successes = 0
+            logger.info(f"Circuit '{self.name}' half-open after {self._open_for:.1f}s")
+        return self._state
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._open_for - self.clock())
+
+    def allow(self) -> bool:
+        """Reserve a call; False means fail fast. End allowed calls with record_success/failure() or release()."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            if self._current_state() == HALF_OPEN:
+                self._half_open_successes += 1
+                self._half_open_calls = max(0, self._half_open_calls - 1)
+                if self._half_open_successes >= self.success_threshold:
+                    self._state = CLOSED
+                    logger.info(f"Circuit '{self.name}' closed")
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        """Count a failure; retry_after (e.g. from a 429) keeps the breaker open at least that long."""
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold or retry_after:
+                self._trip(retry_after)
+
+    def _trip(self, retry_after: Optional[float]):
+        if self._state != OPEN:
+            self.trips += 1
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._open_for = max(self.reset_timeout, retry_after or 0.0)
+        self._half_open_calls = 0
+        logger.warning(f"Circuit '{self.name}' open for {self._open_for:.1f}s "
+                       f"after {self._consecutive_failures} consecutive failures")
+
+    def release(self):
+        """Give back a call reserved by allow() whose outcome says nothing about the dependency."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._half_open_calls = max(0, self._half_open_calls - 1)
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def call(self, fn: Callable, *args, is_failure: Callable[[BaseException], bool] = None, **kwargs) -> Any:
+        """
+        Call fn through the breaker.
+
+        Exceptions are re-raised; they count as failures unless is_failure returns False
+        for them (e.g. a bad request is not the dependency's fault).
+        """
+        with self.guard(is_failure):
+            return fn(*args, **kwargs)
+
+    @contextmanager
+    def guard(self, is_failure: Callable[[BaseException], bool] = None):
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+        try:
+            yield self
+        except BaseException as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(getattr(e, 'retry_after', None))
+            else:
+                self.release()
+            raise
+        self.record_success()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state()
+            return {
+                'state': state,
+                'trips': self.trips,
+                'successes': self.successes,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'consecutive_failures': self._consecutive_failures,
+                'retry_in': (max(0.0, self._opened_at + self._open_for - self.clock())
+                             if state == OPEN else 0.0),
+            }
+
+
+class BreakerRegistry:
+    """
+    One lazily created breaker per dependency.
+
+    Args:
+        settings (dict): dependency -> CircuitBreaker keyword arguments; missing keys use DEFAULT_SETTINGS.
+        clock (callable): Monotonic time source shared by all breakers.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, dict]] = None, clock: Callable[[], float] = time.monotonic):
+        self.settings = settings or {}
+        self.clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                options = {**DEFAULT_SETTINGS, **self.settings.get(name, {})}
+                breaker = self._breakers[name] = CircuitBreaker(name, clock=self.clock, **options)
+            return breaker
+
+    def metrics(self) -> Dict[str, dict]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.metrics() for b in breakers}
@@ -0,0 +1,197 @@
+"""
+Database helpers behind the trading API (api/trading_routes.py).
+
+They work on the models in models/trading_models.py with the caller's session and
+commit their own writes. List endpoints do not go through here; they page over the
+models directly with api/pagination.py.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from models.trading_models import BotJoke, BotThought, Trade, TradingDecision
+
+DEFAULT_JOKES = [
+    ("I told my portfolio a joke. It didn't laugh, it just dropped 5%.", "trading"),
+    ("Buy the dip, they said. Now I own the whole dip.", "trading"),
+    ("My stop-loss and I are no longer on speaking terms.", "trading"),
+    ("I'm not a bug, I'm an undocumented trading strategy.", "technical"),
+    ("I ran a backtest on my sense of humor. Sharpe ratio: negative.", "self-deprecating"),
+]
+
+
+def create_trade(db: Session, symbol: str, entry_price: float, entry_quantity: float, trade_type: str,
+                 strategy_used: Optional[str] = None, confidence_score: Optional[float] = None,
+                 decision_id: Optional[int] = None) -> Trade:
+    trade = Trade(
+        symbol=symbol,
+        entry_price=entry_price,
+        entry_quantity=entry_quantity,
+        trade_type=trade_type.upper(),
+        strategy_used=strategy_used,
+        confidence_score=confidence_score,
+        decision_id=decision_id,
+        status="OPEN",
+    )
+    db.add(trade)
+    db.commit()
+    db.refresh(trade)
+    return trade
+
+
+def get_trade_by_id(db: Session, trade_id: int) -> Optional[Trade]:
+    return db.query(Trade).filter(Trade.id == trade_id).first()
+
+
+def close_trade(db: Session, trade_id: int, exit_price: float, exit_quantity: float) -> Trade:
+    """Close an open trade and record its profit/loss. Raises ValueError for unknown or closed trades."""
+    trade = get_trade_by_id(db, trade_id)
+    if trade is None:
+        raise ValueError(f"Trade with ID {trade_id} not found")
+    if trade.status != "OPEN":
+        raise ValueError(f"Trade with ID {trade_id} is {trade.status}, not OPEN")
+
+    direction = -1 if trade.trade_type == "SELL" else 1
+    trade.exit_time = datetime.utcnow()
+    trade.exit_price = exit_price
+    trade.exit_quantity = exit_quantity
+    trade.profit_loss = direction * (exit_price - trade.entry_price) * exit_quantity - (trade.fees or 0.0)
+    cost = trade.entry_price * exit_quantity
+    trade.profit_loss_percentage = trade.profit_loss / cost * 100 if cost else 0.0
+    trade.status = "CLOSED"
+    db.commit()
+    db.refresh(trade)
+    return trade
+
+
+def record_trading_decision(db: Session, symbol: str, decision: str, confidence_score: Optional[float] = None,
+                            thought_process: Optional[str] = None, indicators: Optional[dict] = None,
+                            market_conditions: Optional[dict] = None, model_used: Optional[str] = None,
+                            model_version: Optional[str] = None) -> TradingDecision:
+    db_decision = TradingDecision(
+        symbol=symbol,
+        decision=decision.upper(),
+        confidence_score=confidence_score,
+        thought_process=thought_process,
+        indicators=indicators,
+        market_conditions=market_conditions,
+        model_used=model_used,
+        model_version=model_version,
+    )
+    db.add(db_decision)
+    db.commit()
+    db.refresh(db_decision)
+    return db_decision
+
+
+def record_bot_thought(db: Session, thought_type: str, thought_content: str, symbol: Optional[str] = None,
+                       confidence: Optional[float] = None, metrics: Optional[dict] = None) -> BotThought:
+    thought = BotThought(
+        thought_type=thought_type,
+        thought_content=thought_content,
+        symbol=symbol,
+        confidence=confidence,
+        metrics=metrics,
+    )
+    db.add(thought)
+    db.commit()
+    db.refresh(thought)
+    return thought
+
+
+def get_total_profit_stats(db: Session, symbol: Optional[str] = None, days: int = 30) -> dict:
+    """Win/loss and profit totals of the trades closed in the last `days` days."""
+    query = db.query(Trade.profit_loss).filter(
+        Trade.status == "CLOSED",
+        Trade.exit_time >= datetime.utcnow() - timedelta(days=days),
+    )
+    if symbol:
+        query = query.filter(Trade.symbol == symbol)
+    results = [row.profit_loss or 0.0 for row in query]
+
+    total_profit = sum(p for p in results if p > 0)
+    total_loss = -sum(p for p in results if p < 0)
+    winning = sum(1 for p in results if p > 0)
+    return {
+        "symbol": symbol,
+        "days": days,
+        "total_trades": len(results),
+        "winning_trades": winning,
+        "losing_trades": sum(1 for p in results if p < 0),
+        "win_rate": winning / len(results) if results else 0.0,
+        "total_profit": total_profit,
+        "total_loss": total_loss,
+        "net_profit": total_profit - total_loss,
+        "profit_factor": total_profit / total_loss if total_loss else None,
+    }
+
+
+def add_joke(db: Session, joke_text: str, category: Optional[str] = "general") -> BotJoke:
+    joke = BotJoke(joke_text=joke_text, category=category or "general")
+    db.add(joke)
+    db.commit()
+    db.refresh(joke)
+    return joke
+
+
+def get_jokes(db: Session, skip: int = 0, limit: int = 100, category: Optional[str] = None,
+              active_only: bool = True) -> List[BotJoke]:
+    query = db.query(BotJoke)
+    if category:
+        query = query.filter(BotJoke.category == category)
+    if active_only:
+        query = query.filter(BotJoke.active.is_(True))
+    return query.order_by(BotJoke.id).offset(skip).limit(limit).all()
+
+
+def get_random_joke(db: Session, category: Optional[str] = None) -> Optional[BotJoke]:
+    """A random active joke, counted as used."""
+    query = db.query(BotJoke.id).filter(BotJoke.active.is_(True))
+    if category:
+        query = query.filter(BotJoke.category == category)
+    ids = [row.id for row in query]
+    if not ids:
+        return None
+    joke = db.get(BotJoke, random.choice(ids))
+    joke.use_count = (joke.use_count or 0) + 1
+    joke.last_used_at = datetime.utcnow()
+    db.commit()
+    db.refresh(joke)
+    return joke
+
+
+def update_joke(db: Session, joke_id: int, joke_text: Optional[str] = None, category: Optional[str] = None,
+                active: Optional[bool] = None) -> Optional[BotJoke]:
+    joke = db.get(BotJoke, joke_id)
+    if joke is None:
+        return None
+    if joke_text is not None:
+        joke.joke_text = joke_text
+    if category is not None:
+        joke.category = category
+    if active is not None:
+        joke.active = active
+    db.commit()
+    db.refresh(joke)
+    return joke
+
+
+def delete_joke(db: Session, joke_id: int) -> bool:
+    joke = db.get(BotJoke, joke_id)
+    if joke is None:
+        return False
+    db.delete(joke)
+    db.commit()
+    return True
+
+
+def initialize_default_jokes(db: Session) -> int:
+    """Add DEFAULT_JOKES when the table is empty. Returns jokes added."""
+    if db.query(BotJoke).count():
+        return 0
+    db.add_all(BotJoke(joke_text=text, category=category) for text, category in DEFAULT_JOKES)
+    db.commit()
+    return len(DEFAULT_JOKES)
@@ -1,16 +1,73 @@
 import logging
 import json
-from typing import Dict, Any, List
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.feature_extraction.text import CountVectorizer
+from scipy import sparse
+from sklearn.preprocessing import StandardScaler, normalize
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 
 logger = logging.getLogger(__name__)
 
+REPORT_TIMEFRAMES = {
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+    'weekly': timedelta(weeks=1),
+    'monthly': timedelta(days=30)
+}
+
+
+class IncrementalDecisionClusterer:
+    """
+    TF-IDF + MiniBatchKMeans over decision reasoning, kept between reports.
+
+    Texts are hashed once when a decision is recorded, so there is no vocabulary to refit.
+    Document frequencies are accumulated as decisions arrive and the centroids are
+    updated with partial_fit on new decisions only.
+    """
+
+    def __init__(self, n_clusters: int = 3, n_features: int = 2 ** 12, random_state: int = 42):
+        self.n_clusters = n_clusters
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+        self.doc_freq = np.zeros(n_features)
+        self.n_docs = 0
+        self.fitted = False
+        self._pending: List[sparse.csr_matrix] = []
+
+    def add(self, text: str) -> sparse.csr_matrix:
+        """Hash a new document, update document frequencies and queue it for the centroids."""
+        counts = self.vectorizer.transform([text])
+        self.doc_freq[counts.indices] += 1
+        self.n_docs += 1
+        self._pending.append(counts)
+        return counts
+
+    def tfidf(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+        return normalize(sparse.csr_matrix(counts.multiply(idf)))
+
+    def update(self):
+        """Fold queued documents into the centroids."""
+        if not self._pending:
+            return
+        if not self.fitted and len(self._pending) < self.n_clusters:
+            return
+        self.kmeans.partial_fit(self.tfidf(sparse.vstack(self._pending)))
+        self.fitted = True
+        self._pending = []
+
+    def labels(self, rows: List[sparse.csr_matrix]) -> np.ndarray:
+        self.update()
+        if not self.fitted or not rows:
+            return np.zeros(len(rows), dtype=int)
+        return self.kmeans.predict(self.tfidf(sparse.vstack(rows)))
+
+
 class ExplanationEngine:
     def __init__(self, config: Dict):
         self.config = config
@@ -20,6 +77,13 @@ class ExplanationEngine:
         self.decision_history = []
         self.insight_history = []
         self.patterns = {}
+        # Report state: decision timestamps for windowing, the text model kept between
+        # reports and finished reports per timeframe
+        self._decision_times: List[datetime] = []
+        self.decision_clusterer = IncrementalDecisionClusterer(
+            n_clusters=config.get('pattern_clusters', 3) if config else 3
+        )
+        self._report_cache: Dict[str, tuple] = {}
 
     def explain_decision(self, decision_data: Dict) -> Dict:
         """Generate human-readable explanation for a decision"""
@@ -32,11 +96,7 @@ class ExplanationEngine:
                 'patterns': self._identify_patterns(decision_data)
             }
             
-            self.decision_history.append({
-                'timestamp': datetime.now(),
-                'decision': decision_data['decision'],
-                'explanation': explanation
-            })
+            self._record_decision(decision_data, explanation)
             
             return explanation
             
@@ -119,10 +179,9 @@ class ExplanationEngine:
     def _explain_context(self, decision_data: Dict) -> Dict:
         """Provide context for decision"""
         context = {
-            'market_conditions': self._get_market_conditions(decision_data),
-            'historical_patterns': self._get_historical_patterns(),
-            'risk_factors': self._get_risk_factors(decision_data),
-            'timeframe': self._get_timeframe_context()
+            'market_conditions': decision_data.get('market_regime', 'unknown'),
+            'historical_patterns': [p['description'] for p in self.patterns.get('last_report', [])],
+            'timeframe': self.config.get('timeframe', 'daily') if self.config else 'daily'
         }
         
         return context
@@ -131,8 +190,10 @@ class ExplanationEngine:
         """Identify patterns in decision making"""
         patterns = []
         
-        # Check for similar decisions
-        similar_decisions = self._find_similar_decisions(decision_data)
+        # Same decision in the same market regime among the recent history
+        similar_decisions = [d for d in self.decision_history[-100:]
+                             if d['decision'] == decision_data['decision']
+                             and d['market_regime'] == decision_data.get('market_regime')]
         if similar_decisions:
             patterns.append({
                 'type': 'Decision Pattern',
@@ -140,24 +201,45 @@ class ExplanationEngine:
                 'confidence': np.mean([d['confidence'] for d in similar_decisions])
             })
         
-        # Check for market regime patterns
-        regime_patterns = self._find_regime_patterns(decision_data)
-        if regime_patterns:
-            patterns.extend(regime_patterns)
-        
         return patterns
 
+    def _record_decision(self, decision_data: Dict, explanation: Dict,
+                         timestamp: Optional[datetime] = None) -> None:
+        """Append a decision to the history and to the incremental text model"""
+        timestamp = timestamp or datetime.now()
+        reasoning = decision_data.get('reasoning', [])
+        self.decision_history.append({
+            'timestamp': timestamp,
+            'decision': decision_data['decision'],
+            'confidence': decision_data.get('confidence', 0.0),
+            'reasoning': reasoning,
+            'market_regime': decision_data.get('market_regime', 'unknown'),
+            'insights': decision_data.get('insights', {}),
+            'explanation': explanation,
+            'text_vector': self.decision_clusterer.add(json.dumps(reasoning))
+        })
+        self._decision_times.append(timestamp)
+
     def generate_report(self, timeframe: str = 'daily') -> Dict:
         """Generate comprehensive report"""
         try:
+            # The decision window is loaded once and shared by every section; a finished
+            # report is reused until the window gains or loses decisions
+            start, end = self._window_bounds(timeframe)
+            cached = self._report_cache.get(timeframe)
+            if cached and cached[0] == (start, end):
+                return cached[1]
+
+            recent_decisions = self.decision_history[start:end]
             report = {
-                'summary': self._generate_report_summary(timeframe),
-                'performance': self._analyze_performance(timeframe),
-                'decision_patterns': self._analyze_decision_patterns(timeframe),
-                'risk_analysis': self._analyze_risk(timeframe),
-                'market_insights': self._analyze_market(timeframe)
+                'summary': self._generate_report_summary(timeframe, recent_decisions),
+                'performance': self._analyze_performance(recent_decisions),
+                'decision_patterns': self._analyze_decision_patterns(recent_decisions),
+                'risk_analysis': self._analyze_risk(recent_decisions),
+                'market_insights': self._analyze_market(recent_decisions)
             }
             
+            self._report_cache[timeframe] = ((start, end), report)
             return report
             
         except Exception as e:
@@ -170,10 +252,19 @@ class ExplanationEngine:
                 'market_insights': {}
             }
 
-    def _generate_report_summary(self, timeframe: str) -> str:
+    def _window_bounds(self, timeframe: str) -> tuple:
+        """History slice [start, end) of decisions inside the timeframe"""
+        delta = REPORT_TIMEFRAMES.get(timeframe, REPORT_TIMEFRAMES['daily'])
+        start = bisect_left(self._decision_times, datetime.now() - delta)
+        return start, len(self.decision_history)
+
+    def _get_recent_decisions(self, timeframe: str) -> List[Dict]:
+        """Get decisions within a given timeframe"""
+        start, end = self._window_bounds(timeframe)
+        return self.decision_history[start:end]
+
+    def _generate_report_summary(self, timeframe: str, recent_decisions: List[Dict]) -> str:
         """Generate summary of recent activity"""
-        recent_decisions = self._get_recent_decisions(timeframe)
-        
         if not recent_decisions:
             return "No recent decisions to report"
             
@@ -190,38 +281,33 @@ class ExplanationEngine:
         
         return summary
 
-    def _analyze_performance(self, timeframe: str) -> Dict:
+    def _analyze_performance(self, recent_decisions: List[Dict]) -> Dict:
         """Analyze trading performance"""
-        recent_decisions = self._get_recent_decisions(timeframe)
-        
         if not recent_decisions:
             return {}
             
+        # Outcomes are only known for decisions whose insights carry a profit
+        outcomes = [d['insights'].get('profit', d['insights'].get('pnl')) for d in recent_decisions]
+        outcomes = [o for o in outcomes if o is not None]
         performance = {
-            'win_rate': self._calculate_win_rate(recent_decisions),
+            'win_rate': float(np.mean([o > 0 for o in outcomes])) if outcomes else None,
             'average_confidence': np.mean([d['confidence'] for d in recent_decisions]),
-            'decision_diversity': self._calculate_decision_diversity(recent_decisions),
-            'risk_profile': self._analyze_risk_profile(recent_decisions)
+            'decision_counts': pd.Series([d['decision'] for d in recent_decisions]).value_counts().to_dict()
         }
         
         return performance
 
-    def _analyze_decision_patterns(self, timeframe: str) -> List[Dict]:
+    def _analyze_decision_patterns(self, recent_decisions: List[Dict]) -> List[Dict]:
         """Analyze patterns in decision making"""
-        recent_decisions = self._get_recent_decisions(timeframe)
-        
         if not recent_decisions:
             return []
             
         patterns = []
         
-        # Cluster similar decisions
-        reasons = [json.dumps(d['reasoning']) for d in recent_decisions]
-        X = self.vectorizer.fit_transform(reasons)
-        kmeans = KMeans(n_clusters=3)
-        clusters = kmeans.fit_predict(X)
+        # Cluster similar decisions with the text model kept between reports
+        clusters = self.decision_clusterer.labels([d['text_vector'] for d in recent_decisions])
         
-        for cluster in range(3):
+        for cluster in range(self.decision_clusterer.n_clusters):
             cluster_decisions = [d for i, d in enumerate(recent_decisions) if clusters[i] == cluster]
             if cluster_decisions:
                 patterns.append({
@@ -231,52 +317,42 @@ class ExplanationEngine:
                     'confidence': np.mean([d['confidence'] for d in cluster_decisions])
                 })
         
+        self.patterns['last_report'] = patterns
         return patterns
 
-    def _analyze_risk(self, timeframe: str) -> Dict:
+    def _analyze_risk(self, recent_decisions: List[Dict]) -> Dict:
         """Analyze risk factors"""
-        recent_decisions = self._get_recent_decisions(timeframe)
-        
         if not recent_decisions:
             return {}
             
-        risk_factors = []
-        
-        # Analyze volatility
-        volatility = self._analyze_volatility(recent_decisions)
-        risk_factors.append({
-            'type': 'Volatility',
-            'level': volatility['level'],
-            'trend': volatility['trend'],
-            'impact': volatility['impact']
-        })
-        
-        # Analyze market regime risk
-        regime_risk = self._analyze_regime_risk(recent_decisions)
-        risk_factors.append({
-            'type': 'Market Regime',
-            'current': regime_risk['current'],
-            'transition_risk': regime_risk['transition_risk'],
-            'historical_impact': regime_risk['historical_impact']
-        })
-        
+        confidence = np.array([d['confidence'] for d in recent_decisions], dtype=float)
+        regimes = [d['market_regime'] for d in recent_decisions]
         return {
-            'factors': risk_factors,
-            'overall_risk': self._calculate_overall_risk(risk_factors)
+            'confidence_std': float(confidence.std()),
+            'current_regime': regimes[-1],
+            'regime_counts': pd.Series(regimes).value_counts().to_dict(),
+            'regime_changes': sum(1 for a, b in zip(regimes, regimes[1:]) if a != b)
         }
 
-    def _analyze_market(self, timeframe: str) -> Dict:
+    def _analyze_market(self, recent_decisions: List[Dict]) -> Dict:
         """Analyze market conditions"""
-        recent_decisions = self._get_recent_decisions(timeframe)
-        
         if not recent_decisions:
             return {}
             
+        decisions = [d['decision'] for d in recent_decisions]
         market_analysis = {
-            'regime': self._analyze_market_regime(recent_decisions),
-            'trend_strength': self._analyze_trend_strength(recent_decisions),
-            'sentiment': self._analyze_sentiment(recent_decisions),
-            'volatility_profile': self._analyze_volatility_profile(recent_decisions)
+            'regime': pd.Series([d['market_regime'] for d in recent_decisions]).mode()[0],
+            # Net share of buys over sells, from -1 (all sells) to 1 (all buys)
+            'decision_bias': (decisions.count('buy') - decisions.count('sell')) / len(decisions)
         }
         
         return market_analysis
+
+    def _summarize_cluster(self, cluster_decisions: List[Dict]) -> str:
+        """Describe a cluster by its most common decision and reason"""
+        decisions = pd.Series([d['decision'] for d in cluster_decisions])
+        reasons = pd.Series([r for d in cluster_decisions for r in d['reasoning']], dtype=object)
+        summary = f"Mostly '{decisions.mode()[0]}' decisions"
+        if not reasons.empty:
+            summary += f" driven by: {reasons.astype(str).mode()[0]}"
+        return summary
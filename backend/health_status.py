@@ -0,0 +1,187 @@
+"""
+Health signals published by the trading loop and the checks that read them.
+
+The loop already knows when it last fetched data, how long its last prediction took and
+how often it failed, so it records that in a HealthStatus as it goes. HealthMonitor
+judges each component from those numbers alone, which is a few attribute reads and no
+I/O. Only when a component has published nothing fresh for longer than its max age does
+the monitor fall back to a real probe. Probes run under a time budget, at most one per
+component at a time, and their results are reused for probe_interval seconds, so a
+stalled loop cannot turn the health checker into a second source of exchange traffic.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ('loop', 'data', 'model')
+
+
+@dataclass
+class ComponentStatus:
+    """What the trading loop last published about one component."""
+    last_ok: Optional[float] = None
+    last_error: Optional[float] = None
+    last_error_message: Optional[str] = None
+    consecutive_errors: int = 0
+    total_errors: int = 0
+    latency: Optional[float] = None
+
+
+class HealthStatus:
+    """
+    Freshness, latency and error counters written by the trading loop.
+
+    Args:
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.components: Dict[str, ComponentStatus] = {name: ComponentStatus() for name in COMPONENTS}
+        # Most recent model input, so a model probe never has to fetch data
+        self.last_input: Any = None
+        self._lock = threading.Lock()
+
+    def heartbeat(self):
+        self.record_ok('loop')
+
+    def record_ok(self, component: str, latency: Optional[float] = None):
+        with self._lock:
+            status = self.components[component]
+            status.last_ok = self.clock()
+            status.consecutive_errors = 0
+            if latency is not None:
+                status.latency = latency
+
+    def record_data(self, latest_input: Any = None):
+        self.last_input = latest_input
+        self.record_ok('data')
+
+    def record_prediction(self, latency: float):
+        self.record_ok('model', latency)
+
+    def record_error(self, component: str, error: Any):
+        with self._lock:
+            status = self.components[component]
+            status.last_error = self.clock()
+            status.last_error_message = str(error)
+            status.consecutive_errors += 1
+            status.total_errors += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        now = self.clock()
+        with self._lock:
+            return {
+                name: {
+                    'age': None if s.last_ok is None else now - s.last_ok,
+                    'latency': s.latency,
+                    'consecutive_errors': s.consecutive_errors,
+                    'total_errors': s.total_errors,
+                    'last_error': s.last_error_message,
+                }
+                for name, s in self.components.items()
+            }
+
+
+@dataclass
+class ProbeResult:
+    healthy: bool
+    at: float
+    elapsed: float
+    error: Optional[str] = None
+
+
+@dataclass
+class ComponentPolicy:
+    """When published numbers are good enough and how to probe when they are not."""
+    max_age: float
+    probe: Optional[Callable[[], bool]] = None
+    max_latency: Optional[float] = None
+    max_consecutive_errors: int = 3
+
+
+class HealthMonitor:
+    """
+    Evaluates components from a HealthStatus, probing only stale ones.
+
+    Args:
+        status (HealthStatus): Numbers published by the trading loop.
+        policies (dict): component -> ComponentPolicy.
+        probe_timeout (float): Seconds a probe may take before it counts as failed.
+        probe_interval (float): Seconds a probe result is reused before probing again.
+    """
+
+    def __init__(self, status: HealthStatus, policies: Dict[str, ComponentPolicy],
+                 probe_timeout: float = 10.0, probe_interval: float = 300.0):
+        self.status = status
+        self.policies = policies
+        self.probe_timeout = probe_timeout
+        self.probe_interval = probe_interval
+        self.probes_run = 0
+        self._probe_results: Dict[str, ProbeResult] = {}
+        self._running: Dict[str, Any] = {}
+        self._executor = ThreadPoolExecutor(max_workers=len(policies) or 1, thread_name_prefix='health-probe')
+
+    def evaluate(self, component: str) -> dict:
+        """Judge a component from published numbers and cached probes only; never does I/O."""
+        policy = self.policies[component]
+        published = self.status.components[component]
+        now = self.status.clock()
+        age = None if published.last_ok is None else now - published.last_ok
+
+        if published.consecutive_errors >= policy.max_consecutive_errors:
+            return {'healthy': False, 'stale': False, 'source': 'published', 'age': age,
+                    'reason': f"{published.consecutive_errors} consecutive errors: {published.last_error_message}"}
+        if age is not None and age <= policy.max_age:
+            if policy.max_latency is not None and published.latency is not None \
+                    and published.latency > policy.max_latency:
+                return {'healthy': False, 'stale': False, 'source': 'published', 'age': age,
+                        'reason': f"latency {published.latency:.2f}s over {policy.max_latency:.2f}s"}
+            return {'healthy': True, 'stale': False, 'source': 'published', 'age': age}
+
+        probe = self._probe_results.get(component)
+        if probe is not None and now - probe.at <= self.probe_interval:
+            return {'healthy': probe.healthy, 'stale': True, 'source': 'probe', 'age': age,
+                    'reason': probe.error}
+        return {'healthy': False, 'stale': True, 'source': 'none', 'age': age, 'reason': 'no fresh signal'}
+
+    def check(self, component: str) -> bool:
+        """evaluate(), running the component's probe first if its signal is stale and the last probe expired."""
+        result = self.evaluate(component)
+        if result['stale'] and result['source'] == 'none' and self.policies[component].probe is not None:
+            self.run_probe(component)
+            result = self.evaluate(component)
+        return result['healthy']
+
+    def run_probe(self, component: str) -> ProbeResult:
+        """Run a probe within probe_timeout; a probe still running from an earlier call is not restarted."""
+        policy = self.policies[component]
+        start = self.status.clock()
+        future = self._running.get(component)
+        if future is None or future.done():
+            future = self._executor.submit(policy.probe)
+            self._running[component] = future
+            self.probes_run += 1
+        try:
+            healthy, error = bool(future.result(timeout=self.probe_timeout)), None
+        except FutureTimeout:
+            healthy, error = False, f"probe exceeded {self.probe_timeout:.1f}s"
+        except Exception as e:
+            healthy, error = False, str(e)
+        if error:
+            logger.warning(f"Health probe for {component} failed: {error}")
+        result = ProbeResult(healthy, self.status.clock(), self.status.clock() - start, error)
+        self._probe_results[component] = result
+        return result
+
+    def report(self) -> Dict[str, dict]:
+        return {name: self.evaluate(name) for name in self.policies}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,306 @@
+"""
+Persistent, parallel hyperparameter search for the tree ensembles of AdvancedMLPipeline.
+
+Studies live in a local SQLite store, one per model, feature set and data window, so every trial
+survives the process. Running the search again on the same data window resumes the
+study: finished trials count towards n_trials and trials orphaned by a crash are
+detected by heartbeat and retried. New training data gets a new study (tagged by
+data_window_tag()), which starts from the best parameters of the earlier studies on the
+same feature set (warm start).
+
+Each trial grows its ensemble in stages (warm_start), reports the validation MSE after
+every stage and is pruned by a median or successive-halving pruner as soon as it falls
+behind. Several worker processes optimise the same study at once; the training arrays
+are shared with them as memory-mapped files and each worker's BLAS threads are capped.
+
+Configured through the pipeline config:
+
+    "hyperparameter_search": {
+        "storage_path": "optuna/studies.db",
+        "n_trials": 40,
+        "n_workers": 4,
+        "pruner": "median"
+    }
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.lazy_imports import lazy_import, lazy_attribute
+from backend.ml_components.parallel_training import SharedArrays, limit_threads
+
+optuna = lazy_import('optuna')
+RandomForestRegressor = lazy_attribute('sklearn.ensemble', 'RandomForestRegressor')
+GradientBoostingRegressor = lazy_attribute('sklearn.ensemble', 'GradientBoostingRegressor')
+ExtraTreesRegressor = lazy_attribute('sklearn.ensemble', 'ExtraTreesRegressor')
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'storage_path': 'optuna/studies.db',
+    'n_trials': 40,
+    'n_workers': None,
+    'pruner': 'median',
+    'timeout': None,
+    'validation_fraction': 0.2,
+    # Stages a trial's ensemble is grown in; validation MSE is reported after each
+    'stages': 4,
+    # Best trials of earlier studies on the same feature set enqueued into a new one
+    'warm_start_trials': 3,
+    'seed': None,
+}
+
+
+def _rf_space(trial) -> dict:
+    return {
+        'n_estimators': trial.suggest_int('n_estimators', 50, 200),
+        'max_depth': trial.suggest_int('max_depth', 5, 20),
+        'min_samples_split': trial.suggest_int('min_samples_split', 2, 10),
+    }
+
+
+def _gb_space(trial) -> dict:
+    return {
+        'n_estimators': trial.suggest_int('n_estimators', 50, 200),
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.1, log=True),
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+    }
+
+
+def _et_space(trial) -> dict:
+    return {
+        'n_estimators': trial.suggest_int('n_estimators', 50, 200),
+        'max_depth': trial.suggest_int('max_depth', 5, 20),
+        'min_samples_split': trial.suggest_int('min_samples_split', 2, 10),
+    }
+
+
+# model name -> (estimator class name, search space)
+SEARCH_SPACES: Dict[str, Tuple[str, Callable]] = {
+    'rf': ('RandomForestRegressor', _rf_space),
+    'gb': ('GradientBoostingRegressor', _gb_space),
+    'et': ('ExtraTreesRegressor', _et_space),
+}
+
+
+def _estimator_class(model_name: str):
+    return {
+        'RandomForestRegressor': RandomForestRegressor,
+        'GradientBoostingRegressor': GradientBoostingRegressor,
+        'ExtraTreesRegressor': ExtraTreesRegressor,
+    }[SEARCH_SPACES[model_name][0]]
+
+
+def feature_set_id(feature_names: Sequence[str]) -> str:
+    """Short stable id of an ordered feature list; studies on the same id share history."""
+    return hashlib.sha256('\x1f'.join(map(str, feature_names)).encode()).hexdigest()[:12]
+
+
+def data_window_tag(X) -> str:
+    """
+    Tag of the training window, so new data gets a new study instead of reusing a finished one.
+
+    Frames with a DatetimeIndex or a 'timestamp' column are tagged by their first and last
+    time; anything else by its row count and a hash of its contents.
+    """
+    times = None
+    if hasattr(X, 'index') and hasattr(X.index, 'min') and np.issubdtype(X.index.dtype, np.datetime64):
+        times = X.index
+    elif hasattr(X, 'columns') and 'timestamp' in X.columns:
+        times = X['timestamp']
+    if times is not None and len(times):
+        return f"{times.min():%Y%m%dT%H%M}-{times.max():%Y%m%dT%H%M}"
+    values = np.ascontiguousarray(np.asarray(X, dtype=np.float64))
+    return f"n{len(values)}-{hashlib.sha256(values.tobytes()).hexdigest()[:8]}"
+
+
+def staged_scores(model_name: str, params: dict, X_train: np.ndarray, y_train: np.ndarray,
+                  X_val: np.ndarray, y_val: np.ndarray, stages: int = 4,
+                  seed: Optional[int] = None) -> Iterator[Tuple[int, float]]:
+    """
+    Fit the ensemble in stages and yield (n_estimators, validation MSE) after each.
+
+    The estimator keeps its trees between stages (warm_start), so stopping early costs
+    only the trees grown so far.
+    """
+    params = dict(params)
+    total = params.pop('n_estimators')
+    model = _estimator_class(model_name)(n_estimators=1, warm_start=True, random_state=seed, **params)
+    steps = sorted({max(1, round(total * (i + 1) / stages)) for i in range(stages)})
+    for n_estimators in steps:
+        model.set_params(n_estimators=n_estimators)
+        model.fit(X_train, y_train)
+        residual = model.predict(X_val) - y_val
+        yield n_estimators, float(np.mean(residual * residual))
+
+
+def make_pruner(kind: Optional[str]):
+    if kind == 'median':
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if kind in ('successive_halving', 'sha'):
+        return optuna.pruners.SuccessiveHalvingPruner()
+    if kind in (None, 'none'):
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"Unknown pruner '{kind}'")
+
+
+def make_storage(storage_path: str):
+    """SQLite study store; heartbeats let a resumed search retry trials of a crashed worker."""
+    directory = os.path.dirname(storage_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return optuna.storages.RDBStorage(
+        url=f"sqlite:///{os.path.abspath(storage_path)}",
+        # Workers write to the same file; wait for the lock instead of failing
+        engine_kwargs={'connect_args': {'timeout': 60}},
+        heartbeat_interval=30,
+        grace_period=120,
+        heartbeat_stale_trial_callback=optuna.storages.RetryHeartbeatStaleTrialCallback(max_retry=1),
+    )
+
+
+def _finished_states():
+    return (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+
+
+def _sampler(seed: Optional[int]):
+    return optuna.samplers.TPESampler(seed=seed)
+
+
+def _optimize_worker(storage_path: str, study_name: str, model_name: str, paths: Dict[str, str],
+                     n_trials: int, settings: dict) -> int:
+    """Worker process: optimise the shared study until it holds n_trials finished trials."""
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    arrays = SharedArrays.attach(paths)
+    # Sampler and pruner are not persisted with the study, so each worker builds its own
+    study = optuna.load_study(study_name=study_name, storage=make_storage(storage_path),
+                              sampler=_sampler(settings['seed']), pruner=make_pruner(settings['pruner']))
+    space = SEARCH_SPACES[model_name][1]
+    stages = settings['stages']
+
+    def objective(trial):
+        score = None
+        for step, score in staged_scores(model_name, space(trial), arrays['X_train'], arrays['y_train'],
+                                         arrays['X_val'], arrays['y_val'], stages, settings['seed']):
+            trial.report(score, step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        return score
+
+    stop = optuna.study.MaxTrialsCallback(n_trials, states=_finished_states())
+    study.optimize(objective, n_trials=n_trials, timeout=settings['timeout'], callbacks=[stop],
+                   catch=(ValueError,))
+    return len(study.trials)
+
+
+class HyperparameterSearch:
+    """
+    Resumable multi-process optuna search over SEARCH_SPACES.
+
+    Args:
+        config (dict): Overrides of DEFAULT_CONFIG.
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        self.storage_path = self.config['storage_path']
+
+    def study_name(self, model_name: str, feature_names: Sequence[str], data_tag: Optional[str] = None) -> str:
+        name = f"{model_name}-{feature_set_id(feature_names)}"
+        return f"{name}-{data_tag}" if data_tag else name
+
+    def load_study(self, model_name: str, feature_names: Sequence[str], data_tag: Optional[str] = None):
+        """Create or resume the study for a model and feature set."""
+        name = self.study_name(model_name, feature_names, data_tag)
+        study = optuna.create_study(
+            study_name=name,
+            storage=make_storage(self.storage_path),
+            direction='minimize',
+            sampler=_sampler(self.config['seed']),
+            pruner=make_pruner(self.config['pruner']),
+            load_if_exists=True,
+        )
+        if not study.trials:
+            self._warm_start(study, self.study_name(model_name, feature_names))
+        return study
+
+    def _warm_start(self, study, prefix: str):
+        """Enqueue the best parameters of earlier studies on the same model and feature set."""
+        best: List[Tuple[float, dict]] = []
+        for summary in optuna.get_all_study_summaries(storage=make_storage(self.storage_path)):
+            if summary.study_name == study.study_name or not summary.study_name.startswith(prefix):
+                continue
+            earlier = optuna.load_study(study_name=summary.study_name, storage=make_storage(self.storage_path))
+            best.extend((t.value, t.params) for t in earlier.get_trials(
+                deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)))
+        best.sort(key=lambda item: item[0])
+        for _, params in best[:self.config['warm_start_trials']]:
+            study.enqueue_trial(params, skip_if_exists=True)
+        if best:
+            logger.info(f"Warm-started {study.study_name} with {min(len(best), self.config['warm_start_trials'])} "
+                        f"trials from earlier studies")
+
+    def optimize(self, model_name: str, X: np.ndarray, y: np.ndarray,
+                 feature_names: Optional[Sequence[str]] = None, data_tag: Optional[str] = None) -> dict:
+        """
+        Run (or resume) the search and return the best parameters found so far.
+
+        The last validation_fraction of the rows is held out for the intermediate scores.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        y = np.ascontiguousarray(np.asarray(y, dtype=np.float32).ravel())
+        if feature_names is None:
+            feature_names = [f"f{i}" for i in range(X.shape[1])]
+        split = int(len(X) * (1 - self.config['validation_fraction']))
+        arrays = {'X_train': X[:split], 'y_train': y[:split], 'X_val': X[split:], 'y_val': y[split:]}
+
+        study = self.load_study(model_name, feature_names, data_tag)
+        n_trials = self.config['n_trials']
+        finished = len(study.get_trials(deepcopy=False, states=_finished_states()))
+        remaining = n_trials - finished
+        if remaining > 0:
+            self._run_workers(study.study_name, model_name, arrays, n_trials, remaining)
+        else:
+            logger.info(f"Study {study.study_name} already has {finished} finished trials")
+
+        study = optuna.load_study(study_name=study.study_name, storage=make_storage(self.storage_path))
+        pruned = len(study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.PRUNED,)))
+        if not study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)):
+            logger.warning(f"Study {study.study_name} has no completed trials; using estimator defaults")
+            return {}
+        logger.info(f"Study {study.study_name}: best MSE {study.best_value:.6f} after "
+                    f"{len(study.trials)} trials ({pruned} pruned)")
+        return study.best_params
+
+    def _run_workers(self, study_name: str, model_name: str, arrays: Dict[str, np.ndarray],
+                     n_trials: int, remaining: int):
+        cpus = os.cpu_count() or 1
+        workers = max(1, min(self.config['n_workers'] or cpus, remaining))
+        threads = max(1, cpus // workers)
+        logger.info(f"Searching {study_name}: {remaining} trials on {workers} workers")
+        args = (self.storage_path, study_name, model_name)
+        seed = self.config['seed']
+        settings = [{
+            'stages': self.config['stages'],
+            'timeout': self.config['timeout'],
+            'pruner': self.config['pruner'],
+            # Distinct sampler seeds so seeded workers do not propose the same trials
+            'seed': None if seed is None else seed + worker,
+        } for worker in range(workers)]
+        with SharedArrays(arrays) as shared:
+            if workers == 1:
+                _optimize_worker(*args, shared.paths, n_trials, settings[0])
+                return
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=limit_threads, initargs=(threads,)) as pool:
+                futures = [pool.submit(_optimize_worker, *args, shared.paths, n_trials, worker_settings)
+                           for worker_settings in settings]
+                for future in futures:
+                    future.result()
@@ -0,0 +1,132 @@
+"""
+Deferred imports for heavy frameworks.
+
+TensorFlow, PyTorch, TA-Lib, optuna and scikit-learn each take from hundreds of
+milliseconds to several seconds to import. Modules bind them at top level through
+lazy_import()/lazy_attribute() instead, and the real import happens on first use,
+i.e. when a model of that kind is actually built or loaded. Cron runs and PHP-triggered
+scripts that never touch a framework no longer pay for it.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent importing each lazily loaded module, filled in on first use
+import_times: Dict[str, float] = {}
+
+_modules: Dict[str, 'LazyModule'] = {}
+_lock = threading.RLock()
+
+
+class LazyModule:
+    """Stand-in for a module that imports the real one on first attribute access."""
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_hooks'] = []
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is not None:
+            return module
+        with _lock:
+            if self.__dict__['_module'] is None:
+                name = self.__dict__['_name']
+                # Load a lazily bound parent package first so its import hooks run
+                root = name.split('.')[0]
+                if root != name and root in _modules:
+                    _modules[root]._load()
+                start = time.perf_counter()
+                module = importlib.import_module(name)
+                import_times[name] = time.perf_counter() - start
+                logger.debug(f"Lazily imported {name} in {import_times[name]:.3f}s")
+                for hook in self.__dict__['_hooks']:
+                    hook(module)
+                self.__dict__['_module'] = module
+        return self.__dict__['_module']
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__['_module'] is not None
+
+    def add_import_hook(self, hook: Callable):
+        """Run `hook(module)` once the module is imported (immediately if it already is)."""
+        with _lock:
+            if self.loaded:
+                hook(self.__dict__['_module'])
+            else:
+                self.__dict__['_hooks'].append(hook)
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+class LazyAttribute:
+    """Stand-in for a class or function from a lazily imported module."""
+
+    def __init__(self, module_name: str, attr: str):
+        self._module = lazy_import(module_name)
+        self._attr = attr
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            self._target = getattr(self._module, self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f"<lazy attribute '{self._module.__dict__['_name']}.{self._attr}'>"
+
+
+def lazy_import(name: str, on_import: Optional[Callable] = None) -> LazyModule:
+    """
+    Return a shared lazy stand-in for module `name`.
+
+    Args:
+        name (str): Dotted module name (e.g. 'tensorflow', 'torch.nn').
+        on_import (callable): Optional hook called with the real module once it is imported.
+    """
+    with _lock:
+        module = _modules.get(name)
+        if module is None:
+            module = _modules[name] = LazyModule(name)
+        if name in sys.modules and not module.loaded:
+            module._load()
+    if on_import is not None:
+        module.add_import_hook(on_import)
+    return module
+
+
+def lazy_attribute(module_name: str, attr: str) -> LazyAttribute:
+    """Return a stand-in for `module_name.attr` that imports the module when first called or accessed."""
+    return LazyAttribute(module_name, attr)
+
+
+def loaded_modules(names: List[str]) -> List[str]:
+    """Return which of the given top-level modules have actually been imported."""
+    return [name for name in names if name in sys.modules]
@@ -0,0 +1,286 @@
+"""
+Live market stream for dashboards over the app's Socket.IO server.
+
+Producers (the price updaters and the trading loop) run in their own processes and
+publish events as fire-and-forget JSON datagrams to a local UDP port. The Flask app runs
+a MarketStreamBroker that receives them and fans them out to clients subscribed to the
+event's room. A room is a symbol, or PORTFOLIO_ROOM for account-wide events.
+
+Each client gets at most one 'market_update' batch per min_interval and never more than
+one unacknowledged batch. While a client is busy, price and equity updates are conflated
+to the latest value per symbol; trades and decisions are queued, but only the most recent
+queue_size are kept. A slow client therefore receives current values plus a dropped
+count, never a growing backlog.
+
+Deployment: the app must run as a single worker process (socketio.run, or gunicorn with
+eventlet and -w 1). Only the process that binds the UDP port receives events, and the
+broker does not share subscriptions across processes. A broker that cannot bind logs an
+error, reports listening=False in stats() and refuses subscriptions, so a second worker
+fails loudly instead of leaving its clients without updates.
+
+Events:
+    price     {'price': ..., 'timestamp': ...}
+    equity    {'value': ..., 'timestamp': ...}
+    trade     {'side': ..., 'amount': ..., 'price': ..., 'timestamp': ...}
+    decision  {'signal': ..., 'confidence': ..., 'timestamp': ...}
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STREAM_HOST = os.getenv('MARKET_STREAM_HOST', '127.0.0.1')
+STREAM_PORT = int(os.getenv('MARKET_STREAM_PORT', '8765'))
+PORTFOLIO_ROOM = 'portfolio'
+
+# Only the latest value matters for these, every occurrence matters for the others
+CONFLATED_EVENTS = ('price', 'equity')
+QUEUED_EVENTS = ('trade', 'decision')
+EVENTS = CONFLATED_EVENTS + QUEUED_EVENTS
+
+MAX_DATAGRAM = 65507
+
+
+class StreamPublisher:
+    """
+    Publishes events to the broker without ever blocking the producer.
+
+    A missing or busy broker only means the datagram is lost; publish() never raises.
+    """
+
+    def __init__(self, host: str = STREAM_HOST, port: int = STREAM_PORT):
+        self.address = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self.failures = 0
+
+    def publish(self, event: str, symbol: str, data: Dict[str, Any]) -> bool:
+        if event not in EVENTS:
+            raise ValueError(f"Unknown stream event: {event}")
+        message = json.dumps({'event': event, 'symbol': symbol, 'data': data}, default=str).encode()
+        try:
+            self._sock.sendto(message, self.address)
+            return True
+        except OSError:
+            self.failures += 1
+            return False
+
+    def close(self):
+        self._sock.close()
+
+
+class ClientStream:
+    """Messages waiting for one client."""
+
+    def __init__(self, queue_size: int):
+        self.rooms = set()
+        self.latest: OrderedDict = OrderedDict()
+        self.queue = deque(maxlen=queue_size)
+        self.dropped = 0
+        self.in_flight_since: Optional[float] = None
+        self.last_sent = float('-inf')
+        self.sent = 0
+
+    def pending(self) -> bool:
+        return bool(self.latest or self.queue or self.dropped)
+
+
+class MarketStreamBroker:
+    """
+    Per-room fan-out with per-client throttling, conflation and acknowledgement backpressure.
+
+    Args:
+        emit (callable): emit(event, data, to=sid, callback=fn), e.g. socketio.emit.
+        min_interval (float): Minimum seconds between batches to one client.
+        queue_size (int): Trades/decisions kept per client while it is busy.
+        ack_timeout (float): Seconds after which an unacknowledged batch no longer blocks the client.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(self, emit: Callable, min_interval: float = 0.25, queue_size: int = 100,
+                 ack_timeout: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.emit = emit
+        self.min_interval = min_interval
+        self.queue_size = queue_size
+        self.ack_timeout = ack_timeout
+        self.clock = clock
+        self.rooms: Dict[str, set] = {}
+        self.clients: Dict[str, ClientStream] = {}
+        self.received = 0
+        self.invalid = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = False
+        # None until the receive loop tried to bind, then whether it owns the port
+        self.listening: Optional[bool] = None
+
+    # Subscriptions
+
+    def subscribe(self, sid: str, rooms: Iterable[str]) -> List[str]:
+        """Join rooms. Raises RuntimeError when this process could not bind the stream port."""
+        if self.listening is False:
+            raise RuntimeError("Market stream is not listening in this process")
+        with self._lock:
+            client = self.clients.setdefault(sid, ClientStream(self.queue_size))
+            for room in rooms:
+                client.rooms.add(room)
+                self.rooms.setdefault(room, set()).add(sid)
+            return sorted(client.rooms)
+
+    def unsubscribe(self, sid: str, rooms: Optional[Iterable[str]] = None) -> List[str]:
+        with self._lock:
+            client = self.clients.get(sid)
+            if client is None:
+                return []
+            for room in list(client.rooms if rooms is None else rooms):
+                client.rooms.discard(room)
+                members = self.rooms.get(room)
+                if members is not None:
+                    members.discard(sid)
+                    if not members:
+                        del self.rooms[room]
+                # Nothing from a left room may still be delivered
+                for key in [k for k in client.latest if k[1] == room]:
+                    del client.latest[key]
+            return sorted(client.rooms)
+
+    def disconnect(self, sid: str):
+        self.unsubscribe(sid)
+        with self._lock:
+            self.clients.pop(sid, None)
+
+    # Publishing
+
+    def publish(self, event: str, room: str, data: Dict[str, Any]):
+        """Queue an event for every client in `room`. Never emits directly."""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown stream event: {event}")
+        message = {'event': event, 'symbol': room, 'data': data}
+        with self._lock:
+            for sid in self.rooms.get(room, ()):
+                client = self.clients[sid]
+                if event in CONFLATED_EVENTS:
+                    client.latest[(event, room)] = message
+                    client.latest.move_to_end((event, room))
+                else:
+                    if len(client.queue) == client.queue.maxlen:
+                        client.dropped += 1
+                    client.queue.append(message)
+
+    def handle_datagram(self, payload: bytes):
+        try:
+            message = json.loads(payload)
+            self.publish(message['event'], message['symbol'], message.get('data', {}))
+            self.received += 1
+        except (ValueError, KeyError, TypeError) as e:
+            self.invalid += 1
+            logger.debug(f"Ignoring invalid stream message: {e}")
+
+    # Delivery
+
+    def flush(self) -> int:
+        """Send one batch to every client that is due and not busy. Returns batches sent."""
+        now = self.clock()
+        batches = []
+        with self._lock:
+            for sid, client in self.clients.items():
+                if not client.pending() or now - client.last_sent < self.min_interval:
+                    continue
+                if client.in_flight_since is not None and now - client.in_flight_since < self.ack_timeout:
+                    continue
+                batch = {'messages': list(client.queue) + list(client.latest.values()),
+                         'dropped': client.dropped}
+                client.queue.clear()
+                client.latest.clear()
+                client.dropped = 0
+                client.in_flight_since = now
+                client.last_sent = now
+                client.sent += 1
+                batches.append((sid, batch))
+        # Emit outside the lock; acks may arrive on other threads
+        for sid, batch in batches:
+            self.emit('market_update', batch, to=sid, callback=self._ack_callback(sid))
+        return len(batches)
+
+    def _ack_callback(self, sid: str) -> Callable:
+        def ack(*args):
+            with self._lock:
+                client = self.clients.get(sid)
+                if client is not None:
+                    client.in_flight_since = None
+        return ack
+
+    # Background tasks
+
+    def start(self, spawn: Callable, sleep: Callable[[float], None] = time.sleep,
+              host: str = STREAM_HOST, port: int = STREAM_PORT):
+        """
+        Start the receive and flush loops with e.g. socketio.start_background_task/socketio.sleep.
+
+        Safe to call on every request; only the first call after construction or stop() spawns.
+        Returns True when the loops were started by this call.
+        """
+        with self._lock:
+            if self._started:
+                return False
+            self._started = True
+        self._stop.clear()
+        spawn(self._receive_loop, host, port)
+        spawn(self._flush_loop, sleep)
+        return True
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            self._started = False
+
+    def _receive_loop(self, host: str, port: int):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind((host, port))
+        except OSError as e:
+            self.listening = False
+            logger.error(f"Market stream could not listen on udp://{host}:{port}: {e}. Clients of this "
+                         f"process get no market updates; run the app as a single worker process.")
+            sock.close()
+            return
+        self.listening = True
+        sock.settimeout(0.5)
+        logger.info(f"Market stream listening on udp://{host}:{port}")
+        try:
+            while not self._stop.is_set():
+                try:
+                    payload, _ = sock.recvfrom(MAX_DATAGRAM)
+                except socket.timeout:
+                    continue
+                self.handle_datagram(payload)
+        finally:
+            sock.close()
+
+    def _flush_loop(self, sleep: Callable[[float], None]):
+        while not self._stop.is_set():
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Market stream flush failed: {e}")
+            sleep(min(self.min_interval, 0.1))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'listening': self.listening,
+                'received': self.received,
+                'invalid': self.invalid,
+                'rooms': {room: len(sids) for room, sids in self.rooms.items()},
+                'clients': {sid: {'rooms': sorted(c.rooms), 'sent': c.sent,
+                                  'pending': len(c.latest) + len(c.queue), 'dropped': c.dropped,
+                                  'awaiting_ack': c.in_flight_since is not None}
+                            for sid, c in self.clients.items()},
+            }
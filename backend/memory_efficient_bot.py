@@ -4,13 +4,21 @@ import time
 import logging
 import psutil
 import threading
+import gc
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-import yfinance as yf
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List
 import requests
 import json
+import asyncio
+
+from backend.lazy_imports import lazy_import
+from backend.rate_limiter import AsyncRateLimiter
+from backend.symbol_windows import LRUCache, SymbolWindows, release_memory
+from backend.market_stream import StreamPublisher
+
+yf = lazy_import('yfinance')
 
 # Memory monitoring
 MEMORY_THRESHOLD = 0.8
@@ -22,6 +30,12 @@ class MemoryMonitor:
         self.last_cleanup = time.time()
         self.cleanup_interval = self.config['cleanup_interval_seconds']
         self.consecutive_errors = 0
+        # Callables taking an eviction tier: 'reduce', 'emergency' or 'restore'
+        self.evictors: List[Callable[[str], None]] = []
+        
+    def add_evictor(self, evictor: Callable[[str], None]):
+        """Register a component that frees memory when asked"""
+        self.evictors.append(evictor)
         
     def check_memory(self) -> Dict:
         """Comprehensive memory check with multiple thresholds"""
@@ -46,140 +60,108 @@ class MemoryMonitor:
             
         # Check swap usage
         if swap.percent > self.config['max_swap_usage'] * 100:
-            result['status'] = 'warning'
+            if result['status'] == 'ok':
+                result['status'] = 'warning'
             result['recommendations'].append('reduce_swap')
             
         return result
         
     def cleanup_memory(self):
-        """Enhanced cleanup with multiple strategies"""
+        """Periodic cleanup: apply the eviction tier that matches the current memory status"""
         if time.time() - self.last_cleanup > self.cleanup_interval:
             self.last_cleanup = time.time()
+            status = self.check_memory()
             
-            # Implement cleanup strategies
-            if 'reduce_load' in self.config['low_memory_actions']:
+            if 'emergency_cleanup' in status['recommendations']:
+                self.emergency_cleanup()
+            elif status['status'] != 'ok':
                 self.reduce_memory_load()
+            else:
+                self._evict('restore')
                 
-            if 'emergency_cleanup' in self.config['low_memory_actions']:
-                self.emergency_cleanup()
+            # Check again sooner while under pressure
+            if status['status'] != 'ok' and self.config['low_memory_actions'].get('increase_cleanup_frequency'):
+                self.last_cleanup -= self.cleanup_interval * 0.75
                 
             logging.info(f"Memory cleanup completed. Status: {self.check_memory()['status']}")
             
+    def _evict(self, tier: str):
+        for evictor in self.evictors:
+            evictor(tier)
+            
     def reduce_memory_load(self):
-        """Reduce memory usage by limiting data"""
+        """Reduce memory usage by trimming caches and idle data"""
         try:
-            # Implement memory reduction strategies
             logging.info("Reducing memory load...")
-            # Add more memory reduction strategies here
+            self._evict('reduce')
+            gc.collect()
         except Exception as e:
             logging.error(f"Error during memory reduction: {e}")
             
     def emergency_cleanup(self):
         """Emergency cleanup when memory is critically low"""
         try:
-            # Implement emergency cleanup strategies
             logging.info("Performing emergency memory cleanup...")
-            # Add emergency cleanup strategies here
+            self._evict('emergency')
+            release_memory()
         except Exception as e:
             logging.error(f"Error during emergency cleanup: {e}")
 
-class RateLimiter:
-    def __init__(self, calls_per_minute: int, error_config: Dict):
-        self.calls_per_minute = calls_per_minute
-        self.calls = 0
-        self.last_reset = time.time()
-        self.error_config = error_config
-        self.consecutive_errors = 0
-        self.last_error_time = 0
-        
-    def can_make_call(self) -> bool:
-        """Rate limiting with error handling"""
-        current_time = time.time()
-        
-        # Handle rate limits
-        if current_time - self.last_reset > 60:
-            self.calls = 0
-            self.last_reset = current_time
-            return True
-            
-        if self.calls < self.calls_per_minute:
-            self.calls += 1
-            return True
-            
-        # Handle error conditions
-        if self.consecutive_errors >= self.error_config['max_consecutive_errors']:
-            cooldown_time = self.error_config['error_cooldown_seconds']
-            if current_time - self.last_error_time < cooldown_time:
-                return False
-                
-        return False
-        
-    def register_error(self):
-        """Register an API error"""
-        self.consecutive_errors += 1
-        self.last_error_time = time.time()
-        
-    def reset_error_count(self):
-        """Reset error count after successful call"""
-        self.consecutive_errors = 0
-
 class NetworkErrorTracker:
-    def __init__(self, config: Dict):
+    """Per-endpoint network error backoff that never blocks the event loop"""
+    def __init__(self, config: Dict, rate_limiter: AsyncRateLimiter):
         self.config = config
-        self.last_error_time = 0
-        self.consecutive_errors = 0
-        self.error_cooldown = self.config['error_handling']['network']['error_cooldown_seconds']
+        self.rate_limiter = rate_limiter
         
-    def handle_network_error(self, error: Exception) -> bool:
-        """Handle network errors with retry logic"""
-        current_time = time.time()
-        
-        # Track consecutive errors
-        self.consecutive_errors += 1
-        self.last_error_time = current_time
-        
-        # Check if we should give up
-        if self.consecutive_errors > self.config['error_handling']['network']['max_retries']:
-            logging.error(f"Too many consecutive network errors: {self.consecutive_errors}")
+    def handle_network_error(self, error: Exception, endpoint: str) -> bool:
+        """Register a network error; the endpoint's next acquire() waits out the backoff"""
+        backoff = self.rate_limiter.record_failure(endpoint)
+        if backoff is None:
+            logging.error(f"Too many consecutive network errors for {endpoint}")
             return False
             
-        # Calculate backoff time
-        backoff = min(
-            self.config['error_handling']['network']['backoff_factor'] ** self.consecutive_errors,
-            self.config['error_handling']['network']['timeout_seconds']
-        )
-        
-        logging.warning(f"Network error: {error}. Retrying in {backoff} seconds...")
-        time.sleep(backoff)
+        logging.warning(f"Network error on {endpoint}: {error}. Retrying in {backoff:.1f} seconds...")
         return True
 
 class MemoryEfficientTradingBot:
     def __init__(self, config_path: str):
         self.config = self.load_config(config_path)
         self.memory_monitor = MemoryMonitor(self.config)
-        self.rate_limiters = {
-            'yfinance': RateLimiter(
-                self.config['api_settings']['rate_limits']['yfinance']['calls_per_minute'],
-                self.config['api_settings']['error_config']
-            ),
-            'binance': RateLimiter(
-                self.config['api_settings']['rate_limits']['binance']['calls_per_minute'],
-                self.config['api_settings']['error_config']
-            ),
-            'coingecko': RateLimiter(
-                self.config['api_settings']['rate_limits']['coingecko']['calls_per_minute'],
-                self.config['api_settings']['error_config']
-            )
-        }
-        self.network_error_tracker = NetworkErrorTracker(self.config)
+        self.rate_limiter = AsyncRateLimiter.from_config(self.config)
+        self.network_error_tracker = NetworkErrorTracker(self.config, self.rate_limiter)
+        self.http = requests.Session()
         self.last_data_cleanup = time.time()
-        self.data_cache = {}
+        
+        # Multi-symbol state: one float32 ring buffer per symbol, derived indicators in an LRU
+        memory_settings = self.config['memory_settings']
+        self.windows = SymbolWindows(memory_settings['max_data_points'])
+        self.data_cache = LRUCache(0)
+        self.symbols = self.config['trading_settings'].get('symbols', ['BTC-USD'])
+        self.memory_monitor.add_evictor(self.evict)
+        self.stream = StreamPublisher()
+        
         self.error_handlers = {
             'memory': self.handle_memory_error,
             'network': self.handle_network_error,
             'api': self.handle_api_error
         }
 
+    @property
+    def symbols(self) -> List[str]:
+        return self._symbols
+
+    @symbols.setter
+    def symbols(self, symbols: List[str]):
+        """
+        Set the traded symbols and size the indicator cache to match.
+
+        Every symbol is looked up once per cycle, so a cache smaller than the symbol list
+        would evict each entry before its next use. memory_settings.cache_size, if set,
+        only raises the bound.
+        """
+        self._symbols = list(symbols)
+        self.data_cache.resize(max(self.config['memory_settings'].get('cache_size', 0), len(self._symbols)))
+
     def load_config(self, config_path: str) -> Dict:
         """Load and validate configuration with error handling"""
         try:
@@ -226,23 +208,23 @@ class MemoryEfficientTradingBot:
         logging.error("Critical configuration error. Shutting down...")
         sys.exit(1)
         
-    def fetch_data(self, source: str, symbol: str, interval: str, period: str = "15d") -> Optional[pd.DataFrame]:
+    async def fetch_data(self, source: str, symbol: str, interval: str, period: str = "15d") -> Optional[pd.DataFrame]:
         """Enhanced data fetching with comprehensive error handling"""
         if not self.memory_monitor.check_memory()['status'] == 'ok':
             logging.warning("Memory usage too high, skipping data fetch")
             return None
             
-        if not self.rate_limiters[source].can_make_call():
-            logging.warning(f"Rate limit exceeded for {source}")
-            return None
+        # Waits for a token (or a backoff) without blocking the event loop
+        await self.rate_limiter.acquire(source)
             
         try:
             if source == 'yfinance':
-                df = yf.download(tickers=symbol, interval=interval, period=period)
+                df = await asyncio.to_thread(yf.download, tickers=symbol, interval=interval, period=period)
                 if df.empty:
                     logging.warning(f"Empty data received from {source}")
                     return None
                     
+                self.rate_limiter.record_success(source)
                 df = df.tail(self.config['memory_settings']['max_data_points'])
                 return df
                 
@@ -250,12 +232,36 @@ class MemoryEfficientTradingBot:
             return None
             
         except requests.exceptions.RequestException as e:
-            if not self.network_error_tracker.handle_network_error(e):
-                return None
+            self.handle_network_error(e, source)
+            return None
             
         except Exception as e:
             logging.error(f"Error fetching data from {source}: {e}")
-            self.rate_limiters[source].register_error()
+            self.rate_limiter.record_failure(source)
+            return None
+
+    async def request_json(self, source: str, url: str, path: str, params: Optional[Dict] = None,
+                           weight: float = 1) -> Optional[Any]:
+        """
+        Rate-limited GET against an exchange/data API.
+
+        Waits for `source:path` tokens, feeds response rate-limit headers back into the
+        limiter and backs the endpoint off on errors instead of sleeping.
+        """
+        endpoint = f"{source}:{path}"
+        await self.rate_limiter.acquire(endpoint, weight)
+        timeout = self.config['error_handling']['network']['timeout_seconds']
+        try:
+            response = await asyncio.to_thread(self.http.get, url + path, params=params, timeout=timeout)
+            self.rate_limiter.update_from_headers(endpoint, response.headers, response.status_code)
+            response.raise_for_status()
+            self.rate_limiter.record_success(endpoint)
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            self.handle_api_error(e, endpoint)
+            return None
+        except requests.exceptions.RequestException as e:
+            self.handle_network_error(e, endpoint)
             return None
             
     def handle_memory_error(self, error: Exception):
@@ -274,57 +280,84 @@ class MemoryEfficientTradingBot:
                 
         return memory_status['memory_usage'] < self.config['error_handling']['memory']['threshold'] * 100
         
-    def handle_network_error(self, error: Exception):
+    def handle_network_error(self, error: Exception, endpoint: str = 'network'):
         """Handle network-related errors"""
         max_retries = self.config['error_handling']['network']['max_retries']
-        backoff_factor = self.config['error_handling']['network']['backoff_factor']
-        timeout = self.config['error_handling']['network']['timeout_seconds']
         
-        if not self.network_error_tracker.handle_network_error(error):
+        if not self.network_error_tracker.handle_network_error(error, endpoint):
             logging.error(f"Too many network errors after {max_retries} attempts")
             return False
             
         return True
         
-    def handle_api_error(self, error: Exception):
+    def handle_api_error(self, error: Exception, endpoint: str = 'api'):
         """Handle API-related errors"""
         if isinstance(error, requests.exceptions.Timeout):
             logging.warning("API timeout. Retrying...")
+            self.rate_limiter.record_failure(endpoint)
             return True
             
-        if isinstance(error, requests.exceptions.RateLimitExceeded):
-            logging.warning("API rate limit exceeded. Waiting...")
-            time.sleep(self.config['api_settings']['error_config']['rate_limit_wait'])
+        response = getattr(error, 'response', None)
+        if response is not None and response.status_code in (418, 429):
+            # Retry-After was already applied to the source; also back this endpoint off
+            retry_after = response.headers.get('Retry-After')
+            wait = float(retry_after) if retry_after and retry_after.isdigit() else \
+                self.config['api_settings']['error_config']['rate_limit_wait']
+            logging.warning(f"API rate limit exceeded on {endpoint}. Backing off {wait}s...")
+            self.rate_limiter.record_failure(endpoint, retry_after=wait)
             return True
             
         logging.error(f"API error: {error}")
-        self.rate_limiters['api'].register_error()
-        return False
+        return self.rate_limiter.record_failure(endpoint) is not None
         
-    def process_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process data with memory-efficient operations"""
+    def ingest(self, symbol: str, df: pd.DataFrame) -> int:
+        """Append new candles for a symbol to its ring buffer. Returns rows added."""
         if df is None or df.empty:
-            return df
-            
-        # Use in-place operations to save memory
-        df = df.copy()
-        df['close'] = df['close'].astype(np.float32)
-        df['volume'] = df['volume'].astype(np.float32)
+            return 0
+        if isinstance(df.columns, pd.MultiIndex):
+            # yfinance returns (field, ticker) columns
+            df = df.droplevel(1, axis=1)
+        df = df.rename(columns=str.lower)
+        columns = self.windows.columns
+        rows = df.reindex(columns=columns).to_numpy(dtype=np.float32)
+        if isinstance(df.index, pd.DatetimeIndex):
+            timestamps = df.index.asi8
+        else:
+            timestamps = np.asarray(df.index, dtype=np.int64)
+        added = self.windows.append(symbol, timestamps, rows)
+        if added:
+            self.data_cache.pop(symbol)
+        return added
         
-        # Calculate indicators in a memory-efficient way
-        df['sma_20'] = df['close'].rolling(window=20).mean()
-        df['sma_50'] = df['close'].rolling(window=50).mean()
+    def symbol_indicators(self, symbol: str) -> Dict[str, np.ndarray]:
+        """SMA indicators over a symbol's window, cached until new data arrives"""
+        indicators = self.data_cache.get(symbol)
+        if indicators is None:
+            close = self.windows.column(symbol, 'close')
+            indicators = {
+                'close': close[-1] if len(close) else np.nan,
+                'sma_20': self._rolling_mean(close, 20),
+                'sma_50': self._rolling_mean(close, 50)
+            }
+            self.data_cache.put(symbol, indicators)
+        return indicators
         
-        return df.tail(self.config['memory_settings']['max_data_points'])
+    @staticmethod
+    def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """Trailing mean in float32; empty when there are fewer than `window` values"""
+        if len(values) < window:
+            return np.empty(0, dtype=np.float32)
+        csum = np.cumsum(values, dtype=np.float64)
+        csum[window:] = csum[window:] - csum[:-window]
+        return (csum[window - 1:] / window).astype(np.float32)
         
-    def make_prediction(self, df: pd.DataFrame) -> Dict:
-        """Make prediction using lightweight model"""
-        if df is None or df.empty:
+    def predict_symbol(self, symbol: str) -> Dict:
+        """SMA crossover signal from a symbol's window"""
+        indicators = self.symbol_indicators(symbol)
+        if not len(indicators['sma_50']):
             return {'signal': 'hold'}
-            
-        # Use simple moving averages for prediction
-        last_sma_20 = df['sma_20'].iloc[-1]
-        last_sma_50 = df['sma_50'].iloc[-1]
+        last_sma_20 = indicators['sma_20'][-1]
+        last_sma_50 = indicators['sma_50'][-1]
         
         if last_sma_20 > last_sma_50:
             return {'signal': 'buy'}
@@ -332,7 +365,61 @@ class MemoryEfficientTradingBot:
             return {'signal': 'sell'}
         return {'signal': 'hold'}
         
-    def execute_trade(self, prediction: Dict, current_price: float) -> bool:
+    def evict(self, tier: str):
+        """
+        Free memory according to the monitor's tier.
+        
+        reduce: halve the indicator cache and drop windows of symbols no longer traded.
+        emergency: clear the cache and shrink every window to min_data_points.
+        restore: grow windows back to max_data_points once memory is healthy again.
+        """
+        memory_settings = self.config['memory_settings']
+        if tier == 'reduce':
+            self.data_cache.trim(self.data_cache.maxsize // 2)
+            for symbol in set(self.windows.symbols()) - set(self.symbols):
+                self.windows.drop(symbol)
+        elif tier == 'emergency':
+            self.data_cache.clear()
+            self.windows.resize(memory_settings.get('min_data_points', 60))
+        elif tier == 'restore' and self.windows.capacity < memory_settings['max_data_points']:
+            self.windows.resize(memory_settings['max_data_points'])
+            
+    def memory_stats(self) -> Dict[str, Any]:
+        return {
+            'rss_bytes': psutil.Process().memory_info().rss,
+            'symbols': len(self.windows),
+            'window_bytes': self.windows.nbytes,
+            'window_capacity': self.windows.capacity,
+            'cache_entries': len(self.data_cache),
+            'cache_evictions': self.data_cache.evictions
+        }
+        
+    async def process_symbol(self, symbol: str, semaphore: asyncio.Semaphore) -> bool:
+        """Fetch new candles for one symbol, update its window and act on the signal"""
+        settings = self.config['trading_settings']
+        async with semaphore:
+            # Full history only for the first fetch; afterwards just the recent candles
+            period = settings.get('history_period', '15d') if symbol not in self.windows \
+                else settings.get('update_period', '1d')
+            df = await self.fetch_data(
+                source=settings.get('data_source', 'yfinance'),
+                symbol=symbol,
+                interval=settings.get('interval', '1h'),
+                period=period
+            )
+        if df is None:
+            return False
+        self.ingest(symbol, df)
+        prediction = self.predict_symbol(symbol)
+        price = float(self.windows.column(symbol, 'close')[-1])
+        now = datetime.now()
+        self.stream.publish('price', symbol, {'price': price, 'timestamp': now})
+        self.stream.publish('decision', symbol, {**prediction, 'timestamp': now})
+        if prediction['signal'] != 'hold':
+            return self.execute_trade(prediction, price, symbol)
+        return True
+        
+    def execute_trade(self, prediction: Dict, current_price: float, symbol: Optional[str] = None) -> bool:
         """Execute trade with memory monitoring"""
         if not self.memory_monitor.check_memory()['status'] == 'ok':
             logging.warning("Memory usage too high, skipping trade")
@@ -340,9 +427,38 @@ class MemoryEfficientTradingBot:
             
         # Implement lightweight trading logic here
         logging.info(f"Executing trade: {prediction['signal']} at price: {current_price}")
+        if symbol:
+            self.stream.publish('trade', symbol, {'side': prediction['signal'], 'price': current_price,
+                                                  'timestamp': datetime.now()})
         return True
         
     def run(self):
+        """Run the bot on an asyncio event loop until it stops"""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            logging.info("Bot stopped by user")
+            self.stop()
+
+    async def health_check_loop(self):
+        """Memory health checks, independent of data fetches and rate-limit waits"""
+        interval = min(30, self.config['memory_settings']['cleanup_interval_seconds'])
+        while True:
+            memory_status = self.memory_monitor.check_memory()
+            if memory_status['status'] != 'ok':
+                self.handle_memory_error(Exception(memory_status))
+            self.memory_monitor.cleanup_memory()
+            await asyncio.sleep(interval)
+        
+    async def run_async(self):
+        """Run the trading loop alongside the health checks"""
+        health_task = asyncio.create_task(self.health_check_loop())
+        try:
+            await self.trading_loop()
+        finally:
+            health_task.cancel()
+
+    async def trading_loop(self):
         """Main bot loop with enhanced error handling"""
         error_count = 0
         max_errors = self.config['error_handling']['system']['max_restarts']
@@ -354,45 +470,28 @@ class MemoryEfficientTradingBot:
                 if memory_status['memory_usage'] > self.config['error_handling']['memory']['threshold'] * 100:
                     if not self.handle_memory_error(Exception(memory_status)):
                         error_count += 1
-                        time.sleep(self.config['error_handling']['system']['restart_delay_seconds'])
+                        await asyncio.sleep(self.config['error_handling']['system']['restart_delay_seconds'])
                         continue
                 
-                # Fetch data
-                df = self.fetch_data(
-                    source='yfinance',
-                    symbol='BTC-USD',
-                    interval='1h',
-                    period='15d'
+                # Fetch and act on every symbol, a bounded number of fetches at a time
+                semaphore = asyncio.Semaphore(
+                    self.config['trading_settings'].get('max_concurrent_fetches', 4))
+                results = await asyncio.gather(
+                    *(self.process_symbol(symbol, semaphore) for symbol in self.symbols),
+                    return_exceptions=True
                 )
+                failures = [r for r in results if r is not True]
+                for symbol, result in zip(self.symbols, results):
+                    if isinstance(result, Exception):
+                        logging.error(f"Error processing {symbol}: {result}")
                 
-                if df is None:
+                if len(failures) == len(results):
                     logging.warning("Failed to fetch data")
-                    time.sleep(60)
+                    await asyncio.sleep(60)
                     continue
                 
-                # Process data
-                df = self.process_data(df)
-                
-                # Make prediction
-                prediction = self.make_prediction(df)
-                
-                # Execute trade
-                if prediction['signal'] != 'hold':
-                    if not self.execute_trade(prediction, df['close'].iloc[-1]):
-                        error_count += 1
-                        time.sleep(self.config['error_handling']['system']['restart_delay_seconds'])
-                        continue
-                
-                # Cleanup memory
-                self.memory_monitor.cleanup_memory()
-                
                 # Wait for next interval
-                time.sleep(self.config['trading_settings']['update_interval_seconds'])
-                
-            except KeyboardInterrupt:
-                logging.info("Bot stopped by user")
-                self.stop()
-                break
+                await asyncio.sleep(self.config['trading_settings']['update_interval_seconds'])
                 
             except Exception as e:
                 logging.error(f"Error in trading loop: {e}")
@@ -404,7 +503,7 @@ class MemoryEfficientTradingBot:
                     break
                     
                 # Wait before retry
-                time.sleep(self.config['error_handling']['system']['restart_delay_seconds'])
+                await asyncio.sleep(self.config['error_handling']['system']['restart_delay_seconds'])
                 
     def stop(self):
         """Clean up resources with error handling"""
@@ -0,0 +1,135 @@
+"""
+Background training for reinforcement-learning strategies.
+
+The trading path only pushes experience into a bounded buffer and reads the currently
+published policy. A worker thread trains a private copy of the optimizer on that experience
+and publishes a frozen snapshot of it by swapping a single reference, so decisions never
+wait on training and never see a half-updated network.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExperienceBuffer:
+    """Thread-safe bounded FIFO of experience items; the oldest item is dropped when full."""
+
+    def __init__(self, maxlen: int = 256):
+        self._items = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+    def push(self, item: Any):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def drain(self, max_items: Optional[int] = None, timeout: Optional[float] = None) -> List[Any]:
+        """Remove and return up to max_items items, waiting up to timeout for the first one."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            count = len(self._items) if max_items is None else min(max_items, len(self._items))
+            return [self._items.popleft() for _ in range(count)]
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+
+class BackgroundLearner:
+    """
+    Trains a copy of an RL optimizer on buffered experience in a worker thread.
+
+    Args:
+        optimizer: Initial policy. It is published as-is and deep-copied for training.
+        train_step (callable): train_step(trainer, experience) runs one training update.
+        buffer_size (int): Maximum experience items waiting for training.
+        batch_size (int): Experience items trained on before each publish.
+    """
+
+    def __init__(self, optimizer: Any, train_step: Callable[[Any, Any], None],
+                 buffer_size: int = 256, batch_size: int = 8):
+        self.buffer = ExperienceBuffer(buffer_size)
+        self.train_step = train_step
+        self.batch_size = batch_size
+        self._policy = optimizer
+        self._trainer = copy.deepcopy(optimizer)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.version = 0
+        self.trained = 0
+        self.failures = 0
+        self.last_train_seconds = 0.0
+
+    @property
+    def policy(self) -> Any:
+        """The latest published policy. Treat it as read-only; it is replaced, never mutated."""
+        return self._policy
+
+    def submit(self, experience: Any):
+        """Queue experience for training. Never blocks on training."""
+        self.buffer.push(experience)
+
+    def start(self) -> 'BackgroundLearner':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='rl-background-learner', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        self._stop.set()
+        self.buffer.wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def train_pending(self) -> int:
+        """
+        Train on everything buffered in the calling thread and publish; for use when the
+        worker is not running (e.g. tests or offline runs). Returns the number of items trained.
+        """
+        batch = self.buffer.drain(timeout=0)
+        if batch:
+            self._train_batch(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self.buffer.drain(self.batch_size, timeout=0.5)
+            if batch and not self._stop.is_set():
+                self._train_batch(batch)
+
+    def _train_batch(self, batch: List[Any]):
+        started = time.perf_counter()
+        trained = 0
+        for experience in batch:
+            try:
+                self.train_step(self._trainer, experience)
+                trained += 1
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Background training step failed: {str(e)}")
+        if trained:
+            self._publish()
+            self.trained += trained
+        self.last_train_seconds = time.perf_counter() - started
+
+    def _publish(self):
+        # Snapshot so later training on self._trainer cannot touch the published weights;
+        # the reference assignment itself is atomic for readers.
+        self._policy = copy.deepcopy(self._trainer)
+        self.version += 1
@@ -0,0 +1,199 @@
+"""
+Flat-array inference format for scikit-learn tree ensembles.
+
+A fitted RandomForest, ExtraTrees or GradientBoosting regressor is flattened into four
+node arrays shared by all of its trees (split feature, threshold, interleaved left and
+right child, leaf value) plus the root index of each tree. The arrays are written as plain
+.npy files next to a small meta.json, so loading is a handful of np.load(mmap_mode='r')
+calls instead of unpickling thousands of Tree objects, and several processes scoring
+the same model share one copy of it through the page cache.
+
+Prediction walks every tree for the whole batch at once: each step gathers the split
+feature and threshold of the current node for all (sample, tree) pairs and moves them
+to children[2 * node + went_right]. Leaves point to themselves, so after max_depth steps every walk has
+stopped at its leaf. Inputs are cast to float32 like scikit-learn does, so the
+comparisons and therefore the predictions match the original model.
+"""
+
+import json
+import logging
+import os
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+COMPILED_SUFFIX = '.trees'
+ARRAYS = ('feature', 'threshold', 'children', 'value', 'roots')
+
+# Supported estimators and how their trees are combined
+AGGREGATION = {
+    'RandomForestRegressor': 'mean',
+    'ExtraTreesRegressor': 'mean',
+    'GradientBoostingRegressor': 'sum',
+}
+
+# Samples per traversal block; bounds the (samples x trees) index matrix
+BLOCK_SIZE = 4096
+
+
+def is_compilable(model) -> bool:
+    """True for fitted single-output tree ensembles this module can flatten."""
+    return (type(model).__name__ in AGGREGATION and hasattr(model, 'estimators_')
+            and getattr(model, 'n_outputs_', 1) == 1)
+
+
+class CompiledEnsemble:
+    """
+    A tree ensemble as flat node arrays with a NumPy prediction kernel.
+
+    Args:
+        arrays (dict): The ARRAYS node arrays; may be read-only memory maps.
+        meta (dict): kind, aggregation, n_features, max_depth, base, feature_names.
+    """
+
+    def __init__(self, arrays: dict, meta: dict):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.kind = meta['kind']
+        self.aggregation = meta['aggregation']
+        self.n_features = meta['n_features']
+        self.max_depth = meta['max_depth']
+        self.base = meta['base']
+        self.feature_names: Optional[List[str]] = meta.get('feature_names')
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    @classmethod
+    def from_model(cls, model) -> 'CompiledEnsemble':
+        """Flatten a fitted scikit-learn ensemble."""
+        kind = type(model).__name__
+        if not is_compilable(model):
+            raise ValueError(f"Cannot compile {kind}: expected a fitted single-output "
+                             f"{', '.join(AGGREGATION)}")
+
+        if kind == 'GradientBoostingRegressor':
+            trees = [stage[0].tree_ for stage in model.estimators_]
+            # Shrinkage is folded into the leaf values
+            scale = model.learning_rate
+            base = cls._initial_prediction(model)
+        else:
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            scale = 1.0
+            base = 0.0
+
+        feature, threshold, children, value, roots = [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            n = tree.node_count
+            nodes = np.arange(offset, offset + n, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            # Leaves are their own children so extra traversal steps are no-ops
+            left = np.where(is_leaf, nodes, tree.children_left + offset)
+            right = np.where(is_leaf, nodes, tree.children_right + offset)
+            children.append(np.column_stack([left, right]).ravel().astype(np.int32))
+            value.append(tree.value[:, 0, 0] * scale)
+            roots.append(offset)
+            offset += n
+
+        arrays = {
+            'feature': np.concatenate(feature),
+            'threshold': np.concatenate(threshold).astype(np.float64),
+            'children': np.concatenate(children),
+            'value': np.concatenate(value).astype(np.float64),
+            'roots': np.asarray(roots, dtype=np.int32),
+        }
+        names = getattr(model, 'feature_names_in_', None)
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'kind': kind,
+            'aggregation': AGGREGATION[kind],
+            'n_features': int(model.n_features_in_),
+            'max_depth': int(max(tree.max_depth for tree in trees)),
+            'base': float(base),
+            'feature_names': [str(n) for n in names] if names is not None else None,
+        }
+        return cls(arrays, meta)
+
+    @staticmethod
+    def _initial_prediction(model) -> float:
+        init = model.init_
+        if init == 'zero':
+            return 0.0
+        constant = getattr(init, 'constant_', None)
+        if constant is None:
+            raise ValueError(f"Cannot compile GradientBoostingRegressor with init={type(init).__name__}; "
+                             f"only constant initial predictions are supported")
+        return float(np.ravel(constant)[0])
+
+    # Persistence
+
+    def save(self, path: str):
+        """Write the arrays and meta.json into directory `path`."""
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(self.meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CompiledEnsemble':
+        """Load a saved ensemble; with mmap the node arrays are memory-mapped read-only."""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled tree format {meta.get('format_version')} in {path}")
+        # Plain ndarray views of the maps: same pages, without np.memmap wrapping every result
+        arrays = {name: np.asarray(np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r' if mmap else None))
+                  for name in ARRAYS}
+        return cls(arrays, meta)
+
+    # Inference
+
+    def _as_matrix(self, X) -> np.ndarray:
+        if hasattr(X, 'columns'):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy()
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, but {self.kind} was fitted with {self.n_features}")
+        return X
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf node index of every sample in every tree, shape (n_samples, n_trees)."""
+        X = self._as_matrix(X)
+        leaves = np.empty((len(X), self.n_trees), dtype=np.int32)
+        for start in range(0, len(X), BLOCK_SIZE):
+            leaves[start:start + BLOCK_SIZE] = self._walk(X[start:start + BLOCK_SIZE])
+        return leaves
+
+    def _walk(self, X: np.ndarray) -> np.ndarray:
+        flat = np.ascontiguousarray(X).ravel()
+        # Offset of each sample's row in the flattened input
+        row_start = (np.arange(len(X), dtype=np.int64) * self.n_features)[:, None]
+        nodes = np.repeat(np.asarray(self.roots, dtype=np.int64)[None, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            went_right = flat[row_start + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + went_right]
+        return nodes
+
+    def predict(self, X) -> np.ndarray:
+        values = self.value[self.apply(X)]
+        if self.aggregation == 'mean':
+            return values.mean(axis=1)
+        return self.base + values.sum(axis=1)
+
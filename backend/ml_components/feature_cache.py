@@ -0,0 +1,145 @@
+"""
+Content-addressed cache of prepared training arrays.
+
+Feature engineering, scaling and sequence building depend only on the raw data and a
+handful of settings, so their output is stored under a key hashed from exactly those:
+a fingerprint of the raw rows (range, size and a hash of every value), the feature
+pipeline name and version, the scaler settings, the split sizes and the sequence
+length. A later run over the same window with the same settings finds the entry and
+memory-maps the arrays instead of rebuilding them; changing any input changes the key,
+so stale entries are never reused, only pruned. The X/y model inputs are stored as
+float32; everything else (scaler ranges, prices) keeps its dtype.
+
+Each entry is a directory of .npy files plus meta.json, written to a temporary
+directory first and renamed into place so readers never see a half-written entry.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 2: only the X/y arrays are downcast to float32
+CACHE_FORMAT_VERSION = 2
+
+# Floating arrays whose names start with these are stored as float32
+FLOAT32_PREFIXES = ('X_', 'y_')
+
+
+def fingerprint_frame(data: pd.DataFrame, time_column: str = 'timestamp') -> Dict[str, Any]:
+    """Range, shape and a content hash of a raw DataFrame."""
+    row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(json.dumps([str(c) for c in data.columns]).encode())
+    fingerprint = {'rows': len(data), 'columns': len(data.columns), 'sha256': digest.hexdigest()}
+    if time_column in data.columns and len(data):
+        fingerprint['start'] = str(data[time_column].min())
+        fingerprint['end'] = str(data[time_column].max())
+    return fingerprint
+
+
+class CachedDataset:
+    """Memory-mapped arrays and metadata of one cache entry."""
+
+    def __init__(self, key: str, path: str, arrays: Dict[str, np.ndarray], meta: dict):
+        self.key = key
+        self.path = path
+        self.arrays = arrays
+        self.meta = meta
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+
+class FeatureCache:
+    """
+    Directory of prepared datasets addressed by the hash of their inputs.
+
+    Args:
+        cache_dir (str): Where entries are stored.
+        max_entries (int): Least recently used entries beyond this are removed on store.
+    """
+
+    def __init__(self, cache_dir: str = 'training_data/feature_cache', max_entries: int = 20):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(**parts) -> str:
+        """Stable hash of the JSON-serialisable inputs of a preparation."""
+        payload = json.dumps({'format': CACHE_FORMAT_VERSION, **parts}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str) -> Optional[CachedDataset]:
+        path = self._entry_path(key)
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+                      for name in meta['arrays']}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable feature cache entry {key}: {e}")
+            return None
+        # Touch for least-recently-used pruning
+        os.utime(meta_path)
+        return CachedDataset(key, path, arrays, meta)
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray], meta: Optional[dict] = None) -> CachedDataset:
+        """Write an entry; floating X/y arrays (FLOAT32_PREFIXES) are stored as float32."""
+        staging = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            for name, array in arrays.items():
+                array = np.asarray(array)
+                if name.startswith(FLOAT32_PREFIXES) and np.issubdtype(array.dtype, np.floating):
+                    array = array.astype(np.float32, copy=False)
+                np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array))
+            entry_meta = {**(meta or {}), 'arrays': list(arrays), 'created': time.time()}
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(entry_meta, f, indent=2, default=str)
+            target = self._entry_path(key)
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.prune()
+        return self.load(key)
+
+    def get_or_build(self, key: str, build: Callable[[], Tuple[Dict[str, np.ndarray], dict]]
+                     ) -> Tuple[CachedDataset, bool]:
+        """Load the entry for key, or build(), store and load it. Returns (dataset, hit)."""
+        cached = self.load(key)
+        if cached is not None:
+            logger.info(f"Feature cache hit {key}")
+            return cached, True
+        started = time.perf_counter()
+        arrays, meta = build()
+        dataset = self.store(key, arrays, meta)
+        logger.info(f"Feature cache miss {key}; prepared in {time.perf_counter() - started:.1f}s")
+        return dataset, False
+
+    def prune(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self.cache_dir, name, 'meta.json')
+            if not name.startswith('.') and os.path.exists(meta_path):
+                entries.append((os.path.getmtime(meta_path), name))
+        for _, name in sorted(entries, reverse=True)[self.max_entries:]:
+            shutil.rmtree(self._entry_path(name), ignore_errors=True)
@@ -0,0 +1,293 @@
+"""
+TensorFlow Lite export of trained Keras models, and a loader that needs no training framework.
+
+Live scoring only runs forward passes, yet loading a saved Keras model pulls in the
+whole TensorFlow runtime. export_lite_model() converts a trained model into a .tflite
+flatbuffer, optionally quantized:
+
+    None       float32 weights, same numerics as the original
+    'float16'  float16 weights, half the size, float32 compute on CPU
+    'dynamic'  int8 weights, activations quantized on the fly
+    'int8'     int8 weights and activations, calibrated on representative inputs;
+               inputs and outputs stay float32 so callers need not change
+
+LiteModel loads the flatbuffer with the standalone interpreter (tflite-runtime or
+ai-edge-litert) and only falls back to tensorflow.lite when neither is installed. It
+predicts like a Keras model, so ModelRegistry can serve it in place of the original.
+
+compare_predictions() reports how far the exported model drifts from the original on a
+held-out set; the export stores that report in <model>.tflite.json next to the model.
+"""
+
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from backend.lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+
+logger = logging.getLogger(__name__)
+
+LITE_SUFFIX = '.tflite'
+QUANTIZATION_MODES = (None, 'float16', 'dynamic', 'int8')
+
+# Interpreters in order of preference; the last one loads all of TensorFlow
+INTERPRETERS = (
+    ('tflite_runtime.interpreter', 'Interpreter'),
+    ('ai_edge_litert.interpreter', 'Interpreter'),
+    ('tensorflow', 'lite.Interpreter'),
+)
+
+
+def is_keras_model(model) -> bool:
+    """True for Keras/TensorFlow models, without importing TensorFlow."""
+    return type(model).__module__.split('.')[0] in ('keras', 'tensorflow', 'tf_keras')
+
+
+def metadata_path(path: str) -> str:
+    return f"{path}.json"
+
+
+def export_is_acceptable(metadata: Optional[dict], max_accuracy_drop: float = 0.02) -> bool:
+    """
+    Whether an export may be served in place of its original.
+
+    float32 exports keep the original numerics. Quantized ones need a holdout report
+    showing they lose at most max_accuracy_drop accuracy (or, for non-binary targets,
+    do not raise the MSE by more than that fraction).
+    """
+    if not metadata:
+        return False
+    if metadata.get('quantization') is None:
+        return True
+    holdout = metadata.get('holdout') or {}
+    if 'accuracy_change' in holdout:
+        return holdout['accuracy_change'] >= -max_accuracy_drop
+    if 'mse_exported' in holdout:
+        return holdout['mse_exported'] <= holdout['mse_original'] * (1 + max_accuracy_drop)
+    return False
+
+
+def _batches(data, batch_size: int = 256) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """(X, y) chunks of an array, an (X, y) pair or a WindowedDataset-like iterable of batches."""
+    if isinstance(data, np.ndarray):
+        data = (data, None)
+    if isinstance(data, tuple):
+        X, y = data
+        for i in range(0, len(X), batch_size):
+            yield X[i:i + batch_size], None if y is None else y[i:i + batch_size]
+        return
+    if hasattr(data, 'subset'):
+        # Windowed datasets: keep time order for the comparison
+        data = data.subset(0, None, shuffle=False)
+    for batch in data:
+        yield batch if isinstance(batch, tuple) else (batch, None)
+
+
+def _representative_dataset(calibration, samples: int) -> Callable[[], Iterator[list]]:
+    def generate():
+        produced = 0
+        for X, _ in _batches(calibration):
+            for row in np.asarray(X, dtype=np.float32):
+                yield [row[np.newaxis]]
+                produced += 1
+                if produced >= samples:
+                    return
+    return generate
+
+
+def convert(model, quantization: Optional[str] = None, calibration=None,
+            calibration_samples: int = 200, allow_select_ops: bool = False) -> bytes:
+    """
+    Convert a Keras model to a TFLite flatbuffer.
+
+    Args:
+        model: Trained Keras model.
+        quantization (str): One of QUANTIZATION_MODES.
+        calibration: Representative inputs for 'int8' (array, (X, y) or WindowedDataset).
+        calibration_samples (int): Samples drawn from calibration.
+        allow_select_ops (bool): Permit TensorFlow ops without a TFLite kernel; such
+            models need the TensorFlow flex delegate to run.
+    """
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATION_MODES}")
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+    if quantization is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        if calibration is None:
+            raise ValueError("int8 quantization needs calibration inputs")
+        converter.representative_dataset = _representative_dataset(calibration, calibration_samples)
+        ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    if allow_select_ops:
+        ops.append(tf.lite.OpsSet.SELECT_TF_OPS)
+    converter.target_spec.supported_ops = ops
+    return converter.convert()
+
+
+class LiteModel:
+    """
+    Keras-compatible predict() over a TFLite flatbuffer.
+
+    The interpreter is not thread-safe, so calls are serialised per model; inputs larger
+    than max_batch_size are run in chunks to bound the tensor arena.
+
+    Args:
+        model_content (bytes): The flatbuffer.
+        num_threads (int): Interpreter threads; None lets the runtime decide.
+        max_batch_size (int): Rows per invocation.
+        metadata (dict): Export metadata, if any.
+    """
+
+    def __init__(self, model_content: bytes, num_threads: Optional[int] = None,
+                 max_batch_size: int = 1024, metadata: Optional[dict] = None):
+        interpreter_class, self.runtime = self._interpreter_class()
+        self.interpreter = interpreter_class(model_content=model_content, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.max_batch_size = max_batch_size
+        self.metadata = metadata or {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _interpreter_class() -> Tuple[Any, str]:
+        for module_name, attribute in INTERPRETERS:
+            try:
+                target = importlib.import_module(module_name)
+            except ImportError:
+                continue
+            for part in attribute.split('.'):
+                target = getattr(target, part)
+            if module_name == 'tensorflow':
+                logger.warning("No standalone TFLite interpreter installed; using tensorflow.lite")
+            return target, module_name
+        raise ImportError("No TFLite interpreter available; install tflite-runtime or ai-edge-litert")
+
+    @classmethod
+    def load(cls, path: str, num_threads: Optional[int] = None, **kwargs) -> 'LiteModel':
+        with open(path, 'rb') as f:
+            content = f.read()
+        metadata = None
+        if os.path.exists(metadata_path(path)):
+            with open(metadata_path(path)) as f:
+                metadata = json.load(f)
+        return cls(content, num_threads=num_threads, metadata=metadata, **kwargs)
+
+    @property
+    def input_shape(self) -> tuple:
+        """Keras-style input shape with an open batch dimension."""
+        return (None,) + tuple(int(d) for d in self._input['shape'][1:])
+
+    def _quantize(self, X: np.ndarray) -> np.ndarray:
+        dtype = self._input['dtype']
+        if dtype == np.float32:
+            return np.ascontiguousarray(X, dtype=np.float32)
+        scale, zero_point = self._input['quantization']
+        return np.clip(np.round(X / scale + zero_point), np.iinfo(dtype).min, np.iinfo(dtype).max).astype(dtype)
+
+    def _dequantize(self, y: np.ndarray) -> np.ndarray:
+        if self._output['dtype'] == np.float32:
+            return y
+        scale, zero_point = self._output['quantization']
+        return (y.astype(np.float32) - zero_point) * scale
+
+    def _invoke(self, X: np.ndarray) -> np.ndarray:
+        X = self._quantize(X)
+        if tuple(self._input['shape']) != X.shape:
+            self.interpreter.resize_tensor_input(self._input['index'], X.shape, strict=False)
+            self.interpreter.allocate_tensors()
+            self._input = self.interpreter.get_input_details()[0]
+            self._output = self.interpreter.get_output_details()[0]
+        self.interpreter.set_tensor(self._input['index'], X)
+        self.interpreter.invoke()
+        return self._dequantize(self.interpreter.get_tensor(self._output['index']).copy())
+
+    def predict(self, X, **kwargs) -> np.ndarray:
+        """Predict like keras.Model.predict; extra keyword arguments (verbose, ...) are ignored."""
+        X = np.asarray(X, dtype=np.float32)
+        with self._lock:
+            if len(X) <= self.max_batch_size:
+                return self._invoke(X)
+            return np.concatenate([self._invoke(X[i:i + self.max_batch_size])
+                                   for i in range(0, len(X), self.max_batch_size)])
+
+
+def compare_predictions(original, exported, holdout, threshold: float = 0.5) -> Dict[str, float]:
+    """
+    Drift of an exported model from the original on held-out data.
+
+    Reports prediction differences and, when targets are given, MSE for both models and
+    accuracy of the thresholded signal for binary targets.
+    """
+    reference, lite, targets = [], [], []
+    for X, y in _batches(holdout):
+        reference.append(np.asarray(original.predict(X, verbose=0), dtype=np.float64).ravel())
+        lite.append(np.asarray(exported.predict(X), dtype=np.float64).ravel())
+        if y is not None:
+            targets.append(np.asarray(y, dtype=np.float64).ravel())
+    reference, lite = np.concatenate(reference), np.concatenate(lite)
+    diff = np.abs(lite - reference)
+    report = {
+        'samples': int(len(reference)),
+        'max_abs_diff': float(diff.max()),
+        'mean_abs_diff': float(diff.mean()),
+        'signal_agreement': float(np.mean((reference > threshold) == (lite > threshold))),
+    }
+    if targets:
+        y = np.concatenate(targets)
+        report['mse_original'] = float(np.mean((reference - y) ** 2))
+        report['mse_exported'] = float(np.mean((lite - y) ** 2))
+        if np.isin(y, (0.0, 1.0)).all():
+            report['accuracy_original'] = float(np.mean((reference > threshold) == y))
+            report['accuracy_exported'] = float(np.mean((lite > threshold) == y))
+            report['accuracy_change'] = report['accuracy_exported'] - report['accuracy_original']
+    return report
+
+
+def export_lite_model(model, path: str, quantization: Optional[str] = None, holdout=None,
+                      calibration=None, **convert_kwargs) -> dict:
+    """
+    Convert, write and (with holdout data) validate a TFLite export of a Keras model.
+
+    int8 calibration defaults to the holdout inputs when no calibration data is given.
+
+    Returns:
+        dict: Metadata also written to <path>.json: quantization, shapes, size and the
+            compare_predictions() report under 'holdout'.
+    """
+    start = time.perf_counter()
+    content = convert(model, quantization, calibration if calibration is not None else holdout,
+                      **convert_kwargs)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+    metadata = {
+        'quantization': quantization,
+        'input_shape': [None if d is None else int(d) for d in model.input_shape],
+        'size_bytes': len(content),
+        'convert_seconds': time.perf_counter() - start,
+        'exported_at': time.time(),
+    }
+    if holdout is not None:
+        metadata['holdout'] = compare_predictions(model, LiteModel(content), holdout)
+        logger.info(f"Exported {path} ({quantization or 'float32'}, {len(content) / 2 ** 20:.2f} MB): "
+                    f"{metadata['holdout']}")
+    else:
+        logger.info(f"Exported {path} ({quantization or 'float32'}, {len(content) / 2 ** 20:.2f} MB)")
+    with open(metadata_path(path), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
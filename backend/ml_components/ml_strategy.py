@@ -10,22 +10,35 @@ from ..ml.reinforcement_learning import StrategyOptimizer
 from ..ml.risk_management import RiskManager, RiskLimits
 from ..ml.utils import logger
 from .base_strategy import BaseStrategy
+from .background_learner import BackgroundLearner
 
 class MLTradingStrategy(BaseStrategy):
     """Integrated ML trading strategy with risk management"""
+
+    # Rows of market data kept per training experience
+    TRAINING_WINDOW = 500
     
-    def __init__(self, initial_capital: float = 100000.0):
+    def __init__(self, initial_capital: float = 100000.0,
+                 experience_buffer_size: int = 256, background_training: bool = True):
         super().__init__()
         
         # Initialize ML components
         self.sentiment_analyzer = MarketSentimentAnalyzer()
         self.pattern_recognition = PatternRecognition()
         self.anomaly_detector = MarketAnomalyDetector()
-        self.strategy_optimizer = StrategyOptimizer(
-            input_size=7,
-            hidden_size=128,
-            output_size=3
+
+        # RL training runs on a copy in a worker thread; decisions use the published policy
+        self.learner = BackgroundLearner(
+            StrategyOptimizer(
+                input_size=7,
+                hidden_size=128,
+                output_size=3
+            ),
+            train_step=self._train_on_experience,
+            buffer_size=experience_buffer_size
         )
+        if background_training:
+            self.learner.start()
         
         # Initialize risk management
         self.risk_manager = RiskManager(initial_capital)
@@ -48,6 +61,11 @@ class MLTradingStrategy(BaseStrategy):
             'max_drawdown': 0.0
         }
     
+    @property
+    def strategy_optimizer(self) -> StrategyOptimizer:
+        """The latest published RL policy (read-only), not the copy being trained."""
+        return self.learner.policy
+    
     def analyze_market(self, market_data: pd.DataFrame,
                       news_data: Optional[List[str]] = None) -> Dict[str, float]:
         """Comprehensive market analysis using all ML components"""
@@ -93,7 +111,7 @@ class MLTradingStrategy(BaseStrategy):
             state = self._prepare_state(market_data, analysis)
             
             # Get action from RL model
-            action, confidence = self.strategy_optimizer.select_action(
+            action, confidence = self.learner.policy.select_action(
                 state, training=False)
             
             # Check risk limits
@@ -226,13 +244,9 @@ class MLTradingStrategy(BaseStrategy):
                 current_drawdown
             )
             
-            # Train RL model if enough data
+            # Queue experience for the background learner if enough data
             if len(market_data) >= 100:
-                self.strategy_optimizer.train(
-                    env=self._create_training_env(market_data),
-                    episodes=1,
-                    max_steps_per_episode=100
-                )
+                self.learner.submit(market_data.iloc[-self.TRAINING_WINDOW:].copy())
             
         except Exception as e:
             logger.error(f"Error updating strategy: {str(e)}")
@@ -243,8 +257,27 @@ class MLTradingStrategy(BaseStrategy):
             'strategy_state': self.strategy_state,
             'performance_metrics': self.performance_metrics,
             'risk_metrics': self.risk_manager.get_current_risk_metrics(),
-            'positions': self.risk_manager.positions
+            'positions': self.risk_manager.positions,
+            'learner': {
+                'policy_version': self.learner.version,
+                'episodes_trained': self.learner.trained,
+                'pending_experience': len(self.learner.buffer),
+                'dropped_experience': self.learner.buffer.dropped,
+                'last_train_seconds': self.learner.last_train_seconds
+            }
         }
+
+    def stop(self) -> None:
+        """Stop the background learner"""
+        self.learner.stop()
+
+    def _train_on_experience(self, trainer, market_data: pd.DataFrame) -> None:
+        """Run one training episode of `trainer` on buffered market data"""
+        trainer.train(
+            env=self._create_training_env(market_data),
+            episodes=1,
+            max_steps_per_episode=100
+        )
     
     def _create_training_env(self, market_data: pd.DataFrame):
         """Create training environment for RL"""
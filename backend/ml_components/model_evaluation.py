@@ -5,9 +5,8 @@ This module provides functions to evaluate and compare different trading models.
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+import importlib.util
 from datetime import datetime
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score,
@@ -15,12 +14,8 @@ from sklearn.metrics import (
     mean_absolute_error, mean_squared_error, r2_score
 )
 
-# Check if TensorFlow is available for deep learning model evaluation
-try:
-    import tensorflow as tf
-    HAS_TENSORFLOW = True
-except ImportError:
-    HAS_TENSORFLOW = False
+# Check if TensorFlow is available for deep learning model evaluation without importing it
+HAS_TENSORFLOW = importlib.util.find_spec('tensorflow') is not None
 
 def evaluate_classification_model(model, X_test, y_test, model_name="Model"):
     """
@@ -90,6 +85,8 @@ def evaluate_classification_model(model, X_test, y_test, model_name="Model"):
         print(classification_report(y_test_adj, y_pred_adj, zero_division=0))
         
         # Plot confusion matrix
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         cm = confusion_matrix(y_test, y_pred)
         plt.figure(figsize=(8, 6))
         
@@ -128,7 +125,229 @@ def evaluate_classification_model(model, X_test, y_test, model_name="Model"):
         traceback.print_exc()
         return None
 
-def evaluate_trading_performance(predictions, actual_prices, initial_balance=10000, commission=0.001, save_path=None):
+def ensemble_vote(all_predictions, ensemble_method='majority_vote'):
+    """
+    Combine predictions from several models in one array operation.
+    
+    Args:
+        all_predictions: Array of shape (n_models, n_samples)
+        ensemble_method: 'majority_vote' or 'average'
+        
+    Returns:
+        np.ndarray: Combined prediction per sample. Ties in a majority vote go to
+        the smallest label, as with np.unique + argmax.
+    """
+    all_predictions = np.asarray(all_predictions)
+    if ensemble_method == 'majority_vote':
+        values, inverse = np.unique(all_predictions, return_inverse=True)
+        inverse = inverse.reshape(all_predictions.shape)
+        # counts[k, i] = number of models predicting values[k] for sample i
+        counts = (inverse[np.newaxis, :, :] == np.arange(len(values))[:, np.newaxis, np.newaxis]).sum(axis=1)
+        return values[np.argmax(counts, axis=0)]
+    return np.round(np.mean(all_predictions, axis=0)).astype(int)
+
+def _cumulative_returns(returns):
+    """Cumulative returns along the last axis, skipping NaN like pandas cumprod."""
+    cumulative = np.nancumprod(1 + returns, axis=-1) - 1
+    cumulative[np.isnan(returns)] = np.nan
+    return cumulative
+
+def _drawdown(cumulative_returns):
+    """Drawdown from the running peak along the last axis, skipping NaN like pandas cummax."""
+    return np.fmax.accumulate(cumulative_returns, axis=-1) - cumulative_returns
+
+def _sharpe(returns):
+    """Annualized Sharpe ratio along the last axis (risk-free rate of 0)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(252) * np.nanmean(returns, axis=-1) / np.nanstd(returns, axis=-1, ddof=1)
+
+def compute_trading_metrics(predictions, actual_prices, initial_balance=10000, commission=0.001, return_series=False):
+    """
+    Compute trading performance metrics without printing or plotting.
+    
+    Accepts a single signal vector or a matrix with one row per candidate model, so a
+    whole sweep is evaluated in a few array operations.
+    
+    Args:
+        predictions: Signals (1 for Buy, -1 for Sell, 0 for Hold), shape (n_samples,)
+                     or (n_models, n_samples)
+        actual_prices: Series or array of closing prices, shape (n_samples,)
+        initial_balance: Starting balance for simulation
+        commission: Commission per position change
+        return_series: Also return the per-sample series used by the plots
+        
+    Returns:
+        dict: Trading performance metrics; scalars for 1-D predictions and arrays
+              with one entry per model for 2-D predictions
+    """
+    prices = np.asarray(actual_prices, dtype=float)
+    signals = np.asarray(predictions, dtype=float)
+    single = signals.ndim == 1
+    signals = np.atleast_2d(signals)
+    n_days = prices.shape[0]
+    
+    # Returns, with the first row undefined as in pct_change
+    price_change = np.full(n_days, np.nan)
+    price_change[1:] = prices[1:] / prices[:-1] - 1
+    strategy_returns = np.full(signals.shape, np.nan)
+    strategy_returns[:, 1:] = price_change[1:] * signals[:, :-1]
+    
+    cumulative_market_returns = _cumulative_returns(price_change)
+    cumulative_strategy_returns = _cumulative_returns(strategy_returns)
+    market_drawdown = _drawdown(cumulative_market_returns)
+    strategy_drawdown = _drawdown(cumulative_strategy_returns)
+    
+    # The first row always counts as a position change
+    position_changes = np.ones(signals.shape)
+    position_changes[:, 1:] = signals[:, 1:] != signals[:, :-1]
+    total_trades = position_changes.sum(axis=-1).astype(int)
+    winning_trades = (strategy_returns > 0).sum(axis=-1)
+    losing_trades = (strategy_returns < 0).sum(axis=-1)
+    win_rate = np.where(total_trades > 0, winning_trades / np.maximum(total_trades, 1), 0.0)
+    
+    market_return = cumulative_market_returns[-1]
+    strategy_return = cumulative_strategy_returns[:, -1]
+    final_market_value = initial_balance * (1 + market_return)
+    final_strategy_value = initial_balance * (1 + strategy_return)
+    market_annual_return = (final_market_value / initial_balance) ** (252 / n_days) - 1
+    strategy_annual_return = (final_strategy_value / initial_balance) ** (252 / n_days) - 1
+    
+    strategy_returns_after_commission = strategy_returns - position_changes * commission
+    cumulative_after_commission = _cumulative_returns(strategy_returns_after_commission)
+    final_strategy_value_after_commission = initial_balance * (1 + cumulative_after_commission[:, -1])
+    strategy_annual_return_after_commission = (final_strategy_value_after_commission / initial_balance) ** (252 / n_days) - 1
+    
+    with np.errstate(invalid='ignore'):
+        max_market_drawdown = np.nanmax(market_drawdown) if n_days > 1 else np.nan
+        max_strategy_drawdown = np.nanmax(strategy_drawdown, axis=-1) if n_days > 1 else np.full(len(signals), np.nan)
+    
+    metrics = {
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'losing_trades': losing_trades,
+        'win_rate': win_rate,
+        'final_market_value': np.full(len(signals), final_market_value),
+        'final_strategy_value': final_strategy_value,
+        'final_strategy_value_after_commission': final_strategy_value_after_commission,
+        'market_return': np.full(len(signals), market_return),
+        'strategy_return': strategy_return,
+        'market_annual_return': np.full(len(signals), market_annual_return),
+        'strategy_annual_return': strategy_annual_return,
+        'strategy_annual_return_after_commission': strategy_annual_return_after_commission,
+        'market_sharpe': np.full(len(signals), _sharpe(price_change)),
+        'strategy_sharpe': _sharpe(strategy_returns),
+        'max_market_drawdown': np.full(len(signals), max_market_drawdown),
+        'max_strategy_drawdown': max_strategy_drawdown,
+    }
+    if single:
+        metrics = {key: value[0].item() for key, value in metrics.items()}
+    
+    if return_series:
+        series = {
+            'price': prices,
+            'signal': signals,
+            'price_change': price_change,
+            'strategy_returns': strategy_returns,
+            'cumulative_market_returns': cumulative_market_returns,
+            'cumulative_strategy_returns': cumulative_strategy_returns,
+            'market_drawdown': market_drawdown,
+            'strategy_drawdown': strategy_drawdown,
+            'market_portfolio': initial_balance * (1 + cumulative_market_returns),
+            'strategy_portfolio': initial_balance * (1 + cumulative_strategy_returns),
+            'strategy_returns_after_commission': strategy_returns_after_commission,
+            'cumulative_strategy_returns_after_commission': cumulative_after_commission,
+            'strategy_portfolio_after_commission': initial_balance * (1 + cumulative_after_commission),
+        }
+        if single:
+            series = {key: value[0] if value.ndim == 2 else value for key, value in series.items()}
+        metrics['series'] = series
+    
+    return metrics
+
+def evaluate_candidates(predictions, actual_prices, model_names=None, initial_balance=10000, commission=0.001):
+    """
+    Evaluate many candidate signal vectors against the same prices in one pass.
+    
+    Args:
+        predictions: Array of shape (n_models, n_samples) or dict of name -> signals
+        actual_prices: Series or array of closing prices
+        model_names: Optional list of model names when predictions is an array
+        
+    Returns:
+        pd.DataFrame: One row of trading metrics per candidate, indexed by model name
+    """
+    if isinstance(predictions, dict):
+        model_names = list(predictions.keys())
+        predictions = np.vstack([np.asarray(p) for p in predictions.values()])
+    predictions = np.atleast_2d(predictions)
+    if model_names is None:
+        model_names = [f"Model {i+1}" for i in range(len(predictions))]
+    metrics = compute_trading_metrics(predictions, actual_prices, initial_balance, commission)
+    return pd.DataFrame(metrics, index=pd.Index(model_names, name='model'))
+
+def _plot_trading_performance(results, commission, save_path=None, show=True):
+    """Render the portfolio, returns and drawdown figures for a results frame."""
+    import matplotlib.pyplot as plt
+    
+    # Create figure with subplots
+    fig, axs = plt.subplots(3, 1, figsize=(14, 18), gridspec_kw={'height_ratios': [3, 2, 1]})
+    
+    # Plot portfolio performance
+    axs[0].plot(results.index, results['market_portfolio'], label='Buy & Hold', color='blue')
+    axs[0].plot(results.index, results['strategy_portfolio'], label='Strategy', color='green')
+    if commission > 0:
+        axs[0].plot(results.index, results['strategy_portfolio_after_commission'], 
+                  label=f'Strategy After {commission*100:.2f}% Commission', color='orange', linestyle='--')
+    axs[0].set_title('Portfolio Performance', fontsize=14)
+    axs[0].set_ylabel('Portfolio Value ($)', fontsize=12)
+    axs[0].legend()
+    axs[0].grid(True)
+    
+    # Plot cumulative returns
+    axs[1].plot(results.index, results['cumulative_market_returns'], label='Buy & Hold', color='blue')
+    axs[1].plot(results.index, results['cumulative_strategy_returns'], label='Strategy', color='green')
+    if commission > 0:
+        axs[1].plot(results.index, results['cumulative_strategy_returns_after_commission'], 
+                  label=f'Strategy After Commission', color='orange', linestyle='--')
+    axs[1].set_title('Cumulative Returns', fontsize=14)
+    axs[1].set_ylabel('Cumulative Return (%)', fontsize=12)
+    axs[1].legend()
+    axs[1].grid(True)
+    
+    # Plot drawdowns
+    axs[2].fill_between(results.index, 0, results['market_drawdown'], alpha=0.3, color='blue', label='Market Drawdown')
+    axs[2].fill_between(results.index, 0, results['strategy_drawdown'], alpha=0.3, color='red', label='Strategy Drawdown')
+    axs[2].set_title('Drawdowns', fontsize=14)
+    axs[2].set_ylabel('Drawdown (%)', fontsize=12)
+    axs[2].set_xlabel('Date', fontsize=12)
+    axs[2].legend()
+    axs[2].grid(True)
+    
+    plt.tight_layout()
+    
+    # Save figure if path is provided
+    if save_path:
+        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        print(f"Figure saved to {save_path}")
+        
+    if not show:
+        plt.close(fig)
+        return
+    plt.show()
+    
+    # Plot drawdown
+    plt.figure(figsize=(12, 6))
+    plt.plot(results.index, results['market_drawdown'] * 100, label='Market Drawdown', alpha=0.7)
+    plt.plot(results.index, results['strategy_drawdown'] * 100, label='Strategy Drawdown', alpha=0.7)
+    plt.title('Drawdown Over Time')
+    plt.xlabel('Date')
+    plt.ylabel('Drawdown (%)')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+def evaluate_trading_performance(predictions, actual_prices, initial_balance=10000, commission=0.001, save_path=None,
+                                 plot=True, verbose=True):
     """
     Evaluate trading performance based on predictions and actual price data.
     
@@ -136,171 +355,54 @@ def evaluate_trading_performance(predictions, actual_prices, initial_balance=100
         predictions: Array of predictions (1 for Buy, -1 for Sell, 0 for Hold)
         actual_prices: Series or array of closing prices
         initial_balance: Starting balance for simulation
+        save_path: Optional path to save the performance figure
+        plot: Show the performance figures
+        verbose: Print the results
         
     Returns:
         dict: Trading performance metrics
     """
     try:
-        results = pd.DataFrame({
-            'price': actual_prices,
-            'signal': predictions
-        })
-        
-        # Calculate returns
-        results['price_change'] = results['price'].pct_change()
-        
-        # Calculate strategy returns based on previous signal
-        results['strategy_returns'] = results['price_change'] * results['signal'].shift(1)
-        
-        # Calculate cumulative returns
-        results['cumulative_market_returns'] = (1 + results['price_change']).cumprod() - 1
-        results['cumulative_strategy_returns'] = (1 + results['strategy_returns']).cumprod() - 1
-        
-        # Calculate drawdown
-        results['market_peak'] = results['cumulative_market_returns'].cummax()
-        results['strategy_peak'] = results['cumulative_strategy_returns'].cummax()
-        results['market_drawdown'] = results['market_peak'] - results['cumulative_market_returns']
-        results['strategy_drawdown'] = results['strategy_peak'] - results['cumulative_strategy_returns']
-        
-        # Calculate portfolio value
-        results['market_portfolio'] = initial_balance * (1 + results['cumulative_market_returns'])
-        results['strategy_portfolio'] = initial_balance * (1 + results['cumulative_strategy_returns'])
-        
-        # Calculate trading metrics
-        total_trades = (results['signal'].shift(1) != results['signal']).sum()
-        winning_trades = (results['strategy_returns'] > 0).sum()
-        losing_trades = (results['strategy_returns'] < 0).sum()
-        win_rate = winning_trades / total_trades if total_trades > 0 else 0
-        
-        # Final portfolio value
-        final_market_value = results['market_portfolio'].iloc[-1]
-        final_strategy_value = results['strategy_portfolio'].iloc[-1]
-        
-        # Calculate annualized returns
-        n_days = len(results)
-        market_annual_return = (final_market_value / initial_balance) ** (252 / n_days) - 1
-        strategy_annual_return = (final_strategy_value / initial_balance) ** (252 / n_days) - 1
-        
-        # Maximum drawdown
-        max_market_drawdown = results['market_drawdown'].max()
-        max_strategy_drawdown = results['strategy_drawdown'].max()
-        
-        # Calculate additional metrics
-        # Apply commission costs
-        if commission > 0:
-            # Calculate position changes
-            position_changes = (results['signal'].shift(1) != results['signal']).astype(int)
-            # Apply commission to each trade
-            commission_costs = position_changes * commission
-            # Adjust strategy returns
-            results['strategy_returns_after_commission'] = results['strategy_returns'] - commission_costs
-            # Recalculate cumulative returns with commission
-            results['cumulative_strategy_returns_after_commission'] = (1 + results['strategy_returns_after_commission']).cumprod() - 1
-            # Update portfolio value
-            results['strategy_portfolio_after_commission'] = initial_balance * (1 + results['cumulative_strategy_returns_after_commission'])
-            # Update final values
-            final_strategy_value_after_commission = results['strategy_portfolio_after_commission'].iloc[-1]
-            strategy_annual_return_after_commission = (final_strategy_value_after_commission / initial_balance) ** (252 / n_days) - 1
-        else:
-            final_strategy_value_after_commission = final_strategy_value
-            strategy_annual_return_after_commission = strategy_annual_return
-        
-        # Calculate Sharpe Ratio (assuming risk-free rate of 0)
-        strategy_daily_returns = results['strategy_returns']
-        market_daily_returns = results['price_change']
-        
-        strategy_sharpe = np.sqrt(252) * (strategy_daily_returns.mean() / strategy_daily_returns.std())
-        market_sharpe = np.sqrt(252) * (market_daily_returns.mean() / market_daily_returns.std())
-        
-        # Print results
-        print(f"\n--- Trading Performance Evaluation ---")
-        print(f"Total Trades: {total_trades}")
-        print(f"Winning Trades: {winning_trades} ({win_rate:.2%})")
-        print(f"Losing Trades: {losing_trades} ({1-win_rate:.2%})")
-        print(f"Initial Portfolio: ${initial_balance:.2f}")
-        print(f"Final Market Value: ${final_market_value:.2f} ({results['cumulative_market_returns'].iloc[-1]:.2%} return)")
-        print(f"Final Strategy Value: ${final_strategy_value:.2f} ({results['cumulative_strategy_returns'].iloc[-1]:.2%} return)")
-        if commission > 0:
-            print(f"Final Strategy Value After {commission*100:.2f}% Commission: ${final_strategy_value_after_commission:.2f}")
-        print(f"Market Annual Return: {market_annual_return:.2%}")
-        print(f"Strategy Annual Return: {strategy_annual_return:.2%}")
-        if commission > 0:
-            print(f"Strategy Annual Return After Commission: {strategy_annual_return_after_commission:.2%}")
-        print(f"Market Sharpe Ratio: {market_sharpe:.2f}")
-        print(f"Strategy Sharpe Ratio: {strategy_sharpe:.2f}")
-        print(f"Maximum Market Drawdown: {max_market_drawdown:.2%}")
-        print(f"Maximum Strategy Drawdown: {max_strategy_drawdown:.2%}")
-        
-        # Create figure with subplots
-        fig, axs = plt.subplots(3, 1, figsize=(14, 18), gridspec_kw={'height_ratios': [3, 2, 1]})
-        
-        # Plot portfolio performance
-        axs[0].plot(results.index, results['market_portfolio'], label='Buy & Hold', color='blue')
-        axs[0].plot(results.index, results['strategy_portfolio'], label='Strategy', color='green')
-        if commission > 0:
-            axs[0].plot(results.index, results['strategy_portfolio_after_commission'], 
-                      label=f'Strategy After {commission*100:.2f}% Commission', color='orange', linestyle='--')
-        axs[0].set_title('Portfolio Performance', fontsize=14)
-        axs[0].set_ylabel('Portfolio Value ($)', fontsize=12)
-        axs[0].legend()
-        axs[0].grid(True)
-        
-        # Plot cumulative returns
-        axs[1].plot(results.index, results['cumulative_market_returns'], label='Buy & Hold', color='blue')
-        axs[1].plot(results.index, results['cumulative_strategy_returns'], label='Strategy', color='green')
-        if commission > 0:
-            axs[1].plot(results.index, results['cumulative_strategy_returns_after_commission'], 
-                      label=f'Strategy After Commission', color='orange', linestyle='--')
-        axs[1].set_title('Cumulative Returns', fontsize=14)
-        axs[1].set_ylabel('Cumulative Return (%)', fontsize=12)
-        axs[1].legend()
-        axs[1].grid(True)
-        
-        # Plot drawdowns
-        axs[2].fill_between(results.index, 0, results['market_drawdown'], alpha=0.3, color='blue', label='Market Drawdown')
-        axs[2].fill_between(results.index, 0, results['strategy_drawdown'], alpha=0.3, color='red', label='Strategy Drawdown')
-        axs[2].set_title('Drawdowns', fontsize=14)
-        axs[2].set_ylabel('Drawdown (%)', fontsize=12)
-        axs[2].set_xlabel('Date', fontsize=12)
-        axs[2].legend()
-        axs[2].grid(True)
-        
-        plt.tight_layout()
-        
-        # Save figure if path is provided
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Figure saved to {save_path}")
-            
-        plt.show()
-        
-        # Plot drawdown
-        plt.figure(figsize=(12, 6))
-        plt.plot(results.index, results['market_drawdown'] * 100, label='Market Drawdown', alpha=0.7)
-        plt.plot(results.index, results['strategy_drawdown'] * 100, label='Strategy Drawdown', alpha=0.7)
-        plt.title('Drawdown Over Time')
-        plt.xlabel('Date')
-        plt.ylabel('Drawdown (%)')
-        plt.legend()
-        plt.grid(True)
-        plt.show()
+        computed = compute_trading_metrics(predictions, actual_prices, initial_balance, commission, return_series=True)
+        series = computed.pop('series')
+        index = actual_prices.index if isinstance(actual_prices, pd.Series) else None
+        results = pd.DataFrame(series, index=index)
+        if commission <= 0:
+            results = results.drop(columns=['strategy_returns_after_commission',
+                                            'cumulative_strategy_returns_after_commission',
+                                            'strategy_portfolio_after_commission'])
+        
+        if verbose:
+            win_rate = computed['win_rate']
+            print(f"\n--- Trading Performance Evaluation ---")
+            print(f"Total Trades: {computed['total_trades']}")
+            print(f"Winning Trades: {computed['winning_trades']} ({win_rate:.2%})")
+            print(f"Losing Trades: {computed['losing_trades']} ({1-win_rate:.2%})")
+            print(f"Initial Portfolio: ${initial_balance:.2f}")
+            print(f"Final Market Value: ${computed['final_market_value']:.2f} ({computed['market_return']:.2%} return)")
+            print(f"Final Strategy Value: ${computed['final_strategy_value']:.2f} ({computed['strategy_return']:.2%} return)")
+            if commission > 0:
+                print(f"Final Strategy Value After {commission*100:.2f}% Commission: ${computed['final_strategy_value_after_commission']:.2f}")
+            print(f"Market Annual Return: {computed['market_annual_return']:.2%}")
+            print(f"Strategy Annual Return: {computed['strategy_annual_return']:.2%}")
+            if commission > 0:
+                print(f"Strategy Annual Return After Commission: {computed['strategy_annual_return_after_commission']:.2%}")
+            print(f"Market Sharpe Ratio: {computed['market_sharpe']:.2f}")
+            print(f"Strategy Sharpe Ratio: {computed['strategy_sharpe']:.2f}")
+            print(f"Maximum Market Drawdown: {computed['max_market_drawdown']:.2%}")
+            print(f"Maximum Strategy Drawdown: {computed['max_strategy_drawdown']:.2%}")
+        
+        # Figures are only built when shown or saved
+        if plot or save_path:
+            _plot_trading_performance(results, commission, save_path=save_path, show=plot)
         
         # Return performance metrics
-        metrics = {
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'losing_trades': losing_trades,
-            'win_rate': win_rate,
-            'final_market_value': final_market_value,
-            'final_strategy_value': final_strategy_value,
-            'market_return': results['cumulative_market_returns'].iloc[-1],
-            'strategy_return': results['cumulative_strategy_returns'].iloc[-1],
-            'market_annual_return': market_annual_return,
-            'strategy_annual_return': strategy_annual_return,
-            'max_market_drawdown': max_market_drawdown,
-            'max_strategy_drawdown': max_strategy_drawdown,
-            'results_df': results
-        }
+        metrics = {key: computed[key] for key in (
+            'total_trades', 'winning_trades', 'losing_trades', 'win_rate',
+            'final_market_value', 'final_strategy_value', 'market_return', 'strategy_return',
+            'market_annual_return', 'strategy_annual_return', 'max_market_drawdown', 'max_strategy_drawdown'
+        )}
+        metrics['results_df'] = results
         
         return metrics
         
@@ -386,6 +488,8 @@ def evaluate_deep_learning_model(model, X_test, y_test, sequence_length=60, feat
             print(f"ROC AUC: {roc_auc:.4f}")
         
         # Confusion matrix
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         cm = confusion_matrix(y_test, y_pred)
         plt.figure(figsize=(8, 6))
         
@@ -483,6 +587,8 @@ def compare_models(models, X_test, y_test, actual_prices=None, model_names=None)
     })
     
     # Plot comparison
+    import matplotlib.pyplot as plt
+    import seaborn as sns
     plt.figure(figsize=(12, 8))
     metrics_df = pd.melt(comp_df, id_vars=['Model'], var_name='Metric', value_name='Score')
     sns.barplot(x='Model', y='Score', hue='Metric', data=metrics_df)
@@ -500,7 +606,7 @@ def compare_models(models, X_test, y_test, actual_prices=None, model_names=None)
     
     return {'individual_results': results, 'comparison': comp_df}
 
-def backtest_ensemble(models, X_test, y_test, actual_prices, ensemble_method='majority_vote'):
+def backtest_ensemble(models, X_test, y_test, actual_prices, ensemble_method='majority_vote', plot=True, verbose=True):
     """
     Backtest an ensemble of models against historical price data.
     
@@ -510,6 +616,8 @@ def backtest_ensemble(models, X_test, y_test, actual_prices, ensemble_method='ma
         y_test: True target values
         actual_prices: Series of closing prices
         ensemble_method: Method to combine predictions ('majority_vote' or 'average')
+        plot: Show the trading performance figures
+        verbose: Print the results
         
     Returns:
         dict: Backtesting results
@@ -530,20 +638,10 @@ def backtest_ensemble(models, X_test, y_test, actual_prices, ensemble_method='ma
     # Convert to numpy array
     all_predictions = np.array(all_predictions)
     
-    # Combine predictions based on ensemble method
-    if ensemble_method == 'majority_vote':
-        # For each sample, count occurrences of each unique prediction
-        final_predictions = []
-        for i in range(all_predictions.shape[1]):
-            sample_preds = all_predictions[:, i]
-            values, counts = np.unique(sample_preds, return_counts=True)
-            final_predictions.append(values[np.argmax(counts)])
-    else:  # average
-        final_predictions = np.mean(all_predictions, axis=0)
-        final_predictions = np.round(final_predictions).astype(int)
+    # Combine predictions for all samples at once
+    final_predictions = ensemble_vote(all_predictions, ensemble_method)
     
     # Evaluate ensemble predictions
-    print("\n--- Ensemble Model Evaluation ---")
     acc = accuracy_score(y_test, final_predictions)
     
     # Adjust for precision/recall if -1 is used
@@ -558,13 +656,15 @@ def backtest_ensemble(models, X_test, y_test, actual_prices, ensemble_method='ma
     rec = recall_score(y_test_adj, final_predictions_adj, average='weighted', zero_division=0)
     f1 = f1_score(y_test_adj, final_predictions_adj, average='weighted', zero_division=0)
     
-    print(f"Ensemble Accuracy: {acc:.4f}")
-    print(f"Ensemble Precision: {prec:.4f}")
-    print(f"Ensemble Recall: {rec:.4f}")
-    print(f"Ensemble F1 Score: {f1:.4f}")
+    if verbose:
+        print("\n--- Ensemble Model Evaluation ---")
+        print(f"Ensemble Accuracy: {acc:.4f}")
+        print(f"Ensemble Precision: {prec:.4f}")
+        print(f"Ensemble Recall: {rec:.4f}")
+        print(f"Ensemble F1 Score: {f1:.4f}")
     
     # Evaluate trading performance
-    trading_performance = evaluate_trading_performance(final_predictions, actual_prices)
+    trading_performance = evaluate_trading_performance(final_predictions, actual_prices, plot=plot, verbose=verbose)
     
     return {
         'accuracy': acc,
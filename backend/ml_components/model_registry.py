@@ -6,16 +6,29 @@ Handles model versioning, performance tracking, and ensemble predictions.
 
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, ExtraTreesRegressor
-from sklearn.neural_network import MLPRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
 import joblib
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 import logging
 
+from backend.lazy_imports import lazy_import, lazy_attribute
+from backend.ml_components.compiled_trees import COMPILED_SUFFIX, CompiledEnsemble, is_compilable
+from backend.ml_components.lite_models import (
+    LITE_SUFFIX, LiteModel, export_is_acceptable, export_lite_model, is_keras_model
+)
+
+# TensorFlow and scikit-learn are imported only when a model of that kind is trained
+tf = lazy_import('tensorflow')
+RandomForestRegressor = lazy_attribute('sklearn.ensemble', 'RandomForestRegressor')
+GradientBoostingRegressor = lazy_attribute('sklearn.ensemble', 'GradientBoostingRegressor')
+ExtraTreesRegressor = lazy_attribute('sklearn.ensemble', 'ExtraTreesRegressor')
+MLPRegressor = lazy_attribute('sklearn.neural_network', 'MLPRegressor')
+train_test_split = lazy_attribute('sklearn.model_selection', 'train_test_split')
+mean_squared_error = lazy_attribute('sklearn.metrics', 'mean_squared_error')
+r2_score = lazy_attribute('sklearn.metrics', 'r2_score')
+
 class ModelRegistry:
     def __init__(self, config: dict):
         self.config = config
@@ -23,6 +36,18 @@ class ModelRegistry:
         self.models = {}
         self.model_performance = {}
         self.model_dir = config.get('model_dir', 'models/')
+        # Also write tree ensembles in the flat-array format used for live scoring
+        self.compile_trees = config.get('compile_trees', True)
+        # Also write Keras models as TFLite, served without TensorFlow. Exports are float32
+        # unless lite_quantization is set; a quantized export is only served when its
+        # holdout report stays within lite_max_accuracy_drop of the original
+        self.lite_quantization = config.get('lite_quantization')
+        self.lite_export = config.get('export_lite', True)
+        self.lite_max_accuracy_drop = config.get('lite_max_accuracy_drop', 0.02)
+        # Models predict concurrently; 0 means one worker per CPU
+        self.prediction_workers = config.get('prediction_workers', 0)
+        self._executor = None
+        self.prediction_timings = {}
         os.makedirs(self.model_dir, exist_ok=True)
 
     def register_model(self, name: str, model, performance: dict):
@@ -156,26 +181,67 @@ class ModelRegistry:
         
         return model
 
-    def predict_all(self, features: pd.DataFrame) -> dict:
-        """Get predictions from all models."""
-        predictions = {}
-        
-        for name, model in self.models.items():
-            try:
-                if name == 'lstm':
-                    # Reshape for LSTM
-                    features_reshaped = features.values.reshape((features.shape[0], 1, features.shape[1]))
-                    pred = model.predict(features_reshaped).flatten()
-                else:
-                    pred = model.predict(features)
-                
-                predictions[name] = pred
-            except Exception as e:
-                self.logger.error(f"Error predicting with model {name}: {e}")
-                predictions[name] = np.zeros(len(features))
-        
+    def predict_all(self, features: pd.DataFrame, with_timings: bool = False):
+        """
+        Get predictions from all models.
+
+        Models run concurrently on a shared thread pool; scikit-learn, NumPy and
+        TensorFlow release the GIL while predicting, so the batch takes about as long as
+        the slowest model. Each input layout is prepared once per batch. With
+        with_timings, returns (predictions, seconds per model).
+        """
+        inputs = self._prepare_inputs(features)
+        futures = {
+            name: self._get_executor().submit(self._timed_predict, name, model, inputs)
+            for name, model in self.models.items()
+        }
+        predictions, timings = {}, {}
+        for name, future in futures.items():
+            predictions[name], timings[name] = future.result()
+        self.prediction_timings = timings
+
+        if with_timings:
+            return predictions, timings
         return predictions
 
+    def _prepare_inputs(self, features: pd.DataFrame) -> dict:
+        """Inputs for every model layout, each built once per batch."""
+        inputs = {'tabular': features, 'n_samples': len(features)}
+        if any(self._is_sequence_model(name, model) for name, model in self.models.items()):
+            values = np.asarray(features, dtype=np.float32)
+            inputs['sequence'] = values.reshape((values.shape[0], 1, values.shape[1]))
+        return inputs
+
+    @staticmethod
+    def _is_sequence_model(name: str, model) -> bool:
+        """LSTM-style models take (samples, timesteps, features)."""
+        input_shape = getattr(model, 'input_shape', None)
+        return name == 'lstm' or (isinstance(input_shape, tuple) and len(input_shape) == 3)
+
+    def _timed_predict(self, name: str, model, inputs: dict) -> Tuple[np.ndarray, float]:
+        start = time.perf_counter()
+        try:
+            if self._is_sequence_model(name, model):
+                pred = np.asarray(model.predict(inputs['sequence'], verbose=0)).flatten()
+            else:
+                pred = model.predict(inputs['tabular'])
+        except Exception as e:
+            self.logger.error(f"Error predicting with model {name}: {e}")
+            pred = np.zeros(inputs['n_samples'])
+        return pred, time.perf_counter() - start
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            workers = self.prediction_workers or os.cpu_count() or 1
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='model-predict')
+        return self._executor
+
+    def close(self):
+        """Shut down the prediction thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
     def ensemble_prediction(self, predictions: dict) -> Tuple[float, float]:
         """Calculate ensemble prediction and confidence."""
         if not predictions:
@@ -211,18 +277,90 @@ class ModelRegistry:
     def save_models(self):
         """Save all models to disk."""
         for name, model in self.models.items():
+            if isinstance(model, (CompiledEnsemble, LiteModel)):
+                continue
             model_path = os.path.join(self.model_dir, f"{name}.pkl")
             joblib.dump(model, model_path)
             self.logger.info(f"Saved model {name} to {model_path}")
+        if self.compile_trees:
+            self.export_compiled()
+        if self.lite_export:
+            self.export_lite_models(quantization=self.lite_quantization)
+
+    def export_compiled(self, names: List[str] = None) -> Dict[str, str]:
+        """Write tree ensembles as memory-mappable flat arrays next to their pickles."""
+        exported = {}
+        for name in names or list(self.models):
+            model = self.models[name]
+            if not is_compilable(model):
+                continue
+            path = os.path.join(self.model_dir, f"{name}{COMPILED_SUFFIX}")
+            compiled = CompiledEnsemble.from_model(model)
+            compiled.save(path)
+            exported[name] = path
+            self.logger.info(f"Exported {compiled.n_trees} trees of model {name} to {path} "
+                             f"({compiled.nbytes / 2 ** 20:.1f} MB)")
+        return exported
+
+    def export_lite_models(self, names: List[str] = None, quantization: str = None,
+                           holdout=None) -> Dict[str, dict]:
+        """
+        Write Keras models as TFLite flatbuffers next to their pickles.
 
-    def load_models(self):
-        """Load all models from disk."""
-        for filename in os.listdir(self.model_dir):
-            if filename.endswith('.pkl'):
-                name = filename[:-4]
-                model_path = os.path.join(self.model_dir, filename)
-                self.models[name] = joblib.load(model_path)
-                self.logger.info(f"Loaded model {name} from {model_path}")
+        With holdout data ((X, y) in the model's input layout) each export records its
+        prediction and accuracy drift from the original in its metadata.
+        """
+        exported = {}
+        for name in names or list(self.models):
+            model = self.models[name]
+            if not is_keras_model(model):
+                continue
+            path = os.path.join(self.model_dir, f"{name}{LITE_SUFFIX}")
+            try:
+                exported[name] = export_lite_model(model, path, quantization, holdout=holdout)
+            except Exception as e:
+                # The pickle is still there; live scoring falls back to it
+                self.logger.error(f"TFLite export of model {name} failed: {e}")
+        return exported
+
+    def load_models(self, prefer_compiled: bool = True):
+        """
+        Load all models from disk.
+
+        With prefer_compiled, tree ensembles with an up-to-date compiled export are
+        memory-mapped instead of unpickled, and Keras models with an up-to-date TFLite
+        export run on the standalone interpreter; a pickle saved after the export wins.
+        Quantized TFLite exports without an acceptable holdout report, and exports the
+        interpreter cannot load, fall back to the pickle.
+        """
+        for filename in sorted(os.listdir(self.model_dir)):
+            if not filename.endswith('.pkl'):
+                continue
+            name = filename[:-4]
+            model_path = os.path.join(self.model_dir, filename)
+            compiled_path = os.path.join(self.model_dir, f"{name}{COMPILED_SUFFIX}")
+            meta_path = os.path.join(compiled_path, 'meta.json')
+            if (prefer_compiled and os.path.exists(meta_path)
+                    and os.path.getmtime(meta_path) >= os.path.getmtime(model_path)):
+                self.models[name] = CompiledEnsemble.load(compiled_path)
+                self.logger.info(f"Loaded compiled model {name} from {compiled_path}")
+                continue
+            lite_path = os.path.join(self.model_dir, f"{name}{LITE_SUFFIX}")
+            if (prefer_compiled and os.path.exists(lite_path)
+                    and os.path.getmtime(lite_path) >= os.path.getmtime(model_path)):
+                try:
+                    lite = LiteModel.load(lite_path)
+                except Exception as e:
+                    self.logger.warning(f"Cannot serve {lite_path} ({e}); loading the pickle")
+                else:
+                    if export_is_acceptable(lite.metadata, self.lite_max_accuracy_drop):
+                        self.models[name] = lite
+                        self.logger.info(f"Loaded TFLite model {name} from {lite_path}")
+                        continue
+                    self.logger.warning(f"{lite_path} is quantized without an acceptable holdout report; "
+                                        f"loading the pickle")
+            self.models[name] = joblib.load(model_path)
+            self.logger.info(f"Loaded model {name} from {model_path}")
 
     def get_model_performance(self) -> dict:
         """Get performance metrics for all models."""
@@ -16,6 +16,7 @@ import datetime
 import joblib
 import json
 import logging
+from types import SimpleNamespace
 
 # Import our custom modules
 from advanced_dl_models import (
@@ -26,6 +27,8 @@ from advanced_dl_models import (
 )
 from performance_tracker import ModelPerformanceTracker, TradingStrategyOptimizer
 from deep_learning_models import DeepLearningTrader, prepare_sequences
+from parallel_training import TrainingScheduler
+from feature_cache import FeatureCache, fingerprint_frame
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +41,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger("model_trainer")
 
+MODEL_BUILDERS = {
+    'transformer': build_transformer_model,
+    'inception': build_inception_time_model,
+    'tft': build_temporal_fusion_transformer,
+}
+
+
+def training_callbacks(params):
+    """Early stopping and learning rate schedule shared by all candidates."""
+    return [
+        tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss',
+            patience=params['patience'],
+            restore_best_weights=True
+        ),
+        tf.keras.callbacks.ReduceLROnPlateau(
+            monitor='val_loss',
+            factor=0.5,
+            patience=5,
+            min_lr=0.00001
+        )
+    ]
+
+
+def train_candidate(model_type, arrays, params, save_path):
+    """
+    Train one model type in a TrainingScheduler worker.
+
+    Args:
+        model_type (str): Key of MODEL_BUILDERS
+        arrays (dict): Memory-mapped X_train, y_train, X_val, y_val
+        params (dict): Trainer parameters
+        save_path (str): Where to save the trained model
+
+    Returns:
+        dict: Saved model path and the training history
+    """
+    X_train, y_train = arrays['X_train'], arrays['y_train']
+    model = MODEL_BUILDERS[model_type](
+        input_shape=X_train.shape[1:],
+        dropout_rate=params['dropout_rate']
+    )
+    history = model.fit(
+        X_train, y_train,
+        validation_data=(arrays['X_val'], arrays['y_val']),
+        epochs=params['epochs'],
+        batch_size=params['batch_size'],
+        callbacks=training_callbacks(params),
+        verbose=0
+    )
+    model.save(save_path)
+    return {'path': save_path, 'history': history.history}
+
 
 class AdvancedModelTrainer:
     """
@@ -47,7 +103,8 @@ class AdvancedModelTrainer:
     
     def __init__(self, base_dir='training_data', 
                 performance_db_path='performance_db',
-                model_save_dir='advanced_models'):
+                model_save_dir='advanced_models',
+                feature_cache_dir=None):
         """
         Initialize the advanced model trainer.
         
@@ -55,6 +112,8 @@ class AdvancedModelTrainer:
             base_dir (str): Directory for training data
             performance_db_path (str): Path for performance database
             model_save_dir (str): Directory to save trained models
+            feature_cache_dir (str): Directory for cached training arrays
+                (defaults to <base_dir>/feature_cache)
         """
         self.base_dir = base_dir
         self.model_save_dir = model_save_dir
@@ -64,6 +123,9 @@ class AdvancedModelTrainer:
             if not os.path.exists(dir_path):
                 os.makedirs(dir_path)
         
+        # Prepared arrays keyed by raw data and preparation settings
+        self.feature_cache = FeatureCache(feature_cache_dir or os.path.join(base_dir, 'feature_cache'))
+        
         # Initialize performance tracker and optimizer
         self.performance_tracker = ModelPerformanceTracker(db_path=performance_db_path)
         self.strategy_optimizer = TradingStrategyOptimizer(self.performance_tracker)
@@ -86,7 +148,11 @@ class AdvancedModelTrainer:
             'use_rsi': True,
             'use_macd': True,
             'use_bbands': True,
-            'use_atr': True
+            'use_atr': True,
+            # Train model types in parallel worker processes
+            'parallel_training': True,
+            # Threads per worker; None splits the cores evenly across workers
+            'threads_per_worker': None
         }
         
         # Current parameters (will be updated during self-improvement)
@@ -151,8 +217,85 @@ class AdvancedModelTrainer:
         }
         
         return X_train, X_val, X_test, y_train, y_val, y_test, scalers
-    
-    def train_models(self, X_train, y_train, X_val, y_val, model_types=None):
+
+    def load_or_prepare(self, raw_data, preprocess, target_col='target', test_size=0.2,
+                        val_size=0.2, features=None, pipeline_version=1):
+        """
+        Prepared training arrays for raw data, from the feature cache when possible.
+
+        The cache key covers the raw data (range and content hash), the preprocessing
+        function and its version, the requested features, the scaler, the split sizes
+        and the sequence length, so a hit skips feature engineering, scaling and
+        sequence building entirely and memory-maps the arrays (X/y as float32, the
+        scaler range and test prices at full precision).
+
+        Args:
+            raw_data (pd.DataFrame): Data as fetched, before feature engineering
+            preprocess (callable): raw_data -> (processed_data, feature_list)
+            target_col (str): Name of the target column
+            test_size (float): Proportion of data for testing
+            val_size (float): Proportion of training data for validation
+            features (list, optional): Subset of the pipeline's features to use
+            pipeline_version (int): Bump when preprocess changes its output
+
+        Returns:
+            dict: X_train, X_val, X_test, y_train, y_val, y_test, scalers, data_test
+                (timestamp/close of the test split for backtesting) and cache_hit
+        """
+        key = self.feature_cache.key(
+            data=fingerprint_frame(raw_data),
+            pipeline=f"{preprocess.__module__}.{preprocess.__qualname__}",
+            pipeline_version=pipeline_version,
+            features=features,
+            scaler={'type': 'MinMaxScaler', 'feature_range': [0, 1]},
+            sequence_length=self.current_params['sequence_length'],
+            target_col=target_col,
+            test_size=test_size,
+            val_size=val_size
+        )
+
+        def build():
+            processed_data, pipeline_features = preprocess(raw_data)
+            used = list(features) if features is not None else list(pipeline_features)
+            X_train, X_val, X_test, y_train, y_val, y_test, scalers = self.prepare_training_data(
+                processed_data, used, target_col, test_size, val_size
+            )
+            feature_scaler = scalers['feature_scaler']
+            # The test split is the tail of the time-sorted data, unscaled
+            if 'timestamp' in processed_data.columns:
+                processed_data = processed_data.sort_values('timestamp').reset_index(drop=True)
+            test_data = processed_data.iloc[-len(X_test):] if len(X_test) else processed_data.iloc[:0]
+            arrays = {
+                'X_train': X_train, 'X_val': X_val, 'X_test': X_test,
+                'y_train': y_train, 'y_val': y_val, 'y_test': y_test,
+                'scaler_data_min': feature_scaler.data_min_,
+                'scaler_data_max': feature_scaler.data_max_,
+                'test_close': test_data['close'].to_numpy(np.float64)
+            }
+            if 'timestamp' in test_data.columns:
+                arrays['test_timestamp'] = pd.to_datetime(test_data['timestamp']).to_numpy('datetime64[ns]').astype(np.int64)
+            return arrays, {'features': used, 'rows': len(processed_data)}
+
+        dataset, hit = self.feature_cache.get_or_build(key, build)
+        self.features = dataset.meta['features']
+
+        # Rebuild the fitted scaler from its per-feature range
+        feature_scaler = MinMaxScaler()
+        feature_scaler.fit(pd.DataFrame(
+            [dataset['scaler_data_min'], dataset['scaler_data_max']], columns=self.features
+        ))
+
+        data_test = pd.DataFrame({'close': dataset['test_close']})
+        if 'test_timestamp' in dataset.arrays:
+            data_test['timestamp'] = pd.to_datetime(np.asarray(dataset['test_timestamp']), unit='ns')
+
+        prepared = {name: dataset[name] for name in ('X_train', 'X_val', 'X_test', 'y_train', 'y_val', 'y_test')}
+        prepared.update({'scalers': {'feature_scaler': feature_scaler}, 'data_test': data_test, 'cache_hit': hit})
+        logger.info(f"Training data {'loaded from cache' if hit else 'prepared'}: "
+                    f"X_train shape: {prepared['X_train'].shape}")
+        return prepared
+
+    def train_models(self, X_train, y_train, X_val, y_val, model_types=None, parallel=None):
         """
         Train multiple advanced deep learning models.
         
@@ -162,6 +305,8 @@ class AdvancedModelTrainer:
             X_val (np.array): Validation features
             y_val (np.array): Validation targets
             model_types (list, optional): List of model types to train
+            parallel (bool, optional): Train model types in worker processes;
+                defaults to the 'parallel_training' parameter
             
         Returns:
             dict: Trained models
@@ -169,64 +314,38 @@ class AdvancedModelTrainer:
         if model_types is None:
             model_types = ['transformer', 'inception', 'tft']
         
+        unknown = [t for t in model_types if t not in MODEL_BUILDERS]
+        for model_type in unknown:
+            logger.warning(f"Unknown model type: {model_type}")
+        model_types = [t for t in model_types if t in MODEL_BUILDERS]
+        
         logger.info(f"Training {len(model_types)} model types: {model_types}")
         
         input_shape = X_train.shape[1:]
-        models = {}
-        histories = {}
-        
-        # Set up callbacks
-        callbacks = [
-            tf.keras.callbacks.EarlyStopping(
-                monitor='val_loss',
-                patience=self.current_params['patience'],
-                restore_best_weights=True
-            ),
-            tf.keras.callbacks.ReduceLROnPlateau(
-                monitor='val_loss',
-                factor=0.5,
-                patience=5,
-                min_lr=0.00001
-            )
-        ]
+        callbacks = training_callbacks(self.current_params)
         
-        # Train each model type
-        for model_type in model_types:
-            logger.info(f"Training {model_type} model")
-            
-            # Build the appropriate model
-            if model_type == 'transformer':
-                model = build_transformer_model(
-                    input_shape=input_shape,
-                    dropout_rate=self.current_params['dropout_rate']
-                )
-            elif model_type == 'inception':
-                model = build_inception_time_model(
+        if parallel is None:
+            parallel = self.current_params.get('parallel_training', True)
+        if parallel and len(model_types) > 1 and (os.cpu_count() or 1) > 1:
+            models, histories = self._train_models_parallel(X_train, y_train, X_val, y_val, model_types)
+        else:
+            models, histories = {}, {}
+            for model_type in model_types:
+                logger.info(f"Training {model_type} model")
+                model = MODEL_BUILDERS[model_type](
                     input_shape=input_shape,
                     dropout_rate=self.current_params['dropout_rate']
                 )
-            elif model_type == 'tft':
-                model = build_temporal_fusion_transformer(
-                    input_shape=input_shape,
-                    dropout_rate=self.current_params['dropout_rate']
+                history = model.fit(
+                    X_train, y_train,
+                    validation_data=(X_val, y_val),
+                    epochs=self.current_params['epochs'],
+                    batch_size=self.current_params['batch_size'],
+                    callbacks=callbacks,
+                    verbose=1
                 )
-            else:
-                logger.warning(f"Unknown model type: {model_type}")
-                continue
-            
-            # Train the model
-            history = model.fit(
-                X_train, y_train,
-                validation_data=(X_val, y_val),
-                epochs=self.current_params['epochs'],
-                batch_size=self.current_params['batch_size'],
-                callbacks=callbacks,
-                verbose=1
-            )
-            
-            # Store model and history
-            models[model_type] = model
-            histories[model_type] = history
+                models[model_type] = model
+                histories[model_type] = history
         
         # After training individual models, build an ensemble
         if len(models) > 1:
@@ -262,6 +381,43 @@ class AdvancedModelTrainer:
         logger.info(f"Model training complete: {list(models.keys())}")
         return models, histories
     
+    def _train_models_parallel(self, X_train, y_train, X_val, y_val, model_types):
+        """
+        Train model types concurrently with a TrainingScheduler.
+        
+        The arrays are memory-mapped by the workers rather than pickled to them; each
+        worker saves its model and the parent loads it back.
+        
+        Returns:
+            tuple: (models, histories) for the candidates that trained successfully
+        """
+        candidate_dir = os.path.join(self.model_save_dir, 'candidates')
+        os.makedirs(candidate_dir, exist_ok=True)
+        candidates = [
+            (model_type, {
+                'params': dict(self.current_params),
+                'save_path': os.path.join(candidate_dir, f"{model_type}_iter{self.current_iteration}.keras")
+            })
+            for model_type in model_types
+        ]
+        scheduler = TrainingScheduler(threads_per_worker=self.current_params.get('threads_per_worker'))
+        outcomes = scheduler.run(train_candidate, candidates, {
+            'X_train': np.asarray(X_train, dtype=np.float32),
+            'y_train': np.asarray(y_train, dtype=np.float32),
+            'X_val': np.asarray(X_val, dtype=np.float32),
+            'y_val': np.asarray(y_val, dtype=np.float32),
+        })
+        
+        models, histories = {}, {}
+        for model_type, outcome in outcomes.items():
+            if outcome['error']:
+                logger.error(f"Training {model_type} failed: {outcome['error']}")
+                continue
+            models[model_type] = tf.keras.models.load_model(outcome['result']['path'])
+            histories[model_type] = SimpleNamespace(history=outcome['result']['history'])
+            logger.info(f"Trained {model_type} model in {outcome['seconds']:.1f}s")
+        return models, histories
+    
     def evaluate_models(self, models, X_test, y_test, data_test=None):
         """
         Evaluate trained models on test data.
@@ -523,31 +679,39 @@ class AdvancedModelTrainer:
         logger.info(f"Marked {best_model_type} as best model")
         return save_paths
     
-    def run_training_cycle(self, data, features, target_col='target'):
+    def run_training_cycle(self, data=None, features=None, target_col='target', prepared=None):
         """
         Run a complete training cycle with self-improvement.
-        
+
         Args:
             data (pd.DataFrame): Preprocessed data with features and target
             features (list): List of feature columns to use
             target_col (str): Name of the target column
-            
+            prepared (dict, optional): Output of load_or_prepare; data and features
+                are not needed when given
+
         Returns:
             tuple: (best_model, evaluation_results, updated_parameters)
         """
         logger.info(f"Starting training cycle {self.current_iteration}")
-        
+
         # Prepare data
-        X_train, X_val, X_test, y_train, y_val, y_test, scalers = self.prepare_training_data(
-            data, features, target_col
-        )
-        
+        if prepared is not None:
+            X_train, X_val, X_test = prepared['X_train'], prepared['X_val'], prepared['X_test']
+            y_train, y_val, y_test = prepared['y_train'], prepared['y_val'], prepared['y_test']
+            data_test = prepared['data_test']
+        else:
+            X_train, X_val, X_test, y_train, y_val, y_test, scalers = self.prepare_training_data(
+                data, features, target_col
+            )
+            data_test = data
+
         # Train models
         models, histories = self.train_models(X_train, y_train, X_val, y_val)
-        
+
         # Evaluate models
         evaluation_results, best_model_type = self.evaluate_models(
-            models, X_test, y_test, data_test=data
+            models, X_test, y_test, data_test=data_test
         )
         
         # Self-improve based on results
@@ -0,0 +1,139 @@
+"""
+Process-pool scheduler for training independent model candidates side by side.
+
+The prepared train/validation arrays are written once as .npy files (under /dev/shm
+when it exists, so they never touch the disk) and every worker memory-maps them
+read-only instead of receiving a pickled copy. Each worker caps the thread pools of
+BLAS, OpenMP and TensorFlow at threads_per_worker before importing anything, so
+workers x threads never exceeds the cores and the libraries do not fight over them.
+
+A candidate is a module-level function called as fn(name, arrays, **kwargs) in a
+worker; it must return something picklable (e.g. the path of a saved model and its
+metrics) rather than the model object.
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Environment variables read by the numeric libraries when they create their thread pools
+THREAD_ENV_VARS = (
+    'OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS',
+)
+
+
+class SharedArrays:
+    """
+    Arrays published as memory-mappable .npy files for worker processes.
+
+    Use as a context manager; the files are removed on exit.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], directory: Optional[str] = None):
+        base = directory or ('/dev/shm' if os.path.isdir('/dev/shm') else None)
+        self.directory = tempfile.mkdtemp(prefix='training-arrays-', dir=base)
+        self.paths = {}
+        for name, array in arrays.items():
+            path = os.path.join(self.directory, f"{name}.npy")
+            np.save(path, np.ascontiguousarray(array))
+            self.paths[name] = path
+
+    @staticmethod
+    def attach(paths: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """Read-only memory maps of published arrays."""
+        return {name: np.load(path, mmap_mode='r') for name, path in paths.items()}
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def limit_threads(threads: int):
+    """Cap library thread pools in this process; must run before they are imported."""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+
+
+def _run_candidate(fn: Callable, name: str, paths: Dict[str, str], kwargs: dict) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(name, SharedArrays.attach(paths), **kwargs)
+    return result, time.perf_counter() - start
+
+
+class TrainingScheduler:
+    """
+    Runs candidates in a process pool sized to the machine.
+
+    Args:
+        max_workers (int): Worker processes; default fits threads_per_worker into the CPU count.
+        threads_per_worker (int): Thread cap per worker; default splits the cores evenly.
+        start_method (str): multiprocessing start method. 'spawn' keeps workers free of
+            TensorFlow state initialised in the parent.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, threads_per_worker: Optional[int] = None,
+                 start_method: str = 'spawn'):
+        self.cpus = os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.threads_per_worker = threads_per_worker
+        self.start_method = start_method
+
+    def plan(self, n_candidates: int) -> Tuple[int, int]:
+        """(workers, threads per worker) for n candidates."""
+        if self.max_workers:
+            workers = self.max_workers
+        elif self.threads_per_worker:
+            workers = max(1, self.cpus // self.threads_per_worker)
+        else:
+            workers = self.cpus
+        workers = max(1, min(workers, n_candidates))
+        threads = self.threads_per_worker or max(1, self.cpus // workers)
+        return workers, threads
+
+    def run(self, fn: Callable, candidates: List[Tuple[str, dict]],
+            arrays: Dict[str, np.ndarray]) -> Dict[str, dict]:
+        """
+        Train every (name, kwargs) candidate with fn.
+
+        Returns:
+            dict: name -> {'result', 'seconds', 'error'}; a failing candidate has result None
+            and the error message, the others are unaffected.
+        """
+        if not candidates:
+            return {}
+        workers, threads = self.plan(len(candidates))
+        logger.info(f"Training {len(candidates)} candidates on {workers} workers x {threads} threads")
+        results = {}
+        context = multiprocessing.get_context(self.start_method)
+        with SharedArrays(arrays) as shared, ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=limit_threads, initargs=(threads,)) as pool:
+            futures = {
+                pool.submit(_run_candidate, fn, name, shared.paths, kwargs): name
+                for name, kwargs in candidates
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result, seconds = future.result()
+                    results[name] = {'result': result, 'seconds': seconds, 'error': None}
+                    logger.info(f"Candidate {name} trained in {seconds:.1f}s")
+                except Exception as e:
+                    logger.error(f"Candidate {name} failed: {e}")
+                    results[name] = {'result': None, 'seconds': None, 'error': str(e)}
+        return {name: results[name] for name, _ in candidates}
@@ -66,26 +66,24 @@ class SelectionTracker:
         # For now, return empty DataFrame
         return pd.DataFrame()
 
-    def calculate_performance_metrics(self, days: int = 30) -> dict:
-        """Calculate performance metrics for the last N days."""
+    def _load_decisions(self, days: int) -> pd.DataFrame:
+        """Decisions of the last N days, read once with only the columns the analyses use."""
         cutoff_date = datetime.now() - timedelta(days=days)
-        
-        trades = self.db.query(Trade).filter(
+        rows = self.db.query(
+            Trade.timestamp, Trade.decision, Trade.price, Trade.model_confidence, Trade.risk_score
+        ).filter(
             Trade.timestamp >= cutoff_date
         ).order_by(Trade.timestamp).all()
+        return pd.DataFrame(rows, columns=['timestamp', 'decision', 'price', 'confidence', 'risk_score'])
+
+    def calculate_performance_metrics(self, days: int = 30, df: pd.DataFrame = None) -> dict:
+        """Calculate performance metrics for the last N days."""
+        if df is None:
+            df = self._load_decisions(days)
         
-        if not trades:
+        if df.empty:
             return {}
         
-        # Convert to DataFrame
-        df = pd.DataFrame([{
-            'timestamp': t.timestamp,
-            'decision': t.decision,
-            'price': t.price,
-            'confidence': t.model_confidence,
-            'risk_score': t.risk_score
-        } for t in trades])
-        
         # Calculate metrics
         total_trades = len(df)
         buy_trades = len(df[df['decision'] == 'BUY'])
@@ -156,7 +154,9 @@ class SelectionTracker:
 
     def generate_performance_report(self, days: int = 30) -> dict:
         """Generate comprehensive performance report."""
-        overall_metrics = self.calculate_performance_metrics(days)
+        # One read of the window, shared by every section
+        df = self._load_decisions(days)
+        overall_metrics = self.calculate_performance_metrics(days, df)
         model_metrics = {}
         
         # Get model-specific metrics
@@ -167,10 +167,10 @@ class SelectionTracker:
             )
         
         # Decision analysis
-        decision_analysis = self._analyze_decisions(days)
+        decision_analysis = self._analyze_decisions(days, df)
         
         # Risk analysis
-        risk_analysis = self._analyze_risk(days)
+        risk_analysis = self._analyze_risk(days, df)
         
         report = {
             'overall_metrics': overall_metrics,
@@ -182,23 +182,16 @@ class SelectionTracker:
         
         return report
 
-    def _analyze_decisions(self, days: int) -> dict:
+    def _analyze_decisions(self, days: int, df: pd.DataFrame = None) -> dict:
         """Analyze decision patterns."""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        if df is None:
+            df = self._load_decisions(days)
         
-        trades = self.db.query(Trade).filter(
-            Trade.timestamp >= cutoff_date
-        ).all()
-        
-        if not trades:
+        if df.empty:
             return {}
         
-        df = pd.DataFrame([{
-            'timestamp': t.timestamp,
-            'decision': t.decision,
-            'confidence': t.model_confidence,
-            'risk_score': t.risk_score
-        } for t in trades])
+        df = df.copy()
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
         
         # Decision distribution
         decision_counts = df['decision'].value_counts().to_dict()
@@ -224,24 +217,14 @@ class SelectionTracker:
             'daily_distribution': daily_distribution
         }
 
-    def _analyze_risk(self, days: int) -> dict:
+    def _analyze_risk(self, days: int, df: pd.DataFrame = None) -> dict:
         """Analyze risk patterns."""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        trades = self.db.query(Trade).filter(
-            Trade.timestamp >= cutoff_date
-        ).all()
+        if df is None:
+            df = self._load_decisions(days)
         
-        if not trades:
+        if df.empty:
             return {}
         
-        df = pd.DataFrame([{
-            'timestamp': t.timestamp,
-            'risk_score': t.risk_score,
-            'confidence': t.model_confidence,
-            'decision': t.decision
-        } for t in trades])
-        
         # Risk distribution
         risk_distribution = {
             'mean': df['risk_score'].mean(),
@@ -4,30 +4,44 @@ import pandas as pd
 from pandas import DataFrame as df
 import numpy as np
 from sqlalchemy.orm import Session
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, ExtraTreesRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-import tensorflow as tf
-import keras as keras
-from keras.models import Sequential
-from keras.layers import LSTM, Dense, Dropout, GRU, Attention
 import logging
 from datetime import datetime, timedelta
 from math import *
-import torch.nn as nn
-
-import optuna
-import yfinance as yf
-from typing import Dict, Tuple
-from torch.utils.data import Dataset, DataLoader
-from sklearn.model_selection import GridSearchCV
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from typing import Dict, Optional, Tuple
+from backend.lazy_imports import lazy_import, lazy_attribute
+from backend.hyperparameter_search import HyperparameterSearch, data_window_tag
+from backend.windowed_data import WindowedDataset
 from backend.models.unified_models import Trade
 from backend.models.unified_models import TradeMetrics, ModelPerformance, ModelPrediction
 from backend.database import get_db
 from backend.app import LearningMetric, TradingPerformance
 
+# Heavy frameworks are imported on first use, when a model of that kind is built or loaded
+RandomForestRegressor = lazy_attribute('sklearn.ensemble', 'RandomForestRegressor')
+GradientBoostingRegressor = lazy_attribute('sklearn.ensemble', 'GradientBoostingRegressor')
+ExtraTreesRegressor = lazy_attribute('sklearn.ensemble', 'ExtraTreesRegressor')
+StandardScaler = lazy_attribute('sklearn.preprocessing', 'StandardScaler')
+train_test_split = lazy_attribute('sklearn.model_selection', 'train_test_split')
+GridSearchCV = lazy_attribute('sklearn.model_selection', 'GridSearchCV')
+mean_squared_error = lazy_attribute('sklearn.metrics', 'mean_squared_error')
+mean_absolute_error = lazy_attribute('sklearn.metrics', 'mean_absolute_error')
+r2_score = lazy_attribute('sklearn.metrics', 'r2_score')
+tf = lazy_import('tensorflow')
+keras = lazy_import('keras')
+Sequential = lazy_attribute('keras.models', 'Sequential')
+LSTM = lazy_attribute('keras.layers', 'LSTM')
+Dense = lazy_attribute('keras.layers', 'Dense')
+Dropout = lazy_attribute('keras.layers', 'Dropout')
+GRU = lazy_attribute('keras.layers', 'GRU')
+Attention = lazy_attribute('keras.layers', 'Attention')
+torch = lazy_import('torch')
+nn = lazy_import('torch.nn')
+Dataset = lazy_attribute('torch.utils.data', 'Dataset')
+DataLoader = lazy_attribute('torch.utils.data', 'DataLoader')
+yf = lazy_import('yfinance')
+AutoTokenizer = lazy_attribute('transformers', 'AutoTokenizer')
+AutoModelForSequenceClassification = lazy_attribute('transformers', 'AutoModelForSequenceClassification')
+
 
 
 class RiskManager:
@@ -561,41 +575,13 @@ class AdvancedMLPipeline(MLTradingPipeline):
         self.risk_manager = AdvancedRiskManager(config)
         self.models = {}
         self.hyperparameters = {}
+        self.hyperparameter_search = HyperparameterSearch(config.get('hyperparameter_search'))
         self.logger = logging.getLogger(__name__)
 
-    def optimize_hyperparameters(self, X_train, y_train, model_name: str) -> Dict:
-        """Optimize hyperparameters using Optuna"""
-        def objective(trial):
-            if model_name == 'rf':
-                params = {
-                    'n_estimators': trial.suggest_int('n_estimators', 50, 200),
-                    'max_depth': trial.suggest_int('max_depth', 5, 20),
-                    'min_samples_split': trial.suggest_int('min_samples_split', 2, 10)
-                }
-            elif model_name == 'gb':
-                params = {
-                    'n_estimators': trial.suggest_int('n_estimators', 50, 200),
-                    'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.1),
-                    'max_depth': trial.suggest_int('max_depth', 3, 10)
-                }
-            elif model_name == 'lstm':
-                params = {
-                    'units': trial.suggest_int('units', 50, 150),
-                    'dropout': trial.suggest_float('dropout', 0.1, 0.5),
-                    'learning_rate': trial.suggest_float('learning_rate', 0.001, 0.01)
-                }
-            
-            # Train model with current parameters
-            model = self.train_model(X_train, y_train, model_name, params)
-            
-            # Evaluate
-            predictions = model.predict(X_train)
-            return mean_squared_error(y_train, predictions)
-        
-        study = optuna.create_study(direction='minimize')
-        study.optimize(objective, n_trials=20)
-        
-        return study.best_params
+    def optimize_hyperparameters(self, X_train, y_train, model_name: str, feature_names=None,
+                                 data_tag: Optional[str] = None) -> Dict:
+        """Optimize hyperparameters using a persistent, pruned Optuna study (see hyperparameter_search)"""
+        return self.hyperparameter_search.optimize(model_name, X_train, y_train, feature_names, data_tag)
 
     def create_deep_model(self, input_shape):
         """Create advanced deep learning model"""
@@ -628,7 +614,9 @@ class AdvancedMLPipeline(MLTradingPipeline):
                         d_model=hidden_dim,
                         nhead=num_heads,
                         dim_feedforward=hidden_dim * 4,
-                        dropout=0.1
+                        dropout=0.1,
+                        # Inputs are (batch, sequence, features); attend within a sample, not across the batch
+                        batch_first=True
                     ),
                     num_layers=num_layers
                 )
@@ -648,6 +636,8 @@ class AdvancedMLPipeline(MLTradingPipeline):
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.2, random_state=42
             )
+            # One study per training window, so new data is searched again
+            data_tag = data_window_tag(X)
             
             # Scale features
             X_train_scaled = self.scaler.fit_transform(X_train)
@@ -662,7 +652,11 @@ class AdvancedMLPipeline(MLTradingPipeline):
             
             for name, model_class in models.items():
                 # Optimize hyperparameters
-                best_params = self.optimize_hyperparameters(X_train_scaled, y_train, name)
+                best_params = self.optimize_hyperparameters(
+                    X_train_scaled, y_train, name, feature_names=list(getattr(X, 'columns', [])) or None,
+                    data_tag=data_tag
+                )
+                self.hyperparameters[name] = best_params
                 
                 # Train model
                 model = model_class(**best_params)
@@ -714,17 +708,20 @@ class AdvancedMLPipeline(MLTradingPipeline):
             transformer_optimizer = torch.optim.Adam(transformer_model.parameters(), lr=0.001)
             transformer_criterion = nn.MSELoss()
             
-            # Convert data to PyTorch tensors
-            X_torch = torch.FloatTensor(X_lstm)
-            y_torch = torch.FloatTensor(y_train.values)
+            # One float32 copy of the scaled rows; mini-batches are gathered and prefetched lazily
+            transformer_data = WindowedDataset(
+                X_train_scaled, np.asarray(y_train), seq_length=1, horizon=0,
+                batch_size=32, shuffle=True
+            )
             
             # Train transformer
             for epoch in range(50):
-                transformer_optimizer.zero_grad()
-                outputs = transformer_model(X_torch)
-                loss = transformer_criterion(outputs, y_torch)
-                loss.backward()
-                transformer_optimizer.step()
+                for X_batch, y_batch in transformer_data.torch_batches():
+                    transformer_optimizer.zero_grad()
+                    outputs = transformer_model(X_batch).squeeze(-1)
+                    loss = transformer_criterion(outputs, y_batch)
+                    loss.backward()
+                    transformer_optimizer.step()
             
             # Store deep learning models
             self.models['lstm_attention'] = {
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -11,6 +11,8 @@ class Trade(Base):
     and associated decision factors.
     """
     __tablename__ = 'trades'
+    # (time, id) index backs keyset pagination in api/trading_routes.py; same on the tables below
+    __table_args__ = (Index('ix_trades_entry_time_id', 'entry_time', 'id'),)
 
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String(20), index=True, nullable=False)
@@ -71,6 +73,7 @@ class TradingDecision(Base):
     thoughts, analysis, and factors that led to a trade decision.
     """
     __tablename__ = 'trading_decisions'
+    __table_args__ = (Index('ix_trading_decisions_timestamp_id', 'timestamp', 'id'),)
 
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -120,6 +123,7 @@ class ProfitSummary(Base):
     and symbols to enable efficient historical performance tracking.
     """
     __tablename__ = 'profit_summaries'
+    __table_args__ = (Index('ix_profit_summaries_date_id', 'date', 'id'),)
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime, index=True, nullable=False)
@@ -174,6 +178,7 @@ class BotThought(Base):
     lead to trades but are important for understanding bot behavior.
     """
     __tablename__ = 'bot_thoughts'
+    __table_args__ = (Index('ix_bot_thoughts_timestamp_id', 'timestamp', 'id'),)
 
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,262 @@
+"""
+Shared async rate limiting for exchange and data-source APIs.
+
+Each source (binance, coingecko, ...) has a token bucket refilled at its configured
+rate with a burst capacity; individual endpoints can add their own bucket on top. Waits
+are awaited on the clock, so a throttled call hands control back to the event loop
+instead of blocking it. Server feedback is honoured: Retry-After pauses the source,
+Binance used-weight and Bitvavo remaining-limit headers shrink the available tokens,
+and failures back off exponentially with jitter per endpoint.
+
+Limits come from api_settings in backend/config/memory_efficient_config.json:
+
+    "rate_limits": {
+        "binance": {"calls_per_minute": 1200, "burst": 50,
+                    "endpoints": {"/api/v3/klines": {"calls_per_minute": 300, "burst": 10}}}
+    },
+    "retry_settings": {"max_retries": 3, "backoff_factor": 1.5, "base_delay_seconds": 1,
+                       "max_delay_seconds": 300}
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Limit used for sources missing from the config
+DEFAULT_LIMIT = {'calls_per_minute': 60}
+
+
+class MonotonicClock:
+    """Real clock; tests substitute an object with the same now()/sleep() interface."""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float, clock):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock.now()
+
+    def _refill(self):
+        now = self.clock.now()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, tokens: float = 1) -> float:
+        """Seconds until `tokens` are available (0 if they are now). Does not consume."""
+        self._refill()
+        tokens = min(tokens, self.capacity)
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def take(self, tokens: float = 1):
+        self._refill()
+        self.tokens -= min(tokens, self.capacity)
+
+    def limit_available(self, tokens: float):
+        """Cap the available tokens, e.g. to what the server says is left."""
+        self._refill()
+        self.tokens = max(0.0, min(self.tokens, tokens))
+
+
+@dataclass
+class EndpointState:
+    bucket: Optional[TokenBucket] = None
+    blocked_until: float = 0.0
+    failures: int = 0
+    calls: int = 0
+    waits: int = 0
+    waited_seconds: float = 0.0
+    throttled: int = 0
+    backoffs: deque = field(default_factory=lambda: deque(maxlen=20))
+
+
+class AsyncRateLimiter:
+    """
+    Per-endpoint token buckets with async waits, header feedback and jittered backoff.
+
+    Endpoints are named 'source' or 'source:path'. A call to 'binance:/api/v3/klines'
+    consumes from the binance bucket and, if configured, the klines bucket; its backoff
+    is tracked separately from other binance endpoints.
+
+    Args:
+        limits (dict): Source name -> {'calls_per_minute', 'burst', 'endpoints'}.
+        retry (dict): max_retries, backoff_factor, base_delay_seconds, max_delay_seconds.
+        clock: Object with now() and async sleep(); defaults to the monotonic clock.
+        rng (random.Random): Source of backoff jitter.
+    """
+
+    def __init__(self, limits: Dict[str, dict], retry: Optional[Dict] = None, clock=None,
+                 rng: Optional[random.Random] = None):
+        self.limits = limits
+        retry = retry or {}
+        self.max_retries = retry.get('max_retries', 3)
+        self.backoff_factor = retry.get('backoff_factor', 2.0)
+        self.base_delay = retry.get('base_delay_seconds', 1.0)
+        self.max_delay = retry.get('max_delay_seconds', 300)
+        self.clock = clock or MonotonicClock()
+        self.rng = rng or random.Random()
+        self._endpoints: Dict[str, EndpointState] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict, clock=None, rng=None) -> 'AsyncRateLimiter':
+        """Build from a full bot config (reads its api_settings section)."""
+        api = config['api_settings']
+        return cls(api['rate_limits'], api.get('retry_settings'), clock=clock, rng=rng)
+
+    @staticmethod
+    def _bucket_for(limit: Dict, clock) -> TokenBucket:
+        per_minute = limit.get('weight_per_minute', limit['calls_per_minute'])
+        burst = limit.get('burst', max(1, per_minute / 60))
+        return TokenBucket(per_minute / 60.0, burst, clock)
+
+    def _state(self, endpoint: str) -> EndpointState:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            source, _, path = endpoint.partition(':')
+            limit = self.limits.get(source, DEFAULT_LIMIT)
+            if path:
+                override = limit.get('endpoints', {}).get(path)
+                state = EndpointState(self._bucket_for(override, self.clock) if override else None)
+            else:
+                state = EndpointState(self._bucket_for(limit, self.clock))
+            self._endpoints[endpoint] = state
+        return state
+
+    def _chain(self, endpoint: str) -> List[EndpointState]:
+        """States a call to `endpoint` is subject to: the endpoint itself and its source."""
+        source = endpoint.partition(':')[0]
+        states = [self._state(endpoint)]
+        if source != endpoint:
+            states.append(self._state(source))
+        return states
+
+    def wait_time(self, endpoint: str, weight: float = 1) -> float:
+        """Seconds a call with `weight` would currently have to wait."""
+        now = self.clock.now()
+        delays = []
+        for state in self._chain(endpoint):
+            delays.append(state.blocked_until - now)
+            if state.bucket:
+                delays.append(state.bucket.delay(weight))
+        return max(0.0, *delays)
+
+    async def acquire(self, endpoint: str, weight: float = 1) -> float:
+        """Wait until a call with `weight` is allowed, consume it and return the seconds waited."""
+        chain = self._chain(endpoint)
+        waited = 0.0
+        while True:
+            delay = self.wait_time(endpoint, weight)
+            if delay <= 0:
+                break
+            chain[0].waits += 1
+            waited += delay
+            await self.clock.sleep(delay)
+        for state in chain:
+            if state.bucket:
+                state.bucket.take(weight)
+        chain[0].calls += 1
+        chain[0].waited_seconds += waited
+        return waited
+
+    def update_from_headers(self, endpoint: str, headers: Mapping[str, str], status: Optional[int] = None):
+        """
+        Apply rate-limit feedback from a response.
+
+        Retry-After (seconds or HTTP date) pauses the whole source. X-MBX-USED-WEIGHT-1M and
+        Bitvavo-Ratelimit-Remaining cap the source's tokens to what the exchange has left;
+        a Bitvavo remaining of 0 pauses the source until Bitvavo-Ratelimit-ResetAt.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        source_name = endpoint.partition(':')[0]
+        source = self._state(source_name)
+        now = self.clock.now()
+
+        if status in (418, 429):
+            self._state(endpoint).throttled += 1
+
+        retry_after = self._parse_retry_after(headers.get('retry-after'))
+        if retry_after is not None:
+            source.blocked_until = max(source.blocked_until, now + retry_after)
+            logger.warning(f"{source_name}: server asked to retry after {retry_after:.1f}s")
+
+        limit = self.limits.get(source_name, DEFAULT_LIMIT)
+        used = headers.get('x-mbx-used-weight-1m')
+        if used is not None and source.bucket:
+            allowed = limit.get('weight_per_minute', limit['calls_per_minute'])
+            source.bucket.limit_available(allowed - float(used))
+
+        remaining = headers.get('bitvavo-ratelimit-remaining')
+        if remaining is not None and source.bucket:
+            source.bucket.limit_available(float(remaining))
+            reset_at = headers.get('bitvavo-ratelimit-resetat')
+            if float(remaining) <= 0 and reset_at:
+                pause = max(0.0, float(reset_at) / 1000.0 - time.time())
+                source.blocked_until = max(source.blocked_until, now + pause)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def record_success(self, endpoint: str):
+        self._state(endpoint).failures = 0
+
+    def record_failure(self, endpoint: str, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Back off `endpoint` after a failed call without blocking.
+
+        The pause is exponential in the endpoint's consecutive failures with jitter, or
+        `retry_after` when the server gave one. Returns the pause, or None once
+        max_retries consecutive failures are exceeded and the caller should give up.
+        """
+        state = self._state(endpoint)
+        state.failures += 1
+        if retry_after is None:
+            ceiling = min(self.max_delay, self.base_delay * self.backoff_factor ** (state.failures - 1))
+            # Equal jitter: at least half the exponential delay, so retries cannot collapse to zero
+            delay = ceiling / 2 + self.rng.uniform(0, ceiling / 2)
+        else:
+            delay = min(self.max_delay, retry_after)
+        state.blocked_until = max(state.blocked_until, self.clock.now() + delay)
+        state.backoffs.append(delay)
+        if state.failures > self.max_retries:
+            logger.error(f"{endpoint}: {state.failures} consecutive failures, giving up")
+            return None
+        logger.warning(f"{endpoint}: failure {state.failures}, backing off {delay:.2f}s")
+        return delay
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                'calls': s.calls, 'waits': s.waits, 'waited_seconds': s.waited_seconds,
+                'failures': s.failures, 'throttled': s.throttled,
+                'tokens': s.bucket.tokens if s.bucket else None,
+            }
+            for name, s in self._endpoints.items()
+        }
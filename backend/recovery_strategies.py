@@ -1,18 +1,113 @@
 import logging
 import time
 import traceback
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-import talib
+
+from backend.circuit_breaker import OPEN, BreakerRegistry, CircuitOpenError
+from backend.lazy_imports import lazy_import, lazy_attribute
+
+StandardScaler = lazy_attribute('sklearn.preprocessing', 'StandardScaler')
+KMeans = lazy_attribute('sklearn.cluster', 'KMeans')
+talib = lazy_import('talib')
 
 logger = logging.getLogger(__name__)
 
+# Dependencies that each have a circuit breaker
+ORIGINS = ('exchange', 'database', 'model', 'data')
+
+# Exception modules -> (failure type, origin)
+MODULE_ORIGINS = [
+    (('sqlalchemy', 'mysql', 'pymysql', 'MySQLdb', 'sqlite3', 'psycopg2'), 'DatabaseError', 'database'),
+    (('requests', 'urllib3', 'aiohttp', 'http.client', 'ccxt', 'binance', 'websocket', 'websockets'),
+     'ConnectionError', 'exchange'),
+    (('tensorflow', 'keras', 'sklearn', 'torch', 'xgboost', 'joblib'), 'ModelError', 'model'),
+    (('pandas', 'numpy'), 'DataError', 'data'),
+]
+
+# Built-in exceptions -> (failure type, origin); the origin of a bare connection error
+# is whatever dependency the caller was talking to
+BUILTIN_TYPES = [
+    (MemoryError, 'MemoryError', 'system'),
+    (PermissionError, 'PermissionError', 'system'),
+    ((ConnectionError, TimeoutError), 'ConnectionError', None),
+    ((KeyError, IndexError, ValueError, ArithmeticError), 'DataError', 'data'),
+]
+
+
+@dataclass(frozen=True)
+class FailureClass:
+    """Where a failure came from and whether retrying later can help."""
+    type: str
+    origin: str
+    retryable: bool
+    retry_after: Optional[float] = None
+
+    @property
+    def trips_breaker(self) -> bool:
+        # A rejected request is the caller's fault, not a sign the dependency is down
+        return self.origin in ORIGINS and self.type not in ('RequestError', 'CircuitOpen')
+
+
+def _http_status(error: BaseException) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status', None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or getattr(error, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_failure(error: BaseException, context: Optional[Dict] = None) -> FailureClass:
+    """
+    Classify an exception by its type, the module that defines it and any HTTP status.
+
+    context['dependency'] names the dependency being called and is used as the origin of
+    otherwise ambiguous errors such as a bare ConnectionError or TimeoutError.
+    """
+    dependency = (context or {}).get('dependency')
+
+    if isinstance(error, CircuitOpenError):
+        return FailureClass('CircuitOpen', error.name, True, error.retry_in)
+
+    status = _http_status(error)
+    if status in (418, 429):
+        return FailureClass('RateLimitError', dependency or 'exchange', True, _retry_after(error))
+    if status is not None and status >= 500:
+        return FailureClass('ConnectionError', dependency or 'exchange', True, _retry_after(error))
+    if status is not None and status >= 400:
+        return FailureClass('RequestError', dependency or 'exchange', False)
+
+    modules = [cls.__module__ for cls in type(error).__mro__ if cls.__module__ != 'builtins']
+    for prefixes, failure_type, origin in MODULE_ORIGINS:
+        if any(m == p or m.startswith(p + '.') for m in modules for p in prefixes):
+            names = {cls.__name__ for cls in type(error).__mro__}
+            retryable = failure_type == 'ConnectionError' or bool(
+                names & {'OperationalError', 'InterfaceError', 'DisconnectionError', 'TimeoutError'})
+            return FailureClass(failure_type, origin, retryable)
+
+    for types, failure_type, origin in BUILTIN_TYPES:
+        if isinstance(error, types):
+            return FailureClass(failure_type, origin or dependency or 'exchange',
+                                failure_type == 'ConnectionError')
+
+    # Wrapped errors are classified by what they wrap
+    cause = error.__cause__ or error.__context__
+    if cause is not None and cause is not error:
+        return classify_failure(cause, context)
+    return FailureClass('UnknownError', dependency or 'unknown', False)
+
+
 class RecoveryManager:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, clock=time.monotonic):
         self.config = config
         self.scaler = StandardScaler()
         self.failure_patterns = []
@@ -20,15 +115,22 @@ class RecoveryManager:
         self.recovery_attempts = []
         self.last_recovery = None
         self.max_recovery_attempts = 3
+        # One breaker per dependency so an exchange outage fails fast instead of piling up timeouts
+        self.breakers = BreakerRegistry(config.get('circuit_breakers'), clock=clock)
         
     def detect_failure(self, error: Exception, context: Dict) -> Dict:
         """Detect and categorize failures"""
         try:
-            failure_type = self._classify_failure(error)
+            failure = classify_failure(error, context)
+            if failure.trips_breaker:
+                self.breakers.get(failure.origin).record_failure(failure.retry_after)
             
             # Create failure pattern
             pattern = {
-                'type': failure_type,
+                'type': failure.type,
+                'origin': failure.origin,
+                'retryable': failure.retryable,
+                'retry_after': failure.retry_after,
                 'timestamp': datetime.now(),
                 'error': str(error),
                 'context': context,
@@ -51,24 +153,49 @@ class RecoveryManager:
 
     def _classify_failure(self, error: Exception) -> str:
         """Classify failure type based on error"""
-        error_str = str(error).lower()
-        
-        if 'connection' in error_str or 'timeout' in error_str:
-            return 'ConnectionError'
-        elif 'database' in error_str:
-            return 'DatabaseError'
-        elif 'data' in error_str or 'empty' in error_str:
-            return 'DataError'
-        elif 'memory' in error_str:
-            return 'MemoryError'
-        elif 'permission' in error_str:
-            return 'PermissionError'
-        else:
-            return 'UnknownError'
+        return classify_failure(error).type
+
+    def call(self, dependency: str, fn, *args, context: Optional[Dict] = None, **kwargs):
+        """
+        Call fn through the dependency's circuit breaker.
+
+        Raises CircuitOpenError without calling fn while the breaker is open. Failures
+        are recorded with detect_failure() and re-raised.
+        """
+        breaker = self.breakers.get(dependency)
+        if not breaker.allow():
+            raise CircuitOpenError(dependency, breaker.retry_in())
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            pattern = self.detect_failure(e, {**(context or {}), 'dependency': dependency})
+            if pattern.get('origin') != dependency or pattern.get('type') == 'RequestError':
+                # Not the dependency's fault; release the reservation without counting it
+                breaker.release()
+            raise
+        breaker.record_success()
+        return result
+
+    def circuit_metrics(self) -> Dict[str, dict]:
+        """State, trip count and call counters of every circuit breaker"""
+        return self.breakers.metrics()
 
     def generate_recovery_plan(self, failure_pattern: Dict) -> Dict:
         """Generate recovery plan based on failure pattern"""
         try:
+            origin = failure_pattern.get('origin')
+            if origin in ORIGINS and self.breakers.get(origin).state == OPEN:
+                retry_in = self.breakers.get(origin).retry_in()
+                recovery_plan = {
+                    'strategy': 'FailFast',
+                    'priority': self._determine_recovery_priority(failure_pattern),
+                    'steps': [f'Fail fast while the {origin} circuit is open',
+                              f'Probe {origin} after {retry_in:.0f} seconds'],
+                    'estimated_time': int(np.ceil(retry_in))
+                }
+                self.recovery_attempts.append(recovery_plan)
+                return recovery_plan
+
             recovery_plan = {
                 'strategy': self._select_recovery_strategy(failure_pattern),
                 'priority': self._determine_recovery_priority(failure_pattern),
@@ -94,7 +221,11 @@ class RecoveryManager:
         
         strategies = {
             'ConnectionError': 'RetryWithBackoff',
+            'RateLimitError': 'WaitForRateLimit',
+            'RequestError': 'FixRequest',
+            'CircuitOpen': 'FailFast',
             'DatabaseError': 'ReconnectAndReinitialize',
+            'ModelError': 'ReloadModel',
             'DataError': 'DataValidationAndRepair',
             'MemoryError': 'MemoryCleanupAndRestart',
             'PermissionError': 'CheckAndRestorePermissions',
@@ -109,7 +240,11 @@ class RecoveryManager:
         
         priorities = {
             'ConnectionError': 'High',
+            'RateLimitError': 'Medium',
+            'RequestError': 'Medium',
+            'CircuitOpen': 'Low',
             'DatabaseError': 'Critical',
+            'ModelError': 'High',
             'DataError': 'Medium',
             'MemoryError': 'High',
             'PermissionError': 'Medium',
@@ -129,6 +264,24 @@ class RecoveryManager:
                 'Check network status',
                 'Use backup connection'
             ],
+            'RateLimitError': [
+                'Honour Retry-After',
+                'Reduce request rate',
+                'Resume through a half-open probe'
+            ],
+            'RequestError': [
+                'Log rejected request',
+                'Validate request parameters',
+                'Do not retry unchanged'
+            ],
+            'CircuitOpen': [
+                'Fail fast until the circuit half-opens'
+            ],
+            'ModelError': [
+                'Reload model from disk',
+                'Fall back to remaining ensemble models',
+                'Schedule retraining'
+            ],
             'DatabaseError': [
                 'Close all connections',
                 'Reconnect to database',
@@ -166,9 +319,15 @@ class RecoveryManager:
     def _estimate_recovery_time(self, pattern: Dict) -> int:
         """Estimate recovery time in seconds"""
         failure_type = pattern['type']
+        if pattern.get('retry_after'):
+            return int(np.ceil(pattern['retry_after']))
         times = {
             'ConnectionError': 10,
+            'RateLimitError': 60,
+            'RequestError': 0,
+            'CircuitOpen': 30,
             'DatabaseError': 30,
+            'ModelError': 30,
             'DataError': 20,
             'MemoryError': 15,
             'PermissionError': 25,
@@ -298,6 +457,7 @@ class RecoveryManager:
                 'successful': successful,
                 'success_rate': success_rate,
                 'pattern_analysis': pattern_analysis,
+                'circuit_breakers': self.circuit_metrics(),
                 'last_recovery': self.last_recovery
             }
             
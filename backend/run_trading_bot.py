@@ -3,7 +3,6 @@ import os
 import sys
 import time
 import traceback
-from datetime import datetime
 from pathlib import Path
 import signal
 import threading
@@ -11,6 +10,7 @@ from typing import Optional
 
 from trading_bot import CryptoTradingBot
 from database import get_db, init_db
+from health_status import ComponentPolicy, HealthMonitor
 import pandas as pd
 
 # Setup logging
@@ -45,8 +45,8 @@ class TradingBotRunner:
         self.bot: Optional[CryptoTradingBot] = None
         self.killer = GracefulKiller()
         self.health_check_thread: Optional[threading.Thread] = None
-        self.last_heartbeat = datetime.now()
-        self.max_heartbeat_interval = 300  # 5 minutes
+        self.health_monitor: Optional[HealthMonitor] = None
+        self.max_heartbeat_interval = 300  # 5 minutes past the expected loop interval
 
     def load_config(self) -> dict:
         """Load and validate configuration"""
@@ -109,15 +109,31 @@ class TradingBotRunner:
             'diversification_factor': 1.5
         }
 
+    def build_health_monitor(self) -> HealthMonitor:
+        """Health policies over the counters the bot's trading loop publishes"""
+        # The loop publishes once per cycle, so anything younger than a cycle plus grace is fresh
+        max_age = self.config.get('sleep_interval', 0) + self.max_heartbeat_interval
+        return HealthMonitor(
+            self.bot.health,
+            {
+                'loop': ComponentPolicy(max_age=max_age),
+                'data': ComponentPolicy(max_age=max_age, probe=self.probe_data_feed),
+                'model': ComponentPolicy(max_age=max_age, probe=self.probe_model,
+                                         max_latency=self.config.get('max_prediction_latency')),
+            },
+            probe_timeout=self.config.get('health_probe_timeout', 10.0),
+            probe_interval=self.config.get('health_probe_interval', 300.0),
+        )
+
     def health_check(self):
         """Monitor bot health and trigger recovery if needed"""
         while not self.killer.kill_now:
             try:
-                current_time = datetime.now()
-                time_since_heartbeat = (current_time - self.last_heartbeat).total_seconds()
-                
-                if time_since_heartbeat > self.max_heartbeat_interval:
-                    logger.warning("Heartbeat not detected - attempting recovery")
+                loop = self.health_monitor.evaluate('loop') if self.health_monitor else None
+                # Before the first heartbeat the bot is still training; only repeated errors count then
+                started = loop is not None and (loop['age'] is not None or loop['source'] == 'published')
+                if started and not loop['healthy']:
+                    logger.warning(f"Heartbeat not detected ({loop.get('reason')}) - attempting recovery")
                     self.recover_bot()
                     
                 time.sleep(60)  # Check every minute
@@ -157,7 +173,15 @@ class TradingBotRunner:
             return False
 
     def check_data_feed(self) -> bool:
-        """Check if data feed is working"""
+        """Check if data feed is working, from the trading loop's last fetch when it is recent"""
+        return self.health_monitor is not None and self.health_monitor.check('data')
+
+    def check_model_health(self) -> bool:
+        """Check if ML models are functioning, from the trading loop's last prediction when it is recent"""
+        return self.health_monitor is not None and self.health_monitor.check('model')
+
+    def probe_data_feed(self) -> bool:
+        """Real data feed request, only made when the trading loop has not fetched recently"""
         try:
             import yfinance as yf
             ticker = yf.Ticker(self.config['symbol'])
@@ -167,21 +191,13 @@ class TradingBotRunner:
             logger.error(f"Data feed error: {e}")
             return False
 
-    def check_model_health(self) -> bool:
-        """Check if ML models are functioning"""
+    def probe_model(self) -> bool:
+        """Predict on the loop's last input; never fetches data"""
         try:
-            if not self.bot:
-                return False
-                
-            # Test prediction
-            df = self.bot.pipeline.fetch_data()
-            if df is None or df.empty:
+            if not self.bot or self.bot.health.last_input is None:
                 return False
-                
-            latest_data = df.iloc[-1]
-            prediction, _ = self.bot.pipeline.make_ensemble_prediction(latest_data)
+            prediction, _ = self.bot.pipeline.make_ensemble_prediction(self.bot.health.last_input)
             return prediction is not None
-            
         except Exception as e:
             logger.error(f"Model prediction error: {e}")
             return False
@@ -201,6 +217,9 @@ class TradingBotRunner:
             
             # Create bot instance
             self.bot = CryptoTradingBot(self.config)
+            if self.health_monitor:
+                self.health_monitor.close()
+            self.health_monitor = self.build_health_monitor()
             
             # Start health check thread
             self.health_check_thread = threading.Thread(target=self.health_check)
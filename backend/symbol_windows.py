@@ -0,0 +1,243 @@
+"""
+Fixed-size per-symbol market data windows for the memory-efficient bot.
+
+Each symbol keeps its most recent rows in a preallocated float32 ring buffer, so memory
+per symbol is bounded by max_data_points no matter how long the bot runs. Derived data
+lives in an LRU cache bounded by entry count. Both can be shrunk in place when the
+memory monitor asks for eviction.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class RingBuffer:
+    """
+    Fixed-capacity float32 row buffer with int64 timestamps; new rows overwrite the oldest.
+
+    Args:
+        capacity (int): Maximum rows kept.
+        width (int): Values per row.
+    """
+
+    def __init__(self, capacity: int, width: int):
+        self.width = width
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self.values = np.zeros((self.capacity, self.width), dtype=np.float32)
+        self.timestamps = np.zeros(self.capacity, dtype=np.int64)
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.timestamps.nbytes
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        if not self.size:
+            return None
+        return int(self.timestamps[(self.start + self.size - 1) % self.capacity])
+
+    def extend(self, timestamps: Sequence[int], rows: np.ndarray):
+        """Append rows (oldest first); only the last `capacity` rows are kept."""
+        rows = np.asarray(rows, dtype=np.float32).reshape(-1, self.width)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if len(rows) > self.capacity:
+            rows, timestamps = rows[-self.capacity:], timestamps[-self.capacity:]
+        n = len(rows)
+        if not n:
+            return
+        end = (self.start + self.size) % self.capacity
+        first = min(n, self.capacity - end)
+        self.values[end:end + first] = rows[:first]
+        self.timestamps[end:end + first] = timestamps[:first]
+        if first < n:
+            self.values[:n - first] = rows[first:]
+            self.timestamps[:n - first] = timestamps[first:]
+        overflow = max(0, self.size + n - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def replace_last(self, row: np.ndarray):
+        """Overwrite the newest row in place, e.g. with a fresher copy of a still-open candle."""
+        if not self.size:
+            raise IndexError("replace_last on an empty buffer")
+        self.values[(self.start + self.size - 1) % self.capacity] = np.asarray(row, dtype=np.float32)
+
+    def _order(self) -> np.ndarray:
+        return (self.start + np.arange(self.size)) % self.capacity
+
+    def view(self) -> np.ndarray:
+        """Rows oldest first (a copy when the buffer has wrapped)."""
+        if self.start + self.size <= self.capacity:
+            return self.values[self.start:self.start + self.size]
+        return self.values[self._order()]
+
+    def column(self, index: int) -> np.ndarray:
+        if self.start + self.size <= self.capacity:
+            return self.values[self.start:self.start + self.size, index]
+        return self.values[self._order(), index]
+
+    def times(self) -> np.ndarray:
+        if self.start + self.size <= self.capacity:
+            return self.timestamps[self.start:self.start + self.size]
+        return self.timestamps[self._order()]
+
+    def resize(self, capacity: int):
+        """Reallocate to `capacity` rows, keeping the most recent ones and releasing the old arrays."""
+        capacity = max(1, int(capacity))
+        if capacity == self.capacity:
+            return
+        rows, times = self.view().copy(), self.times().copy()
+        self._alloc(capacity)
+        self.extend(times, rows)
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by number of entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(0, int(maxsize))
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable):
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self.trim(self.maxsize)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.pop(key, default)
+
+    def trim(self, size: int) -> int:
+        """Evict least recently used entries until at most `size` remain. Returns entries evicted."""
+        evicted = 0
+        while len(self._data) > max(0, size):
+            self._data.popitem(last=False)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def clear(self) -> int:
+        return self.trim(0)
+
+    def resize(self, maxsize: int) -> int:
+        """Change the bound, evicting entries beyond a smaller one. Returns entries evicted."""
+        self.maxsize = max(0, int(maxsize))
+        return self.trim(self.maxsize)
+
+
+class SymbolWindows:
+    """
+    Ring-buffered OHLCV windows for many symbols.
+
+    Args:
+        max_data_points (int): Rows kept per symbol.
+        columns (tuple): Value columns stored per row.
+    """
+
+    def __init__(self, max_data_points: int, columns: Sequence[str] = DEFAULT_COLUMNS):
+        self.max_data_points = max_data_points
+        self.capacity = max_data_points
+        self.columns = tuple(columns)
+        self._index = {c: i for i, c in enumerate(self.columns)}
+        self._buffers: Dict[str, RingBuffer] = {}
+
+    def __contains__(self, symbol: str):
+        return symbol in self._buffers
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def symbols(self) -> List[str]:
+        return list(self._buffers)
+
+    def buffer(self, symbol: str) -> RingBuffer:
+        buf = self._buffers.get(symbol)
+        if buf is None:
+            buf = self._buffers[symbol] = RingBuffer(self.capacity, len(self.columns))
+        return buf
+
+    def append(self, symbol: str, timestamps: Sequence[int], rows: np.ndarray) -> int:
+        """
+        Append rows newer than the symbol's last timestamp. Returns rows added or updated.
+
+        A row with the same timestamp as the last stored one is a re-fetch of a candle
+        that was still open, so it replaces the stored row instead of being dropped.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.float32).reshape(-1, len(self.columns))
+        buf = self.buffer(symbol)
+        last = buf.last_timestamp
+        updated = 0
+        if last is not None:
+            same = np.flatnonzero(timestamps == last)
+            if len(same):
+                buf.replace_last(rows[same[-1]])
+                updated = 1
+            newer = timestamps > last
+            timestamps, rows = timestamps[newer], rows[newer]
+        buf.extend(timestamps, rows)
+        return len(rows) + updated
+
+    def column(self, symbol: str, name: str) -> np.ndarray:
+        buf = self._buffers.get(symbol)
+        if buf is None:
+            return np.empty(0, dtype=np.float32)
+        return buf.column(self._index[name])
+
+    def drop(self, symbol: str):
+        self._buffers.pop(symbol, None)
+
+    def resize(self, capacity: int):
+        """Set rows kept per symbol (never above max_data_points) for every window."""
+        self.capacity = max(1, min(int(capacity), self.max_data_points))
+        for buf in self._buffers.values():
+            buf.resize(self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buf.nbytes for buf in self._buffers.values())
+
+
+def release_memory() -> None:
+    """Collect garbage and ask glibc to hand freed heap pages back to the OS."""
+    gc.collect()
+    libc_name = ctypes.util.find_library('c')
+    if not libc_name:
+        return
+    try:
+        libc = ctypes.CDLL(libc_name)
+        if hasattr(libc, 'malloc_trim'):
+            libc.malloc_trim(0)
+    except OSError:
+        pass
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+
+from backend.ml_components.background_learner import BackgroundLearner, ExperienceBuffer
+
+
+class FakeOptimizer:
+    """Stands in for StrategyOptimizer: weights change only through train()."""
+
+    def __init__(self):
+        self.weights = [0.0]
+
+    def select_action(self, state, training=False):
+        return 1 if self.weights[0] > 0 else 0, min(1.0, self.weights[0])
+
+    def train(self, reward, delay=0.0):
+        time.sleep(delay)
+        self.weights[0] += reward
+
+
+class TestBackgroundLearner(unittest.TestCase):
+
+    def test_buffer_is_bounded(self):
+        buffer = ExperienceBuffer(maxlen=3)
+        for i in range(5):
+            buffer.push(i)
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual(buffer.drain(timeout=0), [2, 3, 4])
+        self.assertEqual(buffer.drain(timeout=0), [])
+
+    def test_training_runs_off_the_decision_path(self):
+        started = threading.Event()
+
+        def slow_step(trainer, reward):
+            started.set()
+            trainer.train(reward, delay=0.3)
+
+        optimizer = FakeOptimizer()
+        learner = BackgroundLearner(optimizer, slow_step, batch_size=1).start()
+        try:
+            t0 = time.perf_counter()
+            learner.submit(0.5)
+            self.assertTrue(started.wait(2))
+            # Decisions are served from the published policy while training is in flight
+            self.assertEqual(learner.policy.select_action(None), (0, 0.0))
+            self.assertLess(time.perf_counter() - t0, 0.2)
+
+            deadline = time.time() + 5
+            while learner.version == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(learner.version, 1)
+            self.assertEqual(learner.policy.select_action(None), (1, 0.5))
+        finally:
+            learner.stop()
+        # The original optimizer is never trained in place
+        self.assertEqual(optimizer.weights, [0.0])
+
+    def test_published_policy_is_a_frozen_snapshot(self):
+        learner = BackgroundLearner(FakeOptimizer(), lambda trainer, reward: trainer.train(reward))
+        learner.submit(0.25)
+        self.assertEqual(learner.train_pending(), 1)
+        published = learner.policy
+        learner.submit(0.25)
+        learner.train_pending()
+        self.assertEqual(published.weights, [0.25])
+        self.assertEqual(learner.policy.weights, [0.5])
+        self.assertEqual(learner.version, 2)
+
+    def test_failed_steps_do_not_publish(self):
+        def failing(trainer, experience):
+            raise ValueError('bad experience')
+
+        learner = BackgroundLearner(FakeOptimizer(), failing)
+        learner.submit(1.0)
+        learner.train_pending()
+        self.assertEqual((learner.version, learner.failures), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
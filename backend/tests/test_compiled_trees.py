@@ -0,0 +1,85 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesRegressor, GradientBoostingRegressor, RandomForestRegressor
+from sklearn.neural_network import MLPRegressor
+
+from backend.ml_components.compiled_trees import CompiledEnsemble
+from backend.ml_components.model_registry import ModelRegistry
+
+
+def dataset(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 6)), columns=[f"f{i}" for i in range(6)])
+    y = X['f0'] * 2 - X['f1'] ** 2 + np.sin(X['f2'] * 3) + rng.normal(0, 0.1, n)
+    return X, y
+
+
+class TestCompiledTrees(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.X, cls.y = dataset()
+        cls.models = {
+            'random_forest': RandomForestRegressor(n_estimators=20, max_depth=8, random_state=1),
+            'extra_trees': ExtraTreesRegressor(n_estimators=20, random_state=1),
+            'gradient_boosting': GradientBoostingRegressor(n_estimators=30, max_depth=4, random_state=1),
+        }
+        for model in cls.models.values():
+            model.fit(cls.X, cls.y)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_predictions_match_sklearn_after_mmap_load(self):
+        X_new, _ = dataset(n=300, seed=5)
+        for name, model in self.models.items():
+            path = os.path.join(self.tmp.name, name)
+            CompiledEnsemble.from_model(model).save(path)
+            compiled = CompiledEnsemble.load(path)
+            self.assertFalse(compiled.value.flags.writeable)
+            self.assertIsInstance(compiled.value.base, np.memmap)
+            np.testing.assert_allclose(compiled.predict(X_new), model.predict(X_new), rtol=1e-12, atol=1e-12,
+                                       err_msg=name)
+            np.testing.assert_array_equal(compiled.predict(X_new.to_numpy()[:1]), compiled.predict(X_new.iloc[:1]))
+
+    def test_columns_are_reordered_by_name_and_validated(self):
+        compiled = CompiledEnsemble.from_model(self.models['random_forest'])
+        shuffled = self.X[list(reversed(self.X.columns))]
+        np.testing.assert_allclose(compiled.predict(shuffled), self.models['random_forest'].predict(self.X))
+        with self.assertRaises(ValueError):
+            compiled.predict(np.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            CompiledEnsemble.from_model(MLPRegressor())
+
+    def test_registry_loads_compiled_models_unless_pickle_is_newer(self):
+        registry = ModelRegistry({'model_dir': self.tmp.name})
+        for name, model in self.models.items():
+            registry.register_model(name, model, {'weight': 1.0})
+        registry.save_models()
+
+        loaded = ModelRegistry({'model_dir': self.tmp.name})
+        loaded.load_models()
+        self.assertTrue(all(isinstance(m, CompiledEnsemble) for m in loaded.models.values()))
+        expected = registry.predict_all(self.X)
+        for name, pred in loaded.predict_all(self.X).items():
+            np.testing.assert_allclose(pred, expected[name], rtol=1e-12, atol=1e-12)
+
+        pickle_path = os.path.join(self.tmp.name, 'random_forest.pkl')
+        later = time.time() + 10
+        os.utime(pickle_path, (later, later))
+        stale = ModelRegistry({'model_dir': self.tmp.name})
+        stale.load_models()
+        self.assertIsInstance(stale.models['random_forest'], RandomForestRegressor)
+        self.assertIsInstance(stale.models['extra_trees'], CompiledEnsemble)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from backend.explanation_engine import ExplanationEngine
+
+REASONS = [['Strong uptrend', 'Momentum building'], ['Volatility spike'], ['Negative sentiment', 'Downtrend']]
+
+
+def decision(i):
+    return {
+        'decision': ['buy', 'hold', 'sell'][i % 3],
+        'confidence': 0.5 + (i % 5) / 10,
+        'reasoning': REASONS[i % 3],
+        'market_regime': 'trending' if i % 4 else 'ranging',
+        'insights': {'trend': {'direction': 'up', 'strength': 0.7}},
+    }
+
+
+class TestExplanationEngineReports(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ExplanationEngine({})
+        for i in range(12):
+            self.engine.explain_decision(decision(i))
+
+    def test_window_loaded_once_and_shared_by_sections(self):
+        with mock.patch.object(self.engine, '_window_bounds', wraps=self.engine._window_bounds) as bounds, \
+                mock.patch.object(self.engine, '_get_recent_decisions') as recent:
+            report = self.engine.generate_report('daily')
+        self.assertEqual(bounds.call_count, 1)
+        recent.assert_not_called()
+        self.assertIn('Buy(4) Sell(4) Hold(4)', report['summary'])
+        self.assertEqual(sum(p['frequency'] for p in report['decision_patterns']), 12)
+        self.assertEqual(report['risk_analysis']['current_regime'], 'trending')
+        self.assertEqual(report['performance']['decision_counts'], {'buy': 4, 'hold': 4, 'sell': 4})
+
+    def test_report_cached_until_new_decision(self):
+        first = self.engine.generate_report('daily')
+        with mock.patch.object(self.engine, '_analyze_performance') as performance:
+            self.assertIs(self.engine.generate_report('daily'), first)
+            performance.assert_not_called()
+        self.engine.explain_decision(decision(12))
+        updated = self.engine.generate_report('daily')
+        self.assertIsNot(updated, first)
+        self.assertIn('Buy(5)', updated['summary'])
+
+    def test_window_excludes_old_decisions(self):
+        old = datetime.now() - timedelta(days=3)
+        engine = ExplanationEngine({})
+        engine._record_decision(decision(0), {}, timestamp=old)
+        engine.explain_decision(decision(1))
+        self.assertEqual(len(engine._get_recent_decisions('daily')), 1)
+        self.assertEqual(len(engine._get_recent_decisions('weekly')), 2)
+
+    def test_clusterer_updated_incrementally(self):
+        clusterer = self.engine.decision_clusterer
+        with mock.patch.object(clusterer.kmeans, 'partial_fit', wraps=clusterer.kmeans.partial_fit) as fit:
+            self.engine.generate_report('daily')
+            self.assertEqual(fit.call_count, 1)
+            self.assertEqual(fit.call_args[0][0].shape[0], 12)
+            self.engine.explain_decision(decision(13))
+            self.engine.generate_report('daily')
+            # Only the new decision is fed to the existing centroids
+            self.assertEqual(fit.call_count, 2)
+            self.assertEqual(fit.call_args[0][0].shape[0], 1)
+        self.assertEqual(clusterer.n_docs, 13)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.ml_components.feature_cache import FeatureCache, fingerprint_frame
+
+
+def raw_frame(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=rows, freq='h'),
+        'close': 100 + rng.normal(size=rows).cumsum(),
+        'volume': rng.uniform(1, 10, rows),
+    })
+
+
+class TestFeatureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = FeatureCache(self.tmp.name, max_entries=2)
+        self.builds = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self):
+        self.builds += 1
+        X = np.arange(24, dtype=np.float64).reshape(2, 3, 4)
+        return {'X_train': X, 'y_train': np.array([0, 1])}, {'features': ['a', 'b', 'c', 'd']}
+
+    def test_second_lookup_memory_maps_float32_without_rebuilding(self):
+        key = self.cache.key(data=fingerprint_frame(raw_frame()), sequence_length=3)
+
+        first, hit = self.cache.get_or_build(key, self.build)
+        self.assertFalse(hit)
+        second, hit = self.cache.get_or_build(key, self.build)
+
+        self.assertTrue(hit)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(second.meta['features'], ['a', 'b', 'c', 'd'])
+        self.assertIsInstance(second['X_train'], np.memmap)
+        self.assertEqual(second['X_train'].dtype, np.float32)
+        self.assertEqual(second['y_train'].dtype, np.array([0, 1]).dtype)
+        np.testing.assert_array_equal(second['X_train'], np.arange(24).reshape(2, 3, 4))
+        self.assertFalse(any(name.startswith('.') for name in os.listdir(self.tmp.name)))
+
+    def test_scaler_range_and_prices_keep_full_precision(self):
+        close = np.array([43210.123456789, 43211.987654321])
+        dataset = self.cache.store(self.cache.key(n='precision'), {
+            'X_test': np.array([[0.1, 0.2]]), 'y_test': np.array([0.3]),
+            'scaler_data_max': close, 'test_close': close,
+        })
+
+        self.assertEqual(dataset['X_test'].dtype, np.float32)
+        self.assertEqual(dataset['y_test'].dtype, np.float32)
+        self.assertEqual(dataset['scaler_data_max'].dtype, np.float64)
+        np.testing.assert_array_equal(dataset['test_close'], close)
+
+    def test_key_changes_with_data_and_settings(self):
+        data = raw_frame()
+        base = self.cache.key(data=fingerprint_frame(data), sequence_length=60, features=None)
+
+        self.assertEqual(base, self.cache.key(features=None, sequence_length=60,
+                                              data=fingerprint_frame(data.copy())))
+        changed = data.copy()
+        changed.loc[100, 'close'] += 1e-6
+        self.assertNotEqual(base, self.cache.key(data=fingerprint_frame(changed), sequence_length=60,
+                                                 features=None))
+        self.assertNotEqual(base, self.cache.key(data=fingerprint_frame(data.iloc[1:]), sequence_length=60,
+                                                 features=None))
+        self.assertNotEqual(base, self.cache.key(data=fingerprint_frame(data), sequence_length=30,
+                                                 features=None))
+        self.assertNotEqual(base, self.cache.key(data=fingerprint_frame(data), sequence_length=60,
+                                                 features=['close']))
+
+    def test_least_recently_used_entries_are_pruned(self):
+        keys = [self.cache.key(n=n) for n in range(3)]
+        self.cache.get_or_build(keys[0], self.build)
+        self.cache.get_or_build(keys[1], self.build)
+        old = time.time() - 60
+        os.utime(os.path.join(self.tmp.name, keys[1], 'meta.json'), (old, old))
+
+        self.cache.get_or_build(keys[2], self.build)
+
+        self.assertIsNone(self.cache.load(keys[1]))
+        self.assertIsNotNone(self.cache.load(keys[0]))
+        self.assertIsNotNone(self.cache.load(keys[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import event, text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# generate_reports imports the top-level explanation_engine, not backend/explanation_engine.py
+sys.path.insert(0, ROOT)
+
+from generate_reports import ReportGenerator  # noqa: E402
+
+
+def at(days_ago, hour=12):
+    return datetime.combine(date.today() - timedelta(days=days_ago), time(hour))
+
+
+class TestReportGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.generator = ReportGenerator(f"sqlite:///{os.path.join(self.tmp.name, 'reports.db')}")
+        with self.generator.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE trading_signals (id INTEGER PRIMARY KEY, timestamp DATETIME, "
+                                    "trade_signal VARCHAR(255), confidence DECIMAL(5, 4))"))
+            connection.execute(text("CREATE TABLE learning_metrics (id INTEGER PRIMARY KEY, timestamp DATETIME, "
+                                    "accuracy DECIMAL(5, 4), model_precision DECIMAL(5, 4), "
+                                    "recall DECIMAL(5, 4), f1_score DECIMAL(5, 4))"))
+            with open(os.path.join(ROOT, 'sql', 'add_report_indexes.sql')) as f:
+                for statement in f.read().split(';'):
+                    if 'CREATE' in statement:
+                        connection.execute(text(statement))
+        self.insert_signals([(0, 'buy', 0.8), (0, 'buy', 0.6), (1, 'sell', 0.9), (3, 'hold', 0.5), (10, 'buy', 0.7)])
+        self.insert_metrics([(0, 0.9), (1, 0.7), (8, 0.5)])
+
+        self.queries = []
+        event.listen(self.generator.engine, 'before_cursor_execute', self._record_query)
+
+    def tearDown(self):
+        self.generator.engine.dispose()
+        self.tmp.cleanup()
+
+    def _record_query(self, conn, cursor, statement, parameters, context, executemany):
+        self.queries.append((statement, parameters))
+
+    def raw_queries(self):
+        """Queries that scanned trading_signals or learning_metrics themselves."""
+        return [(statement, parameters) for statement, parameters in self.queries
+                if 'FROM trading_signals' in statement or 'FROM learning_metrics' in statement]
+
+    def count(self, table):
+        with self.generator.engine.connect() as connection:
+            return connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+    def insert_signals(self, rows):
+        with self.generator.engine.begin() as connection:
+            connection.execute(text("INSERT INTO trading_signals (timestamp, trade_signal, confidence) "
+                                    "VALUES (:timestamp, :signal, :confidence)"),
+                               [{'timestamp': at(d), 'signal': s, 'confidence': c} for d, s, c in rows])
+
+    def insert_metrics(self, rows):
+        with self.generator.engine.begin() as connection:
+            connection.execute(text("INSERT INTO learning_metrics (timestamp, accuracy, model_precision, recall, f1_score) "
+                                    "VALUES (:timestamp, :value, :value, :value, :value)"),
+                               [{'timestamp': at(d), 'value': v} for d, v in rows])
+
+    def test_weekly_aggregates_in_one_query_per_table(self):
+        aggregates = self.generator._load_period_aggregates('weekly')
+        self.assertEqual(len(self.raw_queries()), 2)
+
+        summary = self.generator._get_summary_data('weekly', aggregates['current'])
+        self.assertEqual((summary['total_decisions'], summary['buy_signals'], summary['sell_signals'],
+                          summary['hold_signals']), (4, 2, 1, 1))
+        self.assertEqual(summary['avg_confidence'], 0.7)
+        self.assertAlmostEqual(self.generator._get_performance_metrics(aggregates['current'])['accuracy'], 0.8)
+
+        patterns = {p['signal']: p for p in self.generator._get_decision_patterns_data(aggregates['current'])}
+        self.assertEqual(patterns['buy'], {'signal': 'buy', 'frequency': 2, 'avg_confidence': '0.70'})
+
+        previous = self.generator._get_model_comparison_data('weekly', aggregates)[1]
+        self.assertEqual(previous['accuracy'], '0.50')
+        self.assertEqual(aggregates['previous']['signals']['buy']['frequency'], 1)
+
+        # Every closed day of both periods is summarized; today never is
+        self.assertEqual(self.count('report_daily_summary'), 13)
+        self.assertEqual(self.count('report_daily_signals'), 3)
+
+    def test_next_report_reads_closed_days_from_the_summary_tables(self):
+        self.generator._load_period_aggregates('weekly')
+        self.insert_signals([(0, 'sell', 0.4)])
+        # A new generator (e.g. the next cron run) has nothing in memory
+        generator = ReportGenerator(self.generator.db_connection_string)
+        event.listen(generator.engine, 'before_cursor_execute', self._record_query)
+        self.queries.clear()
+
+        html = generator.generate_comprehensive_report('weekly')
+        generator.engine.dispose()
+        self.assertEqual(len(self.raw_queries()), 2)
+        # Only today was read from the raw tables
+        today = datetime.combine(date.today(), time.min)
+        for _, parameters in self.raw_queries():
+            self.assertEqual(datetime.fromisoformat(str(parameters[0])), today)
+            self.assertEqual(datetime.fromisoformat(str(parameters[1])), today + timedelta(days=1))
+        self.assertIn('Total Decisions Analyzed: 5', html)
+        self.assertIn('Sell Signals: 2', html)
+        # Neither table holds balances or P&L, so there is no trading performance section
+        self.assertNotIn('Trading Performance', html)
+        self.assertFalse([q for q, _ in self.queries if q.startswith('INSERT')])
+
+    def test_longer_period_fetches_only_missing_history(self):
+        self.generator._load_period_aggregates('daily')
+        self.assertEqual(self.count('report_daily_summary'), 1)
+        self.queries.clear()
+
+        aggregates = self.generator._load_period_aggregates('weekly')
+        self.assertEqual(len(self.raw_queries()), 2)
+        # Yesterday was summarized by the daily report, so the raw scan skips it
+        yesterday = datetime.combine(date.today() - timedelta(days=1), time.min)
+        for _, parameters in self.raw_queries():
+            self.assertEqual(len(parameters), 4)
+            self.assertEqual(datetime.fromisoformat(str(parameters[1])), yesterday)
+        self.assertEqual(aggregates['current']['signals']['hold']['frequency'], 1)
+        self.assertEqual(aggregates['current']['signals']['sell']['frequency'], 1)
+        self.assertEqual(aggregates['previous']['signals']['buy']['frequency'], 1)
+        self.assertEqual(self.count('report_daily_summary'), 13)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+
+from backend.health_status import ComponentPolicy, HealthMonitor, HealthStatus
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHealthMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.status = HealthStatus(clock=self.clock)
+        self.probe_calls = 0
+        self.probe_result = True
+        self.monitor = HealthMonitor(self.status, {
+            'loop': ComponentPolicy(max_age=60),
+            'data': ComponentPolicy(max_age=60, probe=self.probe),
+            'model': ComponentPolicy(max_age=60, probe=self.probe, max_latency=2.0),
+        }, probe_timeout=0.2, probe_interval=300)
+
+    def tearDown(self):
+        self.monitor.close()
+
+    def probe(self):
+        self.probe_calls += 1
+        return self.probe_result
+
+    def test_fresh_published_signal_needs_no_probe(self):
+        self.status.record_data({'Close': 1})
+        self.status.record_prediction(0.5)
+        self.clock.now += 30
+        self.assertTrue(self.monitor.check('data'))
+        self.assertTrue(self.monitor.check('model'))
+        self.assertEqual(self.probe_calls, 0)
+        self.assertEqual(self.monitor.evaluate('data')['source'], 'published')
+
+    def test_stale_signal_probes_once_per_interval(self):
+        self.status.record_data()
+        self.clock.now += 120
+        self.assertTrue(self.monitor.check('data'))
+        self.assertTrue(self.monitor.check('data'))
+        self.assertEqual(self.probe_calls, 1)
+        self.clock.now += 301
+        self.probe_result = False
+        self.assertFalse(self.monitor.check('data'))
+        self.assertEqual(self.probe_calls, 2)
+
+    def test_errors_and_latency_are_unhealthy_without_probing(self):
+        for _ in range(3):
+            self.status.record_error('data', 'HTTP 429')
+        result = self.monitor.evaluate('data')
+        self.assertFalse(result['healthy'])
+        self.assertIn('HTTP 429', result['reason'])
+        self.status.record_prediction(5.0)
+        self.assertFalse(self.monitor.check('model'))
+        self.assertEqual(self.probe_calls, 0)
+        # A success resets the consecutive error count
+        self.status.record_data()
+        self.assertTrue(self.monitor.check('data'))
+        self.assertEqual(self.status.snapshot()['data']['total_errors'], 3)
+
+    def test_probe_runs_under_time_budget(self):
+        release = threading.Event()
+        calls = []
+
+        def hanging_probe():
+            calls.append(1)
+            release.wait(5)
+            return True
+
+        self.monitor.policies['data'].probe = hanging_probe
+        started = time.perf_counter()
+        result = self.monitor.run_probe('data')
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertFalse(result.healthy)
+        self.assertIn('exceeded', result.error)
+        # The hung probe is awaited again rather than started a second time
+        self.monitor.run_probe('data')
+        self.assertEqual(len(calls), 1)
+        release.set()
+
+    def test_evaluate_is_cheap(self):
+        self.status.record_data()
+        started = time.perf_counter()
+        for _ in range(10000):
+            self.monitor.evaluate('data')
+        self.assertLess((time.perf_counter() - started) / 10000, 50e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
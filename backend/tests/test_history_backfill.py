@@ -0,0 +1,164 @@
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import time
+
+from history_backfill import CandleStore, HistoryBackfill, INTERVAL_MS, align_down, split_windows
+
+HOUR = INTERVAL_MS['1h']
+# On the grid of 10-candle windows used below
+START = 1_700_000_000_000 - (1_700_000_000_000 % (10 * HOUR))
+
+
+def deterministic_candle(symbol, timestamp):
+    """Candle values derived only from symbol and timestamp."""
+    base = 100.0 + sum(ord(c) for c in symbol) % 50 + (timestamp // HOUR) % 24
+    return [timestamp, str(base), str(base + 2), str(base - 2), str(base + 1), str(10.0 + (timestamp // HOUR) % 7)]
+
+
+class MockCandleServer(ThreadingHTTPServer):
+    """Serves Bitvavo-shaped /markets/{symbol}/candles responses on localhost."""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), MockCandleHandler)
+        self.requests = []
+        self.missing = set()   # timestamps to omit from responses
+        self.fail_once = set()  # window starts that return 500 on first request
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v2"
+
+
+class MockCandleHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            parsed = urlparse(self.path)
+            symbol = parsed.path.split('/')[3]
+            query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            start, end, limit = int(query['start']), int(query['end']), int(query['limit'])
+            step = INTERVAL_MS[query['interval']]
+            with server.lock:
+                server.requests.append((symbol, start, end))
+                if start in server.fail_once:
+                    server.fail_once.discard(start)
+                    self._send(500, {'error': 'temporary'})
+                    return
+            threading.Event().wait(0.01)
+            stamps = [t for t in range(start, end, step) if t not in server.missing][:limit]
+            # Bitvavo returns newest candles first
+            self._send(200, [deterministic_candle(symbol, t) for t in reversed(stamps)])
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestHistoryBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockCandleServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.store = CandleStore(':memory:')
+        self.end = START + 100 * HOUR
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.store.close()
+
+    def make_backfill(self, concurrency=2):
+        return HistoryBackfill(self.store, base_url=self.server.base_url,
+                               concurrency={'bitvavo': concurrency}, window_limit=10)
+
+    def test_split_windows_aligned_and_complete(self):
+        windows = split_windows('BTC-EUR', '1h', START + 5, START + 25 * HOUR, limit=10)
+        self.assertEqual(windows[0].start_ms, START)
+        self.assertEqual(windows[-1].end_ms, START + 30 * HOUR)
+        for previous, current in zip(windows, windows[1:]):
+            self.assertEqual(previous.end_ms, current.start_ms)
+
+        # A range starting elsewhere reuses the same grid windows
+        shifted = split_windows('BTC-EUR', '1h', START + 13 * HOUR + 7, START + 25 * HOUR, limit=10)
+        self.assertEqual(shifted, windows[1:])
+
+    def test_moving_range_resumes_and_open_window_is_refetched(self):
+        now_hour = align_down(int(time.time() * 1000), '1h')
+        start, end = now_hour - 35 * HOUR, now_hour + HOUR
+        asyncio.run(self.make_backfill().backfill(['BTC-EUR'], '1h', start, end))
+        open_window = split_windows('BTC-EUR', '1h', now_hour, end, limit=10)[-1]
+        self.assertNotIn((open_window.start_ms, open_window.end_ms), self.store.completed_windows('BTC-EUR', '1h'))
+
+        # A later run with a start that moved by a few minutes only fetches the open window
+        self.server.requests.clear()
+        summary = asyncio.run(self.make_backfill().backfill(['BTC-EUR'], '1h', start + 5 * 60_000, end))
+        self.assertEqual(self.server.requests, [('BTC-EUR', open_window.start_ms, open_window.end_ms)])
+        self.assertEqual(summary['windows'], 1)
+
+    def test_backfill_stores_all_candles_with_concurrency_cap(self):
+        summary = asyncio.run(self.make_backfill(concurrency=3).backfill(
+            ['BTC-EUR', 'ETH-EUR'], '1h', START, self.end))
+
+        self.assertEqual(summary['windows'], 20)
+        self.assertEqual(summary['candles'], 200)
+        self.assertEqual(summary['failed'], [])
+        self.assertLessEqual(self.server.max_in_flight, 3)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+        df = self.store.load('ETH-EUR', '1h', START, self.end)
+        self.assertEqual(len(df), 100)
+        expected = deterministic_candle('ETH-EUR', START + 42 * HOUR)
+        self.assertAlmostEqual(df['close'].iloc[42], float(expected[4]))
+
+    def test_restart_resumes_without_refetching(self):
+        self.server.fail_once = {START + 30 * HOUR}
+        backfill = self.make_backfill()
+        backfill.max_retries = 1
+        first = asyncio.run(backfill.backfill(['BTC-EUR'], '1h', START, self.end))
+        self.assertEqual(len(first['failed']), 1)
+
+        self.server.requests.clear()
+        second = asyncio.run(self.make_backfill().backfill(['BTC-EUR'], '1h', START, self.end))
+        self.assertEqual(second['skipped'], 9)
+        self.assertEqual(self.server.requests, [('BTC-EUR', START + 30 * HOUR, START + 40 * HOUR)])
+        self.assertEqual(len(self.store.load('BTC-EUR', '1h', START, self.end)), 100)
+
+    def test_fill_gaps_refetches_missing_candles(self):
+        self.server.missing = {START + 12 * HOUR, START + 13 * HOUR, START + 57 * HOUR}
+        backfill = self.make_backfill()
+        asyncio.run(backfill.backfill(['BTC-EUR'], '1h', START, self.end))
+        self.assertEqual(self.store.find_gaps('BTC-EUR', '1h', START, self.end),
+                         [(START + 12 * HOUR, START + 14 * HOUR), (START + 57 * HOUR, START + 58 * HOUR)])
+
+        self.server.missing = set()
+        self.server.requests.clear()
+        summary = asyncio.run(backfill.fill_gaps(['BTC-EUR'], '1h', START, self.end))
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(summary['remaining_gaps'], {'BTC-EUR': []})
+        self.assertEqual(len(self.store.load('BTC-EUR', '1h', START, self.end)), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from backend.hyperparameter_search import (
+    HyperparameterSearch, data_window_tag, feature_set_id, make_storage, staged_scores
+)
+
+try:
+    import optuna
+except ImportError:
+    optuna = None
+
+
+class TestHyperparameterSearch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(400, 3)).astype(np.float32)
+        self.y = (self.X[:, 0] - 2 * self.X[:, 1] + rng.normal(scale=0.1, size=400)).astype(np.float32)
+
+    def test_staged_scores_grow_one_ensemble_and_improve(self):
+        scores = list(staged_scores('gb', {'n_estimators': 80, 'learning_rate': 0.1, 'max_depth': 3},
+                                    self.X[:300], self.y[:300], self.X[300:], self.y[300:], stages=4, seed=0))
+
+        self.assertEqual([step for step, _ in scores], [20, 40, 60, 80])
+        self.assertLess(scores[-1][1], scores[0][1])
+
+    def test_studies_are_named_by_model_and_feature_set(self):
+        search = HyperparameterSearch({'storage_path': 'unused.db'})
+        features = ['close', 'volume', 'rsi']
+
+        self.assertEqual(feature_set_id(features), feature_set_id(list(features)))
+        self.assertNotEqual(feature_set_id(features), feature_set_id(features[::-1]))
+        self.assertEqual(search.study_name('rf', features), f"rf-{feature_set_id(features)}")
+        self.assertTrue(search.study_name('rf', features, '2024Q1').startswith(search.study_name('rf', features)))
+
+    def test_data_window_tag_follows_the_training_window(self):
+        index = pd.date_range('2024-01-01', periods=400, freq='h')
+        frame = pd.DataFrame(self.X, index=index)
+
+        self.assertEqual(data_window_tag(frame), '20240101T0000-20240117T1500')
+        self.assertNotEqual(data_window_tag(frame), data_window_tag(frame.iloc[24:]))
+        self.assertEqual(data_window_tag(self.X), data_window_tag(self.X.copy()))
+        self.assertNotEqual(data_window_tag(self.X), data_window_tag(self.X[1:]))
+
+
+@unittest.skipIf(optuna is None, "optuna is not installed")
+class TestHyperparameterSearchStudies(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.X = rng.normal(size=(300, 3)).astype(np.float32)
+        self.y = (self.X[:, 0] - 2 * self.X[:, 1] + rng.normal(scale=0.1, size=300)).astype(np.float32)
+        self.features = ['a', 'b', 'c']
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = {'storage_path': os.path.join(self.tmp.name, 'studies.db'), 'n_workers': 1, 'seed': 0,
+                       'stages': 3, 'pruner': 'median'}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def study(self, search, data_tag):
+        return optuna.load_study(study_name=search.study_name('et', self.features, data_tag),
+                                 storage=f"sqlite:///{self.config['storage_path']}")
+
+    def test_resume_pruning_and_warm_start(self):
+        search = HyperparameterSearch({**self.config, 'n_trials': 12})
+        best = search.optimize('et', self.X, self.y, self.features, data_tag='w1')
+        first = self.study(search, 'w1')
+        states = [t.state for t in first.trials]
+        self.assertEqual(len(states), 12)
+        self.assertIn(optuna.trial.TrialState.PRUNED, states)
+        self.assertEqual(best, first.best_params)
+
+        # Same window: the finished study is resumed, not searched again
+        self.assertEqual(search.optimize('et', self.X, self.y, self.features, data_tag='w1'), best)
+        self.assertEqual(len(self.study(search, 'w1').trials), 12)
+        # A larger budget only runs the missing trials
+        HyperparameterSearch({**self.config, 'n_trials': 14}).optimize('et', self.X, self.y, self.features,
+                                                                       data_tag='w1')
+        self.assertEqual(len(self.study(search, 'w1').trials), 14)
+
+        # New window: a new study that starts from the best earlier parameters
+        search = HyperparameterSearch({**self.config, 'n_trials': 3, 'warm_start_trials': 1})
+        search.optimize('et', self.X[50:], self.y[50:], self.features, data_tag='w2')
+        second = self.study(search, 'w2')
+        self.assertEqual(len(second.trials), 3)
+        self.assertEqual(second.trials[0].params, self.study(search, 'w1').best_params)
+
+    def test_storage_uses_no_deprecated_arguments(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            warnings.simplefilter('error', DeprecationWarning)
+            storage = make_storage(self.config['storage_path'])
+        self.assertIsInstance(storage.heartbeat_stale_trial_callback,
+                              optuna.storages.RetryHeartbeatStaleTrialCallback)
+
+
+if __name__ == '__main__':
+    unittest.main()
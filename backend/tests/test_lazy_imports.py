@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import unittest
+
+from backend.lazy_imports import import_times, lazy_attribute, lazy_import
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_module_imported_on_first_attribute_access(self):
+        # Run in a fresh interpreter so the probe module is not already imported
+        code = (
+            "import sys\n"
+            "from backend.lazy_imports import lazy_import, lazy_attribute\n"
+            "fractions = lazy_import('fractions')\n"
+            "Fraction = lazy_attribute('fractions', 'Fraction')\n"
+            "assert 'fractions' not in sys.modules\n"
+            "assert Fraction(1, 2) == fractions.Fraction(2, 4)\n"
+            "assert 'fractions' in sys.modules\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_import_hook_runs_once_with_real_module(self):
+        seen = []
+        module = lazy_import('colorsys', on_import=seen.append)
+        self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0)[0], 0.0)
+        module.hls_to_rgb(0.0, 0.5, 1.0)
+        self.assertEqual([m.__name__ for m in seen], ['colorsys'])
+        self.assertTrue(module.loaded)
+
+    def test_shared_instance_and_recorded_import_time(self):
+        self.assertIs(lazy_import('decimal'), lazy_import('decimal'))
+        self.assertEqual(str(lazy_attribute('decimal', 'Decimal')('1.5')), '1.5')
+        self.assertIn('decimal', import_times)
+
+
+if __name__ == '__main__':
+    unittest.main()
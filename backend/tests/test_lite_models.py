@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from backend.ml_components.lite_models import compare_predictions, export_is_acceptable, is_keras_model
+from backend.windowed_data import WindowedDataset
+
+
+class LastValueModel:
+    """Predicts from the last row of each window, optionally with a quantization-like offset."""
+
+    def __init__(self, offset=0.0):
+        self.offset = offset
+
+    def predict(self, X, **kwargs):
+        return (X[:, -1, :1] > 0).astype(np.float32) * 0.8 + 0.1 + self.offset
+
+
+class TestComparePredictions(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        base = rng.normal(size=(500, 2))
+        target = np.zeros(500)
+        target[1:] = base[:-1, 0] > 0
+        self.dataset = WindowedDataset(base, target, seq_length=10, shuffle=True, seed=0)
+
+    def test_report_covers_every_holdout_window_in_order(self):
+        report = compare_predictions(LastValueModel(), LastValueModel(offset=0.05), self.dataset)
+
+        self.assertEqual(report['samples'], len(self.dataset))
+        self.assertAlmostEqual(report['max_abs_diff'], 0.05, places=6)
+        self.assertEqual(report['signal_agreement'], 1.0)
+        self.assertEqual(report['accuracy_original'], 1.0)
+        self.assertEqual(report['accuracy_change'], 0.0)
+        self.assertGreater(report['mse_exported'], report['mse_original'])
+
+    def test_accuracy_change_of_a_drifting_export(self):
+        X, y = self.dataset.subset(0, 200, shuffle=False).materialize()
+        report = compare_predictions(LastValueModel(), LastValueModel(offset=-0.5), (X, y))
+
+        self.assertEqual(report['samples'], 200)
+        self.assertLess(report['accuracy_change'], -0.3)
+        self.assertFalse(is_keras_model(LastValueModel()))
+
+
+class TestExportIsAcceptable(unittest.TestCase):
+
+    def test_quantized_exports_need_a_holdout_report_within_the_drop(self):
+        self.assertTrue(export_is_acceptable({'quantization': None}))
+        self.assertFalse(export_is_acceptable(None))
+        self.assertFalse(export_is_acceptable({'quantization': 'dynamic'}))
+        self.assertTrue(export_is_acceptable({'quantization': 'int8', 'holdout': {'accuracy_change': -0.01}}))
+        self.assertFalse(export_is_acceptable({'quantization': 'int8', 'holdout': {'accuracy_change': -0.05}}))
+        self.assertTrue(export_is_acceptable({'quantization': 'int8', 'holdout': {'accuracy_change': -0.05}},
+                                             max_accuracy_drop=0.1))
+        regression = {'quantization': 'float16', 'holdout': {'mse_original': 1.0, 'mse_exported': 1.01}}
+        self.assertTrue(export_is_acceptable(regression))
+        regression['holdout']['mse_exported'] = 1.5
+        self.assertFalse(export_is_acceptable(regression))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import socket
+import threading
+import time
+import unittest
+
+from backend.market_stream import MarketStreamBroker, StreamPublisher
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMarketStreamBroker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sent = []
+        self.broker = MarketStreamBroker(self.emit, min_interval=0.5, queue_size=3, ack_timeout=5.0,
+                                         clock=self.clock)
+
+    def emit(self, event, data, to=None, callback=None):
+        self.sent.append({'event': event, 'data': data, 'to': to, 'ack': callback})
+
+    def messages(self, sid):
+        return [m for s in self.sent if s['to'] == sid for m in s['data']['messages']]
+
+    def test_clients_only_receive_their_rooms(self):
+        self.broker.subscribe('a', ['BTCUSDT'])
+        self.broker.subscribe('b', ['ETHUSDT', 'portfolio'])
+        self.broker.publish('price', 'BTCUSDT', {'price': 1})
+        self.broker.publish('price', 'ETHUSDT', {'price': 2})
+        self.broker.publish('equity', 'portfolio', {'value': 3})
+        self.assertEqual(self.broker.flush(), 2)
+        self.assertEqual([m['symbol'] for m in self.messages('a')], ['BTCUSDT'])
+        self.assertEqual({m['symbol'] for m in self.messages('b')}, {'ETHUSDT', 'portfolio'})
+        self.assertEqual(self.sent[0]['event'], 'market_update')
+
+    def test_busy_client_gets_latest_prices_and_bounded_events(self):
+        self.broker.subscribe('slow', ['BTCUSDT'])
+        self.broker.publish('price', 'BTCUSDT', {'price': 0})
+        self.broker.flush()
+        # No ack yet: everything below is held back and conflated
+        for i in range(1, 1000):
+            self.broker.publish('price', 'BTCUSDT', {'price': i})
+            self.clock.now += 0.001
+            self.broker.flush()
+        for i in range(5):
+            self.broker.publish('trade', 'BTCUSDT', {'id': i})
+        self.assertEqual(len(self.sent), 1)
+
+        self.sent[0]['ack']()
+        self.assertEqual(self.broker.flush(), 1)
+        batch = self.sent[1]['data']
+        self.assertEqual([m['data'] for m in batch['messages'] if m['event'] == 'price'], [{'price': 999}])
+        self.assertEqual([m['data']['id'] for m in batch['messages'] if m['event'] == 'trade'], [2, 3, 4])
+        self.assertEqual(batch['dropped'], 2)
+
+    def test_throttled_to_min_interval(self):
+        self.broker.subscribe('fast', ['BTCUSDT'])
+        self.broker.publish('price', 'BTCUSDT', {'price': 1})
+        self.broker.flush()
+        self.sent[-1]['ack']()
+        self.broker.publish('price', 'BTCUSDT', {'price': 2})
+        self.clock.now += 0.2
+        self.assertEqual(self.broker.flush(), 0)
+        self.clock.now += 0.3
+        self.assertEqual(self.broker.flush(), 1)
+
+    def test_missing_ack_times_out_and_unsubscribe_discards_pending(self):
+        self.broker.subscribe('c', ['BTCUSDT', 'ETHUSDT'])
+        self.broker.publish('price', 'BTCUSDT', {'price': 1})
+        self.broker.flush()
+        self.broker.publish('price', 'BTCUSDT', {'price': 2})
+        self.broker.publish('price', 'ETHUSDT', {'price': 3})
+        self.clock.now += 1
+        self.assertEqual(self.broker.flush(), 0)
+        self.broker.unsubscribe('c', ['ETHUSDT'])
+        self.clock.now += 5
+        self.assertEqual(self.broker.flush(), 1)
+        self.assertEqual([m['symbol'] for m in self.sent[-1]['data']['messages']], ['BTCUSDT'])
+        self.broker.disconnect('c')
+        self.assertEqual(self.broker.stats()['rooms'], {})
+
+    def test_publisher_feeds_broker_over_udp(self):
+        probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+
+        broker = MarketStreamBroker(self.emit, min_interval=0.01)
+        broker.subscribe('sid', ['BTCUSDT'])
+        spawn = lambda target, *args: threading.Thread(target=target, args=args, daemon=True).start()
+        broker.start(spawn, time.sleep, host='127.0.0.1', port=port)
+        publisher = StreamPublisher('127.0.0.1', port)
+        try:
+            deadline = time.time() + 5
+            while not self.sent and time.time() < deadline:
+                publisher.publish('decision', 'BTCUSDT', {'signal': 'buy'})
+                time.sleep(0.05)
+        finally:
+            broker.stop()
+            publisher.close()
+        self.assertTrue(self.sent)
+        self.assertEqual(self.sent[0]['data']['messages'][0]['data'], {'signal': 'buy'})
+        with self.assertRaises(ValueError):
+            publisher.publish('unknown', 'BTCUSDT', {})
+
+    def test_second_process_on_the_port_refuses_subscriptions(self):
+        owner = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        owner.bind(('127.0.0.1', 0))
+        try:
+            broker = MarketStreamBroker(self.emit)
+            with self.assertLogs('backend.market_stream', 'ERROR') as logs:
+                broker._receive_loop('127.0.0.1', owner.getsockname()[1])
+        finally:
+            owner.close()
+
+        self.assertIn('single worker', logs.output[0])
+        self.assertFalse(broker.stats()['listening'])
+        with self.assertRaises(RuntimeError):
+            broker.subscribe('sid', ['BTCUSDT'])
+
+    def test_start_is_idempotent_until_stopped(self):
+        spawned = []
+        spawn = lambda target, *args: spawned.append(target.__name__)
+
+        self.assertTrue(self.broker.start(spawn))
+        self.assertFalse(self.broker.start(spawn))
+        self.assertEqual(spawned, ['_receive_loop', '_flush_loop'])
+        self.broker.stop()
+        self.assertTrue(self.broker.start(spawn))
+        self.assertEqual(len(spawned), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import requests
+
+from tools.mock_exchange import FaultConfig, MarketState, MockExchange
+from tools.tick_replay import TickReplayer, binance_ticker_consumer, measure_ingestion, synthetic_ticks
+
+
+class TestMockExchange(unittest.TestCase):
+
+    def setUp(self):
+        self.state = MarketState({'BTC': 50000.0, 'ETH': 3000.0})
+        self.server = MockExchange(self.state, {'cmc': FaultConfig(rate_limit=2, retry_after=7)}).start()
+        self.url = self.server.base_url
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_binance_shapes(self):
+        prices = requests.get(f"{self.url}/api/v3/ticker/price").json()
+        self.assertIn({'symbol': 'BTCUSDT', 'price': '50000.00000000'}, prices)
+        info = requests.get(f"{self.url}/api/v3/exchangeInfo").json()
+        self.assertIn('ETH', {s['baseAsset'] for s in info['symbols']})
+        klines = requests.get(f"{self.url}/api/v3/klines", params={'symbol': 'BTCUSDT', 'interval': '1m'}).json()
+        self.assertEqual(len(klines[0]), 12)
+        order = requests.post(f"{self.url}/api/v3/order",
+                              params={'symbol': 'ETHEUR', 'side': 'BUY', 'quantity': 1}).json()
+        self.assertEqual(order['status'], 'FILLED')
+        self.assertEqual(len(self.state.orders), 1)
+
+    def test_bitvavo_shapes(self):
+        ticker = requests.get(f"{self.url}/v2/ticker/24h").json()
+        btc = next(t for t in ticker if t['market'] == 'BTC-EUR')
+        self.assertEqual(float(btc['last']), 50000.0)
+        markets = requests.get(f"{self.url}/v2/markets").json()
+        self.assertIn({'market': 'ETH-EUR', 'status': 'trading', 'base': 'ETH', 'quote': 'EUR',
+                       'pricePrecision': 5}, markets)
+        candles = requests.get(f"{self.url}/v2/BTC-EUR/candles", params={'interval': '1h'}).json()
+        self.assertEqual(len(candles[0]), 6)
+
+    def test_cmc_quotes_and_rate_limit(self):
+        v1 = requests.get(f"{self.url}/v1/cryptocurrency/quotes/latest",
+                          params={'symbol': 'BTC,ETH', 'convert': 'USD'}).json()
+        self.assertEqual(v1['data']['ETH']['quote']['USD']['price'], 3000.0)
+        v2 = requests.get(f"{self.url}/v2/cryptocurrency/quotes/latest", params={'id': '1', 'convert': 'EUR'}).json()
+        self.assertEqual(v2['data']['1']['symbol'], 'BTC')
+        limited = requests.get(f"{self.url}/v1/cryptocurrency/listings/latest")
+        self.assertEqual(limited.status_code, 429)
+        self.assertEqual(limited.headers['Retry-After'], '7')
+
+    def test_injected_errors(self):
+        self.server.faults['binance'] = FaultConfig(error_rate=1.0)
+        self.assertEqual(requests.get(f"{self.url}/api/v3/ticker/price").status_code, 500)
+        self.assertEqual(self.server.stats['binance_errors'], 1)
+
+    def test_replay_updates_prices_and_reports_ingestion(self):
+        ticks = synthetic_ticks(['BTC', 'ETH'], 200, interval=1.0, seed=3)
+        replayer = TickReplayer(self.state, ticks, speed=1000)
+        report = measure_ingestion(self.server, replayer, binance_ticker_consumer(self.url, ['BTC', 'ETH']))
+        self.assertEqual(report['ticks'], 200)
+        self.assertGreater(report['consumer_calls'], 0)
+        self.assertEqual(report['consumer_errors'], 0)
+        self.assertAlmostEqual(self.state.snapshot()['ETH']['price'], ticks[-1].price)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from model_evaluation import compute_trading_metrics, ensemble_vote, evaluate_candidates, evaluate_trading_performance
+
+
+def reference_metrics(signals, prices, initial_balance=10000, commission=0.001):
+    """The original pandas computation from evaluate_trading_performance."""
+    results = pd.DataFrame({'price': prices, 'signal': signals})
+    results['price_change'] = results['price'].pct_change()
+    results['strategy_returns'] = results['price_change'] * results['signal'].shift(1)
+    cum_market = (1 + results['price_change']).cumprod() - 1
+    cum_strategy = (1 + results['strategy_returns']).cumprod() - 1
+    total_trades = (results['signal'].shift(1) != results['signal']).sum()
+    position_changes = (results['signal'].shift(1) != results['signal']).astype(int)
+    after_commission = results['strategy_returns'] - position_changes * commission
+    cum_after = (1 + after_commission).cumprod() - 1
+    return {
+        'total_trades': total_trades,
+        'winning_trades': (results['strategy_returns'] > 0).sum(),
+        'final_strategy_value': initial_balance * (1 + cum_strategy.iloc[-1]),
+        'final_market_value': initial_balance * (1 + cum_market.iloc[-1]),
+        'final_strategy_value_after_commission': initial_balance * (1 + cum_after.iloc[-1]),
+        'max_strategy_drawdown': (cum_strategy.cummax() - cum_strategy).max(),
+        'strategy_sharpe': np.sqrt(252) * results['strategy_returns'].mean() / results['strategy_returns'].std(),
+    }
+
+
+class TestModelEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.prices = pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.02, 250)))
+        self.signals = rng.choice([-1, 0, 1], size=(5, 250))
+
+    def test_compute_trading_metrics_matches_pandas_reference(self):
+        for row in self.signals:
+            expected = reference_metrics(row, self.prices)
+            actual = compute_trading_metrics(row, self.prices)
+            for key, value in expected.items():
+                self.assertAlmostEqual(actual[key], value, places=8, msg=key)
+
+    def test_matrix_input_matches_single_rows(self):
+        batch = compute_trading_metrics(self.signals, self.prices)
+        for i, row in enumerate(self.signals):
+            single = compute_trading_metrics(row, self.prices)
+            self.assertAlmostEqual(batch['strategy_return'][i], single['strategy_return'])
+            self.assertEqual(batch['total_trades'][i], single['total_trades'])
+
+    def test_ensemble_vote_matches_per_sample_unique(self):
+        rng = np.random.default_rng(1)
+        predictions = rng.choice([-1, 0, 1], size=(4, 500))
+        expected = []
+        for i in range(predictions.shape[1]):
+            values, counts = np.unique(predictions[:, i], return_counts=True)
+            expected.append(values[np.argmax(counts)])
+        np.testing.assert_array_equal(ensemble_vote(predictions), expected)
+        np.testing.assert_array_equal(
+            ensemble_vote(predictions, 'average'), np.round(predictions.mean(axis=0)).astype(int))
+
+    def test_evaluate_candidates_returns_one_row_per_model(self):
+        table = evaluate_candidates({f"m{i}": row for i, row in enumerate(self.signals)}, self.prices)
+        self.assertEqual(list(table.index), ['m0', 'm1', 'm2', 'm3', 'm4'])
+        self.assertIn('strategy_sharpe', table.columns)
+
+    def test_headless_evaluation_keeps_results_frame(self):
+        metrics = evaluate_trading_performance(self.signals[0], self.prices, plot=False, verbose=False)
+        self.assertEqual(len(metrics['results_df']), len(self.prices))
+        self.assertAlmostEqual(metrics['final_strategy_value'],
+                               reference_metrics(self.signals[0], self.prices)['final_strategy_value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.ml_components.model_registry import ModelRegistry
+
+
+class SleepyModel:
+
+    def __init__(self, delay, value):
+        self.delay = delay
+        self.value = value
+        self.inputs = []
+
+    def predict(self, X, **kwargs):
+        self.inputs.append(X)
+        time.sleep(self.delay)
+        return np.full(len(X), self.value)
+
+
+class SequenceModel(SleepyModel):
+    input_shape = (None, 1, 4)
+
+    def predict(self, X, **kwargs):
+        return super().predict(X).reshape(-1, 1)
+
+
+class BrokenModel:
+
+    def predict(self, X):
+        raise RuntimeError('corrupt model')
+
+
+class TestPredictAll(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry = ModelRegistry({'model_dir': self.tmp.name, 'prediction_workers': 4})
+        self.features = pd.DataFrame(np.arange(12, dtype=float).reshape(3, 4), columns=list('abcd'))
+
+    def tearDown(self):
+        self.registry.close()
+        self.tmp.cleanup()
+
+    def test_models_run_concurrently_with_timings(self):
+        for i in range(4):
+            self.registry.register_model(f"model_{i}", SleepyModel(0.2, i), {'weight': 1.0})
+        start = time.perf_counter()
+        predictions, timings = self.registry.predict_all(self.features, with_timings=True)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(set(timings), set(predictions))
+        self.assertTrue(all(t >= 0.2 for t in timings.values()))
+        np.testing.assert_array_equal(predictions['model_3'], [3, 3, 3])
+        self.assertEqual(self.registry.prediction_timings, timings)
+
+    def test_sequence_input_prepared_once_per_batch(self):
+        lstm, custom, tabular = SequenceModel(0, 1), SequenceModel(0, 2), SleepyModel(0, 3)
+        self.registry.register_model('lstm', lstm, {'weight': 1.0})
+        self.registry.register_model('custom_rnn', custom, {'weight': 1.0})
+        self.registry.register_model('random_forest', tabular, {'weight': 1.0})
+        predictions = self.registry.predict_all(self.features)
+
+        self.assertEqual(lstm.inputs[0].shape, (3, 1, 4))
+        self.assertIs(lstm.inputs[0], custom.inputs[0])
+        self.assertIs(tabular.inputs[0], self.features)
+        self.assertEqual(predictions['lstm'].shape, (3,))
+
+    def test_failing_model_yields_zeros(self):
+        self.registry.register_model('broken', BrokenModel(), {'weight': 1.0})
+        self.registry.register_model('ok', SleepyModel(0, 5), {'weight': 1.0})
+        with self.assertLogs('backend.ml_components.model_registry', level='ERROR'):
+            predictions = self.registry.predict_all(self.features)
+        np.testing.assert_array_equal(predictions['broken'], np.zeros(3))
+        np.testing.assert_array_equal(predictions['ok'], [5, 5, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
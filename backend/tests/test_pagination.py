@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.api.pagination import (
+    csv_stream, decode_cursor, encode_cursor, iter_chunks, keyset_page, ndjson_stream
+)
+from backend.models.trading_models import Base, TradingDecision
+
+START = datetime(2024, 1, 1)
+
+
+class TestKeysetPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        # Three decisions share each timestamp so the id tie-breaker matters
+        self.db.add_all([
+            TradingDecision(timestamp=START + timedelta(minutes=i // 3), symbol='BTC' if i % 2 else 'ETH',
+                            decision='BUY', confidence_score=0.5, indicators={'rsi': i})
+            for i in range(250)
+        ])
+        self.db.commit()
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, parameters, *args: self.statements.append((statement, parameters)))
+
+    def tearDown(self):
+        self.db.close()
+
+    def page(self, cursor=None, limit=40, symbol=None):
+        query = self.db.query(TradingDecision)
+        if symbol:
+            query = query.filter(TradingDecision.symbol == symbol)
+        return keyset_page(query, TradingDecision.timestamp, TradingDecision.id, cursor=cursor, limit=limit)
+
+    def test_pages_cover_every_row_once_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            rows, cursor = self.page(cursor)
+            seen.extend((r.timestamp, r.id) for r in rows)
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 250)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(set(seen)), 250)
+
+    def test_filters_combine_with_cursor(self):
+        rows, cursor = self.page(limit=100, symbol='BTC')
+        more, last = self.page(cursor, limit=100, symbol='BTC')
+        self.assertIsNone(last)
+        self.assertEqual(len(rows) + len(more), 125)
+        self.assertTrue(all(r.symbol == 'BTC' for r in rows + more))
+
+    def test_deep_page_is_index_range_scan_without_offset(self):
+        _, cursor = self.page(limit=200)
+        self.statements.clear()
+        rows, _ = self.page(cursor, limit=40)
+        self.assertEqual(len(rows), 40)
+        sql, parameters = self.statements[-1]
+        # SQLite always renders LIMIT ? OFFSET ?; nothing may be skipped
+        if 'OFFSET' in sql:
+            self.assertEqual(parameters[-1], 0)
+        with self.engine.connect() as connection:
+            plan = ' '.join(str(r[-1]) for r in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql, parameters))
+        self.assertIn('ix_trading_decisions_timestamp_id', plan)
+
+    def test_cursor_round_trip_and_validation(self):
+        cursor = encode_cursor(START, 7)
+        self.assertEqual(decode_cursor(cursor), (START, 7))
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+
+    def test_streams_in_chunks(self):
+        query = self.db.query(TradingDecision)
+        chunks = list(iter_chunks(query, TradingDecision.timestamp, TradingDecision.id, chunk_size=100))
+        self.assertEqual([len(c) for c in chunks], [100, 100, 50])
+
+        lines = ''.join(ndjson_stream(chunks, lambda r: r.to_dict())).splitlines()
+        self.assertEqual(len(lines), 250)
+        self.assertEqual(json.loads(lines[0])['id'], 250)
+
+        parts = list(csv_stream(chunks, lambda r: r.to_dict()))
+        self.assertEqual(len(parts), 3)
+        records = list(csv.DictReader(io.StringIO(''.join(parts))))
+        self.assertEqual(len(records), 250)
+        self.assertEqual(json.loads(records[-1]['indicators']), {'rsi': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import time
+import unittest
+
+import numpy as np
+
+from backend.ml_components.parallel_training import SharedArrays, TrainingScheduler
+
+
+def fit_candidate(name, arrays, ridge=0.0, delay=0.0, fail=False):
+    if fail:
+        raise ValueError(f"{name} diverged")
+    time.sleep(delay)
+    X, y = arrays['X_train'], arrays['y_train']
+    coef = np.linalg.solve(X.T @ X + ridge * np.eye(X.shape[1]), X.T @ y)
+    return {
+        'coef': coef,
+        'memory_mapped': isinstance(arrays['X_train'], np.memmap),
+        'writeable': arrays['X_train'].flags.writeable,
+        'threads': os.environ.get('OMP_NUM_THREADS'),
+        'pid': os.getpid(),
+    }
+
+
+class TestTrainingScheduler(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(500, 4)).astype(np.float32)
+        self.y = self.X @ np.array([1.0, -2.0, 0.5, 3.0], dtype=np.float32)
+
+    def test_candidates_share_memory_mapped_arrays_with_capped_threads(self):
+        scheduler = TrainingScheduler(max_workers=2, threads_per_worker=1)
+        results = scheduler.run(fit_candidate, [('ols', {}), ('ridge', {'ridge': 10.0}), ('bad', {'fail': True})],
+                                {'X_train': self.X, 'y_train': self.y})
+
+        self.assertEqual(list(results), ['ols', 'ridge', 'bad'])
+        ols = results['ols']['result']
+        np.testing.assert_allclose(ols['coef'], [1.0, -2.0, 0.5, 3.0], atol=1e-4)
+        self.assertTrue(ols['memory_mapped'])
+        self.assertFalse(ols['writeable'])
+        self.assertEqual(ols['threads'], '1')
+        self.assertNotEqual(ols['pid'], os.getpid())
+        self.assertGreater(abs(ols['coef'] - results['ridge']['result']['coef']).max(), 0)
+        self.assertIsNone(results['bad']['result'])
+        self.assertIn('diverged', results['bad']['error'])
+
+    def test_candidates_overlap(self):
+        scheduler = TrainingScheduler(max_workers=4, threads_per_worker=1)
+        started = time.perf_counter()
+        results = scheduler.run(fit_candidate, [(f"c{i}", {'delay': 1.0}) for i in range(4)],
+                                {'X_train': self.X, 'y_train': self.y})
+        self.assertLess(time.perf_counter() - started, 3.5)
+        self.assertTrue(all(r['seconds'] >= 1.0 for r in results.values()))
+
+    def test_plan_fits_threads_into_cores(self):
+        scheduler = TrainingScheduler()
+        scheduler.cpus = 16
+        self.assertEqual(scheduler.plan(3), (3, 5))
+        self.assertEqual(scheduler.plan(40), (16, 1))
+        scheduler.threads_per_worker = 4
+        self.assertEqual(scheduler.plan(10), (4, 4))
+
+    def test_shared_files_are_removed(self):
+        with SharedArrays({'X': self.X}) as shared:
+            directory = shared.directory
+            np.testing.assert_array_equal(SharedArrays.attach(shared.paths)['X'], self.X)
+        self.assertFalse(os.path.exists(directory))
+
+
+if __name__ == '__main__':
+    unittest.main()
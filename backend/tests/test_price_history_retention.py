@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime, timedelta
+
+from crons.price_history_retention import (
+    choose_resolution, downsample, expired_partitions, load_config, plan_partitions,
+)
+
+
+class TestPriceHistoryRetention(unittest.TestCase):
+
+    def setUp(self):
+        self.config = load_config()
+        self.now = datetime(2026, 10, 19, 12, 0, 0)
+
+    def test_downsample_raw_ticks_to_minutes_and_hours(self):
+        start = datetime(2026, 10, 19, 10, 0, 0)
+        prices = [10, 12, 9, 11, 20, 18]
+        ticks = [('BTC', start + timedelta(seconds=30 * i), p, p, p, p, 1000 + i, 1) for i, p in enumerate(prices)]
+        minutes = downsample(ticks, 60)
+        self.assertEqual(minutes, [
+            ('BTC', start, 10, 12, 10, 12, 1001, 2),
+            ('BTC', start + timedelta(minutes=1), 9, 11, 9, 11, 1003, 2),
+            ('BTC', start + timedelta(minutes=2), 20, 20, 18, 18, 1005, 2),
+        ])
+        hours = downsample(minutes, 3600)
+        self.assertEqual(hours, [('BTC', start, 10, 20, 9, 18, 1005, 6)])
+
+    def test_choose_resolution_prefers_coarsest_covering(self):
+        pick = lambda start, **kw: choose_resolution(start, self.now, self.now, self.config, **kw)['name']
+        self.assertEqual(pick(self.now - timedelta(hours=1)), 'raw')
+        self.assertEqual(pick(self.now - timedelta(days=2)), '1m')
+        self.assertEqual(pick(self.now - timedelta(days=60)), '1h')
+        self.assertEqual(pick(self.now - timedelta(days=3650)), '1d')
+        # Raw is gone past raw_retention_days, so fall back to the finest rollup still covering
+        self.assertEqual(pick(self.now - timedelta(days=10), step=1), '1m')
+        self.assertEqual(pick(self.now - timedelta(days=2), step=7200), '1h')
+
+    def test_partition_planning_and_expiry(self):
+        existing = ['p20261010', 'p20261011', 'p20261012', 'pmax']
+        days = plan_partitions(existing, datetime(2026, 1, 1), datetime(2026, 10, 12, 15), 2)
+        self.assertEqual(days, [datetime(2026, 10, 13), datetime(2026, 10, 14)])
+        self.assertEqual(len(plan_partitions(['pmax'], datetime(2026, 10, 10, 5), datetime(2026, 10, 12), 0)), 3)
+
+        cutoff = datetime(2026, 10, 12, 6)
+        self.assertEqual(expired_partitions(existing, cutoff, datetime(2026, 10, 20)), ['p20261010', 'p20261011'])
+        # Days not yet folded into the 1m rollup are kept
+        self.assertEqual(expired_partitions(existing, cutoff, datetime(2026, 10, 11, 12)), ['p20261010'])
+        self.assertEqual(expired_partitions(existing, cutoff, None), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import random
+import unittest
+
+from backend.rate_limiter import AsyncRateLimiter, TokenBucket
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'memory_efficient_config.json')
+
+
+class FakeClock:
+    """Virtual time: sleep() advances now() instantly and records the requested delays."""
+
+    def __init__(self):
+        self.time = 1000.0
+        self.sleeps = []
+
+    def now(self):
+        return self.time
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.time += seconds
+        await asyncio.sleep(0)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        limits = {
+            'binance': {'calls_per_minute': 600, 'weight_per_minute': 1200, 'burst': 10,
+                        'endpoints': {'/api/v3/klines': {'calls_per_minute': 60, 'burst': 2}}},
+            'coingecko': {'calls_per_minute': 30, 'burst': 3},
+            'bitvavo': {'calls_per_minute': 1000, 'burst': 30},
+        }
+        retry = {'max_retries': 3, 'backoff_factor': 2, 'base_delay_seconds': 1, 'max_delay_seconds': 10}
+        self.limiter = AsyncRateLimiter(limits, retry, clock=self.clock, rng=random.Random(7))
+
+    def test_burst_then_refill_rate(self):
+        async def calls():
+            return [await self.limiter.acquire('coingecko') for _ in range(5)]
+        waits = run(calls())
+        # Three calls fit the burst; the rest wait 2s each at 30/min
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 2.0)
+        self.assertAlmostEqual(waits[4], 2.0)
+        self.assertAlmostEqual(self.clock.time, 1004.0)
+
+    def test_endpoint_bucket_applies_on_top_of_source(self):
+        async def calls():
+            for _ in range(3):
+                await self.limiter.acquire('binance:/api/v3/klines')
+            await self.limiter.acquire('binance:/api/v3/ticker/price')
+        run(calls())
+        # Third klines call waited 1s for its own bucket; ticker calls are not held back by it
+        self.assertEqual(self.clock.sleeps, [1.0])
+        self.assertAlmostEqual(self.limiter.wait_time('binance:/api/v3/ticker/price'), 0.0)
+
+    def test_waits_yield_to_the_event_loop(self):
+        ticks = []
+
+        async def heartbeat():
+            for _ in range(5):
+                ticks.append(self.clock.now())
+                await asyncio.sleep(0)
+
+        async def main():
+            beat = asyncio.create_task(heartbeat())
+            for _ in range(6):
+                await self.limiter.acquire('coingecko')
+            await beat
+        run(main())
+        self.assertEqual(len(ticks), 5)
+        self.assertLess(ticks[0], self.clock.time)
+
+    def test_retry_after_pauses_the_source(self):
+        self.limiter.update_from_headers('binance:/api/v3/order', {'Retry-After': '30'}, status=429)
+        self.assertAlmostEqual(self.limiter.wait_time('binance:/api/v3/ticker/price'), 30.0)
+        self.assertAlmostEqual(self.limiter.wait_time('coingecko'), 0.0)
+        self.assertAlmostEqual(run(self.limiter.acquire('binance')), 30.0)
+        self.assertEqual(self.limiter.stats()['binance:/api/v3/order']['throttled'], 1)
+
+    def test_weight_headers_cap_tokens(self):
+        self.limiter.update_from_headers('binance:/api/v3/klines', {'X-MBX-USED-WEIGHT-1M': '1198'})
+        # 2 weight left; a weight-5 call needs 3 more at 20 weight/s
+        self.assertAlmostEqual(self.limiter.wait_time('binance', weight=5), 0.15)
+        self.limiter.update_from_headers('bitvavo', {'bitvavo-ratelimit-remaining': '0'})
+        self.assertGreater(self.limiter.wait_time('bitvavo'), 0.0)
+
+    def test_backoff_is_jittered_exponential_per_endpoint(self):
+        delays = [self.limiter.record_failure('binance:/api/v3/klines') for _ in range(3)]
+        for attempt, delay in enumerate(delays):
+            ceiling = 2 ** attempt
+            self.assertTrue(ceiling / 2 <= delay <= ceiling, (attempt, delay))
+        self.assertIsNone(self.limiter.record_failure('binance:/api/v3/klines'))
+        # Other endpoints of the same exchange are unaffected
+        self.assertAlmostEqual(self.limiter.wait_time('binance:/api/v3/ticker/price'), 0.0)
+        self.assertGreater(self.limiter.wait_time('binance:/api/v3/klines'), 0.0)
+        self.limiter.record_success('binance:/api/v3/klines')
+        self.assertEqual(self.limiter.stats()['binance:/api/v3/klines']['failures'], 0)
+
+    def test_bucket_and_config(self):
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=self.clock)
+        bucket.take(2)
+        self.assertAlmostEqual(bucket.delay(5), 2.0)  # capped at capacity
+        with open(CONFIG_PATH) as f:
+            limiter = AsyncRateLimiter.from_config(json.load(f), clock=self.clock)
+        self.assertIn('binance', limiter.limits)
+        self.assertEqual(limiter.max_retries, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
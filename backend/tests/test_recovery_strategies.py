@@ -0,0 +1,136 @@
+import sqlite3
+import unittest
+
+import requests
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from backend.circuit_breaker import CircuitOpenError
+from backend.recovery_strategies import RecoveryManager, classify_failure
+from tools.mock_exchange import FaultConfig, MarketState, MockExchange
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFailureTaxonomy(unittest.TestCase):
+
+    def test_classified_by_type_and_origin(self):
+        closed_port = requests.exceptions.ConnectionError('Max retries exceeded')
+        self.assertEqual(classify_failure(closed_port).origin, 'exchange')
+        self.assertTrue(classify_failure(closed_port).retryable)
+
+        engine = create_engine('sqlite://')
+        with self.assertRaises(OperationalError) as db_error:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT * FROM missing_table'))
+        failure = classify_failure(db_error.exception)
+        self.assertEqual((failure.type, failure.origin), ('DatabaseError', 'database'))
+        self.assertEqual(classify_failure(sqlite3.OperationalError('locked')).origin, 'database')
+
+        self.assertEqual(classify_failure(KeyError('Close')).type, 'DataError')
+        # A message mentioning "connection" no longer decides the type
+        self.assertEqual(classify_failure(ValueError('bad connection string')).type, 'DataError')
+        self.assertEqual(classify_failure(TimeoutError(), {'dependency': 'database'}).origin, 'database')
+        self.assertEqual(classify_failure(MemoryError()).origin, 'system')
+
+        try:
+            from sklearn.exceptions import NotFittedError
+        except ImportError:
+            return
+        self.assertEqual(classify_failure(NotFittedError('fit first')).origin, 'model')
+
+    def test_wrapped_errors_use_their_cause(self):
+        try:
+            try:
+                raise requests.exceptions.Timeout('read timed out')
+            except requests.exceptions.Timeout as e:
+                raise RuntimeError('price update failed') from e
+        except RuntimeError as wrapped:
+            self.assertEqual(classify_failure(wrapped).type, 'ConnectionError')
+
+
+class TestCircuitBreakersAgainstFakeExchange(unittest.TestCase):
+
+    def setUp(self):
+        self.state = MarketState({'BTC': 50000.0})
+        self.server = MockExchange(self.state).start()
+        self.url = self.server.base_url
+        self.clock = FakeClock()
+        self.manager = RecoveryManager({'circuit_breakers': {'exchange': {'failure_threshold': 3,
+                                                                          'reset_timeout': 30}}},
+                                       clock=self.clock)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def ticker(self, endpoint='/api/v3/ticker/price'):
+        response = requests.get(self.url + endpoint, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    def test_outage_trips_fails_fast_and_recovers_through_half_open(self):
+        self.server.faults['binance'] = FaultConfig(error_rate=1.0)
+        for _ in range(3):
+            with self.assertRaises(requests.HTTPError):
+                self.manager.call('exchange', self.ticker)
+        self.assertEqual(self.server.stats['binance_requests'], 3)
+
+        # Open: callers fail fast and the exchange sees no more traffic
+        for _ in range(10):
+            with self.assertRaises(CircuitOpenError):
+                self.manager.call('exchange', self.ticker)
+        self.assertEqual(self.server.stats['binance_requests'], 3)
+        plan = self.manager.generate_recovery_plan(self.manager.failure_patterns[-1])
+        self.assertEqual(plan['strategy'], 'FailFast')
+        self.assertEqual(plan['estimated_time'], 30)
+
+        # Half-open trial fails: open again without waiting for the threshold
+        self.clock.now += 30
+        with self.assertRaises(requests.HTTPError):
+            self.manager.call('exchange', self.ticker)
+        self.assertEqual(self.manager.breakers.get('exchange').state, 'open')
+
+        # Exchange is back: one trial call closes the breaker
+        self.server.faults['binance'] = FaultConfig()
+        self.clock.now += 30
+        self.assertTrue(self.manager.call('exchange', self.ticker))
+        metrics = self.manager.circuit_metrics()['exchange']
+        self.assertEqual(metrics['state'], 'closed')
+        self.assertEqual(metrics['trips'], 2)
+        self.assertEqual(metrics['rejected'], 10)
+        self.assertEqual(self.manager.analyze_recovery_history()['circuit_breakers'], self.manager.circuit_metrics())
+
+    def test_rate_limit_opens_for_retry_after(self):
+        self.server.faults['cmc'] = FaultConfig(rate_limit=1, retry_after=120)
+        self.manager.call('exchange', self.ticker, '/v1/cryptocurrency/listings/latest')
+        with self.assertRaises(requests.HTTPError):
+            self.manager.call('exchange', self.ticker, '/v1/cryptocurrency/listings/latest')
+        pattern = self.manager.failure_patterns[-1]
+        self.assertEqual((pattern['type'], pattern['retry_after']), ('RateLimitError', 120.0))
+        self.clock.now += 60
+        with self.assertRaises(CircuitOpenError) as fast:
+            self.manager.call('exchange', self.ticker)
+        self.assertAlmostEqual(fast.exception.retry_in, 60.0)
+
+    def test_caller_errors_do_not_trip_the_exchange_breaker(self):
+        for _ in range(5):
+            with self.assertRaises(requests.HTTPError):
+                self.manager.call('exchange', self.ticker, '/api/v3/no-such-endpoint')
+            with self.assertRaises(KeyError):
+                self.manager.call('exchange', lambda: self.ticker()[0]['missing'])
+        metrics = self.manager.circuit_metrics()
+        self.assertEqual(metrics['exchange']['state'], 'closed')
+        self.assertEqual(metrics['exchange']['trips'], 0)
+        self.assertEqual([p['type'] for p in self.manager.failure_patterns[:2]], ['RequestError', 'DataError'])
+        self.assertEqual(metrics['data']['trips'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The top-level selection_tracker, not backend/ml_components/selection_tracker.py
+sys.path.insert(0, ROOT)
+
+from selection_tracker import SelectionTracker  # noqa: E402
+
+BASE = datetime(2024, 1, 1, 12)
+HOUR = timedelta(hours=1)
+
+
+def coin(symbol, action, price):
+    return {'symbol': symbol, 'predicted_action': action, 'composite_score': 0.9,
+            'risk_adjusted_score': 0.8, 'close': price}
+
+
+class TestSelectionTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'selections.db')}")
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE coin_selections (id INTEGER PRIMARY KEY, timestamp DATETIME NOT NULL, "
+                "symbol VARCHAR(10) NOT NULL, action VARCHAR(10) NOT NULL, score DECIMAL(10, 8), "
+                "risk_score DECIMAL(10, 8), price DECIMAL(18, 8), model VARCHAR(64) NOT NULL DEFAULT 'default', "
+                "metadata JSON, return_1h DOUBLE, return_24h DOUBLE, return_7d DOUBLE)"))
+            connection.execute(text("CREATE INDEX idx_coin_selections_timestamp ON coin_selections (timestamp)"))
+            connection.execute(text(
+                "CREATE TABLE coin_selection_stats (day DATE NOT NULL, model VARCHAR(64) NOT NULL, "
+                "action VARCHAR(10) NOT NULL, horizon VARCHAR(8) NOT NULL, selections INT NOT NULL, "
+                "evaluated INT NOT NULL, hits INT NOT NULL, return_sum DOUBLE NOT NULL, "
+                "return_sq_sum DOUBLE NOT NULL, PRIMARY KEY (day, model, action, horizon))"))
+            for table in ('price_history_1m', 'price_history_1h'):
+                connection.execute(text(f"CREATE TABLE {table} (coin_id VARCHAR(50), bucket_start DATETIME, "
+                                        f"open DECIMAL(20, 8), PRIMARY KEY (coin_id, bucket_start))"))
+            prices = [
+                ('price_history_1m', 'BTC', BASE + HOUR, 105), ('price_history_1m', 'ETH', BASE + HOUR + timedelta(minutes=1), 45),
+                ('price_history_1h', 'BTC', BASE + 24 * HOUR, 110), ('price_history_1h', 'BTC', BASE + 7 * 24 * HOUR, 120),
+                ('price_history_1h', 'ETH', BASE + 24 * HOUR, 55),
+                ('price_history_1m', 'BTC', BASE + 25 * HOUR, 99), ('price_history_1h', 'BTC', BASE + 48 * HOUR, 100),
+            ]
+            for table, coin_id, bucket_start, price in prices:
+                connection.execute(text(f"INSERT INTO {table} VALUES (:coin_id, :bucket_start, :price)"),
+                                   {'coin_id': coin_id, 'bucket_start': bucket_start, 'price': price})
+
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: self.statements.append(statement))
+        self.tracker = SelectionTracker(db_engine=self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def record_runs(self):
+        self.tracker.record_selection([coin('BTC', 'buy', 100), coin('ETH', 'sell', 50), coin('ADA', 'hold', 1)],
+                                      {'model_version': 'v1'}, timestamp=BASE)
+        self.tracker.record_selection([coin('BTC', 'sell', 110)], {'model_version': 'v2'}, timestamp=BASE + 24 * HOUR)
+
+    def returns(self):
+        with self.engine.connect() as connection:
+            rows = connection.execute(text("SELECT symbol, model, return_1h, return_24h, return_7d "
+                                           "FROM coin_selections ORDER BY id")).fetchall()
+        return [tuple(r) for r in rows]
+
+    def test_one_insert_per_run(self):
+        self.record_runs()
+        inserts = [s for s in self.statements if s.startswith('INSERT INTO coin_selections')]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual([r[:2] for r in self.returns()], [('BTC', 'v1'), ('ETH', 'v1'), ('ADA', 'v1'), ('BTC', 'v2')])
+
+    def test_forward_returns_from_stored_prices(self):
+        self.record_runs()
+        self.tracker.update_forward_returns(now=BASE + 48 * HOUR)
+        self.tracker.update_forward_returns(now=BASE + 8 * 24 * HOUR)
+        btc, eth, ada, btc2 = self.returns()
+        self.assertAlmostEqual(btc[2], 0.05)
+        self.assertAlmostEqual(btc[3], 0.10)
+        self.assertAlmostEqual(btc[4], 0.20)
+        self.assertAlmostEqual(eth[2], -0.10)
+        self.assertAlmostEqual(eth[3], 0.10)
+        self.assertEqual(ada[2:], (None, None, None))
+        self.assertAlmostEqual(btc2[2], -0.10)
+        self.assertAlmostEqual(btc2[3], 100 / 110 - 1)
+        # The 7d price for the second run has not been stored
+        self.assertIsNone(btc2[4])
+
+    def test_analytics_read_precomputed_stats_in_one_query(self):
+        self.record_runs()
+        self.tracker.update_forward_returns(now=BASE + 48 * HOUR)
+        self.tracker.update_forward_returns(now=BASE + 8 * 24 * HOUR)
+        self.tracker.refresh_model_stats(since=BASE - 24 * HOUR)
+
+        self.statements.clear()
+        analytics = self.tracker.get_model_analytics(BASE - 24 * HOUR, BASE + 10 * 24 * HOUR)
+        self.assertEqual(len(self.statements), 1)
+        self.assertNotIn('coin_selections ', self.statements[0])
+
+        v1 = analytics['v1']
+        self.assertEqual(v1['1h']['buy']['hit_rate'], 1.0)
+        self.assertAlmostEqual(v1['1h']['buy']['avg_return'], 0.05)
+        self.assertEqual(v1['1h']['sell']['hit_rate'], 1.0)
+        self.assertEqual(v1['24h']['sell']['hit_rate'], 0.0)
+        self.assertEqual(v1['1h']['hold'], {'selections': 1, 'evaluated': 0, 'hit_rate': None,
+                                             'avg_return': None, 'return_std': None})
+        self.assertEqual(analytics['v2']['24h']['sell']['hit_rate'], 1.0)
+        self.assertEqual(analytics['v2']['7d']['sell']['evaluated'], 0)
+
+        # Rebuilding the same days replaces rather than duplicates their rows
+        self.tracker.refresh_model_stats(since=BASE - 24 * HOUR)
+        again = self.tracker.get_model_analytics(BASE - 24 * HOUR, BASE + 10 * 24 * HOUR)
+        self.assertEqual(again['v1']['1h']['buy']['selections'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
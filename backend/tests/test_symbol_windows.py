@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from backend.symbol_windows import LRUCache, RingBuffer, SymbolWindows
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_wraps_and_keeps_latest_rows_in_order(self):
+        buf = RingBuffer(capacity=4, width=2)
+        buf.extend([1, 2, 3], [[1, 10], [2, 20], [3, 30]])
+        buf.extend([4, 5, 6], [[4, 40], [5, 50], [6, 60]])
+        self.assertEqual(buf.values.dtype, np.float32)
+        np.testing.assert_array_equal(buf.times(), [3, 4, 5, 6])
+        np.testing.assert_array_equal(buf.column(1), [30, 40, 50, 60])
+        self.assertEqual(buf.last_timestamp, 6)
+        # More rows than capacity in one call keeps only the tail
+        buf.extend(range(10, 20), np.arange(20).reshape(10, 2))
+        np.testing.assert_array_equal(buf.times(), [16, 17, 18, 19])
+
+    def test_resize_keeps_most_recent(self):
+        buf = RingBuffer(capacity=5, width=1)
+        buf.extend(range(7), np.arange(7))
+        buf.resize(2)
+        self.assertEqual(buf.nbytes, 2 * 4 + 2 * 8)
+        np.testing.assert_array_equal(buf.column(0), [5, 6])
+        buf.resize(5)
+        buf.extend([7], [[7]])
+        np.testing.assert_array_equal(buf.column(0), [5, 6, 7])
+
+
+class TestSymbolWindows(unittest.TestCase):
+
+    def test_append_skips_rows_already_stored(self):
+        windows = SymbolWindows(max_data_points=3, columns=('close', 'volume'))
+        self.assertEqual(windows.append('BTC', [1, 2], [[1, 1], [2, 1]]), 2)
+        # Row 2 is the last stored one, so it is refreshed and counted along with 3 and 4
+        self.assertEqual(windows.append('BTC', [1, 2, 3, 4], [[9, 9], [2, 1], [3, 1], [4, 1]]), 3)
+        np.testing.assert_array_equal(windows.column('BTC', 'close'), [2, 3, 4])
+        self.assertEqual(len(windows.column('ETH', 'close')), 0)
+
+    def test_refetched_open_candle_replaces_the_stored_copy(self):
+        windows = SymbolWindows(max_data_points=3, columns=('close', 'volume'))
+        windows.append('BTC', [1, 2, 3], [[1, 1], [2, 1], [3.0, 5]])
+        # Candle 3 was still open; the next fetch returns it again with a later close
+        self.assertEqual(windows.append('BTC', [2, 3], [[2, 1], [3.5, 8]]), 1)
+        np.testing.assert_array_equal(windows.column('BTC', 'close'), [1, 2, 3.5])
+        np.testing.assert_array_equal(windows.column('BTC', 'volume'), [1, 1, 8])
+
+        # Wrapped buffer: the newest row is not at the end of the array
+        self.assertEqual(windows.append('BTC', [3, 4], [[3.75, 9], [4, 1]]), 2)
+        np.testing.assert_array_equal(windows.column('BTC', 'close'), [2, 3.75, 4])
+        self.assertEqual(windows.append('BTC', [4], [[4.25, 2]]), 1)
+        np.testing.assert_array_equal(windows.column('BTC', 'close'), [2, 3.75, 4.25])
+
+    def test_resize_is_capped_by_max_data_points(self):
+        windows = SymbolWindows(max_data_points=10, columns=('close',))
+        for symbol in ('A', 'B'):
+            windows.append(symbol, range(10), np.arange(10))
+        windows.resize(4)
+        self.assertEqual(windows.nbytes, 2 * 4 * (4 + 8))
+        windows.resize(50)
+        self.assertEqual(windows.capacity, 10)
+        windows.append('C', range(3), np.arange(3))
+        self.assertEqual(windows.buffer('C').capacity, 10)
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(cache.trim(1), 1)
+        self.assertEqual(cache.clear(), 1)
+        self.assertEqual(cache.evictions, 3)
+
+    def test_resize_changes_the_bound(self):
+        cache = LRUCache(maxsize=1)
+        cache.resize(3)
+        for key in 'abc':
+            cache.put(key, key)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.resize(1), 2)
+        self.assertEqual((len(cache), cache.get('c')), (1, 'c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tools.synthetic_market import MarketConfig, SyntheticMarket, generate_market
+
+
+class TestSyntheticMarket(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = MarketConfig(n_assets=40, periods=24 * 365, seed=7)
+        cls.market = generate_market(cls.config)
+
+    def test_same_seed_same_market(self):
+        again = generate_market(self.config)
+        np.testing.assert_array_equal(again.close, self.market.close)
+        np.testing.assert_array_equal(again.regime, self.market.regime)
+        other = generate_market(self.config, seed=8)
+        self.assertFalse(np.allclose(np.nan_to_num(other.close), np.nan_to_num(self.market.close)))
+
+    def test_ohlc_consistent_and_nan_outside_listing(self):
+        m = self.market
+        listed = m.listed
+        self.assertTrue(np.all(m.high[listed] >= np.maximum(m.open, m.close)[listed]))
+        self.assertTrue(np.all(m.low[listed] <= np.minimum(m.open, m.close)[listed]))
+        self.assertTrue(np.all(m.low[listed] > 0) and np.all(m.volume[listed] > 0))
+        self.assertTrue(np.isnan(m.close[~listed]).all())
+        self.assertTrue(listed.any(axis=0).all())
+        self.assertTrue((~listed[0]).any(), 'some assets list late')
+        self.assertTrue((~listed[-1]).any(), 'some assets delist')
+
+        frame = m.to_frame()
+        self.assertEqual(len(frame), listed.sum())
+        self.assertFalse(frame.isna().any().any())
+
+    def test_correlation_regimes_and_clustering(self):
+        m = self.market
+        returns = np.diff(np.log(m.close[:, m.listed.all(axis=0)]), axis=0)
+        corr = np.corrcoef(returns.T)
+        mean_corr = corr[np.triu_indices_from(corr, 1)].mean()
+        self.assertAlmostEqual(mean_corr, self.config.correlation, delta=0.1)
+        self.assertEqual(set(m.regime), {'trend', 'chop', 'crash'})
+
+        # Within one regime absolute returns are autocorrelated, raw returns are not
+        chop = generate_market(self.config, n_assets=1, regime_weights={'chop': 1.0},
+                               late_listing_share=0.0, delisting_share=0.0)
+        r = np.diff(np.log(chop.close[:, 0]))
+        abs_r = np.abs(r)
+        self.assertGreater(np.corrcoef(abs_r[1:], abs_r[:-1])[0, 1], 0.1)
+        self.assertLess(abs(np.corrcoef(r[1:], r[:-1])[0, 1]), 0.05)
+
+    def test_npz_round_trip_and_asset_frame(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'market.npz')
+            self.market.save(path)
+            loaded = SyntheticMarket.load(path)
+        np.testing.assert_array_equal(loaded.volume, self.market.volume)
+        self.assertTrue(loaded.timestamps.equals(self.market.timestamps))
+
+        symbol = self.market.symbols[3]
+        frame = self.market.asset_frame(symbol)
+        self.assertEqual(list(frame.columns), ['open', 'high', 'low', 'close', 'volume'])
+        self.assertEqual(len(frame), self.market.listed[:, 3].sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
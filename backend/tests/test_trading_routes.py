@@ -0,0 +1,92 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+try:
+    import fastapi  # noqa: F401
+    import mysql.connector  # noqa: F401
+except ImportError:
+    fastapi = None
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# The API modules import their siblings flat, as when run from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+START = datetime(2024, 1, 1)
+
+
+@unittest.skipIf(fastapi is None, "fastapi and mysql-connector-python are required for the API routes")
+class TestTradingRoutes(unittest.TestCase):
+
+    def setUp(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from api.trading_routes import router
+        from database import get_db
+        from models.trading_models import Base, Trade
+
+        engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        with self.Session() as db:
+            db.add_all([
+                Trade(symbol='BTC' if i % 2 else 'ETH', entry_time=START + timedelta(minutes=i // 2),
+                      entry_price=100.0 + i, entry_quantity=1.0, trade_type='BUY')
+                for i in range(45)
+            ])
+            db.commit()
+
+        def override_get_db():
+            db = self.Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_db] = override_get_db
+        self.client = TestClient(app)
+
+    def test_pages_through_trades_with_cursor(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 10, **({'cursor': cursor} if cursor else {})}
+            body = self.client.get('/trading/trades/', params=params).json()
+            seen.extend((row['entry_time'], row['id']) for row in body['data'])
+            cursor = body['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 45)
+        self.assertEqual(len(set(seen)), 45)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+        btc = self.client.get('/trading/trades/', params={'symbol': 'BTC', 'limit': 100}).json()
+        self.assertEqual(btc['count'], 22)
+        self.assertEqual(self.client.get('/trading/trades/', params={'cursor': 'not-a-cursor'}).status_code, 400)
+
+    def test_create_close_and_stats(self):
+        created = self.client.post('/trading/trades/', json={
+            'symbol': 'SOL', 'entry_price': 20.0, 'entry_quantity': 2.0, 'trade_type': 'buy'
+        }).json()['data']
+        closed = self.client.put(f"/trading/trades/{created['id']}/close",
+                                 json={'exit_price': 25.0, 'exit_quantity': 2.0}).json()['data']
+
+        self.assertEqual(closed['status'], 'CLOSED')
+        self.assertAlmostEqual(closed['profit_loss'], 10.0)
+        self.assertAlmostEqual(closed['profit_loss_percentage'], 25.0)
+        self.assertEqual(self.client.put(f"/trading/trades/{created['id']}/close",
+                                         json={'exit_price': 25.0, 'exit_quantity': 2.0}).status_code, 404)
+
+        stats = self.client.get('/trading/profit/stats/', params={'symbol': 'SOL'}).json()['data']
+        self.assertEqual((stats['total_trades'], stats['winning_trades'], stats['net_profit']), (1, 1, 10.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# train_advanced_models imports its top-level siblings flat
+sys.path.insert(0, ROOT)
+
+try:
+    import train_advanced_models
+except ImportError:
+    train_advanced_models = None
+
+
+@unittest.skipIf(train_advanced_models is None, "tensorflow, torch and transformers are required for the training script")
+class TestCreateSyntheticData(unittest.TestCase):
+
+    def test_short_window_keeps_every_requested_hour(self):
+        data = train_advanced_models.create_synthetic_data(days=2, seed=0)
+
+        self.assertEqual(len(data), 48)
+        self.assertFalse(data.isna().any().any())
+        self.assertTrue(data['timestamp'].is_monotonic_increasing)
+        self.assertTrue(set(data['target'].unique()) <= {0, 1})
+        self.assertTrue(data.equals(train_advanced_models.create_synthetic_data(days=2, seed=0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import csv
+import glob
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                'crypto_sources'))
+
+from trending_exports import (BACKUP_TIME_FORMAT, HISTORY_NAME, append_changes, backup_path,  # noqa: E402
+                              compact_backups, diff_snapshot, html_signature, read_snapshot, row_key,
+                              write_snapshot)
+
+
+def exported(symbol, price, address="", age=12.0):
+    return {"Name": symbol.title(), "Symbol": symbol, "Exchange": "CoinGecko", "Price USD": price,
+            "24h Change %": "+1.00%", "Volume": "1,000", "Market Cap": "N/A", "Age (hours)": age,
+            "First Seen": "2025-07-13T10:00:00+00:00", "Sources": 1, "Score": "3.000", "Address": address}
+
+
+class TestTrendingExports(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_only_changed_rows_reach_the_change_log(self):
+        snapshot = os.path.join(self.dir, "snapshot.csv")
+        log = os.path.join(self.dir, "changes.csv")
+        first = {row_key(row): row for row in [exported("AAA", "$1.00", "0xAbC"), exported("BBB", "$2.00")]}
+        write_snapshot(snapshot, first.values())
+
+        previous = read_snapshot(snapshot)
+        self.assertEqual(list(previous), ["0xabc", "symbol:BBB"])
+        second = {row_key(row): row for row in [exported("AAA", "$1.00", "0xAbC", age=13.5),
+                                                exported("CCC", "$3.00")]}
+        append_changes(log, diff_snapshot(previous, second), "t1")
+        append_changes(log, diff_snapshot(second, second), "t2")
+
+        with open(log, newline="") as f:
+            changes = [(row["Timestamp"], row["Change"], row["Key"]) for row in csv.DictReader(f)]
+        self.assertEqual(changes, [("t1", "added", "symbol:CCC"), ("t1", "removed", "symbol:BBB")])
+
+    def test_old_backups_are_compacted_into_a_rolling_history(self):
+        now = datetime(2025, 7, 13, 12, 0, 0)
+        times = [now - timedelta(days=40), now - timedelta(hours=3), now - timedelta(hours=2),
+                 now - timedelta(hours=1), now]
+        for i, when in enumerate(times):
+            write_snapshot(backup_path(self.dir, when), [exported("AAA", f"${i}.00")])
+
+        self.assertEqual(compact_backups(self.dir, keep=3, now=now), 2)
+        remaining = sorted(os.path.basename(p) for p in glob.glob(os.path.join(self.dir, "*.csv")))
+        self.assertEqual(remaining, [os.path.basename(backup_path(self.dir, when)) for when in times[2:]])
+
+        # The 40-day-old snapshot is past retention and trimmed away
+        with gzip.open(os.path.join(self.dir, HISTORY_NAME), "rt", newline="") as f:
+            history = list(csv.DictReader(f))
+        self.assertEqual([(row["Snapshot"], row["Price USD"]) for row in history],
+                         [(times[1].strftime(BACKUP_TIME_FORMAT), "$1.00")])
+
+        write_snapshot(backup_path(self.dir, now + timedelta(hours=1)), [exported("AAA", "$5.00")])
+        self.assertEqual(compact_backups(self.dir, keep=3, now=now), 1)
+        with gzip.open(os.path.join(self.dir, HISTORY_NAME), "rt", newline="") as f:
+            self.assertEqual([row["Price USD"] for row in csv.DictReader(f)], ["$1.00", "$2.00"])
+
+    def test_html_signature_follows_the_visible_rows(self):
+        rows = ["<tr><td>AAA</td></tr>", "<tr><td>BBB</td></tr>"]
+
+        self.assertEqual(html_signature(rows), html_signature(list(rows)))
+        self.assertNotEqual(html_signature(rows), html_signature(rows[::-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
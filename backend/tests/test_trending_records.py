@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                'crypto_sources'))
+
+from trending_records import TrendingRecord, merge_records, score  # noqa: E402
+
+
+class TestMergeRecords(unittest.TestCase):
+
+    def test_same_coin_from_several_sources_becomes_one_row(self):
+        records = [
+            TrendingRecord('DexScreener', 'Pepe', 'PEPE', price_usd=1.0, volume=100, address='0xABC'),
+            TrendingRecord('Birdeye', 'Pepe', 'pepe', price_usd=3.0, volume=300, address='0xabc'),
+            TrendingRecord('Bitvavo', 'PEPE', 'PEPE-EUR', price_eur=0.9, volume='200'),
+            TrendingRecord('CoinGecko', 'Other', 'OTH', price_usd=5.0),
+        ]
+        table = merge_records(records)
+
+        self.assertEqual(len(table), 2)
+        pepe = next(row for row in table.rows() if row['symbol'] == 'PEPE')
+        self.assertEqual(pepe['exchanges'], 'Birdeye, Bitvavo, DexScreener')
+        self.assertEqual(pepe['sources'], 3)
+        self.assertEqual(pepe['price_usd'], 2.0)
+        self.assertEqual(pepe['volume'], 300.0)
+        self.assertEqual(pepe['address'], '0xABC')
+
+    def test_ambiguous_symbol_keeps_address_groups_apart(self):
+        records = [
+            TrendingRecord('Jupiter', 'Cat A', 'CAT', address='SoLaddrA'),
+            TrendingRecord('Birdeye', 'Cat B', 'CAT', address='SoLaddrB'),
+            TrendingRecord('CoinGecko', 'Cat', 'CAT'),
+        ]
+        table = merge_records(records)
+
+        self.assertEqual(len(table), 3)
+        self.assertEqual(sorted(table['sources']), [1, 1, 1])
+
+    def test_rows_are_ranked_by_score_and_filtered_for_display(self):
+        records = [
+            TrendingRecord('CoinGecko', 'Small', 'SML', price_usd=1.0, volume=10),
+            TrendingRecord('CoinGecko', 'Big', 'BIG', volume=1e6, market_cap=1e8),
+            TrendingRecord('Birdeye', 'Big', 'BIG', volume=2e6),
+            TrendingRecord('CoinGecko', 'Empty', 'NIL', volume=0),
+        ]
+        table = merge_records(records)
+
+        self.assertEqual(table['symbol'], ['BIG', 'SML', 'NIL'])
+        self.assertAlmostEqual(table['score'][0], score(2e6, 1e8, 2))
+        self.assertEqual(table.with_price_or_volume()['symbol'], ['BIG', 'SML'])
+        self.assertEqual(table.head(1)['symbol'], ['BIG'])
+
+
+if __name__ == '__main__':
+    unittest.main()
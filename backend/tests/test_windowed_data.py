@@ -0,0 +1,78 @@
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.windowed_data import WindowedDataset, chronological_split
+
+
+class TestWindowedDataset(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frame = pd.DataFrame({
+            'close': rng.normal(size=300),
+            'volume': rng.normal(size=300),
+            'target': rng.integers(0, 2, 300),
+        })
+        self.features = ['close', 'volume']
+
+    def naive_windows(self, seq_length):
+        values = self.frame[self.features].to_numpy()
+        X = np.array([values[i:i + seq_length] for i in range(len(values) - seq_length)])
+        y = self.frame['target'].to_numpy()[seq_length:]
+        return X, y
+
+    def test_batches_match_materialized_windows_in_float32(self):
+        dataset = WindowedDataset.from_frame(self.frame, self.features, seq_length=20, batch_size=64)
+        batches = list(dataset.batches())
+
+        X_expected, y_expected = self.naive_windows(20)
+        self.assertEqual(len(batches), dataset.n_batches)
+        X = np.concatenate([X for X, _ in batches])
+        y = np.concatenate([y for _, y in batches])
+        self.assertEqual(X.dtype, np.float32)
+        np.testing.assert_allclose(X, X_expected, rtol=1e-6)
+        np.testing.assert_array_equal(y, y_expected)
+        self.assertEqual(dataset.base.nbytes, 300 * 2 * 4)
+
+    def test_shuffled_pass_visits_every_window_once(self):
+        dataset = WindowedDataset.from_frame(self.frame, self.features, seq_length=5, batch_size=32,
+                                             shuffle=True, seed=1)
+        first = np.concatenate([y for _, y in dataset.batches()])
+        second = np.concatenate([y for _, y in dataset.batches()])
+
+        _, y_expected = self.naive_windows(5)
+        np.testing.assert_array_equal(np.sort(first), np.sort(y_expected))
+        self.assertFalse(np.array_equal(first, second))
+
+    def test_split_is_chronological_and_shares_the_base_array(self):
+        dataset = WindowedDataset.from_frame(self.frame, self.features, seq_length=10, shuffle=True)
+        train, val, test = chronological_split(dataset, test_size=0.2, val_size=0.25)
+
+        self.assertEqual((len(train), len(val), len(test)), (174, 58, 58))
+        self.assertTrue(train.base is val.base is test.base is dataset.base)
+        self.assertLess(train.starts.max(), val.starts.min())
+        self.assertLess(val.starts.max(), test.starts.min())
+        self.assertFalse(test.shuffle)
+
+    def test_abandoned_pass_stops_the_prefetch_thread(self):
+        dataset = WindowedDataset.from_frame(self.frame, self.features, seq_length=5, batch_size=8, prefetch=2)
+        batches = dataset.batches()
+        next(batches)
+        batches.close()
+
+        self.assertFalse(any(t.name == 'windowed-prefetch' for t in threading.enumerate()))
+
+    def test_horizon_zero_labels_rows_with_their_own_target(self):
+        values = np.arange(12, dtype=np.float64).reshape(6, 2)
+        dataset = WindowedDataset(values, np.arange(6), seq_length=1, horizon=0, batch_size=10, prefetch=0)
+        X, y = dataset.materialize()
+
+        self.assertEqual(X.shape, (6, 1, 2))
+        np.testing.assert_array_equal(X[:, 0, 0] / 2, y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import time
 from datetime import datetime, timedelta
 from advanced_ml_pipeline import AdvancedMLPipeline
 from database import get_db, init_db
+from health_status import HealthStatus
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -21,6 +22,8 @@ class CryptoTradingBot:
         self.initial_balance = config['initial_balance']
         self.current_balance = self.initial_balance
         self.trades = []
+        # Freshness, latency and error counters read by the runner's health checks
+        self.health = HealthStatus()
         self.db = next(get_db())
         self.logger = logging.getLogger(__name__)
         self.setup_logging()
@@ -275,17 +278,22 @@ class CryptoTradingBot:
                     df = self.pipeline.fetch_data()
                     if df is None or df.empty:
                         self.logger.error("No data available")
+                        self.health.record_error('data', 'No data available')
                         continue
 
                     # Get latest data point
                     latest_data = df.iloc[-1]
                     latest_price = latest_data['Close']
+                    self.health.record_data(latest_data)
 
                     # Make prediction with confidence
+                    started = time.perf_counter()
                     prediction, confidence = self.make_prediction(latest_data)
                     if prediction is None or confidence is None:
                         self.logger.error("Prediction failed")
+                        self.health.record_error('model', 'Prediction failed')
                         continue
+                    self.health.record_prediction(time.perf_counter() - started)
 
                     # Make trading decision with risk management
                     decision, risk_score = self.pipeline.make_trading_decision(
@@ -305,11 +313,14 @@ class CryptoTradingBot:
                     if len(self.trades) % self.config['evaluation_interval'] == 0:
                         self.analyze_performance()
 
+                    self.health.heartbeat()
+
                     # Sleep before next iteration
                     time.sleep(self.config['sleep_interval'])
 
                 except Exception as e:
                     self.logger.error(f"Error in trading loop: {e}")
+                    self.health.record_error('loop', e)
                     time.sleep(60)  # Wait before retrying
 
         except KeyboardInterrupt:
@@ -0,0 +1,203 @@
+"""
+Lazily windowed float32 training data for sequence models.
+
+Materialising every (seq_length, n_features) window up front stores each row
+seq_length times. A WindowedDataset keeps one float32 base array of shape
+(rows, n_features) plus the start index of every window, and gathers a batch of
+windows only when it is requested. A background thread builds the next batches while
+the model trains on the current one, so peak memory stays near the size of the base
+array plus a few batches.
+
+Window i covers rows i .. i+seq_length-1 and its target is the row horizon steps
+after the window, targets[i+seq_length-1+horizon]; the default horizon of 1 matches
+prepare_sequences. Splits and subsets share the base array.
+
+The same dataset feeds Keras (to_keras(), a tf.data pipeline) and torch
+(torch_batches()).
+"""
+
+import logging
+import queue
+import threading
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from backend.lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+torch = lazy_import('torch')
+
+logger = logging.getLogger(__name__)
+
+Batch = Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+
+
+class WindowedDataset:
+    """
+    Windows over a float32 base array, gathered batch by batch.
+
+    Args:
+        base (np.ndarray): (rows, n_features) inputs; converted to float32 once.
+        targets (np.ndarray, optional): Per-row targets; without them batches are inputs only.
+        seq_length (int): Rows per window.
+        horizon (int): Rows from the last row of a window to its target row; 0 labels a
+            window with its own last row.
+        starts (np.ndarray, optional): Window start rows; defaults to every full window with a target row.
+        batch_size (int): Windows per batch.
+        shuffle (bool): Visit windows in a new random order on every pass.
+        seed (int, optional): Seed for the shuffle order.
+        prefetch (int): Batches built ahead by the background thread; 0 builds them inline.
+    """
+
+    def __init__(self, base: np.ndarray, targets: Optional[np.ndarray] = None, seq_length: int = 60,
+                 starts: Optional[np.ndarray] = None, batch_size: int = 32, shuffle: bool = False,
+                 seed: Optional[int] = None, prefetch: int = 2, horizon: int = 1):
+        self.base = np.ascontiguousarray(base, dtype=np.float32)
+        self.targets = None if targets is None else np.ascontiguousarray(targets, dtype=np.float32).ravel()
+        self.seq_length = seq_length
+        self.horizon = horizon
+        # Target row of a window relative to its start row
+        self._target_lag = seq_length - 1 + horizon
+        if starts is None:
+            starts = np.arange(max(0, len(self.base) - self._target_lag))
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.prefetch = prefetch
+        self._rng = np.random.default_rng(seed)
+        self._offsets = np.arange(seq_length, dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, data, features: Sequence[str], seq_length: int = 60,
+                   target_col: Optional[str] = 'target', **kwargs) -> 'WindowedDataset':
+        """Dataset over the feature columns of a DataFrame."""
+        base = data[list(features)].to_numpy(dtype=np.float32)
+        targets = data[target_col].to_numpy(dtype=np.float32) if target_col else None
+        return cls(base, targets, seq_length, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def n_batches(self) -> int:
+        return -(-len(self.starts) // self.batch_size)
+
+    @property
+    def input_shape(self) -> Tuple[int, int]:
+        return self.seq_length, self.base.shape[1]
+
+    def subset(self, start: int, stop: Optional[int] = None, **overrides) -> 'WindowedDataset':
+        """Windows start..stop of this dataset (by position), sharing the base array."""
+        options = dict(batch_size=self.batch_size, shuffle=self.shuffle, prefetch=self.prefetch,
+                       horizon=self.horizon)
+        options.update(overrides)
+        return WindowedDataset(self.base, self.targets, self.seq_length, self.starts[start:stop], **options)
+
+    def inputs(self) -> 'WindowedDataset':
+        """The same windows in order, without targets (for prediction)."""
+        return WindowedDataset(self.base, None, self.seq_length, self.starts, batch_size=self.batch_size,
+                               prefetch=self.prefetch, horizon=self.horizon)
+
+    def window_targets(self) -> Optional[np.ndarray]:
+        """Targets of all windows in order."""
+        if self.targets is None:
+            return None
+        return self.targets[self.starts + self._target_lag]
+
+    def gather(self, starts: np.ndarray) -> Batch:
+        """Inputs (len(starts), seq_length, n_features), with targets when the dataset has them."""
+        X = self.base[starts[:, None] + self._offsets]
+        if self.targets is None:
+            return X
+        return X, self.targets[starts + self._target_lag]
+
+    def materialize(self) -> Batch:
+        """Every window at once, for callers that need plain arrays."""
+        return self.gather(self.starts)
+
+    def _order(self) -> np.ndarray:
+        return self._rng.permutation(self.starts) if self.shuffle else self.starts
+
+    def _build(self) -> Iterator[Batch]:
+        order = self._order()
+        for i in range(0, len(order), self.batch_size):
+            yield self.gather(order[i:i + self.batch_size])
+
+    def batches(self) -> Iterator[Batch]:
+        """One pass over the data, with up to prefetch batches built ahead in a background thread."""
+        if self.prefetch <= 0:
+            yield from self._build()
+            return
+
+        buffer: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def offer(item) -> bool:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for batch in self._build():
+                    if not offer(batch):
+                        return
+                offer(done)
+            except BaseException as e:
+                offer(e)
+
+        worker = threading.Thread(target=produce, name='windowed-prefetch', daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Consumer stopped early (e.g. early stopping); let the producer exit
+            stop.set()
+            worker.join(timeout=1.0)
+
+    def __iter__(self) -> Iterator[Batch]:
+        return self.batches()
+
+    def to_keras(self):
+        """tf.data.Dataset of (X, y) batches, rebuilt lazily on every epoch."""
+        seq_length, n_features = self.input_shape
+        x_spec = tf.TensorSpec(shape=(None, seq_length, n_features), dtype=tf.float32)
+        signature = x_spec if self.targets is None else (x_spec, tf.TensorSpec(shape=(None,), dtype=tf.float32))
+        return tf.data.Dataset.from_generator(self.batches, output_signature=signature)
+
+    def torch_batches(self, device=None) -> Iterator:
+        """Batches as torch tensors sharing memory with the gathered numpy arrays."""
+        for batch in self.batches():
+            if self.targets is None:
+                yield torch.from_numpy(batch).to(device) if device else torch.from_numpy(batch)
+                continue
+            X, y = (torch.from_numpy(part) for part in batch)
+            yield (X.to(device), y.to(device)) if device else (X, y)
+
+
+def chronological_split(dataset: WindowedDataset, test_size: float = 0.2,
+                        val_size: float = 0.2) -> Tuple[WindowedDataset, WindowedDataset, WindowedDataset]:
+    """
+    (train, val, test) in time order: the last test_size of the windows for testing and
+    the last val_size of the rest for validation. Only the training part is shuffled.
+    """
+    total = len(dataset)
+    n_test = int(np.ceil(total * test_size))
+    n_train_val = total - n_test
+    n_val = int(n_train_val * val_size)
+    train = dataset.subset(0, n_train_val - n_val)
+    val = dataset.subset(n_train_val - n_val, n_train_val, shuffle=False)
+    test = dataset.subset(n_train_val, total, shuffle=False)
+    return train, val, test
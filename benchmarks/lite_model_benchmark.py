@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Keras vs TFLite serving of the deep trading models.
+
+Trains each model on synthetic windowed data for a few epochs, exports it with
+backend/ml_components/lite_models.py in every requested quantization mode, then
+compares:
+
+    load_s      cold model load in a fresh interpreter process, including the
+                runtime import (TensorFlow for Keras, the TFLite interpreter for exports)
+    latency_ms  best-of-N predict() time per batch size
+    size_mb     file size on disk
+    holdout     accuracy and prediction drift on the held-out windows
+
+Exits non-zero when an export loses more than --max-accuracy-drop accuracy.
+
+Usage:
+    python benchmarks/lite_model_benchmark.py
+    python benchmarks/lite_model_benchmark.py --models lstm transformer --quantization none int8
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'crypto_sources'))
+
+from backend.ml_components.lite_models import LiteModel, export_lite_model  # noqa: E402
+from backend.windowed_data import WindowedDataset, chronological_split  # noqa: E402
+
+BUILDERS = {
+    'lstm': ('deep_learning_models', 'build_lstm_model'),
+    'gru': ('deep_learning_models', 'build_gru_model'),
+    'cnn_lstm': ('deep_learning_models', 'build_cnn_lstm_model'),
+    'bilstm': ('deep_learning_models', 'build_bidirectional_lstm_model'),
+    'transformer': ('advanced_dl_models', 'build_transformer_model'),
+    'inception_time': ('advanced_dl_models', 'build_inception_time_model'),
+    'tft': ('advanced_dl_models', 'build_temporal_fusion_transformer'),
+}
+
+KERAS_LOAD = """
+import sys, time
+start = time.perf_counter()
+import tensorflow as tf
+model = tf.keras.models.load_model(sys.argv[1], compile=False)
+print(time.perf_counter() - start)
+"""
+
+LITE_LOAD = """
+import sys, time
+start = time.perf_counter()
+from backend.ml_components.lite_models import LiteModel
+model = LiteModel.load(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def synthetic_windows(rows: int, n_features: int, seq_length: int, seed: int) -> WindowedDataset:
+    """Random-walk features with a weakly predictable next-step direction."""
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(rows, n_features)).cumsum(axis=0)
+    base = (base - base.mean(axis=0)) / base.std(axis=0)
+    signal = base[:, 0] - base[:, 1] + rng.normal(scale=0.5, size=rows)
+    target = (np.diff(signal, prepend=signal[0]) > 0).astype(np.float32)
+    return WindowedDataset(base, target, seq_length, batch_size=64, shuffle=True, seed=seed)
+
+
+def build(name: str, input_shape):
+    module_name, function = BUILDERS[name]
+    module = __import__(module_name)
+    return getattr(module, function)(input_shape)
+
+
+def best_of(repeats: int, fn) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def cold_load(script: str, path: str) -> float:
+    result = subprocess.run([sys.executable, '-c', script, path], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def run(models: list, modes: list, rows: int, n_features: int, seq_length: int, epochs: int,
+        batch_sizes: list, repeats: int, seed: int) -> dict:
+    dataset = synthetic_windows(rows, n_features, seq_length, seed)
+    train, val, test = chronological_split(dataset, test_size=0.2, val_size=0.2)
+    X_live = test.inputs().materialize()
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in models:
+            model = build(name, dataset.input_shape)
+            model.fit(train.to_keras(), validation_data=val.to_keras(), epochs=epochs, verbose=0)
+            keras_path = os.path.join(tmp, f"{name}.keras")
+            model.save(keras_path)
+
+            entry = {'keras': {
+                'size_mb': os.path.getsize(keras_path) / 2 ** 20,
+                'load_s': cold_load(KERAS_LOAD, keras_path),
+                'latency_ms': {size: best_of(repeats, lambda: model.predict(X_live[:size], verbose=0)) * 1000
+                               for size in batch_sizes},
+            }}
+            for mode in modes:
+                quantization = None if mode == 'none' else mode
+                lite_path = os.path.join(tmp, f"{name}-{mode}.tflite")
+                try:
+                    metadata = export_lite_model(model, lite_path, quantization, holdout=test, calibration=train)
+                except Exception as e:
+                    entry[mode] = {'error': str(e)}
+                    continue
+                lite = LiteModel.load(lite_path, num_threads=1)
+                entry[mode] = {
+                    'size_mb': metadata['size_bytes'] / 2 ** 20,
+                    'load_s': cold_load(LITE_LOAD, lite_path),
+                    'latency_ms': {size: best_of(repeats, lambda: lite.predict(X_live[:size])) * 1000
+                                   for size in batch_sizes},
+                    'holdout': metadata['holdout'],
+                }
+            report[name] = entry
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', nargs='+', default=['lstm', 'gru', 'cnn_lstm', 'bilstm', 'transformer'],
+                        choices=sorted(BUILDERS))
+    parser.add_argument('--quantization', nargs='+', default=['none', 'float16', 'dynamic', 'int8'],
+                        choices=['none', 'float16', 'dynamic', 'int8'])
+    parser.add_argument('--rows', type=int, default=4000)
+    parser.add_argument('--features', type=int, default=16)
+    parser.add_argument('--seq-length', type=int, default=60)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 64])
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.02,
+                        help='Largest allowed holdout accuracy loss of an export')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = run(args.models, args.quantization, args.rows, args.features, args.seq_length, args.epochs,
+                 args.batch_sizes, args.repeats, args.seed)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failed = {
+        f"{name}/{mode}": result.get('error') or result['holdout'].get('accuracy_change')
+        for name, entry in report.items() for mode, result in entry.items()
+        if mode != 'keras' and ('error' in result
+                                or result['holdout'].get('accuracy_change', 0.0) < -args.max_accuracy_drop)
+    }
+    if failed:
+        print(f"FAILED exports losing more than {args.max_accuracy_drop:.3f} accuracy or not converting: {failed}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
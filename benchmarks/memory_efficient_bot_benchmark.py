@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+RSS benchmark for MemoryEfficientTradingBot in multi-symbol mode.
+
+Feeds synthetic hourly candles for many symbols through the bot's ingest/predict path
+(no network) for a long simulated run and samples the process RSS. After warm-up every
+window is full and the indicator cache holds one entry per symbol, so RSS should stay flat; the
+script exits non-zero when it grows by more than the allowed amount.
+
+Usage:
+    python benchmarks/memory_efficient_bot_benchmark.py
+    python benchmarks/memory_efficient_bot_benchmark.py --symbols 250 --steps 5000 --emergency-every 1000
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import psutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.memory_efficient_bot import MemoryEfficientTradingBot  # noqa: E402
+
+CONFIG_PATH = os.path.join(ROOT, 'backend', 'config', 'memory_efficient_config.json')
+HOUR_NS = 3_600_000_000_000
+
+
+def candles(start_ns: int, count: int, prices: np.ndarray, rng: np.random.Generator) -> list:
+    """One DataFrame per symbol with `count` new hourly candles continuing from `prices`."""
+    frames = []
+    index = pd.DatetimeIndex(start_ns + HOUR_NS * np.arange(count))
+    for i in range(len(prices)):
+        closes = prices[i] * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+        prices[i] = closes[-1]
+        frames.append(pd.DataFrame({
+            'Open': closes, 'High': closes * 1.01, 'Low': closes * 0.99,
+            'Close': closes, 'Volume': rng.uniform(1, 100, count),
+        }, index=index))
+    return frames
+
+
+def run(symbols: int, steps: int, batch: int, sample_every: int, emergency_every: int, seed: int) -> dict:
+    bot = MemoryEfficientTradingBot(CONFIG_PATH)
+    bot.symbols = [f"SYM{i:04d}-USD" for i in range(symbols)]
+    rng = np.random.default_rng(seed)
+    prices = rng.uniform(1, 1000, symbols)
+    process = psutil.Process()
+    max_points = bot.config['memory_settings']['max_data_points']
+
+    # Initial history fills every window once
+    now_ns = 0
+    for symbol, df in zip(bot.symbols, candles(now_ns, max_points, prices, rng)):
+        bot.ingest(symbol, df)
+    now_ns += max_points * HOUR_NS
+
+    samples = []
+    signals = {'buy': 0, 'sell': 0, 'hold': 0}
+    for step in range(1, steps + 1):
+        for symbol, df in zip(bot.symbols, candles(now_ns, batch, prices, rng)):
+            bot.ingest(symbol, df)
+            signals[bot.predict_symbol(symbol)['signal']] += 1
+        now_ns += batch * HOUR_NS
+        if emergency_every and step % emergency_every == 0:
+            bot.memory_monitor.emergency_cleanup()
+            bot.evict('restore')
+        if step % sample_every == 0:
+            samples.append((step, process.memory_info().rss))
+
+    warm = samples[len(samples) // 4:] or samples
+    first, last = warm[0][1], warm[-1][1]
+    stats = bot.memory_stats()
+    return {
+        'symbols': symbols,
+        'steps': steps,
+        'candles_ingested': symbols * (max_points + steps * batch),
+        'signals': signals,
+        'rss_mb': {'after_warmup': first / 2 ** 20, 'end': last / 2 ** 20,
+                   'peak': max(r for _, r in samples) / 2 ** 20},
+        'rss_growth_mb': (last - first) / 2 ** 20,
+        'window_mb': stats['window_bytes'] / 2 ** 20,
+        'cache_entries': stats['cache_entries'],
+        'cache_evictions': stats['cache_evictions'],
+        'samples': [{'step': s, 'rss_mb': r / 2 ** 20} for s, r in samples],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=150)
+    parser.add_argument('--steps', type=int, default=1000, help='Simulated update cycles')
+    parser.add_argument('--batch', type=int, default=1, help='New candles per symbol per cycle')
+    parser.add_argument('--sample-every', type=int, default=50)
+    parser.add_argument('--emergency-every', type=int, default=0, help='Force an emergency eviction every N cycles')
+    parser.add_argument('--max-growth-mb', type=float, default=8.0, help='Allowed RSS growth after warm-up')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = run(args.symbols, args.steps, args.batch, args.sample_every, args.emergency_every, args.seed)
+    summary = {k: v for k, v in report.items() if k != 'samples'}
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if report['rss_growth_mb'] > args.max_growth_mb:
+        print(f"REGRESSION RSS grew {report['rss_growth_mb']:.1f} MB after warm-up "
+              f"(limit {args.max_growth_mb:.1f} MB)")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for Python entry points.
+
+Imports each entry point in a fresh interpreter and fails when it does not import or
+when a heavy framework ends up in sys.modules at module level. That check does not depend
+on the machine it runs on and is the gate.
+
+Import times are reported relative to importing REFERENCE_MODULE in the same way, so they
+can be compared across machines. --update-baseline records those ratios in a local,
+git-ignored baseline; later runs also fail when an entry point's ratio grew by more than
+the tolerance.
+
+Usage:
+    python benchmarks/startup_benchmark.py                   # check imports (and local baseline)
+    python benchmarks/startup_benchmark.py --update-baseline # record local timing ratios
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Per-machine, never committed (see .gitignore)
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'startup_baseline.local.json')
+
+# Imported by every entry point; timings are reported as multiples of its import time
+REFERENCE_MODULE = 'pandas'
+
+# Entry point name -> module imported by cron jobs and PHP-triggered calls
+ENTRY_POINTS = {
+    'crypto_selector': 'crypto_selector',
+    'ml_pipeline': 'backend.ml_pipeline',
+    'model_registry': 'backend.ml_components.model_registry',
+    'deep_learning_models': 'crypto_sources.deep_learning_models',
+    'feature_engine': 'feature_engine',
+}
+
+# Frameworks that must only be imported when a model of that kind is used
+HEAVY_MODULES = ['tensorflow', 'keras', 'torch', 'talib', 'optuna', 'sklearn', 'transformers', 'matplotlib']
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+error = None
+try:
+    __import__({module!r})
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'error': error,
+    'heavy': [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, repeats: int) -> dict:
+    """Import `module` in `repeats` fresh interpreters and keep the fastest run."""
+    runs = []
+    for _ in range(repeats):
+        code = PROBE.format(root=ROOT, module=module, heavy=HEAVY_MODULES)
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=300
+        ).stdout.strip().splitlines()
+        runs.append(json.loads(output[-1]) if output else {'seconds': None, 'error': 'no output', 'heavy': []})
+    ok = [r for r in runs if r['error'] is None]
+    best = min(ok, key=lambda r: r['seconds']) if ok else runs[-1]
+    return best
+
+
+def check(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return a list of failure messages."""
+    failures = []
+    for name, result in results.items():
+        if result['error']:
+            failures.append(f"{name}: import failed ({result['error']})")
+            continue
+        if result['heavy']:
+            failures.append(f"{name}: imports {', '.join(result['heavy'])} at startup")
+        previous = baseline.get(name, {}).get('ratio')
+        if previous is not None and result['ratio'] is not None:
+            limit = previous * (1 + tolerance)
+            if result['ratio'] > limit:
+                failures.append(f"{name}: {result['ratio']:.2f}x {REFERENCE_MODULE} exceeds baseline "
+                                f"{previous:.2f}x (limit {limit:.2f}x)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=3, help='Fresh interpreters per entry point')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed relative growth of the time ratio')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    reference = measure(REFERENCE_MODULE, args.repeats)
+    if reference['error']:
+        print(f"Reference import {REFERENCE_MODULE} failed: {reference['error']}")
+        return 1
+    print(f"{REFERENCE_MODULE + ' (reference)':24s} {reference['seconds']:8.3f}s")
+
+    results = {}
+    for name, module in ENTRY_POINTS.items():
+        results[name] = result = measure(module, args.repeats)
+        if result['error']:
+            result['ratio'] = None
+            print(f"{name:24s} FAILED ({result['error']})")
+        else:
+            result['ratio'] = result['seconds'] / reference['seconds']
+            heavy = ', '.join(result['heavy']) or '-'
+            print(f"{name:24s} {result['seconds']:8.3f}s  {result['ratio']:5.2f}x  heavy: {heavy}")
+
+    baseline = {}
+    if args.update_baseline:
+        errors = [name for name, result in results.items() if result['error']]
+        if errors:
+            print(f"Not writing a baseline while {', '.join(errors)} fail to import")
+            return 1
+        with open(args.baseline, 'w') as f:
+            json.dump({name: {'ratio': result['ratio']} for name, result in results.items()}, f, indent=4)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = check(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
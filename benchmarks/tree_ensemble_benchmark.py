@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Pickled vs compiled tree ensembles in ModelRegistry.
+
+Trains the registry's RandomForest, GradientBoosting and ExtraTrees models on synthetic
+features, saves them both as joblib pickles and in the flat-array format of
+backend/ml_components/compiled_trees.py, then compares load time, on-disk size and
+batch throughput. Exits non-zero when a compiled model's predictions differ from the
+scikit-learn ones by more than the tolerance.
+
+Usage:
+    python benchmarks/tree_ensemble_benchmark.py
+    python benchmarks/tree_ensemble_benchmark.py --rows 20000 --features 40 --batch-sizes 1 300 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.ml_components.compiled_trees import CompiledEnsemble  # noqa: E402
+from backend.ml_components.model_registry import (  # noqa: E402
+    ExtraTreesRegressor, GradientBoostingRegressor, RandomForestRegressor
+)
+
+# Same settings as ModelRegistry._train_traditional_models
+MODELS = {
+    'random_forest': lambda: RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1),
+    'gradient_boosting': lambda: GradientBoostingRegressor(n_estimators=100, learning_rate=0.1, max_depth=5,
+                                                           random_state=42),
+    'extra_trees': lambda: ExtraTreesRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1),
+}
+
+
+def features(rows: int, count: int, rng: np.random.Generator) -> pd.DataFrame:
+    return pd.DataFrame(rng.normal(size=(rows, count)), columns=[f"feature_{i}" for i in range(count)])
+
+
+def best_of(repeats: int, fn) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def run(rows: int, n_features: int, batch_sizes: list, repeats: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    X = features(rows, n_features, rng)
+    y = X.iloc[:, 0] * 2 - X.iloc[:, 1] ** 2 + np.sin(X.iloc[:, 2] * 3) + rng.normal(0, 0.1, rows)
+    X_live = features(max(batch_sizes), n_features, rng)
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, build in MODELS.items():
+            model = build().fit(X, y)
+            pickle_path = os.path.join(tmp, f"{name}.pkl")
+            compiled_path = os.path.join(tmp, f"{name}.trees")
+            joblib.dump(model, pickle_path)
+            CompiledEnsemble.from_model(model).save(compiled_path)
+
+            pickled = joblib.load(pickle_path)
+            compiled = CompiledEnsemble.load(compiled_path)
+            if hasattr(pickled, 'n_jobs'):
+                # Live scoring runs one model per worker
+                pickled.n_jobs = 1
+
+            throughput = {}
+            for size in batch_sizes:
+                batch = X_live.iloc[:size]
+                pickle_s = best_of(repeats, lambda: pickled.predict(batch))
+                compiled_s = best_of(repeats, lambda: compiled.predict(batch))
+                throughput[size] = {
+                    'pickle_rows_per_s': size / pickle_s,
+                    'compiled_rows_per_s': size / compiled_s,
+                    'speedup': pickle_s / compiled_s,
+                }
+
+            pickle_load = best_of(repeats, lambda: joblib.load(pickle_path))
+            compiled_load = best_of(repeats, lambda: CompiledEnsemble.load(compiled_path))
+            report[name] = {
+                'trees': compiled.n_trees,
+                'nodes': int(len(compiled.value)),
+                'size_mb': {'pickle': os.path.getsize(pickle_path) / 2 ** 20,
+                            'compiled': directory_size(compiled_path) / 2 ** 20},
+                'load_ms': {'pickle': pickle_load * 1000, 'compiled': compiled_load * 1000},
+                'throughput': throughput,
+                'max_abs_diff': float(np.max(np.abs(compiled.predict(X_live) - pickled.predict(X_live)))),
+            }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='Training rows')
+    parser.add_argument('--features', type=int, default=20)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 1000])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=1e-9, help='Allowed prediction difference')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = run(args.rows, args.features, args.batch_sizes, args.repeats, args.seed)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    mismatched = {name: r['max_abs_diff'] for name, r in report.items() if r['max_abs_diff'] > args.tolerance}
+    if mismatched:
+        print(f"MISMATCH compiled predictions differ from scikit-learn: {mismatched}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
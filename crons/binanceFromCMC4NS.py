@@ -1,3 +1,4 @@
+import os
 import requests
 import mysql.connector # type: ignore
 from datetime import datetime
@@ -16,6 +17,9 @@ DB_CONFIG = {
     'unix_socket': '/opt/lampp/var/mysql/mysql.sock'
 }
 EXCHANGE_NAME = 'binance'
+# Base URLs can be overridden to point at tools/mock_exchange.py
+CMC_API_URL = os.getenv('CMC_API_URL', 'https://pro-api.coinmarketcap.com')
+BINANCE_API_URL = os.getenv('BINANCE_API_URL', 'https://api.binance.com')
 
 def get_exchange_id(cursor, exchange_name):
     cursor.execute("SELECT id FROM exchanges WHERE exchange_name = %s", (exchange_name,))
@@ -37,7 +41,7 @@ def fetch_cmc_data_for_symbols(symbols, headers):
     for i in range(0, len(symbols), batch_size):
         batch = symbols[i:i+batch_size]
         symbols_str = ','.join(batch)
-        quotes_url = 'https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest'
+        quotes_url = f'{CMC_API_URL}/v1/cryptocurrency/quotes/latest'
         quotes_params = {'symbol': symbols_str, 'convert': 'USD'}
         
         print(f"Fetching CMC data for batch: {symbols_str[:70]}...")
@@ -65,7 +69,7 @@ def main():
 
         # 1. Fetch Binance symbols
         print("Fetching Binance exchange info...")
-        binance_url = 'https://api.binance.com/api/v3/exchangeInfo'
+        binance_url = f'{BINANCE_API_URL}/api/v3/exchangeInfo'
         binance_response = requests.get(binance_url)
         binance_response.raise_for_status()
         binance_data = binance_response.json()
@@ -1,4 +1,5 @@
 
+import os
 import requests
 import mysql.connector # type: ignore
 from datetime import datetime
@@ -19,6 +20,9 @@ DB_CONFIG = {
     'unix_socket': '/opt/lampp/var/mysql/mysql.sock'
 }
 EXCHANGE_NAME = 'bitvavo'
+# Base URLs can be overridden to point at tools/mock_exchange.py
+CMC_API_URL = os.getenv('CMC_API_URL', 'https://pro-api.coinmarketcap.com')
+BITVAVO_REST_URL = os.getenv('BITVAVO_REST_URL', 'https://api.bitvavo.com/v2')
 
 def get_exchange_id(cursor, exchange_name):
     cursor.execute("SELECT id FROM exchanges WHERE exchange_name = %s", (exchange_name,))
@@ -40,7 +44,7 @@ def fetch_cmc_data_for_symbols(symbols, headers):
     for i in range(0, len(symbols), batch_size):
         batch = symbols[i:i+batch_size]
         symbols_str = ','.join(batch)
-        quotes_url = 'https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest'
+        quotes_url = f'{CMC_API_URL}/v1/cryptocurrency/quotes/latest'
         quotes_params = {'symbol': symbols_str, 'convert': 'USD'}
         
         print(f"Fetching CMC data for batch: {symbols_str[:70]}...")
@@ -69,7 +73,7 @@ def main():
 
         # 1. Fetch Bitvavo symbols
         print("Fetching Bitvavo exchange info...")
-        bitvavo_url = 'https://api.bitvavo.com/v2/markets'
+        bitvavo_url = f'{BITVAVO_REST_URL}/markets'
         bitvavo_response = requests.get(bitvavo_url)
         bitvavo_response.raise_for_status()
         bitvavo_data = bitvavo_response.json()
@@ -0,0 +1,405 @@
+"""
+Retention, downsampling and partition maintenance for price_history.
+
+The price updaters insert one row per coin every few seconds. This job folds raw ticks
+into 1-minute OHLCV rows, 1-minute rows into 1-hour rows and 1-hour rows into 1-day rows
+(tables from sql/create_price_history_rollups.sql), keeps raw price_history partitioned
+by day, drops raw partitions past raw_retention_days and trims the rollups past their own
+retention. Settings live in config/price_history_retention.json.
+
+Readers call fetch_price_history(), which picks the coarsest resolution that still covers
+the requested range at the requested spacing.
+
+Run every few minutes from cron:
+    */5 * * * * python3 /opt/lampp/htdocs/NS/crons/price_history_retention.py
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'config', 'price_history_retention.json')
+
+DB_CONFIG = {
+    'unix_socket': '/opt/lampp/var/mysql/mysql.sock',
+    'host': 'localhost',
+    'database': 'NS',
+    'user': 'root',
+    'password': '1304',
+}
+
+RAW_TABLE = 'price_history'
+STATE_TABLE = 'price_history_rollup_state'
+EPOCH = datetime(1970, 1, 1)
+
+# Timestamp / volume column names used by the different price_history writers
+TIME_COLUMNS = ('recorded_at', 'timestamp')
+VOLUME_COLUMNS = ('volume', 'volume_24h')
+
+
+def load_config(path: str = CONFIG_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_connection():
+    import mysql.connector  # type: ignore
+    return mysql.connector.connect(**DB_CONFIG)
+
+
+def floor_time(dt: datetime, seconds: int) -> datetime:
+    """Start of the `seconds`-wide bucket containing dt (buckets aligned to the epoch)."""
+    offset = (dt - EPOCH).total_seconds() % seconds
+    return dt - timedelta(seconds=offset)
+
+
+def resolutions(config: dict) -> List[dict]:
+    """Rollup resolutions from finest to coarsest, each with its name."""
+    items = [dict(spec, name=name) for name, spec in config['resolutions'].items()]
+    return sorted(items, key=lambda r: r['seconds'])
+
+
+def downsample(rows: Iterable[tuple], seconds: int) -> List[tuple]:
+    """
+    Fold rows into buckets of `seconds`.
+
+    Args:
+        rows: (coin_id, time, open, high, low, close, volume, samples) ordered by time per coin.
+              Raw ticks are passed as (coin_id, time, price, price, price, price, volume, 1).
+
+    Returns:
+        list: (coin_id, bucket_start, open, high, low, close, volume, samples) per bucket.
+    """
+    buckets: Dict[tuple, list] = {}
+    for coin_id, ts, o, h, l, c, v, n in rows:
+        key = (coin_id, floor_time(ts, seconds))
+        b = buckets.get(key)
+        if b is None:
+            buckets[key] = [o, h, l, c, v, n]
+        else:
+            b[1] = max(b[1], h)
+            b[2] = min(b[2], l)
+            b[3] = c
+            if v is not None:
+                b[4] = v
+            b[5] += n
+    return [(coin, start, *values) for (coin, start), values in sorted(buckets.items())]
+
+
+def choose_resolution(start: datetime, end: datetime, now: datetime, config: dict,
+                      step: Optional[float] = None, max_points: Optional[int] = None) -> dict:
+    """
+    Pick the coarsest resolution whose bucket is no wider than `step` seconds and whose
+    retention still covers `start`. `step` defaults to the range split into max_points.
+    Falls back to the finest resolution that covers `start` when none is fine enough.
+    """
+    max_points = max_points or config.get('default_max_points', 500)
+    if step is None:
+        step = max((end - start).total_seconds(), 0) / max_points
+    candidates = [{'name': 'raw', 'table': RAW_TABLE, 'seconds': 0,
+                   'retention_days': config['raw_retention_days']}] + resolutions(config)
+
+    covering = [r for r in candidates
+                if r['retention_days'] is None or start >= now - timedelta(days=r['retention_days'])]
+    if not covering:
+        return candidates[-1]
+    fine_enough = [r for r in covering if r['seconds'] <= step]
+    return fine_enough[-1] if fine_enough else covering[0]
+
+
+def fetch_price_history(conn, coin_id: str, start: datetime, end: Optional[datetime] = None,
+                        step: Optional[float] = None, max_points: Optional[int] = None,
+                        config: Optional[dict] = None) -> List[dict]:
+    """
+    Price history for a coin between start and end at the coarsest sufficient resolution.
+
+    Returns:
+        list: Dicts with time, open, high, low, close, volume and resolution, oldest first.
+    """
+    config = config or load_config()
+    now = datetime.now()
+    end = end or now
+    resolution = choose_resolution(start, end, now, config, step, max_points)
+    cursor = conn.cursor()
+    try:
+        if resolution['name'] == 'raw':
+            time_col, volume_col = detect_raw_columns(cursor)
+            volume_expr = volume_col or 'NULL'
+            cursor.execute(
+                f"SELECT {time_col}, price, price, price, price, {volume_expr} FROM {RAW_TABLE} "
+                f"WHERE coin_id = %s AND {time_col} >= %s AND {time_col} <= %s ORDER BY {time_col}",
+                (coin_id, start, end))
+        else:
+            cursor.execute(
+                f"SELECT bucket_start, open, high, low, close, volume FROM {resolution['table']} "
+                f"WHERE coin_id = %s AND bucket_start >= %s AND bucket_start <= %s ORDER BY bucket_start",
+                (coin_id, floor_time(start, resolution['seconds']), end))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    keys = ('time', 'open', 'high', 'low', 'close', 'volume')
+    return [dict(zip(keys, row), resolution=resolution['name']) for row in rows]
+
+
+def detect_raw_columns(cursor) -> tuple:
+    """(time column, volume column or None) of the raw price_history table."""
+    cursor.execute(
+        "SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (RAW_TABLE,))
+    columns = {row[0] for row in cursor.fetchall()}
+    time_col = next((c for c in TIME_COLUMNS if c in columns), None)
+    if time_col is None:
+        raise RuntimeError(f"{RAW_TABLE} has none of the timestamp columns {TIME_COLUMNS}")
+    return time_col, next((c for c in VOLUME_COLUMNS if c in columns), None)
+
+
+# --- Rollups ---
+
+def get_watermark(cursor, resolution: str) -> Optional[datetime]:
+    cursor.execute(f"SELECT last_bucket FROM {STATE_TABLE} WHERE resolution = %s", (resolution,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def set_watermark(cursor, resolution: str, bucket: datetime):
+    cursor.execute(
+        f"INSERT INTO {STATE_TABLE} (resolution, last_bucket) VALUES (%s, %s) "
+        f"ON DUPLICATE KEY UPDATE last_bucket = VALUES(last_bucket)",
+        (resolution, bucket))
+
+
+def upsert_buckets(cursor, table: str, buckets: List[tuple]):
+    if not buckets:
+        return
+    cursor.executemany(
+        f"INSERT INTO {table} (coin_id, bucket_start, open, high, low, close, volume, samples) "
+        f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+        f"ON DUPLICATE KEY UPDATE open = VALUES(open), high = VALUES(high), low = VALUES(low), "
+        f"close = VALUES(close), volume = VALUES(volume), samples = VALUES(samples)",
+        buckets)
+
+
+def read_source(cursor, source: dict, since: Optional[datetime], until: datetime,
+                raw_columns: tuple) -> List[tuple]:
+    """Rows of the next finer level in the downsample() input layout."""
+    if source['name'] == 'raw':
+        time_col, volume_col = raw_columns
+        volume_expr = volume_col or 'NULL'
+        where = f"{time_col} < %s" + (f" AND {time_col} >= %s" if since else '')
+        cursor.execute(
+            f"SELECT coin_id, {time_col}, price, price, price, price, {volume_expr}, 1 FROM {RAW_TABLE} "
+            f"WHERE {where} ORDER BY coin_id, {time_col}, id",
+            (until, since) if since else (until,))
+    else:
+        where = "bucket_start < %s" + (" AND bucket_start >= %s" if since else '')
+        cursor.execute(
+            f"SELECT coin_id, bucket_start, open, high, low, close, volume, samples FROM {source['table']} "
+            f"WHERE {where} ORDER BY coin_id, bucket_start",
+            (until, since) if since else (until,))
+    return cursor.fetchall()
+
+
+def source_bounds(cursor, source: dict, raw_columns: tuple) -> tuple:
+    if source['name'] == 'raw':
+        time_col = raw_columns[0]
+        cursor.execute(f"SELECT MIN({time_col}), MAX({time_col}) FROM {RAW_TABLE}")
+    else:
+        cursor.execute(f"SELECT MIN(bucket_start), MAX(bucket_start) FROM {source['table']}")
+    return cursor.fetchone()
+
+
+def rollup(conn, config: dict) -> Dict[str, int]:
+    """
+    Bring every rollup table up to date, finest first, each built from the level below.
+
+    Work starts at the last (possibly still open) bucket of the previous run, so reruns
+    only rewrite that bucket plus anything new. Large backlogs are processed in chunks
+    of rollup_chunk_hours.
+    """
+    chunk_seconds = config.get('rollup_chunk_hours', 24) * 3600
+    cursor = conn.cursor()
+    written = {}
+    try:
+        raw_columns = detect_raw_columns(cursor)
+        source = {'name': 'raw', 'table': RAW_TABLE, 'seconds': 0}
+        for resolution in resolutions(config):
+            since = get_watermark(cursor, resolution['name'])
+            first, last = source_bounds(cursor, source, raw_columns)
+            written[resolution['name']] = 0
+            if last is None:
+                source = resolution
+                continue
+            since = since or floor_time(first, resolution['seconds'])
+            # Whole buckets per chunk so no bucket is split across two reads
+            chunk = timedelta(seconds=-(-chunk_seconds // resolution['seconds']) * resolution['seconds'])
+            while since <= last:
+                until = since + chunk
+                buckets = downsample(read_source(cursor, source, since, until, raw_columns),
+                                     resolution['seconds'])
+                upsert_buckets(cursor, resolution['table'], buckets)
+                if buckets:
+                    set_watermark(cursor, resolution['name'], max(b[1] for b in buckets))
+                conn.commit()
+                written[resolution['name']] += len(buckets)
+                since = until
+            source = resolution
+    finally:
+        cursor.close()
+    return written
+
+
+# --- Partitions and retention ---
+
+def partition_name(day: datetime) -> str:
+    return f"p{day:%Y%m%d}"
+
+
+def plan_partitions(existing: List[str], first_day: datetime, today: datetime, days_ahead: int) -> List[datetime]:
+    """
+    Days that still need a daily partition split off pmax.
+
+    New partitions can only be carved from the end of the range, so planning starts after
+    the newest existing daily partition (or at first_day when there is none).
+    """
+    days = sorted(datetime.strptime(name[1:], '%Y%m%d') for name in existing if name != 'pmax')
+    start = days[-1] + timedelta(days=1) if days else first_day.replace(hour=0, minute=0, second=0, microsecond=0)
+    last = today.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days_ahead)
+    needed = []
+    while start <= last:
+        needed.append(start)
+        start += timedelta(days=1)
+    return needed
+
+
+def expired_partitions(existing: List[str], cutoff: datetime, rolled_up_to: Optional[datetime]) -> List[str]:
+    """Daily partitions whose whole day is older than cutoff and already folded into the 1m rollup."""
+    if rolled_up_to is None:
+        return []
+    limit = min(cutoff, rolled_up_to)
+    expired = []
+    for name in existing:
+        if name == 'pmax':
+            continue
+        day_end = datetime.strptime(name[1:], '%Y%m%d') + timedelta(days=1)
+        if day_end <= limit:
+            expired.append(name)
+    return sorted(expired)
+
+
+def list_partitions(cursor) -> Optional[List[str]]:
+    """Partition names of price_history, or None when the table is not partitioned."""
+    cursor.execute(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (RAW_TABLE,))
+    names = [row[0] for row in cursor.fetchall() if row[0]]
+    return names or None
+
+
+def ensure_partitions(conn, config: dict, now: Optional[datetime] = None) -> List[str]:
+    """Split pmax so every day up to partition_days_ahead has its own partition."""
+    now = now or datetime.now()
+    cursor = conn.cursor()
+    try:
+        existing = list_partitions(cursor)
+        if existing is None or 'pmax' not in existing:
+            return []
+        time_col, _ = detect_raw_columns(cursor)
+        cursor.execute(f"SELECT MIN({time_col}) FROM {RAW_TABLE} PARTITION (pmax)")
+        first = cursor.fetchone()[0] or now
+        days = plan_partitions(existing, first, now, config.get('partition_days_ahead', 3))
+        if not days:
+            return []
+        parts = ', '.join(
+            f"PARTITION {partition_name(d)} VALUES LESS THAN (TO_DAYS('{(d + timedelta(days=1)):%Y-%m-%d}'))"
+            for d in days)
+        cursor.execute(f"ALTER TABLE {RAW_TABLE} REORGANIZE PARTITION pmax INTO "
+                       f"({parts}, PARTITION pmax VALUES LESS THAN MAXVALUE)")
+        return [partition_name(d) for d in days]
+    finally:
+        cursor.close()
+
+
+def delete_in_batches(conn, table: str, column: str, cutoff: datetime, batch_size: int) -> int:
+    cursor = conn.cursor()
+    deleted = 0
+    try:
+        while True:
+            cursor.execute(f"DELETE FROM {table} WHERE {column} < %s LIMIT {int(batch_size)}", (cutoff,))
+            conn.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return deleted
+    finally:
+        cursor.close()
+
+
+def apply_retention(conn, config: dict, now: Optional[datetime] = None) -> dict:
+    """
+    Drop raw data past raw_retention_days and trim rollups past their retention_days.
+
+    Raw data is only removed once it is covered by the 1-minute rollup. Partitioned tables
+    lose whole days with DROP PARTITION; unpartitioned ones fall back to batched deletes.
+    """
+    now = now or datetime.now()
+    batch = config.get('delete_batch_size', 10000)
+    finest = resolutions(config)[0]
+    cursor = conn.cursor()
+    try:
+        rolled_up_to = get_watermark(cursor, finest['name'])
+        existing = list_partitions(cursor)
+        time_col, _ = detect_raw_columns(cursor)
+    finally:
+        cursor.close()
+
+    report = {'dropped_partitions': [], 'deleted': {}}
+    cutoff = now - timedelta(days=config['raw_retention_days'])
+    if existing:
+        report['dropped_partitions'] = expired_partitions(existing, cutoff, rolled_up_to)
+        if report['dropped_partitions']:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"ALTER TABLE {RAW_TABLE} DROP PARTITION {', '.join(report['dropped_partitions'])}")
+            finally:
+                cursor.close()
+    elif rolled_up_to is not None:
+        report['deleted'][RAW_TABLE] = delete_in_batches(conn, RAW_TABLE, time_col, min(cutoff, rolled_up_to), batch)
+
+    for resolution in resolutions(config):
+        if resolution['retention_days'] is not None:
+            report['deleted'][resolution['table']] = delete_in_batches(
+                conn, resolution['table'], 'bucket_start', now - timedelta(days=resolution['retention_days']), batch)
+    return report
+
+
+def run_once(config: dict):
+    conn = get_connection()
+    try:
+        created = ensure_partitions(conn, config)
+        written = rollup(conn, config)
+        report = apply_retention(conn, config)
+    finally:
+        conn.close()
+    print(f"{datetime.now():%Y-%m-%d %H:%M:%S} partitions added: {len(created)}, buckets written: {written}, "
+          f"dropped: {report['dropped_partitions']}, deleted: {report['deleted']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Downsample and expire price_history')
+    parser.add_argument('--config', default=CONFIG_PATH)
+    parser.add_argument('--loop', type=int, default=0, help='Repeat every N seconds instead of running once')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    while True:
+        run_once(config)
+        if not args.loop:
+            break
+        time.sleep(args.loop)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,8 @@ from mysql.connector import Error
 
 # Configuration
 COINMARKETCAP_API_KEY = 'a36ab379-15a0-409b-99ec-85ab7f2836ea'
+# Base URL can be overridden to point at tools/mock_exchange.py
+CMC_API_URL = os.getenv('CMC_API_URL', 'https://pro-api.coinmarketcap.com')
 DB_CONFIG = {
     'unix_socket': '/opt/lampp/var/mysql/mysql.sock',
     'host': 'localhost',
@@ -106,7 +108,7 @@ def get_cmc_id(symbol):
 
 def fetch_coinmarketcap_prices(coin_symbols):
     """Fetch latest prices from CoinMarketCap for multiple symbols"""
-    url = 'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    url = f'{CMC_API_URL}/v2/cryptocurrency/quotes/latest'
     headers = {
         'X-CMC_PRO_API_KEY': COINMARKETCAP_API_KEY,
         'Accepts': 'application/json'
@@ -1,4 +1,5 @@
 
+import os
 import requests
 import mysql.connector
 from datetime import datetime
@@ -13,6 +14,8 @@ DB_CONFIG = {
     'unix_socket': '/opt/lampp/var/mysql/mysql.sock'
 }
 EXCHANGE_NAME = 'bitvavo'
+# Base URL can be overridden to point at tools/mock_exchange.py
+BITVAVO_REST_URL = os.getenv('BITVAVO_REST_URL', 'https://api.bitvavo.com/v2')
 
 def get_exchange_id(cursor, exchange_name):
     """Fetches the ID of the specified exchange from the database."""
@@ -30,7 +33,7 @@ def main():
     try:
         # 1. Fetch all 24h ticker data from Bitvavo
         print("Fetching ticker data from Bitvavo API...")
-        bitvavo_url = 'https://api.bitvavo.com/v2/ticker/24h'
+        bitvavo_url = f'{BITVAVO_REST_URL}/ticker/24h'
         response = requests.get(bitvavo_url)
         response.raise_for_status()  # Raises an exception for bad status codes
         ticker_data = response.json()
@@ -4,12 +4,12 @@ import numpy as np
 from typing import Dict, Any, List
 import logging
 from datetime import datetime
-import tensorflow as tf # Added for model loading
 from feature_engine import FeatureEngine
 from model_registry import ModelRegistry
 from selection_tracker import SelectionTracker
 from backend.database import engine # Import the SQLAlchemy engine
-from advanced_dl_models import build_transformer_model, build_inception_time_model, build_temporal_fusion_transformer, build_ensemble_model
+# TensorFlow and the advanced_dl_models builders are not needed to score coins; they are
+# imported by joblib only if a loaded model actually contains TensorFlow objects.
 
 # Dummy classes to satisfy joblib.load for TensorFlow models
 class InceptionTimeModel:
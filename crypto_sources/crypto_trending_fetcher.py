@@ -51,6 +51,10 @@ Fore = colorama.Fore
 Style = colorama.Style
 init = colorama.init
 # No external dependencies for table formatting
+from trending_exports import (CSV_FIELDS, append_changes, backup_path, compact_backups, diff_snapshot,
+                              html_is_current, html_signature, read_snapshot, row_key, snapshot_is_stale,
+                              write_snapshot)
+from trending_records import TrendingRecord, TrendingTable, merge_records, record_fields
 
 # ---------------- CONFIG ----------------
 BIRDEYE_API_KEY = '1758e18b-1744-4ad6-a2a9-908af2f33c8a'
@@ -94,18 +98,18 @@ class BitvavoSource(CryptoSource):
             if not any(x in symbol for x in ["EUR", "USDT"]):
                 continue
 
-            trending.append({
-                "Exchange": "Bitvavo",
-                "Name": symbol.split("-")[0],
-                "Symbol": symbol,
-                "Price USD": float(data.get('last')) if "USDT" in symbol and data.get('last') is not None else None,
-                "Price EUR": float(data.get('last')) if "EUR" in symbol and data.get('last') is not None else None,
-                "24h Change %": float(data.get('priceChangePercentage')) if data.get('priceChangePercentage') is not None else 0,
-                "Volume": float(data.get('volume')) if data.get('volume') is not None else 0,
-                "Market Cap": None
-            })
+            trending.append(TrendingRecord(
+                exchange="Bitvavo",
+                name=symbol.split("-")[0],
+                symbol=symbol,
+                price_usd=data.get('last') if "USDT" in symbol else None,
+                price_eur=data.get('last') if "EUR" in symbol else None,
+                change_24h=data.get('priceChangePercentage') or 0,
+                # Quote-currency volume, comparable with the USD volumes of the other sources
+                volume=data.get('volumeQuote') or 0,
+            ))
 
-        return sorted(trending, key=lambda x: x['Volume'], reverse=True)[:10]
+        return sorted(trending, key=lambda x: x.volume or 0, reverse=True)[:10]
 
 
 class JupiterSource(CryptoSource):
@@ -133,16 +137,14 @@ class JupiterSource(CryptoSource):
                     price = float(price_info.get('price')) if price_info.get('price') else None
                 except Exception:
                     price = None
-                results.append({
-                    "Exchange": "Jupiter",
-                    "Name": name,
-                    "Symbol": symbol,
-                    "Price USD": price,
-                    "Price EUR": None,
-                    "24h Change %": None,  # Not available in new API
-                    "Volume": None,
-                    "Market Cap": None
-                })
+                # 24h change and volume are not available in the new API
+                results.append(TrendingRecord(
+                    exchange="Jupiter",
+                    name=name,
+                    symbol=symbol,
+                    price_usd=price,
+                    address=token_id,
+                ))
             return results
         except Exception as e:
             logging.error(f"Jupiter API error: {e}")
@@ -153,15 +155,19 @@ class CoinGeckoSource(CryptoSource):
     async def fetch(self, session):
         try:
             data = await (await session.get("https://api.coingecko.com/api/v3/search/trending")).json()
-            return [{
-                "Exchange": "CoinGecko",
-                "Name": coin['item']['name'],
-                "Symbol": coin['item']['symbol'],
-                "Price USD": coin['item']['price_btc'],
-                "24h Change %": None,
-                "Volume": None,
-                "Market Cap": None
-            } for coin in data['coins']]
+            results = []
+            for coin in data['coins']:
+                item = coin['item']
+                # price_btc is denominated in BTC; the USD figures live under 'data'
+                usd = item.get('data') or {}
+                results.append(TrendingRecord(
+                    exchange="CoinGecko",
+                    name=item['name'],
+                    symbol=item['symbol'],
+                    price_usd=usd.get('price'),
+                    change_24h=(usd.get('price_change_percentage_24h') or {}).get('usd'),
+                ))
+            return results
         except Exception as e:
             print(f"CoinGecko API error: {e}")
             return []
@@ -191,15 +197,14 @@ class AlpacaSource(CryptoSource):
                         open_ = latest.get('o')
                         close_ = latest.get('c')
                         change_pct = ((close_ - open_) / open_ * 100) if open_ else None
-                        cryptos.append({
-                            "Exchange": "Alpaca",
-                            "Name": symbol.split('/')[0],
-                            "Symbol": symbol,
-                            "Price USD": close_,
-                            "24h Change %": change_pct,
-                            "Volume": latest.get('v'),
-                            "Market Cap": None
-                        })
+                        cryptos.append(TrendingRecord(
+                            exchange="Alpaca",
+                            name=symbol.split('/')[0],
+                            symbol=symbol,
+                            price_usd=close_,
+                            change_24h=change_pct,
+                            volume=latest.get('v'),
+                        ))
                     except Exception as e:
                         logging.error(f"Alpaca parse error for {symbol}: {e}")
             return cryptos
@@ -258,16 +263,15 @@ class CMCSource(SyncCryptoSource):
             one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
 
             coins = [
-                {
-                    "Exchange": "CoinMarketCap",
-                    "Name": coin['name'],
-                    "Symbol": coin['symbol'],
-                    "Price USD": coin['quote']['USD']['price'],
-                    "Price EUR": None,
-                    "24h Change %": None,
-                    "Volume": coin['quote']['USD']['volume_24h'],
-                    "Market Cap": coin['quote']['USD']['market_cap']
-                }
+                TrendingRecord(
+                    exchange="CoinMarketCap",
+                    name=coin['name'],
+                    symbol=coin['symbol'],
+                    price_usd=coin['quote']['USD']['price'],
+                    volume=coin['quote']['USD']['volume_24h'],
+                    market_cap=coin['quote']['USD']['market_cap'],
+                    address=(coin.get('platform') or {}).get('token_address'),
+                )
                 for coin in data['data']
                 if datetime.strptime(coin['date_added'], "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc) > one_day_ago
                 and coin['quote']['USD']['volume_24h'] > min_volume
@@ -306,15 +310,15 @@ class LiveCoinWatchSource(SyncCryptoSource):
             print(f"LiveCoinWatch API error: Unexpected response format: {data}")
             return []
         return [
-            {
-                "Exchange": "LiveCoinWatch",
-                "Name": coin.get('name'),
-                "Symbol": coin.get('code'),
-                "Price USD": coin.get('rate'),
-                "24h Change %": coin.get('delta', {}).get('day') if isinstance(coin.get('delta'), dict) else None,
-                "Volume": coin.get('volume'),
-                "Market Cap": coin.get('cap')
-            }
+            TrendingRecord(
+                exchange="LiveCoinWatch",
+                name=coin.get('name'),
+                symbol=coin.get('code'),
+                price_usd=coin.get('rate'),
+                change_24h=coin.get('delta', {}).get('day') if isinstance(coin.get('delta'), dict) else None,
+                volume=coin.get('volume'),
+                market_cap=coin.get('cap'),
+            )
             for coin in coins if coin.get('volume', 0) is not None and coin.get('volume', 0) >= min_volume
         ]
 
@@ -346,15 +350,16 @@ class BirdeyeSource(SyncCryptoSource):
                 return []
             
             return [
-                {
-                    "Exchange": "Birdeye",
-                    "Name": token.get("name"),
-                    "Symbol": token.get("symbol"),
-                    "Price USD": token.get("price_usd"),
-                    "24h Change %": token.get("change_24h"),
-                    "Volume": token.get("volume_usd_24h"),
-                    "Market Cap": token.get("market_cap"),
-                }
+                TrendingRecord(
+                    exchange="Birdeye",
+                    name=token.get("name"),
+                    symbol=token.get("symbol"),
+                    price_usd=token.get("price_usd"),
+                    change_24h=token.get("change_24h"),
+                    volume=token.get("volume_usd_24h"),
+                    market_cap=token.get("market_cap"),
+                    address=token.get("address"),
+                )
                 for token in data['data'] if token.get("volume_usd_24h", 0) is not None and token.get("volume_usd_24h", 0) >= min_volume
             ]
         except Exception as e:
@@ -372,7 +377,7 @@ class CoinPaprikaSource(SyncCryptoSource):
         for coin in coins:
             first_data_at = coin.get("first_data_at")
             if first_data_at:
-                created = datetime.fromisoformat(first_data_at.replace("Z", ""))
+                created = datetime.fromisoformat(first_data_at.replace("Z", "+00:00"))
                 # Use timezone-aware UTC datetime for compatibility
                 try:
                     now_dt = datetime.now(datetime.UTC)
@@ -381,15 +386,13 @@ class CoinPaprikaSource(SyncCryptoSource):
                     from datetime import timezone
                     now_dt = datetime.now(timezone.utc)
                 if (now_dt - created).days <= max_days_old:
-                    new_coins.append({
-                        "Exchange": "CoinPaprika",
-                        "Name": coin.get("name"),
-                        "Symbol": coin.get("symbol"),
-                        "Price USD": None,
-                        "24h Change %": None,
-                        "Volume": None,
-                        "Market Cap": None
-                    })
+                    new_coins.append(TrendingRecord(
+                        exchange="CoinPaprika",
+                        name=coin.get("name"),
+                        symbol=coin.get("symbol"),
+                        age_hours=(now_dt - created).total_seconds() / 3600,
+                        first_seen=first_data_at,
+                    ))
         return new_coins
 
 
@@ -407,15 +410,14 @@ class DexScreenerSource(SyncCryptoSource):
                 price = token.get('priceUsd')
                 volume = token.get('volume24h')
                 if volume is not None and volume >= min_volume:
-                    results.append({
-                        "Exchange": "DexScreener",
-                        "Name": token.get('name'),
-                        "Symbol": token.get('symbol'),
-                        "Price USD": price,
-                        "24h Change %": None,
-                        "Volume": volume,
-                        "Market Cap": None
-                    })
+                    results.append(TrendingRecord(
+                        exchange="DexScreener",
+                        name=token.get('name'),
+                        symbol=token.get('symbol'),
+                        price_usd=price,
+                        volume=volume,
+                        address=token.get('tokenAddress'),
+                    ))
             except Exception as e:
                 logging.error(f"DexScreener parse error: {e}")
         return results
@@ -462,140 +464,146 @@ async def get_all_data():
     return all_data, list(set(failed_sources))
 
 
+def _as_table(data):
+    """Exporters take the merged TrendingTable; a plain list of records is merged first."""
+    return data if isinstance(data, TrendingTable) else merge_records(data)
+
+
+def _display_rows(table):
+    """Formatted strings of every displayable coin, built once and shared by the exporters."""
+    for row in table.with_price_or_volume().rows():
+        price, change, volume, market_cap = row['price_usd'], row['change_24h'], row['volume'], row['market_cap']
+        yield {
+            "Name": row['name'],
+            "Symbol": row['symbol'],
+            "Exchange": row['exchanges'],
+            "Price USD": f"${price:,.2f}" if price is not None else "$0.00",
+            "24h Change %": f"{change:+.2f}%" if change is not None else "N/A",
+            "Volume": f"{volume:,}" if volume is not None else "N/A",
+            "Market Cap": f"${market_cap:,.2f}" if market_cap is not None else "N/A",
+            "change": change,
+            "row": row,
+        }
+
+
 def write_to_csv(data, filename="trending_crypto.csv"):
+    """Write the raw per-source records, one line per record."""
     if not data:
         print("No data to write.")
         return
 
-    keys = data[0].keys()
+    keys = record_fields()
     with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        writer.writerows(data)
+        writer = csv.writer(f)
+        writer.writerow(keys)
+        writer.writerows([getattr(record, key) for key in keys] for record in data)
     print(f"{Fore.GREEN} Data written to {filename}")
 
 
-def export_to_csv(data, filename="crypto_trending_data.csv", save_backup=True):
-    """Export the crypto data to a CSV file for use in LibreOffice Calc"""
+BACKUP_DIR = "/opt/lampp/htdocs/NS/data/csv"
+
+
+def export_to_csv(data, filename="crypto_trending_data.csv", save_backup=True,
+                  changes_filename="crypto_trending_changes.csv", backup_dir=BACKUP_DIR, keep_backups=3):
+    """
+    Update the keyed CSV snapshot for LibreOffice Calc and the PHP fallbacks.
+
+    Only added, changed and removed rows are appended to the change log; the snapshot
+    and its timestamped backup are rewritten only when something changed or the
+    snapshot's ages are due for a refresh. Older backups are compacted into the rolling
+    history (see trending_exports.py).
+    """
     import os
-    from datetime import datetime, timezone
+    from datetime import datetime, timezone, timedelta
     
-    # Current time for age calculation
-    current_time = datetime.now(timezone.utc)
+    table = _as_table(data)
+    previous = read_snapshot(filename)
+    now = datetime.now(timezone.utc)
     
-    # Filter entries with price or volume
-    filtered_data = []
-    for item in data:
-        price = item.get('Price USD')
-        volume = item.get('Volume')
-        if price is None and (volume is None or volume == 0):
-            continue
-            
-        # Format the data for CSV (without color formatting)
-        change = item.get("24h Change %")
-        change_str = f"{change:+.2f}%" if change is not None else "N/A"
-        price_str = f"${price:,.2f}" if price is not None else "$0.00"
-        volume_str = f"{volume:,}" if volume is not None else "N/A"
-        market_cap = item.get('Market Cap')
-        market_cap_str = f"${market_cap:,.2f}" if market_cap is not None else "N/A"
-        
-        # Add age in hours if available or set default for fallback mechanism
-        age_hours = item.get('age_hours')
-        first_seen = item.get('first_seen')
-        
-        # For fallback mechanism, we'll set all coins to be "new" (12 hours old)
-        # if they don't have age information, so they pass the filter in the fallback
-        if age_hours is None:
-            age_hours = 12.0
-            
-        if first_seen is None:
-            # Create a timestamp from 12 hours ago for fallback data
-            from datetime import timedelta
-            first_seen = (current_time - timedelta(hours=12)).isoformat()
-        
-        filtered_data.append({
-            "Name": item['Name'],
-            "Symbol": item['Symbol'],
-            "Exchange": item['Exchange'],
-            "Price USD": price_str,
-            "24h Change %": change_str,
-            "Volume": volume_str,
-            "Market Cap": market_cap_str,
-            "Age (hours)": age_hours,
-            "First Seen": first_seen
-        })
+    # Coins without age information are treated as 12 hours old, so they pass the
+    # age filter of the PHP fallback that reads these files. Their First Seen is kept
+    # from the snapshot so it does not change on every run
+    fallback_first_seen = (now - timedelta(hours=12)).isoformat()
     
-    # Write to CSV file
-    if filtered_data:
-        # Make sure the original file is written
-        with open(filename, 'w', newline='') as csvfile:
-            fieldnames = ["Name", "Symbol", "Exchange", "Price USD", "24h Change %", "Volume", "Market Cap", "Age (hours)", "First Seen"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for item in filtered_data:
-                writer.writerow(item)
-        print(f"\n{Fore.GREEN}Data exported to {filename}{Style.RESET_ALL}")
-        
-        # Save a timestamped backup copy for fallback mechanism
-        if save_backup:
-            # Create backup directory if it doesn't exist
-            backup_dir = "/opt/lampp/htdocs/NS/data/csv"
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # Create timestamped filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = os.path.join(backup_dir, f"crypto_data_{timestamp}.csv")
-            
-            # Save the backup copy
-            with open(backup_filename, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for item in filtered_data:
-                    writer.writerow(item)
-            print(f"{Fore.GREEN}Backup saved to {backup_filename}{Style.RESET_ALL}")
-    else:
+    rows = {}
+    for item in _display_rows(table):
+        row = item['row']
+        exported = {
+            **{field: item[field] for field in CSV_FIELDS[:7]},
+            "Sources": row['sources'],
+            "Score": f"{row['score']:.3f}",
+            "Address": row['address'] or "",
+        }
+        key = row_key(exported)
+        if row['age_hours'] is not None:
+            exported["Age (hours)"] = row['age_hours']
+            exported["First Seen"] = row['first_seen'] or fallback_first_seen
+        else:
+            exported["Age (hours)"] = 12.0
+            exported["First Seen"] = previous.get(key, {}).get("First Seen") or fallback_first_seen
+        rows.setdefault(key, exported)
+    
+    if not rows:
         print(f"\n{Fore.RED}No data to export{Style.RESET_ALL}")
+        return
+    
+    changes = diff_snapshot(previous, rows)
+    if changes:
+        append_changes(changes_filename, changes, now.isoformat())
+    elif not snapshot_is_stale(filename):
+        print(f"\n{Fore.CYAN}No changes since the last export of {filename}{Style.RESET_ALL}")
+        return
+    
+    write_snapshot(filename, rows.values())
+    print(f"\n{Fore.GREEN}Data exported to {filename} ({len(changes)} changed rows logged to "
+          f"{changes_filename}){Style.RESET_ALL}")
+    if save_backup:
+        # Timestamped backup copy for the fallback mechanism
+        os.makedirs(backup_dir, exist_ok=True)
+        backup = backup_path(backup_dir, datetime.now())
+        write_snapshot(backup, rows.values())
+        compacted = compact_backups(backup_dir, keep=keep_backups)
+        print(f"{Fore.GREEN}Backup saved to {backup}"
+              + (f", {compacted} older backups compacted" if compacted else "") + Style.RESET_ALL)
 
-def export_to_html(data, filename="crypto_trending_data.html"):
-    """Export the crypto data to an HTML file with AutoFilter enabled"""
-    # Filter entries with price or volume
-    filtered_data = []
-    for item in data:
-        price = item.get('Price USD')
-        volume = item.get('Volume')
-        if price is None and (volume is None or volume == 0):
-            continue
-            
-        # Format the data for HTML
-        change = item.get("24h Change %")
-        change_str = f"{change:+.2f}%" if change is not None else "N/A"
-        price_str = f"${price:,.2f}" if price is not None else "$0.00"
-        volume_str = f"{volume:,}" if volume is not None else "N/A"
-        market_cap = item.get('Market Cap')
-        market_cap_str = f"${market_cap:,.2f}" if market_cap is not None else "N/A"
-        
-        # Add color to change values
+
+HTML_FIELDS = ["Name", "Symbol", "Exchange", "Price USD", "24h Change %", "Volume", "Market Cap"]
+
+
+def export_to_html(data, filename="crypto_trending_data.html", top_n=100):
+    """
+    Export the top_n coins of the merged crypto table to an HTML file with AutoFilter enabled.
+
+    The file is left untouched when the visible rows are the same as last time.
+    """
+    from html import escape
+    
+    table = _as_table(data)
+    
+    # Table rows; collected in a list and joined once
+    rows = []
+    for item in _display_rows(table.with_price_or_volume().head(top_n)):
+        change = item['change']
+        cells = {field: escape(str(item[field])) for field in HTML_FIELDS}
         if change and change >= 0:
-            change_str = f'<span style="color:green">{change_str}</span>'
+            cells["24h Change %"] = f'<span style="color:green">{cells["24h Change %"]}</span>'
         elif change and change < 0:
-            change_str = f'<span style="color:red">{change_str}</span>'
-        
-        filtered_data.append({
-            "Name": item['Name'],
-            "Symbol": item['Symbol'],
-            "Exchange": item['Exchange'],
-            "Price USD": price_str,
-            "24h Change %": change_str,
-            "Volume": volume_str,
-            "Market Cap": market_cap_str
-        })
+            cells["24h Change %"] = f'<span style="color:red">{cells["24h Change %"]}</span>'
+        rows.append("<tr>" + "".join(f"<td>{cells[field]}</td>" for field in HTML_FIELDS) + "</tr>")
     
-    # Create HTML file with data-table attributes for auto-filtering
-    if filtered_data:
-        fieldnames = ["Name", "Symbol", "Exchange", "Price USD", "24h Change %", "Volume", "Market Cap"]
-        
-        html_content = f"""
+    if not rows:
+        print(f"\n{Fore.RED}No data to export{Style.RESET_ALL}")
+        return
+    
+    signature = html_signature(rows)
+    if html_is_current(filename, signature):
+        print(f"\n{Fore.CYAN}Top {top_n} unchanged, {filename} not rewritten{Style.RESET_ALL}")
+        return
+    
+    header = "".join(f"<th>{field}</th>" for field in HTML_FIELDS)
+    html_content = f"""
         <!DOCTYPE html>
+        {signature}
         <html>
         <head>
             <meta charset="UTF-8">
@@ -614,163 +622,61 @@ def export_to_html(data, filename="crypto_trending_data.html"):
             <p><b>Instructions:</b> When opening in LibreOffice Calc or Excel, select the entire table and enable AutoFilter (Data > AutoFilter).</p>
             <table id="cryptoTable" class="display" data-order='[[0, "asc"]]'>
                 <thead>
-                    <tr>
-        """
-        
-        # Add table headers
-        for field in fieldnames:
-            html_content += f"<th>{field}</th>"
-        html_content += "</tr></thead><tbody>"
-        
-        # Add table rows
-        for item in filtered_data:
-            html_content += "<tr>"
-            for field in fieldnames:
-                html_content += f"<td>{item[field]}</td>"
-            html_content += "</tr>"
-        
-        html_content += """</tbody>
+                    <tr>{header}</tr></thead><tbody>{"".join(rows)}</tbody>
             </table>
         </body>
         </html>
         """
-        
-        with open(filename, 'w') as htmlfile:
-            htmlfile.write(html_content)
-        print(f"\n{Fore.GREEN}Data exported to {filename} (HTML with table formatting){Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Open this file in LibreOffice Calc or Excel for auto-filtering{Style.RESET_ALL}")
-    else:
-        print(f"\n{Fore.RED}No data to export{Style.RESET_ALL}")
+    
+    with open(filename, 'w') as htmlfile:
+        htmlfile.write(html_content)
+    print(f"\n{Fore.GREEN}Data exported to {filename} (HTML with table formatting){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Open this file in LibreOffice Calc or Excel for auto-filtering{Style.RESET_ALL}")
 
 
 def print_with_colors(data, failed_sources=None):
-    # Filter entries with price or volume
-    filtered_data = []
-    for item in data:
-        price = item.get('Price USD')
-        volume = item.get('Volume')
-        if price is None and (volume is None or volume == 0):
-            continue
-            
-        # Format the data
-        change = item.get("24h Change %")
-        change_str = f"{change:+.2f}%" if change is not None else "N/A"
-        price_str = f"${price:,.2f}" if price is not None else "$0.00"
-        volume_str = f"{volume:,}" if volume is not None else "N/A"
-        market_cap = item.get('Market Cap')
-        market_cap_str = f"${market_cap:,.2f}" if market_cap is not None else "N/A"
-        
-        # Add colored versions for display
-        change_color = Fore.GREEN if change and change >= 0 else Fore.RED
-        
-        filtered_data.append({
-            "name": item['Name'],
-            "symbol": item['Symbol'],
-            "exchange": item['Exchange'],
-            "price": price_str,
-            "change": change_str,
-            "change_positive": change and change >= 0,
-            "volume": volume_str,
-            "market_cap": market_cap_str
-        })
+    table = _as_table(data)
+    
+    # Column key -> (header, color)
+    headers = {
+        "Name": ("Name", Fore.CYAN),
+        "Symbol": ("Symbol", Fore.CYAN),
+        "Exchange": ("Exchanges", Fore.BLUE),
+        "Price USD": ("Price USD", Fore.YELLOW),
+        "24h Change %": ("24h Change %", None),
+        "Volume": ("Volume", Fore.MAGENTA),
+        "Market Cap": ("Market Cap", ""),
+    }
+    filtered_data = list(_display_rows(table))
     
-    # Display the table
     if filtered_data:
-        # Define column headers and widths
-        headers = {
-            "name": "Name", 
-            "symbol": "Symbol", 
-            "exchange": "Exchange", 
-            "price": "Price USD", 
-            "change": "24h Change %", 
-            "volume": "Volume", 
-            "market_cap": "Market Cap"
-        }
-        
         # Calculate column widths
-        col_widths = {}
-        for key in headers:
-            # Start with header width
-            col_widths[key] = len(headers[key])
-            # Check data width
-            for item in filtered_data:
+        col_widths = {key: len(header) for key, (header, _) in headers.items()}
+        for item in filtered_data:
+            for key in headers:
                 col_widths[key] = max(col_widths[key], len(str(item[key])))
         
-        # Print top border
-        top_border = "┏"
-        for i, key in enumerate(headers):
-            top_border += "━" * (col_widths[key] + 2)
-            if i < len(headers) - 1:
-                top_border += "┳"
-            else:
-                top_border += "┓"
-        print(top_border)
-        
-        # Print header
-        header_row = "┃"
-        for key in headers:
-            header_row += f" {Fore.GREEN}{headers[key]:{col_widths[key]}}{Style.RESET_ALL} ┃"
-        print(header_row)
-        
-        # Print separator line
-        separator = "┣"
-        for i, key in enumerate(headers):
-            separator += "━" * (col_widths[key] + 2)
-            if i < len(headers) - 1:
-                separator += "╋"
-            else:
-                separator += "┫"
-        print(separator)
+        def border(left, fill, middle, right):
+            return left + middle.join(fill * (col_widths[key] + 2) for key in headers) + right
         
-        # Print data rows with source separators
-        current_source = None
+        lines = [border("┏", "━", "┳", "┓")]
+        lines.append("┃" + "".join(
+            f" {Fore.GREEN}{header:{col_widths[key]}}{Style.RESET_ALL} ┃" for key, (header, _) in headers.items()
+        ))
+        lines.append(border("┣", "━", "╋", "┫"))
         for item in filtered_data:
-            # Check if we're switching to a new source
-            if current_source is not None and current_source != item["exchange"]:
-                # Print a thin separator line between different sources
-                thin_separator = "┠"
-                for i, key in enumerate(headers):
-                    thin_separator += "┄" * (col_widths[key] + 2)
-                    if i < len(headers) - 1:
-                        thin_separator += "╂"
-                    else:
-                        thin_separator += "┨"
-                print(thin_separator)
-            
-            # Update current source
-            current_source = item["exchange"]
-            
-            # Print the data row
             row = "┃"
-            for key in headers:
-                if key == "name":
-                    row += f" {Fore.CYAN}{item[key]:{col_widths[key]}}{Style.RESET_ALL} ┃"
-                elif key == "symbol":
-                    row += f" {Fore.CYAN}{item[key]:{col_widths[key]}}{Style.RESET_ALL} ┃"
-                elif key == "exchange":
-                    row += f" {Fore.BLUE}{item[key]:{col_widths[key]}}{Style.RESET_ALL} ┃"
-                elif key == "price":
-                    row += f" {Fore.YELLOW}{item[key]:{col_widths[key]}}{Style.RESET_ALL} ┃"
-                elif key == "change":
-                    color = Fore.GREEN if item["change_positive"] else Fore.RED
-                    row += f" {color}{item[key]:{col_widths[key]}}{Style.RESET_ALL} ┃"
-                elif key == "volume":
-                    row += f" {Fore.MAGENTA}{item[key]:{col_widths[key]}}{Style.RESET_ALL} ┃"
-                else:
-                    row += f" {item[key]:{col_widths[key]}} ┃"
-            print(row)
-        
-        # Print bottom border
-        bottom_border = "┗"
-        for i, key in enumerate(headers):
-            bottom_border += "━" * (col_widths[key] + 2)
-            if i < len(headers) - 1:
-                bottom_border += "┻"
-            else:
-                bottom_border += "┛"
-        print(bottom_border)
+            for key, (_, color) in headers.items():
+                if color is None:
+                    color = Fore.GREEN if item["change"] and item["change"] >= 0 else Fore.RED
+                value = f"{str(item[key]):{col_widths[key]}}"
+                row += f" {color}{value}{Style.RESET_ALL} ┃" if color else f" {value} ┃"
+            lines.append(row)
+        lines.append(border("┗", "━", "┻", "┛"))
+        print("\n".join(lines))
         
-        print(f"\n{Fore.CYAN}Displayed {len(filtered_data)} entries with price or volume data.{Style.RESET_ALL}")
+        print(f"\n{Fore.CYAN}Displayed {len(filtered_data)} coins with price or volume data, "
+              f"merged across sources and ranked by score.{Style.RESET_ALL}")
     else:
         print(f"{Fore.YELLOW}No data with price or volume to display.{Style.RESET_ALL}")
         
@@ -779,10 +685,12 @@ def print_with_colors(data, failed_sources=None):
 
 
 async def main():
-    data, failed_sources = await get_all_data()
-    write_to_csv(data)
-    print_with_colors(data, failed_sources=failed_sources)
-    return data
+    records, failed_sources = await get_all_data()
+    write_to_csv(records)
+    # One deduplicated table for every exporter
+    table = merge_records(records)
+    print_with_colors(table, failed_sources=failed_sources)
+    return table
 
 
 if __name__ == "__main__":
@@ -793,4 +701,4 @@ if __name__ == "__main__":
     export_to_csv(data)
     
     # Export data to HTML with table formatting (better for auto-filtering)
-    export_to_html(data)
\ No newline at end of file
+    export_to_html(data)
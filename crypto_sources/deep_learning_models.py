@@ -7,28 +7,51 @@ and trading signal generation in cryptocurrency markets.
 
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, Model
-from tensorflow.keras.layers import Dense, LSTM, GRU, Dropout, BatchNormalization, Input
-from tensorflow.keras.layers import Conv1D, MaxPooling1D, Flatten, Bidirectional, Attention
-from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, ReduceLROnPlateau
-from tensorflow.keras.optimizers import Adam
-from tensorflow.keras.regularizers import l1_l2
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 import joblib
 
-# Suppress TensorFlow warnings
-tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+from backend.lazy_imports import lazy_import, lazy_attribute
+from backend.windowed_data import WindowedDataset, chronological_split
+from backend.ml_components.lite_models import LITE_SUFFIX, LiteModel, export_lite_model
+
+
+def _suppress_tensorflow_warnings(tf):
+    tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
+
+
+# TensorFlow, scikit-learn and matplotlib are imported when a model is built, trained or plotted
+tf = lazy_import('tensorflow', on_import=_suppress_tensorflow_warnings)
+Sequential = lazy_attribute('tensorflow.keras.models', 'Sequential')
+Model = lazy_attribute('tensorflow.keras.models', 'Model')
+Dense = lazy_attribute('tensorflow.keras.layers', 'Dense')
+LSTM = lazy_attribute('tensorflow.keras.layers', 'LSTM')
+GRU = lazy_attribute('tensorflow.keras.layers', 'GRU')
+Dropout = lazy_attribute('tensorflow.keras.layers', 'Dropout')
+BatchNormalization = lazy_attribute('tensorflow.keras.layers', 'BatchNormalization')
+Input = lazy_attribute('tensorflow.keras.layers', 'Input')
+Conv1D = lazy_attribute('tensorflow.keras.layers', 'Conv1D')
+MaxPooling1D = lazy_attribute('tensorflow.keras.layers', 'MaxPooling1D')
+Flatten = lazy_attribute('tensorflow.keras.layers', 'Flatten')
+Bidirectional = lazy_attribute('tensorflow.keras.layers', 'Bidirectional')
+Attention = lazy_attribute('tensorflow.keras.layers', 'Attention')
+EarlyStopping = lazy_attribute('tensorflow.keras.callbacks', 'EarlyStopping')
+ModelCheckpoint = lazy_attribute('tensorflow.keras.callbacks', 'ModelCheckpoint')
+ReduceLROnPlateau = lazy_attribute('tensorflow.keras.callbacks', 'ReduceLROnPlateau')
+Adam = lazy_attribute('tensorflow.keras.optimizers', 'Adam')
+l1_l2 = lazy_attribute('tensorflow.keras.regularizers', 'l1_l2')
+StandardScaler = lazy_attribute('sklearn.preprocessing', 'StandardScaler')
+train_test_split = lazy_attribute('sklearn.model_selection', 'train_test_split')
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
 
 
 def prepare_sequences(data, features, seq_length=60, target_col='target'):
     """
     Prepare sequence data for time series models.
     
+    Builds every window at once as float32; training code should prefer a
+    WindowedDataset, which gathers windows batch by batch.
+    
     Args:
         data (pd.DataFrame): DataFrame with features and target
         features (list): List of feature column names
@@ -38,13 +61,7 @@ def prepare_sequences(data, features, seq_length=60, target_col='target'):
     Returns:
         tuple: X_sequences, y_targets
     """
-    X, y = [], []
-    
-    for i in range(len(data) - seq_length):
-        X.append(data[features].iloc[i:i+seq_length].values)
-        y.append(data[target_col].iloc[i+seq_length])
-    
-    return np.array(X), np.array(y)
+    return WindowedDataset.from_frame(data, features, seq_length, target_col).materialize()
 
 
 def build_lstm_model(input_shape, output_units=1, dropout_rate=0.2):
@@ -283,9 +300,12 @@ class DeepLearningTrader:
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
     
-    def prepare_data(self, data, features, target_col='target', test_size=0.2, val_size=0.2):
+    def prepare_datasets(self, data, features, target_col='target', test_size=0.2, val_size=0.2):
         """
-        Prepare data for training.
+        Prepare lazily windowed training, validation and test data.
+        
+        All three share one float32 copy of the feature columns; windows are gathered
+        per batch while training.
         
         Args:
             data (pd.DataFrame): Preprocessed DataFrame with features and target
@@ -295,31 +315,41 @@ class DeepLearningTrader:
             val_size (float): Proportion of training data for validation
             
         Returns:
-            tuple: X_train, X_val, X_test, y_train, y_val, y_test
+            tuple: train, val, test WindowedDatasets
         """
         self.features = features
         
-        # Prepare sequences
-        X, y = prepare_sequences(data, features, self.sequence_length, target_col)
-        
-        # Split into train and test
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, shuffle=False
+        dataset = WindowedDataset.from_frame(
+            data, features, self.sequence_length, target_col,
+            batch_size=self.batch_size, shuffle=True
         )
+        train, val, test = chronological_split(dataset, test_size, val_size)
         
-        # Split training data into training and validation
-        train_samples = len(X_train)
-        val_samples = int(train_samples * val_size)
+        print(f"Training windows: {len(train)}, validation: {len(val)}, testing: {len(test)} "
+              f"(window shape {dataset.input_shape}, base array {dataset.base.nbytes / 1e6:.1f} MB)")
         
-        X_val = X_train[-val_samples:]
-        y_val = y_train[-val_samples:]
-        X_train = X_train[:-val_samples]
-        y_train = y_train[:-val_samples]
+        return train, val, test
+    
+    def prepare_data(self, data, features, target_col='target', test_size=0.2, val_size=0.2):
+        """
+        Prepare data for training as plain arrays.
         
-        print(f"Training data shape: {X_train.shape}")
-        print(f"Validation data shape: {X_val.shape}")
-        print(f"Testing data shape: {X_test.shape}")
+        Same split as prepare_datasets(), with every window materialized.
         
+        Args:
+            data (pd.DataFrame): Preprocessed DataFrame with features and target
+            features (list): Feature columns to use
+            target_col (str): Target column name
+            test_size (float): Proportion of data for testing
+            val_size (float): Proportion of training data for validation
+            
+        Returns:
+            tuple: X_train, X_val, X_test, y_train, y_val, y_test
+        """
+        train, val, test = self.prepare_datasets(data, features, target_col, test_size, val_size)
+        (X_train, y_train), (X_val, y_val), (X_test, y_test) = (
+            part.materialize() for part in (train, val, test)
+        )
         return X_train, X_val, X_test, y_train, y_val, y_test
     
     def build_model(self, input_shape, output_units=1):
@@ -348,21 +378,23 @@ class DeepLearningTrader:
         
         return self.model
     
-    def train(self, X_train, y_train, X_val, y_val, output_units=1):
+    def train(self, X_train, y_train=None, X_val=None, y_val=None, output_units=1):
         """
         Train the deep learning model.
         
         Args:
-            X_train (np.array): Training features
-            y_train (np.array): Training targets
-            X_val (np.array): Validation features
-            y_val (np.array): Validation targets
+            X_train (np.array or WindowedDataset): Training features, or the
+                training dataset from prepare_datasets()
+            y_train (np.array): Training targets (not used with a dataset)
+            X_val (np.array or WindowedDataset): Validation features or dataset
+            y_val (np.array): Validation targets (not used with a dataset)
             output_units (int): Number of output units
             
         Returns:
             tf.keras.Model: Trained model
         """
-        input_shape = (X_train.shape[1], X_train.shape[2])
+        streaming = isinstance(X_train, WindowedDataset)
+        input_shape = X_train.input_shape if streaming else (X_train.shape[1], X_train.shape[2])
         
         # Build the model
         if self.model is None:
@@ -377,24 +409,34 @@ class DeepLearningTrader:
         ]
         
         # Train the model
-        self.history = self.model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
-            epochs=self.epochs,
-            batch_size=self.batch_size,
-            callbacks=callbacks,
-            verbose=1
-        )
+        if streaming:
+            # Batches are gathered from the shared base array and prefetched in the background
+            self.history = self.model.fit(
+                X_train.to_keras(),
+                validation_data=X_val.to_keras(),
+                epochs=self.epochs,
+                callbacks=callbacks,
+                verbose=1
+            )
+        else:
+            self.history = self.model.fit(
+                X_train, y_train,
+                validation_data=(X_val, y_val),
+                epochs=self.epochs,
+                batch_size=self.batch_size,
+                callbacks=callbacks,
+                verbose=1
+            )
         
         return self.model
     
-    def evaluate(self, X_test, y_test):
+    def evaluate(self, X_test, y_test=None):
         """
         Evaluate the trained model.
         
         Args:
-            X_test (np.array): Test features
-            y_test (np.array): Test targets
+            X_test (np.array or WindowedDataset): Test features or dataset
+            y_test (np.array): Test targets (not used with a dataset)
             
         Returns:
             dict: Evaluation metrics
@@ -403,10 +445,14 @@ class DeepLearningTrader:
             raise ValueError("Model has not been trained yet")
         
         # Evaluate the model
-        loss, accuracy = self.model.evaluate(X_test, y_test, verbose=0)
+        if isinstance(X_test, WindowedDataset):
+            loss, accuracy = self.model.evaluate(X_test.to_keras(), verbose=0)
+            y_test = X_test.window_targets()
+        else:
+            loss, accuracy = self.model.evaluate(X_test, y_test, verbose=0)
         
         # Get predictions
-        y_pred_prob = self.model.predict(X_test)
+        y_pred_prob = self.predict(X_test)
         y_pred = (y_pred_prob > 0.5).astype(int).flatten()
         
         from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
@@ -501,6 +547,52 @@ class DeepLearningTrader:
         print(f"Model saved to {model_path}")
         return model_path
     
+    def export_lite(self, holdout=None, quantization=None, calibration=None, model_name=None):
+        """
+        Export the trained model for CPU inference without TensorFlow.
+        
+        Args:
+            holdout: Held-out data to measure the accuracy change on, e.g. the test
+                WindowedDataset from prepare_datasets() or an (X, y) pair
+            quantization (str): None (float32), 'float16', 'dynamic' or 'int8'
+            calibration: Representative inputs for 'int8' (defaults to holdout)
+            model_name (str): Custom model name
+            
+        Returns:
+            tuple: (path to the .tflite file, export metadata with the holdout report)
+        """
+        if self.model is None:
+            raise ValueError("Model has not been trained yet")
+        
+        if model_name is None:
+            model_name = f"{self.model_type}_model"
+        
+        lite_path = os.path.join(self.save_dir, f"{model_name}{LITE_SUFFIX}")
+        metadata = export_lite_model(self.model, lite_path, quantization, holdout=holdout,
+                                     calibration=calibration)
+        print(f"Lite model saved to {lite_path}")
+        if 'holdout' in metadata:
+            print(f"Holdout comparison: {metadata['holdout']}")
+        return lite_path, metadata
+    
+    def load_lite_model(self, lite_path):
+        """
+        Load an exported model for prediction; TensorFlow is not imported.
+        
+        Args:
+            lite_path (str): Path to the .tflite file
+            
+        Returns:
+            LiteModel: Loaded model
+        """
+        self.model = LiteModel.load(lite_path)
+        
+        features_path = lite_path.replace(LITE_SUFFIX, '_features.joblib')
+        if os.path.exists(features_path):
+            self.features = joblib.load(features_path)
+        
+        return self.model
+    
     def load_model(self, model_path):
         """
         Load a trained model.
@@ -525,7 +617,7 @@ class DeepLearningTrader:
         Make predictions with the trained model.
         
         Args:
-            X (np.array): Input data
+            X (np.array or WindowedDataset): Input data
             
         Returns:
             np.array: Predicted probabilities
@@ -533,6 +625,10 @@ class DeepLearningTrader:
         if self.model is None:
             raise ValueError("Model has not been trained yet")
         
+        if isinstance(X, WindowedDataset):
+            if isinstance(self.model, LiteModel):
+                return np.concatenate([self.model.predict(batch) for batch in X.inputs().batches()])
+            return self.model.predict(X.inputs().to_keras(), verbose=0)
         return self.model.predict(X)
     
     def backtest(self, data, features, initial_cash=10000, commission=0.001, plot=True):
@@ -552,15 +648,13 @@ class DeepLearningTrader:
         if self.model is None:
             raise ValueError("Model has not been trained yet")
         
-        # Prepare sequences for the entire dataset
-        X_full = []
-        for i in range(len(data) - self.sequence_length):
-            X_full.append(data[features].iloc[i:i+self.sequence_length].values)
-        
-        X_full = np.array(X_full)
+        # Windows over the entire dataset, gathered batch by batch
+        X_full = WindowedDataset.from_frame(
+            data, features, self.sequence_length, target_col=None, batch_size=self.batch_size
+        )
         
         # Get predictions for the entire dataset
-        predictions = self.model.predict(X_full)
+        predictions = self.predict(X_full)
         
         # Create a copy of the data for backtesting
         backtest_data = data.iloc[self.sequence_length:].copy().reset_index(drop=True)
@@ -72,6 +72,9 @@ BITVAVO_API_KEY = os.getenv("BITVAVO_API_KEY")
 BITVAVO_API_SECRET = os.getenv("BITVAVO_API_SECRET")
 ALPACA_API_KEY =  os.getenv('ALPACA_API_KEY')
 ALPACA_API_SECRET = os.getenv('ALPACA_API_SECRET')
+# Optional base URL overrides, e.g. to point at tools/mock_exchange.py
+BINANCE_API_URL = os.getenv('BINANCE_API_URL')
+BITVAVO_REST_URL = os.getenv('BITVAVO_REST_URL', 'https://api.bitvavo.com/v2')
 
 # Split Data
 def split_data(df, features, target):
@@ -241,7 +244,11 @@ def nz(value, default=0):
 
 # fetch historical data from Binance, returns a dataframe
 def fetch_binance_data(symbol='BTCUSDT', interval='1h', lookback='730 days ago UTC'):
-    binance_client = BinanceClient(BINANCE_API_KEY, BINANCE_API_SECRET)
+    client_class = BinanceClient
+    if BINANCE_API_URL:
+        # The client pings API_URL in its constructor, so override it on a subclass
+        client_class = type('BinanceClient', (BinanceClient,), {'API_URL': f"{BINANCE_API_URL}/api"})
+    binance_client = client_class(BINANCE_API_KEY, BINANCE_API_SECRET)
     klines = binance_client.get_historical_klines(symbol, BinanceClient.KLINE_INTERVAL_1DAY, lookback)
     data = pd.DataFrame(klines, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'SMA', 'EMA', 'RSI', 'target'])
     data['close'] = pd.to_numeric(data['close'], errors='coerce')
@@ -252,7 +259,7 @@ def fetch_binance_data(symbol='BTCUSDT', interval='1h', lookback='730 days ago U
 
 # fetch historical data from bitvavo and return a dataframe
 def fetch_bitvavo_data(symbol='BTC-EUR', interval='1h', start_date="2023-03-18", end_date="2025-03-18"):
-    bitvavo = Bitvavo({'APIKEY': BITVAVO_API_KEY,'APISECRET': BITVAVO_API_SECRET})
+    bitvavo = Bitvavo({'APIKEY': BITVAVO_API_KEY,'APISECRET': BITVAVO_API_SECRET, 'RESTURL': BITVAVO_REST_URL})
     params = {'market': symbol, 'interval': interval}
     if start_date:
         params['start'] = int(pd.to_datetime(start_date).timestamp() * 1000)
@@ -0,0 +1,212 @@
+"""
+Change-only writers for the trending exports.
+
+The fetcher used to rewrite the CSV and HTML exports in full on every run and drop a
+new timestamped backup into the PHP data directory each time. The exports now work
+against a keyed snapshot:
+
+    snapshot    crypto_trending_data.csv, one row per coin keyed by contract address
+                (or symbol when a coin has none). It is only rewritten when a row was
+                added, changed or removed, or when it is older than SNAPSHOT_REFRESH so
+                the ages it reports stay current.
+    change log  An append-only CSV of the added, changed and removed rows, each with
+                the time of the run. Consumers that follow it never reparse the snapshot.
+    backups     A timestamped copy of the snapshot is written with each rewrite, since
+                the PHP fallbacks read the newest crypto_data_*.csv. compact_backups()
+                folds all but the newest few into one gzipped rolling history that keeps
+                HISTORY_RETENTION of snapshots. The history is not a .csv file, so it is
+                never picked up as the newest export.
+    HTML        Carries a signature of its visible rows right after the doctype and is
+                only regenerated when the signature changes.
+"""
+
+import csv
+import glob
+import gzip
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CSV_FIELDS = ["Name", "Symbol", "Exchange", "Price USD", "24h Change %", "Volume", "Market Cap",
+              "Age (hours)", "First Seen", "Sources", "Score", "Address"]
+
+# Changes with the clock rather than with the coin; refreshed by SNAPSHOT_REFRESH instead
+VOLATILE_FIELDS = ("Age (hours)",)
+
+CHANGE_FIELDS = ["Timestamp", "Change", "Key"] + CSV_FIELDS
+HISTORY_FIELDS = ["Snapshot"] + CSV_FIELDS
+
+SNAPSHOT_REFRESH = timedelta(hours=1)
+HISTORY_RETENTION = timedelta(days=30)
+
+BACKUP_PREFIX = "crypto_data_"
+BACKUP_TIME_FORMAT = "%Y%m%d_%H%M%S"
+HISTORY_NAME = "crypto_data_history.csv.gz"
+
+HTML_SIGNATURE = "<!-- trending-rows: {} -->"
+
+
+def row_key(row: dict) -> str:
+    """Snapshot key of an exported row: its contract address, else its symbol."""
+    address = row.get("Address") or ""
+    if address:
+        # EVM addresses are case-insensitive; Solana addresses are not
+        return address.lower() if address.startswith("0x") else address
+    return f"symbol:{(row.get('Symbol') or '').upper()}"
+
+
+def _atomic_write_csv(path: str, fields: List[str], rows: Iterable[dict]):
+    """Write a CSV next to its destination and move it into place, so readers never see half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_snapshot(path: str) -> Dict[str, dict]:
+    """Rows of an exported CSV keyed by row_key(), in file order; empty if there is none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline="") as f:
+        return {row_key(row): row for row in csv.DictReader(f)}
+
+
+def write_snapshot(path: str, rows: Iterable[dict]):
+    _atomic_write_csv(path, CSV_FIELDS, rows)
+
+
+def snapshot_is_stale(path: str, now: Optional[datetime] = None) -> bool:
+    if not os.path.exists(path):
+        return True
+    modified = datetime.fromtimestamp(os.path.getmtime(path))
+    return (now or datetime.now()) - modified >= SNAPSHOT_REFRESH
+
+
+def diff_snapshot(old: Dict[str, dict], new: Dict[str, dict]) -> List[Tuple[str, str, dict]]:
+    """
+    (change, key, row) for every added, changed or removed row.
+
+    Values are compared as they appear in the CSV; VOLATILE_FIELDS are ignored.
+    Removed rows carry their last exported values.
+    """
+    compared = [field for field in CSV_FIELDS if field not in VOLATILE_FIELDS]
+    changes = []
+    for key, row in new.items():
+        previous = old.get(key)
+        if previous is None:
+            changes.append(("added", key, row))
+        elif any(str(previous.get(field) or "") != str(row.get(field) or "") for field in compared):
+            changes.append(("changed", key, row))
+    changes.extend(("removed", key, row) for key, row in old.items() if key not in new)
+    return changes
+
+
+def append_changes(path: str, changes: List[Tuple[str, str, dict]], timestamp: str):
+    """Append changes to the change log, writing the header when the log is new."""
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CHANGE_FIELDS, extrasaction="ignore")
+        if new_file:
+            writer.writeheader()
+        for change, key, row in changes:
+            writer.writerow({**row, "Timestamp": timestamp, "Change": change, "Key": key})
+
+
+def backup_path(backup_dir: str, when: datetime) -> str:
+    return os.path.join(backup_dir, f"{BACKUP_PREFIX}{when.strftime(BACKUP_TIME_FORMAT)}.csv")
+
+
+def _backup_time(path: str) -> str:
+    return os.path.basename(path)[len(BACKUP_PREFIX):-len(".csv")]
+
+
+def _history_rows(path: str):
+    with gzip.open(path, "rt", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _trim_history(path: str, now: datetime):
+    """
+    Drop snapshots older than HISTORY_RETENTION.
+
+    Only the first row is read unless trimming is due; a day of slack keeps the rewrite
+    to about once a day.
+    """
+    cutoff = (now - HISTORY_RETENTION).strftime(BACKUP_TIME_FORMAT)
+    slack = (now - HISTORY_RETENTION - timedelta(days=1)).strftime(BACKUP_TIME_FORMAT)
+    oldest = next(_history_rows(path), None)
+    if oldest is None or oldest["Snapshot"] >= slack:
+        return
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with gzip.open(os.fdopen(fd, "wb"), "wt", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(row for row in _history_rows(path) if row["Snapshot"] >= cutoff)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def compact_backups(backup_dir: str, keep: int = 3, now: Optional[datetime] = None) -> int:
+    """
+    Move all but the newest `keep` timestamped backups into the rolling history.
+
+    Each gzip member appended to the history continues the same CSV stream, so the header
+    is only written once. Backups from before the Sources/Score/Address columns get empty
+    values for them.
+
+    Returns:
+        int: Number of backups compacted.
+    """
+    backups = sorted(glob.glob(os.path.join(backup_dir, f"{BACKUP_PREFIX}*.csv")))
+    old = backups[:-keep] if keep > 0 else backups
+    if not old:
+        return 0
+
+    history = os.path.join(backup_dir, HISTORY_NAME)
+    new_file = not os.path.exists(history)
+    with gzip.open(history, "at", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+        if new_file:
+            writer.writeheader()
+        for path in old:
+            with open(path, newline="") as src:
+                snapshot = _backup_time(path)
+                writer.writerows({**row, "Snapshot": snapshot} for row in csv.DictReader(src))
+    for path in old:
+        os.remove(path)
+
+    _trim_history(history, now or datetime.now())
+    return len(old)
+
+
+def html_signature(rows: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(row.encode("utf-8"))
+        digest.update(b"\n")
+    return HTML_SIGNATURE.format(digest.hexdigest())
+
+
+def html_is_current(path: str, signature: str) -> bool:
+    """True when the HTML at path was rendered from rows with this signature."""
+    if not os.path.exists(path):
+        return False
+    with open(path, encoding="utf-8", errors="replace") as f:
+        # The signature sits right after the doctype
+        return signature in f.read(1024)
@@ -0,0 +1,213 @@
+"""
+One record schema for every trending source, and the merge that deduplicates them.
+
+Each source used to return dicts of its own shape, and every exporter walked all of
+them, so a coin listed by five sources was printed five times. Sources now build
+TrendingRecord objects. merge_records() makes one pass over all records and hash-joins
+them on their contract address, or on the normalized symbol when there is no address.
+A symbol-only record joins the address group of the same symbol if that group is
+unique. The result is a TrendingTable: one column per field, one row per coin, sorted
+by a cross-source score. CSV, HTML and console output all read that table, so writing
+output is linear in the number of records.
+
+Score per coin:
+
+    log10(1 + volume) + MARKET_CAP_WEIGHT * log10(1 + market cap)
+        + SOURCE_WEIGHT * (number of sources - 1)
+
+Volume and market cap are the largest values any source reported, since aggregators
+already sum over venues. Price and 24h change are the median of the reported values.
+"""
+
+import math
+import re
+from dataclasses import dataclass, fields
+from statistics import median
+from typing import Dict, Iterable, Iterator, List, Optional
+
+MARKET_CAP_WEIGHT = 0.5
+SOURCE_WEIGHT = 1.0
+
+# Quote currencies stripped from pair symbols such as BTC-EUR or ETH/USD
+QUOTE_SUFFIX = re.compile(r'[-/_](EUR|USDT|USDC|USD|BTC|ETH)$', re.IGNORECASE)
+
+
+def _number(value) -> Optional[float]:
+    """Float or None; sources send numbers, numeric strings, empty strings and None."""
+    if value is None or value == '':
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def normalize_symbol(symbol: Optional[str]) -> str:
+    return QUOTE_SUFFIX.sub('', (symbol or '').strip()).upper()
+
+
+@dataclass
+class TrendingRecord:
+    """One coin as reported by one source."""
+    exchange: str
+    name: Optional[str]
+    symbol: Optional[str]
+    price_usd: Optional[float] = None
+    price_eur: Optional[float] = None
+    change_24h: Optional[float] = None
+    volume: Optional[float] = None
+    market_cap: Optional[float] = None
+    address: Optional[str] = None
+    age_hours: Optional[float] = None
+    first_seen: Optional[str] = None
+
+    def __post_init__(self):
+        for name in ('price_usd', 'price_eur', 'change_24h', 'volume', 'market_cap', 'age_hours'):
+            setattr(self, name, _number(getattr(self, name)))
+        self.address = (self.address or '').strip() or None
+
+    @property
+    def key_symbol(self) -> str:
+        return normalize_symbol(self.symbol or self.name)
+
+    @property
+    def key_address(self) -> Optional[str]:
+        # EVM addresses are case-insensitive; Solana addresses are not
+        if self.address and self.address.startswith('0x'):
+            return self.address.lower()
+        return self.address
+
+
+# Column order of a TrendingTable
+COLUMNS = ('name', 'symbol', 'address', 'exchanges', 'sources', 'price_usd', 'price_eur', 'change_24h',
+           'volume', 'market_cap', 'age_hours', 'first_seen', 'score')
+
+
+class TrendingTable:
+    """
+    Merged coins as columns of equal length, sorted by score.
+
+    Args:
+        columns (dict): Column name -> list, for every name in COLUMNS.
+    """
+
+    def __init__(self, columns: Dict[str, list]):
+        self.columns = columns
+
+    @classmethod
+    def empty(cls) -> 'TrendingTable':
+        return cls({name: [] for name in COLUMNS})
+
+    def __len__(self) -> int:
+        return len(self.columns['symbol'])
+
+    def __getitem__(self, column: str) -> list:
+        return self.columns[column]
+
+    def rows(self) -> Iterator[dict]:
+        names = list(self.columns)
+        for values in zip(*(self.columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+    def head(self, n: int) -> 'TrendingTable':
+        return TrendingTable({name: values[:n] for name, values in self.columns.items()})
+
+    def with_price_or_volume(self) -> 'TrendingTable':
+        """Coins with a price or a non-zero volume, the ones worth displaying."""
+        keep = [i for i, (price, volume) in enumerate(zip(self.columns['price_usd'], self.columns['volume']))
+                if price is not None or volume]
+        return TrendingTable({name: [values[i] for i in keep] for name, values in self.columns.items()})
+
+
+class _Group:
+    """Accumulates the records of one coin during the merge."""
+
+    __slots__ = ('records', 'address')
+
+    def __init__(self, address: Optional[str] = None):
+        self.records: List[TrendingRecord] = []
+        self.address = address
+
+
+def _first(values: Iterable):
+    return next((v for v in values if v not in (None, '')), None)
+
+
+def _median(values: Iterable[Optional[float]]) -> Optional[float]:
+    present = [v for v in values if v is not None]
+    return median(present) if present else None
+
+
+def _max(values: Iterable[Optional[float]]) -> Optional[float]:
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+def score(volume: Optional[float], market_cap: Optional[float], sources: int) -> float:
+    return (math.log10(1 + max(volume or 0.0, 0.0))
+            + MARKET_CAP_WEIGHT * math.log10(1 + max(market_cap or 0.0, 0.0))
+            + SOURCE_WEIGHT * (sources - 1))
+
+
+def merge_records(records: Iterable[TrendingRecord]) -> TrendingTable:
+    """Deduplicate records across sources into one scored TrendingTable."""
+    by_address: Dict[str, _Group] = {}
+    by_symbol: Dict[str, _Group] = {}
+    # Address groups per symbol, to decide where symbol-only records belong
+    address_groups: Dict[str, List[_Group]] = {}
+    pending: List[TrendingRecord] = []
+
+    for record in records:
+        if not record.key_symbol and not record.key_address:
+            continue
+        address = record.key_address
+        if address is None:
+            pending.append(record)
+            continue
+        group = by_address.get(address)
+        if group is None:
+            group = by_address[address] = _Group(record.address)
+            address_groups.setdefault(record.key_symbol, []).append(group)
+        group.records.append(record)
+
+    for record in pending:
+        candidates = address_groups.get(record.key_symbol, ())
+        if len(candidates) == 1:
+            candidates[0].records.append(record)
+            continue
+        group = by_symbol.get(record.key_symbol)
+        if group is None:
+            group = by_symbol[record.key_symbol] = _Group()
+        group.records.append(record)
+
+    merged = []
+    for group in list(by_address.values()) + list(by_symbol.values()):
+        recs = group.records
+        exchanges = sorted({r.exchange for r in recs})
+        volume = _max(r.volume for r in recs)
+        market_cap = _max(r.market_cap for r in recs)
+        ages = [r for r in recs if r.age_hours is not None]
+        youngest = min(ages, key=lambda r: r.age_hours) if ages else None
+        merged.append({
+            'name': _first(r.name for r in recs),
+            'symbol': recs[0].key_symbol,
+            'address': group.address,
+            'exchanges': ', '.join(exchanges),
+            'sources': len(exchanges),
+            'price_usd': _median(r.price_usd for r in recs),
+            'price_eur': _median(r.price_eur for r in recs),
+            'change_24h': _median(r.change_24h for r in recs),
+            'volume': volume,
+            'market_cap': market_cap,
+            'age_hours': youngest.age_hours if youngest else None,
+            'first_seen': youngest.first_seen if youngest else _first(r.first_seen for r in recs),
+            'score': score(volume, market_cap, len(exchanges)),
+        })
+
+    merged.sort(key=lambda row: row['score'], reverse=True)
+    return TrendingTable({name: [row[name] for row in merged] for name in COLUMNS})
+
+
+def record_fields() -> List[str]:
+    return [f.name for f in fields(TrendingRecord)]
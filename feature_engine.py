@@ -1,10 +1,13 @@
 import pandas as pd
 import numpy as np
-import talib
 
 from typing import Dict, Any
 import logging
 
+from backend.lazy_imports import lazy_import
+
+talib = lazy_import('talib')
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class FeatureEngine:
@@ -6,7 +6,9 @@ import pandas as pd
 import asyncio
 import httpx
 import numpy as np
-from typing import List
+from typing import List, Optional
+
+from history_backfill import CandleStore, HistoryBackfill, DEFAULT_STORE_PATH
 
 # Database Configuration (not directly used for fetching, but kept for context)
 DB_CONFIG = {
@@ -22,7 +24,23 @@ BITVAVO_API_BASE_URL = "https://api.bitvavo.com/v2"
 # Coins to fetch historical data for (using Bitvavo format)
 COINS_TO_FETCH = ['BTC-EUR', 'ETH-EUR', 'XRP-EUR', 'ADA-EUR', 'SOL-EUR']
 
-async def fetch_bitvavo_candlestick_data(symbol: str, interval: str, start_time: int, end_time: int, limit: int = 1000) -> pd.DataFrame:
+# CoinGecko API Base URL
+COINGECKO_API_BASE_URL = "https://api.coingecko.com/api/v3"
+
+# Bitvavo market symbol -> CoinGecko coin id
+SYMBOL_TO_COINGECKO = {
+    'BTC-EUR': 'bitcoin',
+    'ETH-EUR': 'ethereum',
+    'XRP-EUR': 'ripple',
+    'ADA-EUR': 'cardano',
+    'SOL-EUR': 'solana',
+}
+
+# Daily quote volume is typically a few percent of market cap; used only when CoinGecko has no data
+VOLUME_TO_MARKET_CAP_RATIO = 20
+
+async def fetch_bitvavo_candlestick_data(symbol: str, interval: str, start_time: int, end_time: int, limit: int = 1000,
+                                         client: Optional[httpx.AsyncClient] = None) -> pd.DataFrame:
     """
     Fetch historical candlestick data from the Bitvavo API.
 
@@ -32,6 +50,7 @@ async def fetch_bitvavo_candlestick_data(symbol: str, interval: str, start_time:
         start_time (int): The start time for the data fetch in milliseconds Unix timestamp.
         end_time (int): The end time for the data fetch in milliseconds Unix timestamp.
         limit (int): The maximum number of data points to return.
+        client (httpx.AsyncClient): Optional shared client; a new one is created if omitted.
 
     Returns:
         pd.DataFrame: A DataFrame containing the fetched candlestick data.
@@ -39,10 +58,13 @@ async def fetch_bitvavo_candlestick_data(symbol: str, interval: str, start_time:
     """
     url = f"{BITVAVO_API_BASE_URL}/markets/{symbol}/candles?interval={interval}&start={start_time}&end={end_time}&limit={limit}"
     
-    async with httpx.AsyncClient() as client:
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            response = await own_client.get(url)
+    else:
         response = await client.get(url)
-        response.raise_for_status()  # Raise an error for bad responses
-        data = response.json()
+    response.raise_for_status()  # Raise an error for bad responses
+    data = response.json()
     
     # Bitvavo returns data as a list of lists: 
     # [timestamp, open, high, low, close, volume]
@@ -55,13 +77,65 @@ async def fetch_bitvavo_candlestick_data(symbol: str, interval: str, start_time:
         
     return df
 
-async def fetch_historical_data_for_backtesting(coin_symbols: List[str], days: int = 730) -> pd.DataFrame:
+async def fetch_market_cap_from_coingecko(coin_id: str, date: str, client: Optional[httpx.AsyncClient] = None) -> float:
+    """
+    Fetch the market cap of a coin on a single date from CoinGecko.
+
+    Prefer HistoryBackfill.fetch_market_caps for ranges; it needs one request per coin
+    instead of one per date.
+
+    Args:
+        coin_id (str): CoinGecko coin id (e.g., 'bitcoin').
+        date (str): Date in dd-mm-yyyy format.
+        client (httpx.AsyncClient): Optional shared client.
+
+    Returns:
+        float: Market cap in EUR, or 0.0 if unavailable.
+    """
+    url = f"{COINGECKO_API_BASE_URL}/coins/{coin_id}/history"
+    params = {'date': date, 'localization': 'false'}
+    try:
+        if client is None:
+            async with httpx.AsyncClient() as own_client:
+                response = await own_client.get(url, params=params)
+        else:
+            response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        return float(data.get('market_data', {}).get('market_cap', {}).get('eur', 0.0))
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error fetching market cap for {coin_id} on {date}: {e}")
+        return 0.0
+
+async def estimate_market_cap_from_volume(df: pd.DataFrame, coin_symbol: str) -> pd.DataFrame:
+    """
+    Estimate market cap from traded value when no market cap data is available.
+
+    Args:
+        df (pd.DataFrame): Candles with 'close' and 'volume' columns.
+        coin_symbol (str): The market symbol, used for logging only.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with a 'market_cap' column.
+    """
+    df = df.copy()
+    df['market_cap'] = df['close'] * df['volume'] * VOLUME_TO_MARKET_CAP_RATIO
+    print(f"Using volume-based market cap estimate for {coin_symbol}.")
+    return df
+
+async def fetch_historical_data_for_backtesting(coin_symbols: List[str], days: int = 730, interval: str = '1d',
+                                                store_path: str = DEFAULT_STORE_PATH) -> pd.DataFrame:
     """
     Fetches historical data for a list of coin symbols from Bitvavo and returns it as a single Pandas DataFrame.
+
+    Candles are backfilled concurrently into a local store first, so repeated calls only
+    fetch windows that are not stored yet, and missing candles are requested again.
     
     Args:
         coin_symbols (List[str]): A list of coin symbols (e.g., ['BTC-EUR', 'ETH-EUR']).
         days (int): The number of days of historical data to fetch.
+        interval (str): Candle interval (e.g., '1h', '1d').
+        store_path (str): Path of the local candle store.
         
     Returns:
         pd.DataFrame: A DataFrame containing historical data for all coins.
@@ -75,51 +149,41 @@ async def fetch_historical_data_for_backtesting(coin_symbols: List[str], days: i
     start_timestamp_ms = int(start_time.timestamp() * 1000)
     end_timestamp_ms = int(end_time.timestamp() * 1000)
 
-    for coin_symbol in coin_symbols:
-        try:
-            # Fetch daily candlestick data
-            df_candlestick = await fetch_bitvavo_candlestick_data(
-                symbol=coin_symbol,
-                interval='1d', # Daily interval
-                start_time=start_timestamp_ms,
-                end_time=end_timestamp_ms
+    store = CandleStore(store_path)
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            backfill = HistoryBackfill(store, base_url=BITVAVO_API_BASE_URL, client=client)
+            summary = await backfill.backfill(coin_symbols, interval, start_timestamp_ms, end_timestamp_ms)
+            print(f"Backfill: {summary['windows']} windows fetched, {summary['skipped']} already stored, "
+                  f"{summary['candles']} candles, {len(summary['failed'])} failed.")
+            await backfill.fill_gaps(coin_symbols, interval, start_timestamp_ms, end_timestamp_ms)
+
+            # One market cap request per coin for the whole range
+            coin_ids = [SYMBOL_TO_COINGECKO.get(s, s.split('-')[0].lower()) for s in coin_symbols]
+            market_caps = await asyncio.gather(
+                *(backfill.fetch_market_caps(coin_id, start_timestamp_ms, end_timestamp_ms) for coin_id in coin_ids)
             )
-            
-            if not df_candlestick.empty:
-                df_candlestick['symbol'] = coin_symbol
-                
-                # Fetch real market cap data from CoinGecko API
-                coin_id = SYMBOL_TO_COINGECKO.get(coin_symbol, coin_symbol.split('-')[0].lower())
-                date_str = df_candlestick['timestamp'].dt.strftime('%d-%m-%Y').iloc[0]
-                
-                # For each date, fetch market cap (in practice, you might want to batch this)
-                market_caps = []
-                for date in df_candlestick['timestamp'].dt.strftime('%d-%m-%Y'):
-                    market_cap = await fetch_market_cap_from_coingecko(coin_id, date)
-                    market_caps.append(market_cap)
-                
-                df_candlestick['market_cap'] = market_caps
-                
+
+        for coin_symbol, caps in zip(coin_symbols, market_caps):
+            df_candlestick = store.load(coin_symbol, interval, start_timestamp_ms, end_timestamp_ms)
+            if df_candlestick.empty:
+                print(f"No historical data found for {coin_symbol}.")
+                continue
+
+            df_candlestick['symbol'] = coin_symbol
+            if caps.empty:
                 # If CoinGecko fails, use volume-based estimation as fallback
-                if all(mc == 0 for mc in market_caps):
-                    df_candlestick = await estimate_market_cap_from_volume(df_candlestick, coin_symbol)
-                
-                # Set date_added to the first timestamp for each coin
-                df_candlestick['date_added'] = df_candlestick['timestamp'].min()
-                
-                all_historical_data.append(df_candlestick)
-                print(f"Successfully fetched {df_candlestick.shape[0]} daily records for {coin_symbol}.")
+                df_candlestick = await estimate_market_cap_from_volume(df_candlestick, coin_symbol)
             else:
-                print(f"No daily historical data found for {coin_symbol}.")
-
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error fetching data for {coin_symbol}: {e.response.status_code} - {e.response.text}")
-        except httpx.RequestError as e:
-            print(f"Request error fetching data for {coin_symbol}: {e}")
-        except Exception as e:
-            print(f"An unexpected error occurred for {coin_symbol}: {e}")
-        
-        await asyncio.sleep(0.1) # Be kind to the API
+                df_candlestick['market_cap'] = df_candlestick['timestamp'].dt.normalize().map(caps).ffill().bfill()
+
+            # Set date_added to the first timestamp for each coin
+            df_candlestick['date_added'] = df_candlestick['timestamp'].min()
+
+            all_historical_data.append(df_candlestick)
+            print(f"Successfully loaded {df_candlestick.shape[0]} {interval} records for {coin_symbol}.")
+    finally:
+        store.close()
 
     if not all_historical_data:
         print("No historical data fetched. Returning empty DataFrame.")
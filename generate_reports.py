@@ -2,7 +2,7 @@ import pandas as pd
 import numpy as np
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from sqlalchemy import create_engine, text
 from typing import Dict, Any, List
 
@@ -12,6 +12,55 @@ from model_evaluation import evaluate_classification_model, evaluate_trading_per
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+PERIOD_DAYS = {'daily': 1, 'weekly': 7, 'monthly': 30}
+METRIC_COLUMNS = ('accuracy', 'model_precision', 'recall', 'f1_score')
+
+# Closed-day aggregates, created by sql/add_report_indexes.sql
+SUMMARY_TABLE = 'report_daily_summary'
+SIGNAL_SUMMARY_TABLE = 'report_daily_signals'
+
+
+def _as_date(value) -> date:
+    """DATE() comes back as a date from MySQL and as a string from SQLite."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _day_ranges(days: List[date]) -> List[tuple]:
+    """Collapse days into (first_day, day_after_last) runs of consecutive days."""
+    ranges = []
+    for day in sorted(days):
+        if ranges and ranges[-1][1] == day:
+            ranges[-1][1] = day + timedelta(days=1)
+        else:
+            ranges.append([day, day + timedelta(days=1)])
+    return [tuple(r) for r in ranges]
+
+
+def _combine_days(signal_days: Dict, metric_days: Dict, start_day: date, end_day: date) -> Dict:
+    """Merge daily aggregates for [start_day, end_day]."""
+    signals, metrics = {}, {c: [0.0, 0] for c in METRIC_COLUMNS}
+    day = start_day
+    while day <= end_day:
+        for signal, (frequency, conf_sum, conf_count) in signal_days.get(day, {}).items():
+            total = signals.setdefault(signal, [0, 0.0, 0])
+            total[0] += frequency
+            total[1] += conf_sum
+            total[2] += conf_count
+        for column, (value_sum, count) in metric_days.get(day, {}).items():
+            metrics[column][0] += value_sum
+            metrics[column][1] += count
+        day += timedelta(days=1)
+    return {
+        'signals': {s: {'frequency': f, 'confidence_sum': cs, 'confidence_count': cc}
+                    for s, (f, cs, cc) in signals.items()},
+        'metrics': {c: (v / n if n else None) for c, (v, n) in metrics.items()}
+    }
+
+
 class ReportGenerator:
     def __init__(self, db_connection_string: str, config: Dict = None):
         self.db_connection_string = db_connection_string
@@ -31,84 +80,176 @@ class ReportGenerator:
             raise
 
     def generate_comprehensive_report(self, timeframe: str = 'daily') -> str:
+        aggregates = self._load_period_aggregates(timeframe)
         report_data = {
             "title": f"Comprehensive Crypto Trading Bot Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "summary": self._get_summary_data(timeframe),
-            "performance_metrics": self._get_performance_metrics(),
-            "trading_performance": self._get_trading_performance_data(),
-            "decision_patterns": self._get_decision_patterns_data(),
-            "model_comparison": self._get_model_comparison_data()
+            "summary": self._get_summary_data(timeframe, aggregates['current']),
+            "performance_metrics": self._get_performance_metrics(aggregates['current']),
+            "decision_patterns": self._get_decision_patterns_data(aggregates['current']),
+            "model_comparison": self._get_model_comparison_data(timeframe, aggregates)
         }
         return self._render_html_report(report_data)
 
-    def _get_summary_data(self, timeframe: str) -> Dict:
-        # Placeholder for summary data from explanation_engine
-        # This would involve calling explanation_engine.generate_report(timeframe)
-        # For now, return dummy data
+    def _load_period_aggregates(self, timeframe: str) -> Dict:
+        """Signal and learning-metric aggregates for the current and the previous period."""
+        days = PERIOD_DAYS.get(timeframe, 1)
+        today = date.today()
+        current_start = today - timedelta(days=days - 1)
+        previous_start = current_start - timedelta(days=days)
+        signal_days, metric_days = {}, {}
+        try:
+            signal_days, metric_days = self._daily_aggregates(previous_start, today)
+        except Exception as e:
+            logging.error(f"Error aggregating report data: {e}")
         return {
-            "period": timeframe,
-            "total_decisions": 100,
-            "buy_signals": 50,
-            "sell_signals": 30,
-            "hold_signals": 20,
-            "avg_confidence": 0.75
+            'current': _combine_days(signal_days, metric_days, current_start, today),
+            'previous': _combine_days(signal_days, metric_days, previous_start, current_start - timedelta(days=1)),
+            'current_start': current_start,
+            'previous_start': previous_start,
+            'end': today
         }
 
-    def _get_performance_metrics(self) -> Dict:
-        # Fetch data from learning_metrics table
+    def _daily_aggregates(self, start_day: date, today: date) -> tuple:
+        """
+        Per-day aggregates for [start_day, today].
+
+        Closed days are read from the summary tables. Closed days not summarized yet and
+        today are aggregated from trading_signals and learning_metrics with one grouped query
+        per table, and the closed ones are stored so no later report scans them again. Rows
+        written for a day after it was summarized are therefore not counted.
+        """
         try:
-            query = "SELECT AVG(accuracy) as avg_accuracy, AVG(model_precision) as avg_precision, AVG(recall) as avg_recall, AVG(f1_score) as avg_f1_score FROM learning_metrics"
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query)).fetchone()
-                if result:
-                    return {
-                        "accuracy": result.avg_accuracy,
-                        "precision": result.avg_precision,
-                        "recall": result.avg_recall,
-                        "f1_score": result.avg_f1_score
-                    }
-                return {}
+            signal_days, metric_days = self._read_closed_days(start_day, today)
+            summaries_available = True
         except Exception as e:
-            logging.error(f"Error fetching performance metrics: {e}")
-            return {}
+            logging.warning(f"Daily report summaries unavailable ({e}); run sql/add_report_indexes.sql")
+            signal_days, metric_days = {}, {}
+            summaries_available = False
+
+        missing = [start_day + timedelta(days=i) for i in range((today - start_day).days)]
+        missing = [day for day in missing if day not in metric_days]
+        fetched_signals, fetched_metrics = self._aggregate_raw_days(_day_ranges(missing + [today]))
+
+        if summaries_available and missing:
+            try:
+                self._store_closed_days(missing, fetched_signals, fetched_metrics)
+            except Exception as e:
+                logging.error(f"Error storing daily report summaries: {e}")
+        signal_days.update(fetched_signals)
+        metric_days.update(fetched_metrics)
+        return signal_days, metric_days
+
+    def _read_closed_days(self, start_day: date, today: date) -> tuple:
+        params = {"start": start_day, "today": today}
+        metric_columns = ", ".join(f"{c}_sum, {c}_count" for c in METRIC_COLUMNS)
+        with self.engine.connect() as connection:
+            metric_rows = connection.execute(text(
+                f"SELECT day, {metric_columns} FROM {SUMMARY_TABLE} "
+                "WHERE day >= :start AND day < :today"), params).fetchall()
+            signal_rows = connection.execute(text(
+                f"SELECT day, trade_signal, frequency, confidence_sum, confidence_count FROM {SIGNAL_SUMMARY_TABLE} "
+                "WHERE day >= :start AND day < :today"), params).fetchall()
+        return self._parse_signal_rows(signal_rows), self._parse_metric_rows(metric_rows)
+
+    def _aggregate_raw_days(self, ranges: List[tuple]) -> tuple:
+        params, where = {}, []
+        for i, (first, end) in enumerate(ranges):
+            params[f"start_{i}"] = datetime.combine(first, time.min)
+            params[f"end_{i}"] = datetime.combine(end, time.min)
+            where.append(f"(timestamp >= :start_{i} AND timestamp < :end_{i})")
+        where = " OR ".join(where)
+        metric_columns = ", ".join(f"SUM({c}) AS {c}_sum, COUNT({c}) AS {c}_count" for c in METRIC_COLUMNS)
+        signals_query = ("SELECT DATE(timestamp) AS day, trade_signal, COUNT(*) AS frequency, "
+                         "SUM(confidence) AS confidence_sum, COUNT(confidence) AS confidence_count "
+                         f"FROM trading_signals WHERE {where} GROUP BY DATE(timestamp), trade_signal")
+        metrics_query = (f"SELECT DATE(timestamp) AS day, {metric_columns} "
+                         f"FROM learning_metrics WHERE {where} GROUP BY DATE(timestamp)")
+
+        with self.engine.connect() as connection:
+            signal_rows = connection.execute(text(signals_query), params).fetchall()
+            metric_rows = connection.execute(text(metrics_query), params).fetchall()
+        return self._parse_signal_rows(signal_rows), self._parse_metric_rows(metric_rows)
+
+    def _store_closed_days(self, days: List[date], signal_days: Dict, metric_days: Dict):
+        """Insert the summaries of closed days. Days without metrics still get a row, marking them done."""
+        empty = {c: (0.0, 0) for c in METRIC_COLUMNS}
+        summary_rows = [{"day": day, **{f"{c}_{part}": value
+                                        for c, pair in metric_days.get(day, empty).items()
+                                        for part, value in zip(("sum", "count"), pair)}}
+                        for day in days]
+        # trade_signal is part of the key, so a missing signal is stored as ''
+        signal_rows = [{"day": day, "trade_signal": signal or '', "frequency": f, "confidence_sum": cs, "confidence_count": cc}
+                       for day in days for signal, (f, cs, cc) in signal_days.get(day, {}).items()]
+        metric_columns = [f"{c}_{part}" for c in METRIC_COLUMNS for part in ("sum", "count")]
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                f"INSERT INTO {SUMMARY_TABLE} (day, {', '.join(metric_columns)}) "
+                f"VALUES (:day, {', '.join(':' + c for c in metric_columns)})"), summary_rows)
+            if signal_rows:
+                connection.execute(text(
+                    f"INSERT INTO {SIGNAL_SUMMARY_TABLE} (day, trade_signal, frequency, confidence_sum, confidence_count) "
+                    "VALUES (:day, :trade_signal, :frequency, :confidence_sum, :confidence_count)"), signal_rows)
+
+    @staticmethod
+    def _parse_signal_rows(rows) -> Dict:
+        signal_days = {}
+        for row in rows:
+            signal_days.setdefault(_as_date(row.day), {})[row.trade_signal or None] = (
+                row.frequency, float(row.confidence_sum or 0), row.confidence_count)
+        return signal_days
 
-    def _get_trading_performance_data(self) -> Dict:
-        # This would typically involve fetching actual trading data and predictions
-        # and then calling evaluate_trading_performance from model_evaluation.py
-        # For now, return dummy data
+    @staticmethod
+    def _parse_metric_rows(rows) -> Dict:
+        return {_as_date(row.day): {c: (float(getattr(row, f"{c}_sum") or 0), getattr(row, f"{c}_count"))
+                                    for c in METRIC_COLUMNS}
+                for row in rows}
+
+    def _get_summary_data(self, timeframe: str, aggregates: Dict) -> Dict:
+        signals = aggregates['signals']
+        confidence_sum = sum(s['confidence_sum'] for s in signals.values())
+        confidence_count = sum(s['confidence_count'] for s in signals.values())
         return {
-            "initial_balance": 10000,
-            "final_balance": 12000,
-            "total_return": 0.20,
-            "annualized_return": 0.25,
-            "max_drawdown": 0.10
+            "period": timeframe,
+            "total_decisions": sum(s['frequency'] for s in signals.values()),
+            "buy_signals": signals.get('buy', {}).get('frequency', 0),
+            "sell_signals": signals.get('sell', {}).get('frequency', 0),
+            "hold_signals": signals.get('hold', {}).get('frequency', 0),
+            "avg_confidence": round(confidence_sum / confidence_count, 2) if confidence_count else 'N/A'
         }
 
-    def _get_decision_patterns_data(self) -> List[Dict]:
-        # Fetch data from trading_signals table
-        try:
-            query = "SELECT trade_signal, COUNT(*) as frequency, AVG(confidence) as avg_confidence FROM trading_signals GROUP BY trade_signal"
-            with self.engine.connect() as connection:
-                result = connection.execute(text(query)).fetchall()
-                patterns = []
-                for row in result:
-                    patterns.append({
-                        "signal": row.trade_signal,
-                        "frequency": row.frequency,
-                        "avg_confidence": f'{row.avg_confidence:.2f}' if isinstance(row.avg_confidence, (int, float)) else 'N/A'
-                    })
-                return patterns
-        except Exception as e:
-            logging.error(f"Error fetching decision patterns: {e}")
-            return []
+    def _get_performance_metrics(self, aggregates: Dict) -> Dict:
+        metrics = {c: (round(v, 4) if v is not None else 'N/A') for c, v in aggregates['metrics'].items()}
+        return {
+            "accuracy": metrics['accuracy'],
+            "precision": metrics['model_precision'],
+            "recall": metrics['recall'],
+            "f1_score": metrics['f1_score']
+        }
 
-    def _get_model_comparison_data(self) -> List[Dict]:
-        # This would involve fetching evaluation results for different models
-        # and potentially calling compare_models from model_evaluation.py
-        # For now, return dummy data
+    def _get_decision_patterns_data(self, aggregates: Dict) -> List[Dict]:
+        patterns = []
+        for signal, stats in sorted(aggregates['signals'].items(), key=lambda item: str(item[0])):
+            patterns.append({
+                "signal": signal,
+                "frequency": stats['frequency'],
+                "avg_confidence": f"{stats['confidence_sum'] / stats['confidence_count']:.2f}" if stats['confidence_count'] else 'N/A'
+            })
+        return patterns
+
+    def _get_model_comparison_data(self, timeframe: str, aggregates: Dict) -> List[Dict]:
+        # learning_metrics has no model column, so the model is compared against itself
+        # over the previous period of the same length
+        def row(label, metrics):
+            return {
+                "model": label,
+                "accuracy": f"{metrics['accuracy']:.2f}" if metrics['accuracy'] is not None else 'N/A',
+                "f1_score": f"{metrics['f1_score']:.2f}" if metrics['f1_score'] is not None else 'N/A'
+            }
         return [
-            {"model": "Model A", "accuracy": f'{0.85:.2f}', "f1_score": f'{0.82:.2f}'},
-            {"model": "Model B", "accuracy": f'{0.88:.2f}', "f1_score": f'{0.86:.2f}'}
+            row(f"Current {timeframe} ({aggregates['current_start']} - {aggregates['end']})",
+                aggregates['current']['metrics']),
+            row(f"Previous {timeframe} ({aggregates['previous_start']} - "
+                f"{aggregates['current_start'] - timedelta(days=1)})", aggregates['previous']['metrics'])
         ]
 
     def _render_html_report(self, data: Dict) -> str:
@@ -170,32 +311,6 @@ class ReportGenerator:
                     </div>
                 </div>
 
-                <div class="section">
-                    <h2>Trading Performance</h2>
-                    <div class="metric-grid">
-                        <div class="metric-item">
-                            <h3>Initial Balance</h3>
-                            <p>${data['trading_performance']['initial_balance']:.2f}</p>
-                        </div>
-                        <div class="metric-item">
-                            <h3>Final Balance</h3>
-                            <p>${data['trading_performance']['final_balance']:.2f}</p>
-                        </div>
-                        <div class="metric-item">
-                            <h3>Total Return</h3>
-                            <p>{data['trading_performance']['total_return']:.2%}</p>
-                        </div>
-                        <div class="metric-item">
-                            <h3>Annualized Return</h3>
-                            <p>{data['trading_performance']['annualized_return']:.2%}</p>
-                        </div>
-                        <div class="metric-item">
-                            <h3>Max Drawdown</h3>
-                            <p>{data['trading_performance']['max_drawdown']:.2%}</p>
-                        </div>
-                    </div>
-                </div>
-
                 <div class="section">
                     <h2>Decision Patterns</h2>
                     <table>
@@ -0,0 +1,357 @@
+"""
+Windowed, resumable candle backfill.
+
+Splits each symbol's date range into exchange-sized windows and fetches them
+concurrently over one shared httpx client. Every source gets its own
+concurrency cap, completed windows are recorded in a local SQLite ledger so an
+interrupted backfill resumes where it stopped, and gap detection re-requests
+candles that are missing inside the stored range.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BITVAVO_API_BASE_URL = "https://api.bitvavo.com/v2"
+COINGECKO_API_BASE_URL = "https://api.coingecko.com/api/v3"
+
+# Local store for fetched candles and the window ledger
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'history_backfill.db')
+
+# Maximum number of in-flight requests per upstream source
+SOURCE_CONCURRENCY = {
+    'bitvavo': 4,
+    'coingecko': 1,
+}
+
+# Candle interval lengths in milliseconds (Bitvavo interval names)
+INTERVAL_MS = {
+    '1m': 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3_600_000,
+    '2h': 2 * 3_600_000,
+    '4h': 4 * 3_600_000,
+    '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000,
+    '12h': 12 * 3_600_000,
+    '1d': 86_400_000,
+}
+
+CANDLE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+@dataclass(frozen=True)
+class Window:
+    """Half-open time range [start_ms, end_ms) of candles for one symbol."""
+    symbol: str
+    interval: str
+    start_ms: int
+    end_ms: int
+
+
+def align_down(timestamp_ms: int, interval: str) -> int:
+    """Round a millisecond timestamp down to the start of its candle."""
+    step = INTERVAL_MS[interval]
+    return timestamp_ms - (timestamp_ms % step)
+
+
+def split_windows(symbol: str, interval: str, start_ms: int, end_ms: int, limit: int = 1000) -> List[Window]:
+    """
+    Cover [start_ms, end_ms) with windows of exactly `limit` candles.
+
+    Windows sit on a fixed grid of multiples of `limit` candles from the epoch, so
+    overlapping ranges produce the same windows whatever their start and end, which
+    is what makes the ledger resumable. The first and last window may extend past
+    the range.
+    """
+    span = INTERVAL_MS[interval] * limit
+    start = start_ms - start_ms % span
+    windows = []
+    while start < end_ms:
+        windows.append(Window(symbol, interval, start, start + span))
+        start += span
+    return windows
+
+
+def closed_until(interval: str, now_ms: Optional[int] = None) -> int:
+    """End of the last closed candle; candles from here on are still open."""
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    return align_down(now_ms, interval)
+
+
+class CandleStore:
+    """SQLite store for candles and the ledger of completed backfill windows."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS candles (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    PRIMARY KEY (symbol, interval, timestamp)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS backfill_windows (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    start_ms INTEGER NOT NULL,
+                    end_ms INTEGER NOT NULL,
+                    candles INTEGER NOT NULL,
+                    fetched_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (symbol, interval, start_ms, end_ms)
+                )
+            """)
+
+    def close(self):
+        self._conn.close()
+
+    def completed_windows(self, symbol: str, interval: str) -> set:
+        """Return the (start_ms, end_ms) pairs already stored for a symbol."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_ms, end_ms FROM backfill_windows WHERE symbol = ? AND interval = ?",
+                (symbol, interval),
+            ).fetchall()
+        return {(start, end) for start, end in rows}
+
+    def save_window(self, window: Window, candles: List[list], complete: bool = True):
+        """
+        Store a window's candles and, if `complete`, mark the window done in one transaction.
+
+        Windows reaching into open candles are stored but not marked, so they are
+        fetched again until every candle in them has closed.
+        """
+        rows = [
+            (window.symbol, window.interval, int(c[0]), float(c[1]), float(c[2]),
+             float(c[3]), float(c[4]), float(c[5]))
+            for c in candles
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO candles (symbol, interval, timestamp, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if not complete:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO backfill_windows (symbol, interval, start_ms, end_ms, candles) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (window.symbol, window.interval, window.start_ms, window.end_ms, len(rows)),
+            )
+
+    def timestamps(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT timestamp FROM candles WHERE symbol = ? AND interval = ? "
+                "AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                (symbol, interval, start_ms, end_ms),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def find_gaps(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """
+        Return missing candle ranges as half-open (start_ms, end_ms) pairs.
+
+        Only the span between the first and last stored candle is checked, so
+        the period before a coin was listed is not reported as a gap.
+        """
+        stamps = self.timestamps(symbol, interval, start_ms, end_ms)
+        if len(stamps) < 2:
+            return []
+        step = INTERVAL_MS[interval]
+        gaps = []
+        for previous, current in zip(stamps, stamps[1:]):
+            if current - previous > step:
+                gaps.append((previous + step, current))
+        return gaps
+
+    def load(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> pd.DataFrame:
+        """Load stored candles as a DataFrame with a datetime `timestamp` column."""
+        with self._lock:
+            df = pd.read_sql_query(
+                "SELECT timestamp, open, high, low, close, volume FROM candles "
+                "WHERE symbol = ? AND interval = ? AND timestamp >= ? AND timestamp < ? "
+                "ORDER BY timestamp",
+                self._conn,
+                params=(symbol, interval, start_ms, end_ms),
+            )
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+
+class HistoryBackfill:
+    """
+    Concurrent candle backfill over one shared client.
+
+    Args:
+        store (CandleStore): Where candles and completed windows are recorded.
+        base_url (str): Bitvavo-compatible REST base URL.
+        concurrency (dict): Per-source in-flight request caps, merged over SOURCE_CONCURRENCY.
+        window_limit (int): Candles per request window.
+        client (httpx.AsyncClient): Optional client to share; one is created per run otherwise.
+    """
+
+    def __init__(self, store: CandleStore, base_url: str = BITVAVO_API_BASE_URL,
+                 concurrency: Optional[Dict[str, int]] = None, window_limit: int = 1000,
+                 client: Optional[httpx.AsyncClient] = None, timeout: float = 30.0,
+                 max_retries: int = 3):
+        self.store = store
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = {**SOURCE_CONCURRENCY, **(concurrency or {})}
+        self.window_limit = window_limit
+        self.client = client
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, source: str) -> asyncio.Semaphore:
+        if source not in self._semaphores:
+            self._semaphores[source] = asyncio.Semaphore(self.concurrency.get(source, 1))
+        return self._semaphores[source]
+
+    async def _get_json(self, client: httpx.AsyncClient, source: str, url: str, params: dict):
+        """GET under the source's concurrency cap, retrying transient failures."""
+        for attempt in range(self.max_retries):
+            async with self._semaphore(source):
+                try:
+                    response = await client.get(url, params=params)
+                    response.raise_for_status()
+                    return response.json()
+                except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                    status = getattr(getattr(e, 'response', None), 'status_code', None)
+                    if status is not None and status < 500 and status != 429:
+                        raise
+                    if attempt == self.max_retries - 1:
+                        raise
+                    logger.warning(f"Retrying {source} request ({attempt + 1}/{self.max_retries}): {e}")
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def fetch_window(self, client: httpx.AsyncClient, window: Window) -> List[list]:
+        """Fetch one window of candles, keeping only rows inside the window."""
+        data = await self._get_json(
+            client, 'bitvavo',
+            f"{self.base_url}/markets/{window.symbol}/candles",
+            {
+                'interval': window.interval,
+                'start': window.start_ms,
+                'end': window.end_ms,
+                'limit': self.window_limit,
+            },
+        )
+        return [c for c in data if window.start_ms <= int(c[0]) < window.end_ms]
+
+    async def _fetch_and_store(self, client: httpx.AsyncClient, window: Window) -> int:
+        candles = await self.fetch_window(client, window)
+        complete = window.end_ms <= closed_until(window.interval)
+        await asyncio.to_thread(self.store.save_window, window, candles, complete)
+        return len(candles)
+
+    async def _run_windows(self, client: httpx.AsyncClient, windows: Iterable[Window]) -> dict:
+        windows = list(windows)
+        results = await asyncio.gather(
+            *(self._fetch_and_store(client, w) for w in windows), return_exceptions=True
+        )
+        summary = {'windows': len(windows), 'candles': 0, 'failed': []}
+        for window, result in zip(windows, results):
+            if isinstance(result, Exception):
+                logger.error(f"Window {window} failed: {result}")
+                summary['failed'].append(window)
+            else:
+                summary['candles'] += result
+        return summary
+
+    async def _with_client(self, func, *args):
+        if self.client is not None:
+            return await func(self.client, *args)
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            return await func(client, *args)
+
+    def pending_windows(self, symbols: List[str], interval: str, start_ms: int, end_ms: int) -> List[Window]:
+        """Return the windows in range that the ledger does not mark as stored."""
+        pending = []
+        for symbol in symbols:
+            done = self.store.completed_windows(symbol, interval)
+            for window in split_windows(symbol, interval, start_ms, end_ms, self.window_limit):
+                if (window.start_ms, window.end_ms) not in done:
+                    pending.append(window)
+        return pending
+
+    async def backfill(self, symbols: List[str], interval: str, start_ms: int, end_ms: int) -> dict:
+        """
+        Fetch every pending window for `symbols` in [start_ms, end_ms).
+
+        Returns:
+            dict: {'windows': fetched window count, 'skipped': windows already stored,
+                   'candles': candles stored, 'failed': list of failed windows}
+        """
+        total = sum(len(split_windows(s, interval, start_ms, end_ms, self.window_limit)) for s in symbols)
+        pending = self.pending_windows(symbols, interval, start_ms, end_ms)
+        summary = await self._with_client(self._run_windows, pending)
+        summary['skipped'] = total - len(pending)
+        return summary
+
+    async def fill_gaps(self, symbols: List[str], interval: str, start_ms: int, end_ms: int) -> dict:
+        """Detect missing candles inside the stored range and request them again."""
+        windows = []
+        for symbol in symbols:
+            for gap_start, gap_end in self.store.find_gaps(symbol, interval, start_ms, end_ms):
+                windows.extend(split_windows(symbol, interval, gap_start, gap_end, self.window_limit))
+        # Several gaps can fall into the same grid window
+        windows = list(dict.fromkeys(windows))
+        summary = await self._with_client(self._run_windows, windows)
+        summary['remaining_gaps'] = {
+            symbol: self.store.find_gaps(symbol, interval, start_ms, end_ms) for symbol in symbols
+        }
+        return summary
+
+    async def fetch_market_caps(self, coin_id: str, start_ms: int, end_ms: int,
+                                base_url: str = COINGECKO_API_BASE_URL) -> pd.Series:
+        """
+        Fetch CoinGecko market caps for a whole range in one request.
+
+        Returns:
+            pd.Series: Market cap indexed by UTC calendar date; empty on failure.
+        """
+        async def _fetch(client):
+            data = await self._get_json(
+                client, 'coingecko',
+                f"{base_url.rstrip('/')}/coins/{coin_id}/market_chart/range",
+                {'vs_currency': 'eur', 'from': start_ms // 1000, 'to': end_ms // 1000},
+            )
+            return data.get('market_caps', [])
+
+        try:
+            points = await self._with_client(_fetch)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"CoinGecko market caps unavailable for {coin_id}: {e}")
+            return pd.Series(dtype=float)
+        if not points:
+            return pd.Series(dtype=float)
+        frame = pd.DataFrame(points, columns=['timestamp', 'market_cap'])
+        frame['date'] = pd.to_datetime(frame['timestamp'], unit='ms').dt.normalize()
+        return frame.groupby('date')['market_cap'].last()
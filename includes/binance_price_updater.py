@@ -1,14 +1,25 @@
 import json
+import os
 import time
 import mysql.connector # type: ignore
 import requests
 import logging
 import signal
 import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.market_stream import StreamPublisher
+
+# Base URL can be overridden to point at tools/mock_exchange.py
+BINANCE_API_URL = os.getenv('BINANCE_API_URL', 'https://api.binance.com')
 
 # For clean exit
 running = True
 
+# Live dashboard stream (backend/app.py); publishing never blocks or fails the update loop
+stream = StreamPublisher()
+
 def signal_handler(sig, frame):
     global running
     script_logger.info("Shutting down gracefully...")
@@ -64,7 +75,7 @@ def fetch_binance_prices(symbols):
     """Fetches current prices for given symbols from Binance API."""
     prices = {}
     try:
-        url = "https://api.binance.com/api/v3/ticker/price"
+        url = f"{BINANCE_API_URL}/api/v3/ticker/price"
         response = requests.get(url)
         response.raise_for_status()
         data = response.json()
@@ -94,6 +105,7 @@ def log_and_save_portfolio_prices():
             port=3307
         )
         cursor = connection.cursor()
+        current_time = datetime.now()
 
         for symbol_eur in symbols_to_track:
             if symbol_eur in prices:
@@ -101,6 +113,7 @@ def log_and_save_portfolio_prices():
                 symbol = symbol_eur.replace('EUR', '')
 
                 price_logger.info(f"{symbol_eur}:{price}")
+                stream.publish('price', symbol_eur, {'price': price, 'coin_id': symbol, 'timestamp': current_time})
 
                 insert_query = "INSERT INTO price_history (coin_id, price) VALUES (%s, %s)"
                 cursor.execute(insert_query, (symbol, price))
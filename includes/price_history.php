@@ -0,0 +1,164 @@
+<?php
+/**
+ * Price history reader.
+ *
+ * Raw price_history rows are expired by crons/price_history_retention.py after they have been
+ * downsampled into the price_history_1m/_1h/_1d OHLCV tables. These helpers pick the coarsest
+ * resolution that still covers a requested range at the requested spacing, mirroring
+ * choose_resolution() in the cron so PHP and Python readers agree.
+ */
+
+require_once __DIR__ . '/database.php';
+
+define('PRICE_HISTORY_RETENTION_CONFIG', __DIR__ . '/../config/price_history_retention.json');
+
+/**
+ * Retention settings, shared with the Python cron.
+ */
+function getPriceHistoryRetentionConfig(): array {
+    static $config = null;
+    if ($config === null) {
+        $json = @file_get_contents(PRICE_HISTORY_RETENTION_CONFIG);
+        $config = $json ? json_decode($json, true) : null;
+        if (!$config) {
+            $config = ['raw_retention_days' => null, 'default_max_points' => 500, 'resolutions' => []];
+        }
+    }
+    return $config;
+}
+
+/**
+ * Pick the coarsest resolution whose bucket is no wider than $step seconds and whose retention covers $start.
+ *
+ * @param int $start Range start (unix seconds)
+ * @param int $end Range end (unix seconds)
+ * @param int|null $step Desired spacing between points in seconds, defaults to range / max points
+ * @return array ['name' => ..., 'table' => ..., 'seconds' => ...]
+ */
+function choosePriceHistoryResolution(int $start, int $end, ?int $step = null, ?int $maxPoints = null): array {
+    $config = getPriceHistoryRetentionConfig();
+    $maxPoints = $maxPoints ?: ($config['default_max_points'] ?? 500);
+    if ($step === null) {
+        $step = max($end - $start, 0) / $maxPoints;
+    }
+
+    $candidates = [['name' => 'raw', 'table' => 'price_history', 'seconds' => 0,
+                    'retention_days' => $config['raw_retention_days'] ?? null]];
+    foreach ($config['resolutions'] as $name => $spec) {
+        $candidates[] = array_merge($spec, ['name' => $name]);
+    }
+    usort($candidates, function ($a, $b) { return $a['seconds'] <=> $b['seconds']; });
+
+    $now = time();
+    $covering = array_values(array_filter($candidates, function ($r) use ($start, $now) {
+        return $r['retention_days'] === null || $start >= $now - $r['retention_days'] * 86400;
+    }));
+    if (empty($covering)) {
+        return end($candidates);
+    }
+    $fineEnough = array_values(array_filter($covering, function ($r) use ($step) {
+        return $r['seconds'] <= $step;
+    }));
+    return $fineEnough ? end($fineEnough) : $covering[0];
+}
+
+/**
+ * Oldest timestamp available for a coin across raw and daily data (unix seconds), or null.
+ */
+function getPriceHistoryStart(PDO $db, string $coinId): ?int {
+    $oldest = [];
+    $queries = ["SELECT MIN(recorded_at) FROM price_history WHERE coin_id = ?"];
+    $config = getPriceHistoryRetentionConfig();
+    foreach ($config['resolutions'] as $spec) {
+        $queries[] = "SELECT MIN(bucket_start) FROM {$spec['table']} WHERE coin_id = ?";
+    }
+    foreach ($queries as $sql) {
+        try {
+            $stmt = $db->prepare($sql);
+            $stmt->execute([$coinId]);
+            $value = $stmt->fetchColumn();
+            if ($value) {
+                $oldest[] = strtotime($value);
+            }
+        } catch (PDOException $e) {
+            // Rollup table not created yet
+        }
+    }
+    return $oldest ? min($oldest) : null;
+}
+
+/**
+ * Rollup rows of one resolution for a coin, including the bucket that contains $start.
+ *
+ * @throws PDOException when the rollup table does not exist
+ */
+function fetchPriceHistoryRollup(PDO $db, string $coinId, array $resolution, int $start, int $end): array {
+    $stmt = $db->prepare("SELECT bucket_start AS recorded_at, close AS price, open, high, low, volume
+                          FROM {$resolution['table']}
+                          WHERE coin_id = ? AND bucket_start > ? AND bucket_start <= ?
+                          ORDER BY bucket_start ASC");
+    $stmt->execute([$coinId, date('Y-m-d H:i:s', $start - $resolution['seconds']), date('Y-m-d H:i:s', $end)]);
+    $rows = $stmt->fetchAll(PDO::FETCH_ASSOC);
+    foreach ($rows as &$row) {
+        $row['resolution'] = $resolution['name'];
+    }
+    unset($row);
+    return $rows;
+}
+
+/**
+ * Price history for a coin between $start and $end, oldest first.
+ *
+ * Rows carry recorded_at and price (the bucket close) like raw price_history rows, plus
+ * open/high/low/volume and the resolution used. When the chosen rollup table is missing, or
+ * its rows do not reach back to $start (e.g. before the retention cron has filled it), the
+ * next finer rollup is tried, and finally the raw rows. The source reaching furthest back wins.
+ */
+function fetchPriceHistoryRange(PDO $db, string $coinId, int $start, ?int $end = null, ?int $step = null, ?int $maxPoints = null): array {
+    $end = $end ?? time();
+    $resolution = choosePriceHistoryResolution($start, $end, $step, $maxPoints);
+    $from = date('Y-m-d H:i:s', $start);
+    $to = date('Y-m-d H:i:s', $end);
+
+    $candidates = [];
+    if ($resolution['name'] !== 'raw') {
+        foreach (getPriceHistoryRetentionConfig()['resolutions'] as $name => $spec) {
+            if ($spec['seconds'] <= $resolution['seconds']) {
+                $candidates[] = array_merge($spec, ['name' => $name]);
+            }
+        }
+        usort($candidates, function ($a, $b) { return $b['seconds'] <=> $a['seconds']; });
+    }
+    // Rows of a rollup that does not reach back to $start yet; used unless a finer source reaches further
+    $partial = [];
+    foreach ($candidates as $candidate) {
+        try {
+            $rows = fetchPriceHistoryRollup($db, $coinId, $candidate, $start, $end);
+        } catch (PDOException $e) {
+            error_log("Price history rollup {$candidate['table']} unavailable: " . $e->getMessage());
+            continue;
+        }
+        if ($rows && strtotime($rows[0]['recorded_at']) <= $start) {
+            return $rows;
+        }
+        if ($rows && (!$partial || strtotime($rows[0]['recorded_at']) < strtotime($partial[0]['recorded_at']))) {
+            $partial = $rows;
+        }
+    }
+
+    $stmt = $db->prepare("SELECT recorded_at, price, price AS open, price AS high, price AS low
+                          FROM price_history
+                          WHERE coin_id = ? AND recorded_at >= ? AND recorded_at <= ?
+                          ORDER BY recorded_at ASC");
+    $stmt->execute([$coinId, $from, $to]);
+    $rows = $stmt->fetchAll(PDO::FETCH_ASSOC);
+    foreach ($rows as &$row) {
+        $row['resolution'] = 'raw';
+    }
+    unset($row);
+    if ($partial && (!$rows || strtotime($partial[0]['recorded_at']) <= strtotime($rows[0]['recorded_at']))) {
+        return $partial;
+    }
+    return $rows;
+}
+?>
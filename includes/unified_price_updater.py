@@ -1,4 +1,5 @@
 import json
+import os
 import time
 import mysql.connector # type: ignore
 import requests
@@ -6,17 +7,26 @@ import logging
 import signal
 import sys
 from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.market_stream import PORTFOLIO_ROOM, StreamPublisher
+
 BITVAVO_API_KEY='ce59283de845c416deef1dd91f10c3879f0554e18c938dc9170550cebfcfbe37'
 BITVAVO_API_SECRET='28de1f1699a1bc9845a132e91dfa888801d7437d297e419521f6b9bbce670c88ea3a937b6f5c09421573340b5cc75f98edb05cd3ca19a79ddcc820e43b20c29b'
 BINANCE_API_KEY='X8HpKiRKv6fNCulGEV2ReFpgyeS4wT0SWgokopvObB6ICUADi5nOEUZNFbcWUP9I'
 BINANCE_API_SECRET='qeJ3x3SByFxFepLXrBqkWkSYijPt2DjvNA1MVA7fykgOqgUw6Jrb0Cmmvm7DWqWs'
-BINANCE_API_URL='https://api.binance.com'
-BITVAVO_API_URL='https://api.bitvavo.com/v2/order'
+# Base URLs can be overridden to point at tools/mock_exchange.py
+BINANCE_API_URL=os.getenv('BINANCE_API_URL', 'https://api.binance.com')
+BITVAVO_REST_URL=os.getenv('BITVAVO_REST_URL', 'https://api.bitvavo.com/v2')
+BITVAVO_API_URL=f"{BITVAVO_REST_URL}/order"
 
 
 # For clean exit
 running = True
 
+# Live dashboard stream (backend/app.py); publishing never blocks or fails the update loop
+stream = StreamPublisher()
+
 # PHP API Endpoints
 SELL_API_URL = "http://localhost/NS/api/execute-sell.php"
 BUY_API_URL = "http://localhost/NS/api/execute-buy.php"
@@ -182,7 +192,7 @@ def fetch_binance_prices(symbols):
     """Fetches current prices for given symbols from Binance API."""
     prices = {}
     try:
-        url = "https://api.binance.com/api/v3/ticker/price"
+        url = f"{BINANCE_API_URL}/api/v3/ticker/price"
         response = requests.get(url)
         response.raise_for_status()
         data = response.json()
@@ -201,7 +211,8 @@ def fetch_bitvavo_prices(symbols_to_fetch):
     try:
         bitvavo_engine = Bitvavo({
             'APIKEY': BITVAVO_API_KEY,
-            'APISECRET': BITVAVO_API_SECRET
+            'APISECRET': BITVAVO_API_SECRET,
+            'RESTURL': BITVAVO_REST_URL
         })
         response = bitvavo_engine.ticker24h({})
         for item in response:
@@ -226,7 +237,7 @@ def unified_price_update_loop():
         # Fetch coins from portfolio along with their associated exchange_id from the coins table
         # Assuming portfolio.coin_id matches coins.symbol or coins.id
         cursor.execute("""
-            SELECT p.coin_id, c.exchange_id 
+            SELECT p.coin_id, c.exchange_id, p.amount
             FROM portfolio p
             JOIN coins c ON p.coin_id = c.symbol OR p.coin_id = c.id
             WHERE p.amount > 0
@@ -240,8 +251,10 @@ def unified_price_update_loop():
         binance_symbols_to_track = []
         bitvavo_symbols_to_track = []
         coin_exchange_map = {}
+        coin_amounts = {}
 
-        for coin_id, exchange_id in portfolio_coins:
+        for coin_id, exchange_id, amount in portfolio_coins:
+            coin_amounts[coin_id] = float(amount)
             # Assuming coin_id from portfolio is the base symbol (e.g., BTC, SAHARA)
             if exchange_id == 2: # Binance
                 binance_symbols_to_track.append(f"{coin_id.upper()}USDT")
@@ -267,6 +280,7 @@ def unified_price_update_loop():
             all_fetched_prices.update(bitvavo_prices)
 
         current_time = datetime.now()
+        portfolio_equity = 0.0
 
         for full_symbol, base_coin_id in coin_exchange_map.items():
             price = None
@@ -284,6 +298,11 @@ def unified_price_update_loop():
                 connection.commit()
                 script_logger.info(f"Successfully inserted price for {base_coin_id}: {price}")
 
+                position_value = coin_amounts.get(base_coin_id, 0.0) * price
+                portfolio_equity += position_value
+                stream.publish('price', full_symbol, {'price': price, 'coin_id': base_coin_id, 'timestamp': current_time})
+                stream.publish('equity', full_symbol, {'value': position_value, 'timestamp': current_time})
+
                 # --- Apex Tracking Logic ---
                 apex_data = get_apex_data(base_coin_id)
 
@@ -314,6 +333,9 @@ def unified_price_update_loop():
                                         script_logger.info(f"Attempting to sell {amount_to_sell} of {base_coin_id} at {price}.")
                                         if execute_sell_api(base_coin_id, amount_to_sell, price):
                                             script_logger.info(f"Successfully sold {amount_to_sell} of {base_coin_id}. Updating status to 'sold'.")
+                                            stream.publish('trade', full_symbol, {'side': 'sell', 'amount': amount_to_sell,
+                                                                                   'price': price, 'reason': 'apex_drop',
+                                                                                   'timestamp': current_time})
                                             update_apex_data(base_coin_id, apex_price, apex_data['apex_timestamp'], drop_start_timestamp, 'sold')
                                         else:
                                             script_logger.error(f"Failed to sell {base_coin_id}. Will continue monitoring.")
@@ -332,6 +354,7 @@ def unified_price_update_loop():
             else:
                 script_logger.warning(f"Price not found for {full_symbol}. Skipping insertion and apex tracking.")
 
+        stream.publish('equity', PORTFOLIO_ROOM, {'value': portfolio_equity, 'timestamp': current_time})
         return True # Return True to indicate coins were processed
     except mysql.connector.Error as err:
         script_logger.error(f"Database error in unified_price_update_loop: {err}")
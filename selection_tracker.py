@@ -1,24 +1,46 @@
+import json
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Forward-return horizons: column suffix -> (seconds, price table read at selection time + horizon).
+# Raw price_history only lives a few days, so the horizons read the OHLCV rollups from
+# sql/create_price_history_rollups.sql; the first bucket opening at or after the target is used.
+HORIZONS = {
+    '1h': (3600, 'price_history_1m', 60),
+    '24h': (86400, 'price_history_1h', 3600),
+    '7d': (7 * 86400, 'price_history_1h', 3600),
+}
+# How long after a horizon has passed a missing price is still looked for
+OUTCOME_LOOKBACK = timedelta(days=2)
+DEFAULT_MODEL = 'default'
+
+
 class SelectionTracker:
     def __init__(self, db_engine=None):
         self.db_engine = db_engine
         self.Session = sessionmaker(bind=self.db_engine) if self.db_engine else None
         self.selection_history = [] # In-memory for demonstration, primarily for testing without DB
 
-    def record_selection(self, selected_coins: List[Dict], selection_metadata: Dict = None):
+    def record_selection(self, selected_coins: Union[List[Dict], pd.DataFrame], selection_metadata: Dict = None,
+                         timestamp: Optional[datetime] = None):
         """
         Records a coin selection event.
-        In a real system, this would persist to a database.
+
+        All coins of one run are written with a single multi-row INSERT in one transaction.
         """
-        timestamp = datetime.now()
+        if isinstance(selected_coins, pd.DataFrame):
+            selected_coins = selected_coins.to_dict(orient='records')
+        timestamp = timestamp or datetime.now()
+        metadata = selection_metadata or {}
+        model = str(metadata.get('model_version') or metadata.get('model_run_id') or DEFAULT_MODEL)
+
+        records = []
         for coin in selected_coins:
             record = {
                 'timestamp': timestamp,
@@ -30,28 +52,137 @@ class SelectionTracker:
                 'metadata': selection_metadata # e.g., model version, market regime
             }
             self.selection_history.append(record)
-            logging.info(f"Recorded selection for {coin['symbol']} at {timestamp}")
-
-            # Database insertion
-            if self.db_engine and self.Session:
-                session = self.Session()
-                try:
-                    query = text("INSERT INTO coin_selections (timestamp, symbol, action, score, risk_score, price) VALUES (:timestamp, :symbol, :action, :score, :risk_score, :price)")
-                    session.execute(query, {
-                        "timestamp": record['timestamp'],
-                        "symbol": record['coin_symbol'],
-                        "action": record['predicted_action'],
-                        "score": record['composite_score'],
-                        "risk_score": record['risk_adjusted_score'],
-                        "price": record['price_at_selection']
-                    })
-                    session.commit()
-                    logging.info(f"Successfully saved selection for {coin['symbol']} to DB.")
-                except Exception as e:
-                    session.rollback()
-                    logging.error(f"Error saving selection for {coin['symbol']} to DB: {e}")
-                finally:
-                    session.close()
+            records.append(record)
+        logging.info(f"Recorded {len(records)} selections at {timestamp}")
+
+        # Database insertion
+        if records and self.db_engine and self.Session:
+            session = self.Session()
+            try:
+                query = text("INSERT INTO coin_selections (timestamp, symbol, action, score, risk_score, price, model, metadata) "
+                             "VALUES (:timestamp, :symbol, :action, :score, :risk_score, :price, :model, :metadata)")
+                metadata_json = json.dumps(selection_metadata, default=str) if selection_metadata else None
+                session.execute(query, [{
+                    "timestamp": record['timestamp'],
+                    "symbol": record['coin_symbol'],
+                    "action": record['predicted_action'],
+                    "score": record['composite_score'],
+                    "risk_score": record['risk_adjusted_score'],
+                    "price": record['price_at_selection'],
+                    "model": model,
+                    "metadata": metadata_json
+                } for record in records])
+                session.commit()
+                logging.info(f"Successfully saved {len(records)} selections to DB.")
+            except Exception as e:
+                session.rollback()
+                logging.error(f"Error saving selections to DB: {e}")
+            finally:
+                session.close()
+
+    def _shift(self, column: str, seconds: int) -> str:
+        """SQL expression for `column` + `seconds`."""
+        if self.db_engine.dialect.name == 'sqlite':
+            return f"datetime({column}, '+{int(seconds)} seconds')"
+        return f"DATE_ADD({column}, INTERVAL {int(seconds)} SECOND)"
+
+    def update_forward_returns(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Fill return_1h/return_24h/return_7d for selections whose horizon has passed.
+
+        One UPDATE per horizon joins each pending selection to the first stored price at or
+        after selection time + horizon. Selections whose price never shows up within
+        OUTCOME_LOOKBACK stay NULL. Returns rows updated per horizon.
+        """
+        now = now or datetime.now()
+        updated = {}
+        with self.db_engine.begin() as connection:
+            for horizon, (seconds, table, bucket_seconds) in HORIZONS.items():
+                column = f"return_{horizon}"
+                target = self._shift('coin_selections.timestamp', seconds)
+                limit = self._shift('coin_selections.timestamp', seconds + max(bucket_seconds * 2, 3600))
+                query = text(f"""
+                    UPDATE coin_selections
+                    SET {column} = (
+                        SELECT p.open * 1.0 / coin_selections.price - 1
+                        FROM {table} p
+                        WHERE p.coin_id = coin_selections.symbol
+                          AND p.bucket_start >= {target}
+                          AND p.bucket_start < {limit}
+                        ORDER BY p.bucket_start
+                        LIMIT 1
+                    )
+                    WHERE {column} IS NULL
+                      AND price > 0
+                      AND timestamp <= :due
+                      AND timestamp > :oldest
+                """)
+                due = now - timedelta(seconds=seconds)
+                result = connection.execute(query, {"due": due, "oldest": due - OUTCOME_LOOKBACK})
+                updated[horizon] = result.rowcount
+        logging.info(f"Forward returns updated: {updated}")
+        return updated
+
+    def refresh_model_stats(self, since: Optional[datetime] = None, now: Optional[datetime] = None):
+        """
+        Rebuild the per-day, per-model rows of coin_selection_stats from `since` onwards.
+
+        By default only the days whose outcomes can still change are rebuilt, i.e. back to
+        the longest horizon plus OUTCOME_LOOKBACK.
+        """
+        now = now or datetime.now()
+        if since is None:
+            since = now - timedelta(seconds=max(h[0] for h in HORIZONS.values())) - OUTCOME_LOOKBACK
+        since = datetime.combine(since.date(), datetime.min.time())
+        with self.db_engine.begin() as connection:
+            connection.execute(text("DELETE FROM coin_selection_stats WHERE day >= :since"), {"since": since.date()})
+            for horizon in HORIZONS:
+                column = f"return_{horizon}"
+                hit = (f"CASE WHEN (action = 'buy' AND {column} > 0) OR (action = 'sell' AND {column} < 0) "
+                       f"THEN 1 ELSE 0 END")
+                connection.execute(text(f"""
+                    INSERT INTO coin_selection_stats
+                        (day, model, action, horizon, selections, evaluated, hits, return_sum, return_sq_sum)
+                    SELECT DATE(timestamp), COALESCE(model, '{DEFAULT_MODEL}'), action, '{horizon}',
+                           COUNT(*), COUNT({column}), SUM({hit}),
+                           COALESCE(SUM({column}), 0), COALESCE(SUM({column} * {column}), 0)
+                    FROM coin_selections
+                    WHERE timestamp >= :since
+                    GROUP BY DATE(timestamp), COALESCE(model, '{DEFAULT_MODEL}'), action
+                """), {"since": since})
+
+    def get_model_analytics(self, start_date: datetime, end_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Hit rate and forward-return statistics per model, action and horizon.
+
+        Reads only the precomputed coin_selection_stats rows, so a year of selections is a
+        single indexed range query over at most one row per day/model/action/horizon.
+        """
+        end_date = end_date or datetime.now()
+        query = text("""
+            SELECT model, action, horizon, SUM(selections) AS selections, SUM(evaluated) AS evaluated,
+                   SUM(hits) AS hits, SUM(return_sum) AS return_sum, SUM(return_sq_sum) AS return_sq_sum
+            FROM coin_selection_stats
+            WHERE day >= :start AND day <= :end
+            GROUP BY model, action, horizon
+        """)
+        with self.db_engine.connect() as connection:
+            rows = connection.execute(query, {"start": start_date.date(), "end": end_date.date()}).fetchall()
+
+        analytics: Dict[str, Any] = {}
+        for row in rows:
+            evaluated = int(row.evaluated or 0)
+            mean = float(row.return_sum) / evaluated if evaluated else None
+            variance = float(row.return_sq_sum) / evaluated - mean ** 2 if evaluated else None
+            directional = row.action in ('buy', 'sell')
+            analytics.setdefault(row.model, {}).setdefault(row.horizon, {})[row.action] = {
+                'selections': int(row.selections),
+                'evaluated': evaluated,
+                'hit_rate': int(row.hits) / evaluated if evaluated and directional else None,
+                'avg_return': mean,
+                'return_std': max(variance, 0.0) ** 0.5 if variance is not None else None
+            }
+        return analytics
 
     def get_selection_history(self, start_date: datetime = None, end_date: datetime = None) -> pd.DataFrame:
         """
@@ -66,11 +197,16 @@ class SelectionTracker:
                 history_df = history_df[history_df['timestamp'] <= end_date]
         return history_df
 
-    def analyze_performance(self) -> Dict[str, Any]:
+    def analyze_performance(self, days: int = 365) -> Dict[str, Any]:
         """
         Analyzes the performance of past selections.
-        (Placeholder - requires actual trade outcomes to be linked)
+
+        With a database this is the precomputed per-model outcome analytics; without one
+        only the in-memory selection counts are available.
         """
+        if self.db_engine:
+            return {"models": self.get_model_analytics(datetime.now() - timedelta(days=days))}
+
         logging.info("Analyzing selection performance (placeholder)...")
         history = self.get_selection_history()
         if history.empty:
@@ -0,0 +1,35 @@
+-- Covering indexes for the report aggregation in generate_reports.py, for databases created
+-- before they were added to create_trading_signals_table.sql / create_learning_metrics_table.sql.
+-- The grouped per-day queries range-scan timestamp and read every other column they need
+-- from the index, without touching the table rows.
+
+CREATE INDEX IF NOT EXISTS idx_trading_signals_report
+    ON trading_signals (timestamp, trade_signal, confidence);
+
+CREATE INDEX IF NOT EXISTS idx_learning_metrics_report
+    ON learning_metrics (timestamp, accuracy, model_precision, recall, f1_score);
+
+-- Aggregates of closed days, written once by generate_reports.py the first time a report
+-- covers the day. Later reports read them from here and only scan today's raw rows.
+-- Every summarized day has a report_daily_summary row, also when it had no metrics.
+CREATE TABLE IF NOT EXISTS report_daily_summary (
+    day DATE NOT NULL PRIMARY KEY,
+    accuracy_sum DOUBLE NOT NULL DEFAULT 0,
+    accuracy_count INT NOT NULL DEFAULT 0,
+    model_precision_sum DOUBLE NOT NULL DEFAULT 0,
+    model_precision_count INT NOT NULL DEFAULT 0,
+    recall_sum DOUBLE NOT NULL DEFAULT 0,
+    recall_count INT NOT NULL DEFAULT 0,
+    f1_score_sum DOUBLE NOT NULL DEFAULT 0,
+    f1_score_count INT NOT NULL DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS report_daily_signals (
+    day DATE NOT NULL,
+    trade_signal VARCHAR(255) NOT NULL,
+    frequency INT NOT NULL,
+    confidence_sum DOUBLE NOT NULL DEFAULT 0,
+    confidence_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, trade_signal)
+);
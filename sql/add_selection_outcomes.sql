@@ -0,0 +1,24 @@
+-- Upgrade an existing coin_selections table for forward returns and per-model analytics
+-- (new installs get this from create_coin_selections_table.sql).
+
+ALTER TABLE coin_selections
+    ADD COLUMN IF NOT EXISTS model VARCHAR(64) NOT NULL DEFAULT 'default' AFTER price,
+    ADD COLUMN IF NOT EXISTS return_1h DOUBLE NULL,
+    ADD COLUMN IF NOT EXISTS return_24h DOUBLE NULL,
+    ADD COLUMN IF NOT EXISTS return_7d DOUBLE NULL;
+
+CREATE INDEX IF NOT EXISTS idx_coin_selections_timestamp ON coin_selections (timestamp);
+CREATE INDEX IF NOT EXISTS idx_coin_selections_symbol_timestamp ON coin_selections (symbol, timestamp);
+
+CREATE TABLE IF NOT EXISTS coin_selection_stats (
+    day DATE NOT NULL,
+    model VARCHAR(64) NOT NULL,
+    action VARCHAR(10) NOT NULL,
+    horizon VARCHAR(8) NOT NULL,
+    selections INT NOT NULL,
+    evaluated INT NOT NULL,
+    hits INT NOT NULL,
+    return_sum DOUBLE NOT NULL,
+    return_sq_sum DOUBLE NOT NULL,
+    PRIMARY KEY (day, model, action, horizon)
+);
@@ -0,0 +1,7 @@
+-- Composite (time, id) indexes for keyset pagination and exports in backend/api/trading_routes.py.
+-- New databases get them from backend/models/trading_models.py; run this on existing ones.
+
+CREATE INDEX IF NOT EXISTS ix_trades_entry_time_id ON trades (entry_time, id);
+CREATE INDEX IF NOT EXISTS ix_trading_decisions_timestamp_id ON trading_decisions (timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_bot_thoughts_timestamp_id ON bot_thoughts (timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_profit_summaries_date_id ON profit_summaries (date, id);
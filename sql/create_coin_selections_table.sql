@@ -6,6 +6,27 @@ CREATE TABLE IF NOT EXISTS coin_selections (
     score DECIMAL(10, 8) NOT NULL,
     risk_score DECIMAL(10, 8) NOT NULL,
     price DECIMAL(18, 8) NOT NULL,
+    model VARCHAR(64) NOT NULL DEFAULT 'default',
     metadata JSON,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+    -- Forward returns filled by crons/selection_outcomes.py once each horizon has passed
+    return_1h DOUBLE NULL,
+    return_24h DOUBLE NULL,
+    return_7d DOUBLE NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_coin_selections_timestamp (timestamp),
+    INDEX idx_coin_selections_symbol_timestamp (symbol, timestamp)
+);
+
+-- Per-day, per-model outcome aggregates; analytics read only this table
+CREATE TABLE IF NOT EXISTS coin_selection_stats (
+    day DATE NOT NULL,
+    model VARCHAR(64) NOT NULL,
+    action VARCHAR(10) NOT NULL,
+    horizon VARCHAR(8) NOT NULL,
+    selections INT NOT NULL,
+    evaluated INT NOT NULL,
+    hits INT NOT NULL,
+    return_sum DOUBLE NOT NULL,
+    return_sq_sum DOUBLE NOT NULL,
+    PRIMARY KEY (day, model, action, horizon)
+);
@@ -4,5 +4,7 @@ CREATE TABLE IF NOT EXISTS learning_metrics (
     accuracy DECIMAL(5, 4),
     model_precision DECIMAL(5, 4),
     recall DECIMAL(5, 4),
-    f1_score DECIMAL(5, 4)
-);
\ No newline at end of file
+    f1_score DECIMAL(5, 4),
+    -- Covers the per-day report aggregation in generate_reports.py
+    INDEX idx_learning_metrics_report (timestamp, accuracy, model_precision, recall, f1_score)
+);
@@ -0,0 +1,38 @@
+-- File: sql/create_price_history_rollups.sql
+-- OHLCV rollups of price_history maintained by crons/price_history_retention.py.
+-- volume is the last 24h volume reported inside the bucket (price_history stores rolling 24h volume).
+
+CREATE TABLE IF NOT EXISTS `price_history_1m` (
+    `coin_id` VARCHAR(50) NOT NULL,
+    `bucket_start` DATETIME NOT NULL,
+    `open` DECIMAL(20, 8) NOT NULL,
+    `high` DECIMAL(20, 8) NOT NULL,
+    `low` DECIMAL(20, 8) NOT NULL,
+    `close` DECIMAL(20, 8) NOT NULL,
+    `volume` DECIMAL(30, 2) DEFAULT NULL,
+    `samples` INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (`coin_id`, `bucket_start`),
+    KEY `idx_bucket_start` (`bucket_start`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS `price_history_1h` LIKE `price_history_1m`;
+CREATE TABLE IF NOT EXISTS `price_history_1d` LIKE `price_history_1m`;
+
+-- Last bucket each resolution was built up to; the open bucket is recomputed on the next run
+CREATE TABLE IF NOT EXISTS `price_history_rollup_state` (
+    `resolution` VARCHAR(8) NOT NULL PRIMARY KEY,
+    `last_bucket` DATETIME NOT NULL,
+    `updated_at` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Partition raw ticks by day so expired days are dropped instead of deleted row by row.
+-- MySQL requires the partitioning column in every unique key and does not allow foreign keys
+-- on partitioned tables. Skip the DROP FOREIGN KEY line if your schema has no fk_coin.
+-- The cron adds the daily partitions ahead of time by splitting pmax.
+ALTER TABLE `price_history` DROP FOREIGN KEY `fk_coin`;
+ALTER TABLE `price_history` DROP PRIMARY KEY, ADD PRIMARY KEY (`id`, `recorded_at`);
+ALTER TABLE `price_history` MODIFY `recorded_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE `price_history` ADD INDEX `idx_coin_recorded_at` (`coin_id`, `recorded_at`);
+ALTER TABLE `price_history` PARTITION BY RANGE (TO_DAYS(`recorded_at`)) (
+    PARTITION `pmax` VALUES LESS THAN MAXVALUE
+);
@@ -2,5 +2,7 @@ CREATE TABLE IF NOT EXISTS trading_signals (
     id INT AUTO_INCREMENT PRIMARY KEY,
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
     trade_signal VARCHAR(255),
-    confidence DECIMAL(5, 4)
-);
\ No newline at end of file
+    confidence DECIMAL(5, 4),
+    -- Covers the per-day report aggregation in generate_reports.py
+    INDEX idx_trading_signals_report (timestamp, trade_signal, confidence)
+);
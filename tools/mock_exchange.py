@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Local mock exchange for exercising the ingestion path without network access.
+
+Serves Binance, Bitvavo and CoinMarketCap endpoints in the same response shapes the
+price updaters, CMC crons and fetchall use (ticker, 24h ticker, klines/candles,
+markets/exchangeInfo, listings/quotes and order placement). Prices come from a
+shared MarketState that is either stepped synthetically or fed by tools/tick_replay.py.
+Latency, error responses and rate limiting are configurable per exchange.
+
+Point the scripts at it with:
+    BINANCE_API_URL=http://127.0.0.1:<port>
+    BITVAVO_REST_URL=http://127.0.0.1:<port>/v2
+    CMC_API_URL=http://127.0.0.1:<port>
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+KLINE_INTERVAL_MS = {
+    '1m': 60_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '4h': 14_400_000, '1d': 86_400_000,
+}
+
+# Quote currencies each base asset is listed against
+BINANCE_QUOTES = ['USDT', 'EUR']
+BITVAVO_QUOTES = ['EUR']
+
+
+@dataclass
+class FaultConfig:
+    """Fault injection for one exchange."""
+    latency: float = 0.0          # seconds added to every response
+    jitter: float = 0.0           # extra uniform random latency in seconds
+    error_rate: float = 0.0       # fraction of requests answered with HTTP 500
+    rate_limit: int = 0           # request weight allowed per window, 0 disables
+    rate_window: float = 60.0     # rate limit window in seconds
+    retry_after: int = 1          # Retry-After seconds on a 429
+
+
+class MarketState:
+    """Thread-safe current prices, 1-minute klines and orders for the mock exchange."""
+
+    def __init__(self, prices: Optional[Dict[str, float]] = None, history: int = 1000):
+        self._lock = threading.Lock()
+        self.tickers: Dict[str, dict] = {}
+        self.klines: Dict[str, deque] = defaultdict(lambda: deque(maxlen=history))
+        # Recent (applied_at, price) per symbol, used to measure consumer staleness
+        self.applied: Dict[str, deque] = defaultdict(lambda: deque(maxlen=256))
+        self.orders: List[dict] = []
+        self.ticks_applied = 0
+        for symbol, price in (prices or {}).items():
+            self.apply_tick(symbol, price)
+
+    @classmethod
+    def synthetic(cls, symbols: List[str], seed: int = 42) -> 'MarketState':
+        rng = random.Random(seed)
+        return cls({s: round(rng.uniform(0.1, 50_000), 6) for s in symbols})
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self.tickers)
+
+    def apply_tick(self, symbol: str, price: float, volume: float = 0.0, timestamp: Optional[float] = None):
+        """Set the latest price of a base asset and fold it into the current 1-minute kline."""
+        timestamp = time.time() if timestamp is None else timestamp
+        ms = int(timestamp * 1000)
+        with self._lock:
+            ticker = self.tickers.get(symbol)
+            if ticker is None:
+                ticker = self.tickers[symbol] = {
+                    'price': price, 'open': price, 'high': price, 'low': price, 'volume': 0.0,
+                }
+            ticker['price'] = price
+            ticker['high'] = max(ticker['high'], price)
+            ticker['low'] = min(ticker['low'], price)
+            ticker['volume'] += volume
+            ticker['timestamp'] = ms
+
+            open_time = ms - ms % KLINE_INTERVAL_MS['1m']
+            klines = self.klines[symbol]
+            if klines and klines[-1][0] == open_time:
+                k = klines[-1]
+                k[2], k[3], k[4], k[5] = max(k[2], price), min(k[3], price), price, k[5] + volume
+            else:
+                klines.append([open_time, price, price, price, price, volume])
+            self.applied[symbol].append((time.perf_counter(), price))
+            self.ticks_applied += 1
+
+    def step(self, rng: random.Random, volatility: float = 0.001):
+        """Move every price one random-walk step."""
+        for symbol in self.symbols():
+            with self._lock:
+                price = self.tickers[symbol]['price']
+            self.apply_tick(symbol, price * (1 + rng.gauss(0, volatility)), rng.uniform(0, 10))
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {s: dict(t) for s, t in self.tickers.items()}
+
+    def candles(self, symbol: str, interval: str, start_ms: int = 0, end_ms: Optional[int] = None,
+                limit: int = 500) -> List[list]:
+        """Aggregate stored 1-minute klines into `interval` candles, oldest first."""
+        step = KLINE_INTERVAL_MS.get(interval, KLINE_INTERVAL_MS['1m'])
+        end_ms = end_ms if end_ms is not None else 2 ** 62
+        with self._lock:
+            rows = [list(k) for k in self.klines.get(symbol, ()) if start_ms <= k[0] < end_ms]
+        merged: Dict[int, list] = {}
+        for open_time, o, h, l, c, v in rows:
+            bucket = open_time - open_time % step
+            k = merged.get(bucket)
+            if k is None:
+                merged[bucket] = [bucket, o, h, l, c, v]
+            else:
+                k[2], k[3], k[4], k[5] = max(k[2], h), min(k[3], l), c, k[5] + v
+        return [merged[b] for b in sorted(merged)][-limit:]
+
+    def staleness(self, symbol: str, price: float, observed_at: float) -> Optional[float]:
+        """Seconds between a price being applied and a consumer observing it."""
+        with self._lock:
+            for applied_at, applied_price in reversed(self.applied.get(symbol, ())):
+                if abs(applied_price - price) <= 1e-9 * max(1.0, abs(price)):
+                    return observed_at - applied_at
+        return None
+
+    def add_order(self, order: dict) -> dict:
+        with self._lock:
+            order = dict(order, orderId=len(self.orders) + 1, transactTime=int(time.time() * 1000))
+            self.orders.append(order)
+        return order
+
+
+class _RateWindow:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.used = 0
+
+
+class MockExchange(ThreadingHTTPServer):
+    """
+    HTTP server answering Binance, Bitvavo and CoinMarketCap requests from a MarketState.
+
+    Args:
+        state (MarketState): Prices to serve.
+        faults (dict): Exchange name ('binance', 'bitvavo', 'cmc') -> FaultConfig.
+        host (str), port (int): Bind address; port 0 picks a free port.
+        seed (int): Seed for latency jitter and error injection.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, state: Optional[MarketState] = None, faults: Optional[Dict[str, FaultConfig]] = None,
+                 host: str = '127.0.0.1', port: int = 0, seed: int = 0):
+        super().__init__((host, port), MockExchangeHandler)
+        self.state = state or MarketState.synthetic(['BTC', 'ETH', 'SOL'])
+        self.faults = defaultdict(FaultConfig, faults or {})
+        self.rng = random.Random(seed)
+        self.stats = defaultdict(int)
+        self._windows: Dict[str, _RateWindow] = defaultdict(_RateWindow)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point the ingestion scripts at this server."""
+        return {
+            'BINANCE_API_URL': self.base_url,
+            'BITVAVO_REST_URL': f"{self.base_url}/v2",
+            'CMC_API_URL': self.base_url,
+        }
+
+    def start(self) -> 'MockExchange':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def admit(self, exchange: str, weight: int = 1):
+        """
+        Apply fault injection for one request.
+
+        Returns:
+            tuple: (status, headers) for an injected failure, or (None, headers) to serve normally.
+        """
+        fault = self.faults[exchange]
+        delay = fault.latency + (self.rng.uniform(0, fault.jitter) if fault.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        headers = {}
+        with self._lock:
+            self.stats[f"{exchange}_requests"] += 1
+            if fault.rate_limit:
+                window = self._windows[exchange]
+                if time.monotonic() - window.started >= fault.rate_window:
+                    self._windows[exchange] = window = _RateWindow()
+                window.used += weight
+                if exchange == 'binance':
+                    headers['X-MBX-USED-WEIGHT-1M'] = str(window.used)
+                elif exchange == 'bitvavo':
+                    headers['Bitvavo-Ratelimit-Remaining'] = str(max(0, fault.rate_limit - window.used))
+                if window.used > fault.rate_limit:
+                    self.stats[f"{exchange}_rate_limited"] += 1
+                    headers['Retry-After'] = str(fault.retry_after)
+                    return 429, headers
+            if fault.error_rate and self.rng.random() < fault.error_rate:
+                self.stats[f"{exchange}_errors"] += 1
+                return 500, headers
+        return None, headers
+
+
+class MockExchangeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid Nagle + delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip('/')
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        body = self._read_body()
+        if path.startswith('/api/v3/'):
+            exchange, handler = 'binance', self._binance
+        elif path.startswith('/v1/cryptocurrency') or path.startswith('/v2/cryptocurrency'):
+            exchange, handler = 'cmc', self._cmc
+        elif path.startswith('/v2/'):
+            exchange, handler = 'bitvavo', self._bitvavo
+        else:
+            self._send(404, {'error': f'unknown path {path}'})
+            return
+
+        status, headers = self.server.admit(exchange)
+        if status == 429:
+            self._send(429, {'code': -1003, 'msg': 'Too many requests'}, headers)
+            return
+        if status == 500:
+            self._send(500, {'error': 'Injected server error'}, headers)
+            return
+        try:
+            status, payload = handler(method, path, query, body)
+        except KeyError as e:
+            status, payload = 400, {'error': f'missing or unknown parameter {e}'}
+        self._send(status, payload, headers)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        raw = self.rfile.read(length).decode()
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return {k: v[-1] for k, v in parse_qs(raw).items()}
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # --- Binance -------------------------------------------------------------
+
+    @staticmethod
+    def _split_binance(symbol: str):
+        for quote in BINANCE_QUOTES:
+            if symbol.endswith(quote):
+                return symbol[:-len(quote)], quote
+        raise KeyError(symbol)
+
+    def _binance(self, method, path, query, body):
+        state = self.server.state
+        if path == '/api/v3/order' and method == 'POST':
+            order = state.add_order({**body, **query})
+            price = state.snapshot().get(self._split_binance(order['symbol'])[0], {}).get('price', 0)
+            return 200, {'symbol': order['symbol'], 'orderId': order['orderId'],
+                         'transactTime': order['transactTime'], 'price': str(price),
+                         'origQty': str(order.get('quantity', 0)), 'executedQty': str(order.get('quantity', 0)),
+                         'status': 'FILLED', 'type': order.get('type', 'MARKET'), 'side': order.get('side', 'BUY')}
+        snapshot = state.snapshot()
+        if path == '/api/v3/ticker/price':
+            rows = [{'symbol': f"{base}{quote}", 'price': f"{t['price']:.8f}"}
+                    for base, t in snapshot.items() for quote in BINANCE_QUOTES]
+            if 'symbol' in query:
+                rows = [r for r in rows if r['symbol'] == query['symbol']]
+                return (200, rows[0]) if rows else (400, {'code': -1121, 'msg': 'Invalid symbol.'})
+            return 200, rows
+        if path == '/api/v3/ticker/24hr':
+            rows = []
+            for base, t in snapshot.items():
+                for quote in BINANCE_QUOTES:
+                    change = t['price'] - t['open']
+                    rows.append({
+                        'symbol': f"{base}{quote}", 'lastPrice': f"{t['price']:.8f}",
+                        'openPrice': f"{t['open']:.8f}", 'highPrice': f"{t['high']:.8f}",
+                        'lowPrice': f"{t['low']:.8f}", 'volume': f"{t['volume']:.8f}",
+                        'priceChange': f"{change:.8f}",
+                        'priceChangePercent': f"{(change / t['open'] * 100 if t['open'] else 0):.3f}",
+                    })
+            if 'symbol' in query:
+                rows = [r for r in rows if r['symbol'] == query['symbol']]
+                return (200, rows[0]) if rows else (400, {'code': -1121, 'msg': 'Invalid symbol.'})
+            return 200, rows
+        if path == '/api/v3/exchangeInfo':
+            return 200, {'timezone': 'UTC', 'serverTime': int(time.time() * 1000), 'symbols': [
+                {'symbol': f"{base}{quote}", 'status': 'TRADING', 'baseAsset': base, 'quoteAsset': quote}
+                for base in snapshot for quote in BINANCE_QUOTES
+            ]}
+        if path == '/api/v3/klines':
+            base, _ = self._split_binance(query['symbol'])
+            interval = query.get('interval', '1m')
+            step = KLINE_INTERVAL_MS.get(interval, KLINE_INTERVAL_MS['1m'])
+            candles = state.candles(base, interval, int(query.get('startTime', 0)),
+                                    int(query['endTime']) if 'endTime' in query else None,
+                                    int(query.get('limit', 500)))
+            return 200, [[k[0], f"{k[1]:.8f}", f"{k[2]:.8f}", f"{k[3]:.8f}", f"{k[4]:.8f}", f"{k[5]:.8f}",
+                          k[0] + step - 1, f"{k[4] * k[5]:.8f}", 1, '0', '0', '0'] for k in candles]
+        if path == '/api/v3/ping':
+            return 200, {}
+        if path == '/api/v3/time':
+            return 200, {'serverTime': int(time.time() * 1000)}
+        return 404, {'code': -1, 'msg': f'unknown endpoint {path}'}
+
+    # --- Bitvavo -------------------------------------------------------------
+
+    def _bitvavo(self, method, path, query, body):
+        state = self.server.state
+        parts = path.strip('/').split('/')
+        if path == '/v2/order' and method == 'POST':
+            order = state.add_order({**body, **query})
+            base = order.get('market', '-').split('-')[0]
+            price = state.snapshot().get(base, {}).get('price', 0)
+            return 200, {'orderId': str(order['orderId']), 'market': order.get('market'),
+                         'created': order['transactTime'], 'status': 'filled', 'side': order.get('side', 'buy'),
+                         'orderType': order.get('orderType', 'market'), 'amount': str(order.get('amount', 0)),
+                         'filledAmount': str(order.get('amount', 0)), 'price': str(price)}
+        snapshot = state.snapshot()
+        if path == '/v2/ticker/price':
+            rows = [{'market': f"{b}-{q}", 'price': f"{t['price']:.8f}"}
+                    for b, t in snapshot.items() for q in BITVAVO_QUOTES]
+            return 200, self._filter_market(rows, query)
+        if path == '/v2/ticker/24h':
+            rows = [{
+                'market': f"{b}-{q}", 'open': f"{t['open']:.8f}", 'high': f"{t['high']:.8f}",
+                'low': f"{t['low']:.8f}", 'last': f"{t['price']:.8f}", 'volume': f"{t['volume']:.8f}",
+                'volumeQuote': f"{t['volume'] * t['price']:.8f}", 'bid': f"{t['price'] * 0.9995:.8f}",
+                'ask': f"{t['price'] * 1.0005:.8f}", 'timestamp': t.get('timestamp'),
+            } for b, t in snapshot.items() for q in BITVAVO_QUOTES]
+            return 200, self._filter_market(rows, query)
+        if path == '/v2/markets':
+            rows = [{'market': f"{b}-{q}", 'status': 'trading', 'base': b, 'quote': q, 'pricePrecision': 5}
+                    for b in snapshot for q in BITVAVO_QUOTES]
+            return 200, self._filter_market(rows, query)
+        # /v2/{market}/candles and /v2/markets/{market}/candles
+        if parts[-1] == 'candles':
+            market = parts[-2]
+            base = market.split('-')[0]
+            candles = state.candles(base, query.get('interval', '1m'), int(query.get('start', 0)),
+                                    int(query['end']) if 'end' in query else None, int(query.get('limit', 1440)))
+            # Bitvavo returns newest candles first
+            return 200, [[k[0], f"{k[1]:.8f}", f"{k[2]:.8f}", f"{k[3]:.8f}", f"{k[4]:.8f}", f"{k[5]:.8f}"]
+                         for k in reversed(candles)]
+        if path == '/v2/time':
+            return 200, {'time': int(time.time() * 1000)}
+        return 404, {'errorCode': 110, 'error': f'unknown endpoint {path}'}
+
+    @staticmethod
+    def _filter_market(rows, query):
+        if 'market' in query:
+            rows = [r for r in rows if r['market'] == query['market']]
+            return rows[0] if rows else {'errorCode': 205, 'error': 'market parameter is invalid.'}
+        return rows
+
+    # --- CoinMarketCap -------------------------------------------------------
+
+    def _cmc(self, method, path, query, body):
+        snapshot = self.server.state.snapshot()
+        ids = {symbol: i + 1 for i, symbol in enumerate(sorted(snapshot))}
+        convert = query.get('convert', 'USD')
+
+        def coin(symbol):
+            t = snapshot[symbol]
+            change = (t['price'] - t['open']) / t['open'] * 100 if t['open'] else 0
+            return {
+                'id': ids[symbol], 'name': symbol, 'symbol': symbol, 'slug': symbol.lower(),
+                'date_added': '2020-01-01T00:00:00.000Z', 'cmc_rank': ids[symbol],
+                'circulating_supply': 1_000_000, 'total_supply': 1_000_000,
+                'last_updated': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+                'quote': {convert: {
+                    'price': t['price'], 'volume_24h': t['volume'] * t['price'],
+                    'percent_change_1h': change, 'percent_change_24h': change, 'percent_change_7d': change,
+                    'market_cap': t['price'] * 1_000_000,
+                    'last_updated': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+                }},
+            }
+
+        status = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()), 'error_code': 0,
+                  'error_message': None, 'credit_count': 1}
+        if path.endswith('/listings/latest'):
+            start, limit = int(query.get('start', 1)), int(query.get('limit', 100))
+            symbols = sorted(snapshot, key=lambda s: ids[s])[start - 1:start - 1 + limit]
+            return 200, {'status': status, 'data': [coin(s) for s in symbols]}
+        if path.endswith('/quotes/latest'):
+            if 'id' in query:
+                by_id = {str(v): k for k, v in ids.items()}
+                wanted = [by_id[i] for i in query['id'].split(',') if i in by_id]
+                keys = [str(ids[s]) for s in wanted]
+            else:
+                wanted = [s for s in query.get('symbol', '').split(',') if s in snapshot]
+                keys = wanted
+            data = {key: coin(s) for key, s in zip(keys, wanted)}
+            if path.startswith('/v2/'):
+                # v2 returns a list per symbol key
+                data = {key: value if 'id' in query else [value] for key, value in data.items()}
+            return 200, {'status': status, 'data': data}
+        return 404, {'status': dict(status, error_code=404, error_message=f'unknown endpoint {path}')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local mock Binance/Bitvavo/CoinMarketCap server.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--symbols', default='BTC,ETH,SOL,XRP,ADA')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--step', type=float, default=1.0, help='Seconds between synthetic price steps, 0 disables')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=0, help='Requests per minute per exchange, 0 disables')
+    args = parser.parse_args()
+
+    fault = FaultConfig(latency=args.latency, error_rate=args.error_rate, rate_limit=args.rate_limit)
+    state = MarketState.synthetic(args.symbols.split(','), seed=args.seed)
+    server = MockExchange(state, {name: fault for name in ('binance', 'bitvavo', 'cmc')}, port=args.port,
+                          seed=args.seed).start()
+    print(f"Mock exchange listening on {server.base_url}")
+    for key, value in server.env().items():
+        print(f"  export {key}={value}")
+    rng = random.Random(args.seed)
+    try:
+        while True:
+            if args.step > 0:
+                time.sleep(args.step)
+                state.step(rng)
+            else:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic OHLCV market for many correlated assets at once.
+
+Gives indicator, backtest and training benchmarks a large, fixed corpus with no
+network access. Every array is built for all periods and assets in one pass; the only
+recursion (the volatility process) runs inside scipy.signal.lfilter. The same
+MarketConfig and seed always give the same market.
+
+Model, per period t and asset i:
+    regime      segments of geometric length drawn from regime_weights
+                (trend, chop, crash); each sets drift, volatility scale and jump rate
+    volatility  sigma_i * regime scale * exp(h_t + g_it), with h (market) and g (asset)
+                AR(1) log-volatility processes, i.e. clustered volatility
+    return      vol * (drift + sqrt(rho) * market shock + sqrt(1 - rho) * own shock
+                + jumps), with jumps hitting all assets together in crashes
+    volume      base volume * hour-of-day and weekday profile, higher on large moves
+    listing     some assets list partway through or delist; outside their lifetime
+                every column is NaN (and rows are dropped from to_frame())
+
+Usage:
+    python tools/synthetic_market.py --assets 100 --days 730 --seed 7 --output corpus.csv.gz
+    python tools/synthetic_market.py --assets 20 --days 90 --freq 1min --output corpus.npz
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+@dataclass
+class Regime:
+    """Per-period return behaviour while the market is in this regime."""
+    drift: float                  # mean log return per period, in units of sigma
+    vol_scale: float              # multiplier on every asset's volatility
+    jump_rate: float              # probability of a jump per asset and period
+    jump_mean: float = 0.0        # mean jump log return, in units of sigma
+    jump_std: float = 3.0         # jump size dispersion, in units of sigma
+    market_jumps: bool = False    # jumps hit all listed assets together
+
+
+DEFAULT_REGIMES = {
+    'trend': Regime(drift=0.03, vol_scale=0.9, jump_rate=0.001),
+    'chop': Regime(drift=0.0, vol_scale=0.7, jump_rate=0.0005),
+    'crash': Regime(drift=-0.15, vol_scale=2.5, jump_rate=0.02, jump_mean=-4.0, market_jumps=True),
+}
+
+
+@dataclass
+class MarketConfig:
+    n_assets: int = 10
+    periods: int = 24 * 180
+    freq: str = '1h'
+    start: str = '2023-01-01'
+    seed: Optional[int] = 42
+    regimes: Dict[str, Regime] = field(default_factory=lambda: dict(DEFAULT_REGIMES))
+    regime_weights: Dict[str, float] = field(default_factory=lambda: {'trend': 0.45, 'chop': 0.45, 'crash': 0.10})
+    mean_regime_periods: int = 24 * 7
+    correlation: float = 0.5          # pairwise correlation of returns through the market factor
+    vol_range: tuple = (0.004, 0.02)  # per-period volatility of each asset, drawn log-uniformly
+    vol_persistence: float = 0.98     # AR(1) coefficient of log-volatility
+    vol_of_vol: float = 0.1           # log-volatility shock size
+    price_range: tuple = (0.05, 50_000.0)
+    volume_range: tuple = (1e4, 1e7)
+    volume_sensitivity: float = 0.5   # extra volume per sigma of absolute return
+    late_listing_share: float = 0.2   # assets that list after the first period
+    delisting_share: float = 0.1      # assets that delist before the last period
+
+
+@dataclass
+class SyntheticMarket:
+    """(periods x assets) OHLCV arrays; NaN where an asset is not listed."""
+    timestamps: pd.DatetimeIndex
+    symbols: List[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    listed: np.ndarray
+    regime: np.ndarray                # regime name per period
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format, one row per listed (timestamp, symbol), ordered by time then symbol."""
+        t, a = np.nonzero(self.listed)
+        return pd.DataFrame({
+            'timestamp': self.timestamps[t],
+            'symbol': np.asarray(self.symbols)[a],
+            'open': self.open[t, a],
+            'high': self.high[t, a],
+            'low': self.low[t, a],
+            'close': self.close[t, a],
+            'volume': self.volume[t, a],
+        })
+
+    def asset_frame(self, symbol: str) -> pd.DataFrame:
+        """One asset's listed periods, indexed by timestamp."""
+        i = self.symbols.index(symbol)
+        rows = self.listed[:, i]
+        return pd.DataFrame({
+            'open': self.open[rows, i], 'high': self.high[rows, i], 'low': self.low[rows, i],
+            'close': self.close[rows, i], 'volume': self.volume[rows, i],
+        }, index=self.timestamps[rows])
+
+    def save(self, path: str):
+        """Write to .npz (arrays) or .csv/.csv.gz (to_frame())."""
+        if path.endswith('.npz'):
+            np.savez_compressed(path, timestamps=self.timestamps.to_numpy(), symbols=np.asarray(self.symbols),
+                                open=self.open, high=self.high, low=self.low, close=self.close,
+                                volume=self.volume, listed=self.listed, regime=self.regime)
+        else:
+            self.to_frame().to_csv(path, index=False)
+
+    @classmethod
+    def load(cls, path: str) -> 'SyntheticMarket':
+        """Load a market saved as .npz."""
+        with np.load(path) as data:
+            return cls(timestamps=pd.DatetimeIndex(data['timestamps']), symbols=data['symbols'].tolist(),
+                       open=data['open'], high=data['high'], low=data['low'], close=data['close'],
+                       volume=data['volume'], listed=data['listed'], regime=data['regime'])
+
+
+def _regime_path(config: MarketConfig, rng: np.random.Generator) -> np.ndarray:
+    """Regime index per period from geometric-length segments."""
+    names = list(config.regime_weights)
+    weights = np.array([config.regime_weights[n] for n in names], dtype=float)
+    # Enough segments to cover the run with overwhelming probability; extras are cut off
+    n_segments = int(config.periods / config.mean_regime_periods * 2) + 16
+    lengths = rng.geometric(1 / config.mean_regime_periods, n_segments)
+    choices = rng.choice(len(names), n_segments, p=weights / weights.sum())
+    path = np.repeat(choices, lengths)
+    if len(path) < config.periods:
+        path = np.concatenate([path, np.full(config.periods - len(path), choices[-1])])
+    return path[:config.periods]
+
+
+def _ar1(shocks: np.ndarray, phi: float) -> np.ndarray:
+    """x_t = phi * x_{t-1} + e_t along axis 0, started at its stationary scale."""
+    shocks = shocks.copy()
+    shocks[0] /= np.sqrt(1 - phi ** 2)
+    return lfilter([1.0], [1.0, -phi], shocks, axis=0)
+
+
+def _volume_profile(timestamps: pd.DatetimeIndex) -> np.ndarray:
+    """Busier around the US/EU overlap and on weekdays."""
+    hours = timestamps.hour.to_numpy() + timestamps.minute.to_numpy() / 60
+    intraday = 1 + 0.4 * np.cos(2 * np.pi * (hours - 15) / 24)
+    weekday = np.where(timestamps.dayofweek.to_numpy() >= 5, 0.75, 1.0)
+    return intraday * weekday
+
+
+def _lifetimes(config: MarketConfig, rng: np.random.Generator) -> np.ndarray:
+    """Boolean (periods x assets) listing mask."""
+    T, N = config.periods, config.n_assets
+    list_at = np.where(rng.random(N) < config.late_listing_share, rng.integers(1, max(2, T // 2), N), 0)
+    delist_at = np.where(rng.random(N) < config.delisting_share,
+                         rng.integers(T // 2, T, N), T)
+    # Every asset keeps at least one listed period
+    delist_at = np.maximum(delist_at, list_at + 1)
+    t = np.arange(T)[:, None]
+    return (t >= list_at) & (t < delist_at)
+
+
+def generate_market(config: Optional[MarketConfig] = None, **overrides) -> SyntheticMarket:
+    """Generate a market; keyword arguments override fields of `config`."""
+    config = config or MarketConfig()
+    if overrides:
+        config = MarketConfig(**{**config.__dict__, **overrides})
+    rng = np.random.default_rng(config.seed)
+    T, N = config.periods, config.n_assets
+
+    regime_names = list(config.regime_weights)
+    regime_idx = _regime_path(config, rng)
+    regimes = [config.regimes[name] for name in regime_names]
+    drift = np.array([r.drift for r in regimes])[regime_idx][:, None]
+    vol_scale = np.array([r.vol_scale for r in regimes])[regime_idx][:, None]
+    jump_rate = np.array([r.jump_rate for r in regimes])[regime_idx][:, None]
+    jump_mean = np.array([r.jump_mean for r in regimes])[regime_idx][:, None]
+    jump_std = np.array([r.jump_std for r in regimes])[regime_idx][:, None]
+    market_jumps = np.array([r.market_jumps for r in regimes])[regime_idx][:, None]
+
+    # Clustered volatility: shared market component plus an asset component
+    base_vol = np.exp(rng.uniform(*np.log(config.vol_range), N))[None, :]
+    log_vol = (_ar1(rng.normal(0, config.vol_of_vol, (T, 1)), config.vol_persistence)
+               + _ar1(rng.normal(0, config.vol_of_vol / 2, (T, N)), config.vol_persistence))
+    sigma = base_vol * vol_scale * np.exp(log_vol)
+
+    rho = float(np.clip(config.correlation, 0.0, 1.0))
+    shocks = np.sqrt(rho) * rng.normal(size=(T, 1)) + np.sqrt(1 - rho) * rng.normal(size=(T, N))
+
+    # Jumps: one draw per period for market-wide jumps, one per asset otherwise
+    jump_draw = np.where(market_jumps, rng.random((T, 1)), rng.random((T, N)))
+    jumps = (jump_draw < jump_rate) * rng.normal(jump_mean, jump_std, (T, N))
+
+    log_returns = sigma * (drift + shocks + jumps)
+    start_price = np.exp(rng.uniform(*np.log(config.price_range), N))
+    close = start_price * np.exp(np.cumsum(log_returns, axis=0))
+
+    # Opens gap slightly from the previous close; highs and lows extend past both
+    gap = np.exp(rng.normal(0, 0.1, (T, N)) * sigma)
+    open_ = np.vstack([start_price[None, :], close[:-1]]) * gap
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+    high = body_high * np.exp(np.abs(rng.normal(0, 0.5, (T, N))) * sigma)
+    low = body_low * np.exp(-np.abs(rng.normal(0, 0.5, (T, N))) * sigma)
+
+    timestamps = pd.date_range(start=config.start, periods=T, freq=config.freq)
+    base_volume = np.exp(rng.uniform(*np.log(config.volume_range), N))[None, :]
+    surprise = np.abs(log_returns) / sigma
+    volume = (base_volume * _volume_profile(timestamps)[:, None]
+              * (1 + config.volume_sensitivity * surprise)
+              * rng.lognormal(0, 0.3, (T, N)))
+
+    listed = _lifetimes(config, rng)
+    arrays = {}
+    for name, values in (('open', open_), ('high', high), ('low', low), ('close', close), ('volume', volume)):
+        arrays[name] = np.where(listed, values, np.nan)
+
+    width = len(str(N - 1))
+    return SyntheticMarket(
+        timestamps=timestamps,
+        symbols=[f"SYN{i:0{width}d}" for i in range(N)],
+        listed=listed,
+        regime=np.asarray(regime_names)[regime_idx],
+        **arrays,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assets', type=int, default=50)
+    parser.add_argument('--days', type=float, default=365)
+    parser.add_argument('--freq', default='1h', help='Pandas frequency, e.g. 1min, 1h, 1D')
+    parser.add_argument('--start', default='2023-01-01')
+    parser.add_argument('--correlation', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='.npz, .csv or .csv.gz file to write')
+    args = parser.parse_args()
+
+    periods = int(pd.Timedelta(days=args.days) / pd.Timedelta(args.freq))
+    config = MarketConfig(n_assets=args.assets, periods=periods, freq=args.freq, start=args.start,
+                          correlation=args.correlation, seed=args.seed)
+    started = time.perf_counter()
+    market = generate_market(config)
+    elapsed = time.perf_counter() - started
+    regimes, counts = np.unique(market.regime, return_counts=True)
+    print(f"{args.assets} assets x {periods} periods ({int(market.listed.sum())} listed bars) "
+          f"in {elapsed:.2f}s; regimes: "
+          + ', '.join(f"{r} {c / periods:.0%}" for r, c in zip(regimes, counts)))
+    if args.output:
+        market.save(args.output)
+        print(f"Wrote {args.output} ({os.path.getsize(args.output) / 2 ** 20:.1f} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
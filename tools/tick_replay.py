@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded or synthetic tick stream through the mock exchange and measure ingestion.
+
+Ticks are pushed into a MockExchange at N x their recorded speed while a consumer
+polls the exchange the same way the price updaters do. The report gives replay
+throughput, consumer call latency percentiles, price staleness and error counts,
+so changes to the ingestion path can be compared with no network involved.
+
+Tick files are JSON lines or CSV with columns: ts (epoch seconds), symbol, price[, volume].
+
+Usage:
+    python tools/tick_replay.py --synthetic 5000 --speed 50
+    python tools/tick_replay.py --ticks ticks.jsonl --speed 10 --latency 0.05 --rate-limit 1200
+    python tools/tick_replay.py --synthetic 2000 --consumer includes.binance_price_updater:fetch_binance_prices
+"""
+
+import argparse
+import csv
+import importlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.mock_exchange import FaultConfig, MarketState, MockExchange
+
+
+@dataclass
+class Tick:
+    ts: float
+    symbol: str
+    price: float
+    volume: float = 0.0
+
+
+def load_ticks(path: str) -> List[Tick]:
+    """Load ticks from a .jsonl or .csv file, sorted by timestamp."""
+    ticks = []
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            ticks.append(Tick(float(row['ts']), row['symbol'], float(row['price']), float(row.get('volume') or 0)))
+    ticks.sort(key=lambda t: t.ts)
+    return ticks
+
+
+def save_ticks(ticks: Iterable[Tick], path: str):
+    with open(path, 'w') as f:
+        for t in ticks:
+            f.write(json.dumps({'ts': t.ts, 'symbol': t.symbol, 'price': t.price, 'volume': t.volume}) + '\n')
+
+
+def synthetic_ticks(symbols: List[str], count: int, interval: float = 3.0, seed: int = 42,
+                    volatility: float = 0.002, start: float = 1_700_000_000.0) -> List[Tick]:
+    """Random-walk ticks, one symbol per tick in round-robin, `interval` seconds apart per round."""
+    rng = random.Random(seed)
+    prices = {s: rng.uniform(0.1, 50_000) for s in symbols}
+    step = interval / max(1, len(symbols))
+    ticks = []
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        prices[symbol] *= 1 + rng.gauss(0, volatility)
+        ticks.append(Tick(start + i * step, symbol, round(prices[symbol], 8), round(rng.uniform(0, 5), 6)))
+    return ticks
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    ordered = sorted(values)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': ordered[-1]}
+
+
+class TickReplayer:
+    """Pushes ticks into a MarketState at `speed` x the recorded pace."""
+
+    def __init__(self, state: MarketState, ticks: List[Tick], speed: float = 1.0):
+        self.state = state
+        self.ticks = ticks
+        self.speed = speed
+        self.lag: List[float] = []
+        self.done = threading.Event()
+        self.elapsed = 0.0
+
+    def run(self):
+        if not self.ticks:
+            self.done.set()
+            return
+        origin = self.ticks[0].ts
+        started = time.perf_counter()
+        for tick in self.ticks:
+            due = started + (tick.ts - origin) / self.speed if self.speed > 0 else started
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.lag.append(max(0.0, time.perf_counter() - due))
+            self.state.apply_tick(tick.symbol, tick.price, tick.volume)
+        self.elapsed = time.perf_counter() - started
+        self.done.set()
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        return thread
+
+
+def binance_ticker_consumer(base_url: str, symbols: List[str]) -> Callable[[], Dict[str, float]]:
+    """Poll /api/v3/ticker/price like fetch_binance_prices and return {base symbol: price}."""
+    session = requests.Session()
+    wanted = {f"{s}USDT": s for s in symbols}
+
+    def consume():
+        response = session.get(f"{base_url}/api/v3/ticker/price", timeout=10)
+        response.raise_for_status()
+        return {wanted[item['symbol']]: float(item['price']) for item in response.json() if item['symbol'] in wanted}
+    return consume
+
+
+def bitvavo_ticker_consumer(base_url: str, symbols: List[str]) -> Callable[[], Dict[str, float]]:
+    """Poll /v2/ticker/24h like update_prices_bitvavo_native and return {base symbol: last price}."""
+    session = requests.Session()
+    wanted = {f"{s}-EUR": s for s in symbols}
+
+    def consume():
+        response = session.get(f"{base_url}/v2/ticker/24h", timeout=10)
+        response.raise_for_status()
+        return {wanted[item['market']]: float(item['last']) for item in response.json() if item['market'] in wanted}
+    return consume
+
+
+def external_consumer(spec: str, symbols: List[str]) -> Callable[[], Dict[str, float]]:
+    """
+    Wrap a project fetch function given as 'module:function'.
+
+    The function is called with exchange-formatted symbols (e.g. BTCUSDT) and must return
+    {symbol: price}; results are mapped back to base symbols.
+    """
+    module_name, func_name = spec.split(':')
+    func = getattr(importlib.import_module(module_name), func_name)
+    wanted = {f"{s}USDT": s for s in symbols}
+
+    def consume():
+        return {wanted.get(k, k): float(v) for k, v in func(list(wanted)).items()}
+    return consume
+
+
+def measure_ingestion(server: MockExchange, replayer: TickReplayer, consumer: Callable[[], Dict[str, float]],
+                      poll_interval: float = 0.0, workers: int = 1) -> dict:
+    """
+    Run the replay while `workers` threads poll `consumer`, and return an ingestion report.
+    """
+    latencies: List[float] = []
+    staleness: List[float] = []
+    errors = [0]
+    prices_seen = [0]
+    lock = threading.Lock()
+
+    def poll():
+        while not replayer.done.is_set():
+            start = time.perf_counter()
+            try:
+                prices = consumer()
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                prices = {}
+            end = time.perf_counter()
+            ages = [a for a in (server.state.staleness(s, p, end) for s, p in prices.items()) if a is not None]
+            with lock:
+                latencies.append(end - start)
+                staleness.extend(ages)
+                prices_seen[0] += len(prices)
+            if poll_interval:
+                time.sleep(poll_interval)
+
+    started = time.perf_counter()
+    pollers = [threading.Thread(target=poll, daemon=True) for _ in range(workers)]
+    for p in pollers:
+        p.start()
+    replayer.run()
+    for p in pollers:
+        p.join()
+    wall = time.perf_counter() - started
+
+    return {
+        'ticks': len(replayer.ticks),
+        'speed': replayer.speed,
+        'wall_seconds': wall,
+        'ticks_per_second': len(replayer.ticks) / wall if wall else None,
+        'replay_lag_seconds': _percentiles(replayer.lag),
+        'consumer_calls': len(latencies),
+        'consumer_calls_per_second': len(latencies) / wall if wall else None,
+        'prices_ingested': prices_seen[0],
+        'consumer_latency_seconds': _percentiles(latencies),
+        'staleness_seconds': _percentiles(staleness),
+        'consumer_errors': errors[0],
+        'server': dict(server.stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--ticks', help='Recorded tick file (.jsonl or .csv)')
+    source.add_argument('--synthetic', type=int, default=2000, help='Number of synthetic ticks')
+    parser.add_argument('--symbols', default='BTC,ETH,SOL,XRP,ADA')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--speed', type=float, default=10.0, help='Replay speed multiplier, 0 = as fast as possible')
+    parser.add_argument('--consumer', default='binance',
+                        help="'binance', 'bitvavo', or a 'module:function' fetch function")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--poll-interval', type=float, default=0.0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=0, help='Requests per minute per exchange, 0 disables')
+    parser.add_argument('--save-ticks', help='Write the replayed ticks to this file')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    if args.ticks:
+        ticks = load_ticks(args.ticks)
+        symbols = sorted({t.symbol for t in ticks})
+    else:
+        symbols = args.symbols.split(',')
+        ticks = synthetic_ticks(symbols, args.synthetic, seed=args.seed)
+    if args.save_ticks:
+        save_ticks(ticks, args.save_ticks)
+
+    fault = FaultConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        rate_limit=args.rate_limit)
+    state = MarketState({t.symbol: t.price for t in ticks[:len(symbols)]})
+    server = MockExchange(state, {name: fault for name in ('binance', 'bitvavo', 'cmc')}, seed=args.seed).start()
+    os.environ.update(server.env())
+    try:
+        if args.consumer == 'binance':
+            consumer = binance_ticker_consumer(server.base_url, symbols)
+        elif args.consumer == 'bitvavo':
+            consumer = bitvavo_ticker_consumer(server.base_url, symbols)
+        else:
+            consumer = external_consumer(args.consumer, symbols)
+        report = measure_ingestion(server, TickReplayer(state, ticks, args.speed), consumer,
+                                   args.poll_interval, args.workers)
+    finally:
+        server.stop()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+
+if __name__ == '__main__':
+    main()